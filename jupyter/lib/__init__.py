@@ -3,11 +3,18 @@ Claude Flow Jupyter Library
 
 Provides integration modules for notebooks:
 - cdp_notebook: Chrome DevTools Protocol event capture
+- recording_writer: Buffered background writer for capture recordings
+- event_bus: Publish/subscribe fan-out for captured events
 - automation_bridge: RL training browser automation
 - game_history_collector: Server-side game history collection for ML/RL training
+- game_id_index: Persistent game ID dedup index
+- price_path_store: Columnar float32 price paths for collected games
+- history_export: Streaming, parallel RL export of stored game history
 """
 
 from .cdp_notebook import CDPCapture, MockCDPCapture
+from .recording_writer import BufferedRecordingWriter
+from .event_bus import EventBus, Subscription
 from .automation_bridge import (
     LiveTrainingSession,
     ModelEvaluator,
@@ -16,15 +23,25 @@ from .automation_bridge import (
     print_status
 )
 from .game_history_collector import GameHistoryCollector, MockGameHistoryCollector
+from .game_id_index import GameIdIndex
+from .price_path_store import PricePathStore
+from .history_export import export_history, FEATURE_HOOKS
 
 __all__ = [
     'CDPCapture',
     'MockCDPCapture',
+    'BufferedRecordingWriter',
+    'EventBus',
+    'Subscription',
     'LiveTrainingSession',
     'ModelEvaluator',
     'MockLiveSession',
     'check_dependencies',
     'print_status',
     'GameHistoryCollector',
-    'MockGameHistoryCollector'
+    'MockGameHistoryCollector',
+    'GameIdIndex',
+    'PricePathStore',
+    'export_history',
+    'FEATURE_HOOKS'
 ]
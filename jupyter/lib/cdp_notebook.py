@@ -5,9 +5,10 @@ Chrome DevTools Protocol event capture for Jupyter notebooks.
 Usage:
     from jupyter.lib import CDPCapture
 
-    capture = CDPCapture()
+    capture = CDPCapture()   # or CDPCapture(event_types=[...], keep_raw=True)
     capture.connect()
     capture.start_recording("session.jsonl")
+    capture.subscribe(handle_trade, topics=['standard/newTrade'])
 
     # Later...
     capture.show_recent_events()
@@ -22,9 +23,12 @@ import time
 import threading
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional, Callable, Iterable
 from collections import deque
 
+from .event_bus import EventBus, Subscription
+from .recording_writer import BufferedRecordingWriter
+
 # Optional: Rich display for notebooks
 try:
     import pandas as pd
@@ -34,32 +38,87 @@ except ImportError:
     HAS_IPYTHON = False
 
 
+def frame_event_name(payload: str) -> Optional[str]:
+    """
+    Event name of a Socket.IO `42["name", ...]` frame without decoding it.
+
+    Returns:
+        The name, or None if the frame needs a full JSON parse (escaped
+        characters in the name, or not a plain event frame)
+    """
+    if not payload.startswith('42["'):
+        return None
+    end = payload.find('"', 4)
+    if end < 0:
+        return None
+    name = payload[4:end]
+    if '\\' in name:
+        return None
+    return name
+
+
 class CDPCapture:
     """
     Chrome DevTools Protocol event capture for notebooks.
 
     Connects to Chrome running with --remote-debugging-port and
     intercepts WebSocket frames from rugs.fun backend.
+
+    Each frame's event name is read from its prefix first. Frames that
+    are neither kept (event_types) nor subscribed to are dropped without
+    being decoded; with keep_raw, kept frames no subscriber needs are
+    stored undecoded (see decode_event()). Stored events carry either
+    'data' or 'raw', never both.
     """
 
-    def __init__(self, cdp_port: int = None, max_events: int = 10000):
+    def __init__(
+        self,
+        cdp_port: int = None,
+        max_events: int = 10000,
+        event_types: Optional[Iterable[str]] = None,
+        keep_raw: bool = False
+    ):
         """
         Initialize CDP capture.
 
         Args:
             cdp_port: CDP port (default: from CDP_PORT env or 9222)
             max_events: Maximum events to keep in memory
+            event_types: Event names to keep in memory and recordings
+                (default: all); subscribers still get their topics
+            keep_raw: Store frames no subscriber needs as the raw payload
+                and decode them on demand (recordings are decoded on the
+                writer thread and always hold 'data')
         """
         self.cdp_port = cdp_port or int(os.environ.get('CDP_PORT', 9222))
         self.max_events = max_events
+        self.event_types = frozenset(event_types) if event_types is not None else None
+        self.keep_raw = keep_raw
+        self.frame_stats: Dict[str, int] = {
+            'frames': 0,
+            'decoded': 0,
+            'deferred': 0,
+            'skipped': 0,
+            'errors': 0,
+        }
 
         self.events: deque = deque(maxlen=max_events)
+        # Maintained on insert/evict so monitoring never scans self.events:
+        # live counts per type, each type's events still in self.events
+        # (oldest first), and totals since the last clear(). The frame
+        # thread stores and the notebook thread clears, under one lock.
+        self._events_lock = threading.Lock()
+        self._type_counts: Dict[Optional[str], int] = {}
+        self._events_by_type: Dict[Optional[str], deque] = {}
+        self._type_totals: Dict[Optional[str], int] = {}
         self.is_connected = False
-        self._recording_file = None
+        self._writer: Optional[BufferedRecordingWriter] = None
         self._ws = None
         self._thread = None
         self._stop_event = threading.Event()
-        self._on_event_callback: Optional[Callable] = None
+        # Subscribers run on their own threads, never on the frame thread
+        self.bus = EventBus()
+        self._on_event_subscription: Optional[Subscription] = None
 
         # Try to import pychrome for CDP connection
         try:
@@ -128,12 +187,33 @@ class CDPCapture:
 
             # Parse Socket.IO frame format: 42["eventName", {...}]
             if payload.startswith('42['):
-                event = self._parse_socketio_frame(payload)
-                if event:
-                    self._process_event(event, timestamp)
+                self._handle_frame(payload, timestamp)
 
         except Exception as e:
-            pass  # Silently ignore parse errors
+            self.frame_stats['errors'] += 1
+
+    def _handle_frame(self, payload: str, timestamp: float):
+        """Prefilter a frame by event name, then decode only if needed."""
+        stats = self.frame_stats
+        stats['frames'] += 1
+        name = frame_event_name(payload)
+        if name is not None:
+            kept = self.event_types is None or name in self.event_types
+            subscribed = self.bus.wants(name)
+            if not kept and not subscribed:
+                stats['skipped'] += 1
+                return
+            if self.keep_raw and not subscribed:
+                stats['deferred'] += 1
+                self._process_event({'event_name': name, 'raw': payload}, timestamp)
+                return
+
+        event = self._parse_socketio_frame(payload)
+        if event is None:
+            stats['errors'] += 1
+            return
+        stats['decoded'] += 1
+        self._process_event(event, timestamp)
 
     def _parse_socketio_frame(self, payload: str) -> Optional[Dict]:
         """Parse Socket.IO message frame."""
@@ -146,74 +226,222 @@ class CDPCapture:
                 return {
                     'event_name': data[0],
                     'data': data[1] if len(data) > 1 else {},
-                    'raw': payload
                 }
         except:
             pass
         return None
 
+    def decode_event(self, event: Dict) -> Dict:
+        """
+        Event with 'data', decoding a raw (keep_raw) event if needed.
+
+        Args:
+            event: Stored event
+
+        Returns:
+            The event itself if already decoded, else a decoded copy
+            ('raw' replaced by 'data'; empty data if the frame is invalid)
+        """
+        if 'raw' not in event:
+            return event
+        decoded = {k: v for k, v in event.items() if k != 'raw'}
+        parsed = self._parse_socketio_frame(event['raw'])
+        decoded['data'] = parsed['data'] if parsed else {}
+        return decoded
+
+    def get_frame_stats(self) -> Dict[str, int]:
+        """
+        Frame parsing counters.
+
+        Returns:
+            Dict with frames seen, decoded, deferred (stored raw),
+            skipped (not kept or subscribed, never decoded) and errors
+        """
+        return dict(self.frame_stats)
+
     def _process_event(self, event: Dict, timestamp: float):
         """Process captured event."""
         event['timestamp'] = timestamp
         event['captured_at'] = datetime.now().isoformat()
 
-        # Add to buffer
-        self.events.append(event)
+        if self.event_types is None or event.get('event_name') in self.event_types:
+            # Add to buffer
+            self._store_event(event)
+
+            # Hand off to the recording writer thread if active (enqueue only)
+            writer = self._writer
+            if writer is not None:
+                writer.write(event)
+
+        # Fan out to subscribers (enqueue only)
+        self.bus.publish(event)
+
+    def _store_event(self, event: Dict):
+        """Append to the event buffer, keeping per-type counters and buffers in step."""
+        events = self.events
+        name = event.get('event_name')
+        with self._events_lock:
+            if len(events) == events.maxlen:
+                # The evicted event is the oldest of its type as well
+                evicted = events[0].get('event_name')
+                self._events_by_type[evicted].popleft()
+                self._type_counts[evicted] -= 1
+                if not self._type_counts[evicted]:
+                    del self._type_counts[evicted]
+                    del self._events_by_type[evicted]
+            events.append(event)
+
+            self._type_counts[name] = self._type_counts.get(name, 0) + 1
+            self._type_totals[name] = self._type_totals.get(name, 0) + 1
+            by_type = self._events_by_type.get(name)
+            if by_type is None:
+                by_type = self._events_by_type[name] = deque()
+            by_type.append(event)
+
+    def start_recording(
+        self,
+        filepath: str,
+        segmented: bool = False,
+        compression: str = 'zstd',
+        rotate_mb: Optional[float] = None,
+        rotate_minutes: Optional[float] = None,
+        rotate_per_game: bool = False,
+        **writer_options
+    ):
+        """
+        Start recording events to JSONL file.
 
-        # Write to recording file if active
-        if self._recording_file:
-            self._recording_file.write(json.dumps(event) + '\n')
-            self._recording_file.flush()
+        Events are written by a BufferedRecordingWriter thread, so the frame
+        callback never blocks on disk I/O.
 
-        # Call callback if registered
-        if self._on_event_callback:
+        With segmented=True the recording is split into compressed segments
+        plus a manifest (rag-pipeline ingestion/recording_segments.py, which
+        must be importable - notebooks get it from _paths).
+
+        Args:
+            filepath: Path to output file (base path when segmented)
+            segmented: Write rotating, compressed segments with a manifest
+            compression: Segment compression: 'zstd', 'gzip' or 'none'
+            rotate_mb: Start a new segment after N MB on disk
+            rotate_minutes: Start a new segment after N minutes
+            rotate_per_game: Start a new segment for every new gameId
+            **writer_options: Passed to BufferedRecordingWriter (max_queue,
+                batch_size, flush_interval, fsync, fsync_interval,
+                block_timeout)
+        """
+        self.stop_recording()
+        if segmented:
             try:
-                self._on_event_callback(event)
-            except:
-                pass
+                from ingestion.recording_segments import SegmentedRecordingWriter
+            except ImportError:
+                print("Error: rag-pipeline not importable (needed for segmented recording)")
+                print("Run: import _paths  # from jupyter/notebooks")
+                return
+            writer_options['sink'] = SegmentedRecordingWriter(
+                Path(filepath),
+                compression=compression,
+                rotate_bytes=int(rotate_mb * 1024 * 1024) if rotate_mb else None,
+                rotate_seconds=rotate_minutes * 60 if rotate_minutes else None,
+                rotate_per_game=rotate_per_game,
+            )
+        # keep_raw events are decoded on the writer thread, so recordings
+        # always hold 'data' (and segment rotation can see the gameId)
+        self._writer = BufferedRecordingWriter(
+            filepath, transform=self.decode_event, **writer_options
+        ).start()
+        print(f"Recording to: {filepath}")
 
-    def start_recording(self, filepath: str):
+    def stop_recording(self) -> Optional[str]:
         """
-        Start recording events to JSONL file.
+        Stop recording events, writing out anything still queued.
+
+        Returns:
+            Path to recording file (manifest when segmented), or None if
+            not recording
+        """
+        writer = self._writer
+        if writer is None:
+            return None
+        self._writer = None
+        metrics = writer.close()
+        path = str(writer.sink.manifest_path if writer.sink is not None else writer.path)
+        print(f"Recording stopped: {path}")
+        print(f"  Written: {metrics['written']}, dropped: {metrics['dropped']}, "
+              f"errors: {metrics['errors']}")
+        return path
+
+    def get_recording_metrics(self) -> Optional[Dict[str, Any]]:
+        """
+        Get writer and backpressure metrics for the active recording.
+
+        Returns:
+            Metrics dict (see BufferedRecordingWriter.get_metrics()), or None
+            if not recording
+        """
+        if self._writer is None:
+            return None
+        return self._writer.get_metrics()
+
+    def subscribe(
+        self,
+        callback: Callable[[Dict], None],
+        topics: Optional[List[str]] = None,
+        **options
+    ) -> Subscription:
+        """
+        Subscribe to captured events on a dedicated worker thread.
 
         Args:
-            filepath: Path to output file
+            callback: Function called with each matching event (must not
+                mutate it)
+            topics: Event names to receive (default: all)
+            **options: EventBus.subscribe() options (max_queue, overflow, name)
+
+        Returns:
+            Subscription (pass to unsubscribe())
         """
-        path = Path(filepath)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        self._recording_file = open(path, 'a')
-        print(f"Recording to: {filepath}")
+        return self.bus.subscribe(callback, topics=topics, **options)
 
-    def stop_recording(self) -> Optional[str]:
+    def unsubscribe(self, subscription: Subscription) -> Dict[str, Any]:
         """
-        Stop recording events.
+        Remove a subscriber after draining its queue.
 
         Returns:
-            Path to recording file, or None if not recording
-        """
-        if self._recording_file:
-            path = self._recording_file.name
-            self._recording_file.close()
-            self._recording_file = None
-            print(f"Recording stopped: {path}")
-            return path
-        return None
+            The subscriber's final metrics
+        """
+        return self.bus.unsubscribe(subscription)
 
-    def on_event(self, callback: Callable[[Dict], None]):
+    def on_event(self, callback: Callable[[Dict], None]) -> Subscription:
         """
         Register callback for new events.
 
+        Replaces the callback registered by a previous on_event() call;
+        use subscribe() to add independent subscribers.
+
         Args:
             callback: Function called with each new event
         """
-        self._on_event_callback = callback
+        if self._on_event_subscription is not None:
+            self.bus.unsubscribe(self._on_event_subscription)
+        self._on_event_subscription = self.bus.subscribe(callback, name='on_event')
+        return self._on_event_subscription
+
+    def get_bus_metrics(self) -> Dict[str, Any]:
+        """
+        Event bus fan-out metrics (see EventBus.get_metrics()).
+
+        Returns:
+            Dict with published, unrouted and dropped counts and per-subscriber metrics
+        """
+        return self.bus.get_metrics()
 
-    def get_events(self, limit: int = None) -> List[Dict]:
+    def get_events(self, limit: int = None, decode: bool = False) -> List[Dict]:
         """
         Get captured events.
 
         Args:
             limit: Maximum number of events to return (most recent)
+            decode: Decode raw (keep_raw) events (see decode_event())
 
         Returns:
             List of event dictionaries
@@ -221,26 +449,56 @@ class CDPCapture:
         events = list(self.events)
         if limit:
             events = events[-limit:]
+        if decode:
+            events = [self.decode_event(e) for e in events]
         return events
 
-    def filter_events(self, event_name: str) -> List[Dict]:
+    def filter_events(self, event_name: str, decode: bool = False) -> List[Dict]:
         """
         Get events matching a name.
 
         Args:
             event_name: Event name to filter by
+            decode: Decode raw (keep_raw) events (see decode_event())
 
         Returns:
             List of matching events
         """
-        return [e for e in self.events if e.get('event_name') == event_name]
+        events = list(self._events_by_type.get(event_name, ()))
+        if decode:
+            events = [self.decode_event(e) for e in events]
+        return events
+
+    def get_latest_event(self, event_name: str, decode: bool = False) -> Optional[Dict]:
+        """
+        Most recent buffered event with a name.
 
-    def get_event_counts(self) -> Dict[str, int]:
-        """Get count of each event type."""
-        counts = {}
-        for event in self.events:
-            name = event.get('event_name', 'unknown')
-            counts[name] = counts.get(name, 0) + 1
+        Args:
+            event_name: Event name
+            decode: Decode a raw (keep_raw) event (see decode_event())
+
+        Returns:
+            The event, or None if none is buffered
+        """
+        try:
+            event = self._events_by_type[event_name][-1]
+        except (KeyError, IndexError):
+            return None
+        return self.decode_event(event) if decode else event
+
+    def get_event_counts(self, total: bool = False) -> Dict[str, int]:
+        """
+        Get count of each event type.
+
+        Args:
+            total: Count every event stored since the last clear(), not
+                just those still in the buffer
+
+        Returns:
+            Dict of event name to count, most frequent first
+        """
+        counts = dict(self._type_totals if total else self._type_counts)
+        counts = {('unknown' if name is None else name): count for name, count in counts.items()}
         return dict(sorted(counts.items(), key=lambda x: -x[1]))
 
     def show_recent_events(self, limit: int = 20):
@@ -254,7 +512,7 @@ class CDPCapture:
             print("IPython not available - use get_events() instead")
             return
 
-        events = self.get_events(limit)
+        events = self.get_events(limit, decode=True)
 
         if not events:
             print("No events captured yet")
@@ -293,13 +551,18 @@ class CDPCapture:
         display(HTML(df.to_html(index=False)))
 
     def clear(self):
-        """Clear event buffer."""
-        self.events.clear()
+        """Clear event buffer (safe while the frame thread is storing)."""
+        with self._events_lock:
+            self.events.clear()
+            self._type_counts.clear()
+            self._events_by_type.clear()
+            self._type_totals.clear()
         print("Event buffer cleared")
 
     def disconnect(self):
         """Disconnect from CDP."""
         self.stop_recording()
+        self.bus.flush(timeout=1.0)
 
         if hasattr(self, '_tab') and self._tab:
             try:
@@ -0,0 +1,323 @@
+"""
+Event Bus - Publish/subscribe fan-out for captured events
+
+CDPCapture used to hold a single on_event callback that subscribers
+chained by wrapping, so every subscriber ran serially on the frame
+thread and a slow one stalled capture. EventBus decouples them:
+
+- each subscriber gets its own bounded queue and worker thread, so a
+  slow subscriber only backs up (and drops from) its own queue
+- topic filtering (event_name) happens in publish(), before anything is
+  queued; routes per topic are cached in immutable tuples that are
+  replaced copy-on-write on (un)subscribe, so publish() takes no locks
+- drops, deliveries, callback errors and queue high-water marks are
+  counted per subscriber
+
+Events are shared between subscribers (and the recording writer), so
+callbacks must not mutate them.
+
+Usage:
+    from jupyter.lib import EventBus
+
+    bus = EventBus()
+    sub = bus.subscribe(handle_game, topics=['gameStateUpdate'], max_queue=1000)
+    bus.publish({'event_name': 'gameStateUpdate', 'data': {...}})
+    ...
+    print(bus.get_metrics()['subscribers'][sub.name]['dropped'])
+    bus.close()
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+# Queue-full policies: drop the incoming event, or evict the oldest queued one
+OVERFLOW_POLICIES = ('drop_newest', 'drop_oldest')
+
+# Event key used as the topic
+TOPIC_KEY = 'event_name'
+
+
+class Subscription:
+    """
+    One subscriber: a bounded queue drained by a dedicated worker thread.
+
+    Created by EventBus.subscribe().
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[Dict], None],
+        topics: Optional[Iterable[str]] = None,
+        max_queue: int = 1000,
+        overflow: str = 'drop_newest',
+        name: Optional[str] = None,
+    ):
+        """
+        Initialize and start the worker thread.
+
+        Args:
+            callback: Called with each event on the worker thread
+            topics: Event names to receive (None = all events)
+            max_queue: Maximum events waiting for the callback
+            overflow: One of OVERFLOW_POLICIES
+            name: Name used in metrics and the thread name
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown overflow policy {overflow!r}; expected one of {', '.join(OVERFLOW_POLICIES)}"
+            )
+        if max_queue < 1:
+            raise ValueError("max_queue must be positive")
+
+        self.callback = callback
+        self.topics = frozenset(topics) if topics is not None else None
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.name = name or getattr(callback, '__qualname__', repr(callback))
+
+        # deque append/popleft are atomic; only the publisher appends
+        self._queue: deque = deque()
+        self._ready = threading.Event()
+        self._closing = False
+        self._busy = False
+
+        self.stats: Dict[str, Any] = {
+            'queued': 0,
+            'delivered': 0,
+            'dropped': 0,
+            'errors': 0,
+            'max_queue_depth': 0,
+            'last_error': None,
+        }
+
+        self._thread = threading.Thread(target=self._run, name=f'event-bus:{self.name}', daemon=True)
+        self._thread.start()
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the worker thread is alive."""
+        return self._thread.is_alive()
+
+    def wants(self, topic: Optional[str]) -> bool:
+        """Whether events with this topic are routed here."""
+        return self.topics is None or topic in self.topics
+
+    def offer(self, event: Dict) -> bool:
+        """
+        Queue an event without blocking (called by the publisher).
+
+        Returns:
+            True if queued, False if dropped
+        """
+        if self._closing:
+            self.stats['dropped'] += 1
+            return False
+        depth = len(self._queue)
+        if depth >= self.max_queue:
+            self.stats['dropped'] += 1
+            if self.overflow == 'drop_newest':
+                return False
+            try:
+                self._queue.popleft()
+            except IndexError:
+                pass
+        else:
+            depth += 1
+            if depth > self.stats['max_queue_depth']:
+                self.stats['max_queue_depth'] = depth
+        self._queue.append(event)
+        self.stats['queued'] += 1
+        self._ready.set()
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued event has been handled.
+
+        Returns:
+            True if drained within timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue or self._busy:
+            if not self.is_running or (deadline is not None and time.monotonic() >= deadline):
+                return False
+            time.sleep(0.001)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Stop accepting events, drain the queue and stop the worker thread.
+
+        Returns:
+            Final metrics
+        """
+        self._closing = True
+        self._ready.set()
+        self._thread.join(timeout)
+        return self.get_metrics()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Snapshot of counters plus current queue depth."""
+        metrics = dict(self.stats)
+        metrics['queue_depth'] = len(self._queue)
+        metrics['topics'] = sorted(self.topics) if self.topics is not None else None
+        return metrics
+
+    def _run(self):
+        queue = self._queue
+        while True:
+            # Clear before draining so an append racing the drain re-arms it
+            self._ready.wait()
+            self._ready.clear()
+            while True:
+                try:
+                    event = queue.popleft()
+                except IndexError:
+                    break
+                self._busy = True
+                try:
+                    self.callback(event)
+                    self.stats['delivered'] += 1
+                except Exception as e:
+                    self.stats['errors'] += 1
+                    self.stats['last_error'] = f"{type(e).__name__}: {e}"
+                finally:
+                    self._busy = False
+            if self._closing:
+                return
+
+
+class EventBus:
+    """
+    Fans published events out to subscribers by topic.
+
+    publish() is meant to be called from a single producer thread (the
+    capture frame thread); subscribe() and unsubscribe() may be called
+    from anywhere.
+    """
+
+    def __init__(self):
+        """Create a bus with no subscribers."""
+        self._lock = threading.Lock()  # serializes (un)subscribe only
+        self._subscriptions: Tuple[Subscription, ...] = ()
+        self._routes: Dict[Optional[str], Tuple[Subscription, ...]] = {}
+        self.stats: Dict[str, int] = {'published': 0, 'unrouted': 0}
+
+    @property
+    def subscriptions(self) -> Tuple[Subscription, ...]:
+        """Current subscriptions."""
+        return self._subscriptions
+
+    def subscribe(
+        self,
+        callback: Callable[[Dict], None],
+        topics: Optional[Iterable[str]] = None,
+        max_queue: int = 1000,
+        overflow: str = 'drop_newest',
+        name: Optional[str] = None,
+    ) -> Subscription:
+        """
+        Add a subscriber with its own queue and worker thread.
+
+        Args:
+            callback: Called with each matching event on the worker thread
+            topics: Event names to receive (None = all events)
+            max_queue: Maximum events waiting for the callback
+            overflow: 'drop_newest' or 'drop_oldest' when the queue is full
+            name: Name used in metrics
+
+        Returns:
+            Subscription (pass to unsubscribe())
+        """
+        subscription = Subscription(callback, topics, max_queue, overflow, name)
+        with self._lock:
+            self._subscriptions = self._subscriptions + (subscription,)
+            self._routes = {}
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription, timeout: Optional[float] = 1.0) -> Dict[str, Any]:
+        """
+        Remove a subscriber, draining its queue first.
+
+        Returns:
+            The subscription's final metrics
+        """
+        with self._lock:
+            self._subscriptions = tuple(s for s in self._subscriptions if s is not subscription)
+            self._routes = {}
+        return subscription.close(timeout)
+
+    def wants(self, topic: Optional[str]) -> bool:
+        """Whether any subscriber receives events with this topic."""
+        return bool(self._route(topic))
+
+    def _route(self, topic: Optional[str]) -> Tuple[Subscription, ...]:
+        routes = self._routes
+        subscribers = routes.get(topic)
+        if subscribers is None:
+            subscribers = tuple(s for s in self._subscriptions if s.wants(topic))
+            routes[topic] = subscribers
+        return subscribers
+
+    def publish(self, event: Dict) -> int:
+        """
+        Route an event to every subscriber whose topics match.
+
+        Never blocks; full subscriber queues drop per their overflow policy.
+
+        Returns:
+            Number of subscribers the event was queued for
+        """
+        self.stats['published'] += 1
+        subscribers = self._route(event.get(TOPIC_KEY))
+        if not subscribers:
+            self.stats['unrouted'] += 1
+            return 0
+        queued = 0
+        for subscription in subscribers:
+            queued += subscription.offer(event)
+        return queued
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every subscriber has handled its queued events.
+
+        Returns:
+            True if all drained within timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for subscription in self._subscriptions:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not subscription.flush(remaining):
+                return False
+        return True
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Snapshot of bus and per-subscriber metrics.
+
+        Returns:
+            Dict with published and unrouted counts, total dropped, and
+            'subscribers' mapping names to Subscription.get_metrics()
+        """
+        subscribers = {}
+        for subscription in self._subscriptions:
+            name = subscription.name
+            if name in subscribers:
+                name = f"{name}#{id(subscription):x}"
+            subscribers[name] = subscription.get_metrics()
+        return {
+            **self.stats,
+            'dropped': sum(m['dropped'] for m in subscribers.values()),
+            'subscribers': subscribers,
+        }
+
+    def close(self, timeout: Optional[float] = 1.0):
+        """Drain and stop every subscriber."""
+        with self._lock:
+            subscriptions, self._subscriptions = self._subscriptions, ()
+            self._routes = {}
+        for subscription in subscriptions:
+            subscription.close(timeout)
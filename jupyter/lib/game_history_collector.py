@@ -6,9 +6,14 @@ from gameStateUpdate events. This rolling window of recent completed games
 provides high-value training data with zero manual effort.
 
 Key Features:
-- Automatic deduplication by gameId
+- Automatic deduplication by gameId (persistent index, constant-time startup)
+- O(1) lookup by gameId and range queries over timestamp, rugPoint and
+  peakMultiplier, in memory and over all stored history
 - Rolling window tracking (~10 games)
 - JSONL storage compatible with existing recordings
+- Columnar float32 price paths per session (.prices.npy/.offsets.npy)
+  and tensor-ready RL export (format='npy' or 'arrow')
+- Sharded, parallel export of all stored history with feature hooks
 - Passive collection during any live session
 - Full game data: prices, trades, sidebets, provablyFair
 
@@ -30,16 +35,88 @@ Usage:
     
     collector.attach_to_capture(capture)
     # Games automatically collected from gameStateUpdate events
+
+    # Queries
+    collector.get_game_by_id("20251215-abc123")
+    collector.query_games(min_peak=10.0, start_ts=since_ms, source="all")
+
+    # RL export without JSON
+    collector.export_for_rl_training(format="npy")
+    prices, offsets = collector.get_price_paths().to_numpy()
+    collector.export_history("exports/rl", format="npz", start_ts=since_ms)
 """
 
 import os
 import json
 import time
+from bisect import bisect_left, bisect_right, insort
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Set, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from collections import deque
 
+from .game_id_index import GameIdIndex, numeric_value
+from .price_path_store import PricePathStore, STORE_FORMATS
+from .history_export import export_history
+
+# query_games() sources
+QUERY_SOURCES = ('memory', 'disk', 'all')
+
+# Default export location inside storage_dir (kept out of the game index)
+EXPORTS_DIRNAME = 'exports'
+
+# Games between price-path sidecar checkpoints while collecting
+PRICES_SAVE_INTERVAL = 100
+
+
+def _timestamp_key(game: Dict[str, Any]) -> Tuple[bool, float]:
+    """Sort key putting games without a timestamp last."""
+    ts = numeric_value(game.get('timestamp'))
+    return (ts is None, ts or 0)
+
+
+def _add_price_path(store: PricePathStore, game: Dict[str, Any]):
+    """
+    Add a game to a session sidecar, keeping one entry per session line.
+
+    A game whose prices are not all numbers is logged and added with an
+    empty path, so the sidecar still lines up with its session file.
+    """
+    try:
+        store.add(game)
+    except TypeError as e:
+        print(f"Warning: Bad prices for game {game.get('id')}: {e}")
+        store.add({**game, 'prices': []})
+
+
+class _RangeIndex:
+    """Sorted (value, seq) pairs over one numeric game field."""
+
+    __slots__ = ('field', 'keys')
+
+    def __init__(self, field: str):
+        self.field = field
+        self.keys: List[Tuple[float, int]] = []
+
+    def add(self, game: Dict[str, Any], seq: int):
+        value = numeric_value(game.get(self.field))
+        if value is not None:
+            insort(self.keys, (value, seq))
+
+    def remove(self, game: Dict[str, Any], seq: int):
+        value = numeric_value(game.get(self.field))
+        if value is None:
+            return
+        i = bisect_left(self.keys, (value, seq))
+        if i < len(self.keys) and self.keys[i] == (value, seq):
+            del self.keys[i]
+
+    def range(self, low: Optional[float], high: Optional[float]) -> List[int]:
+        """Sequence numbers of games with low <= value <= high."""
+        start = 0 if low is None else bisect_left(self.keys, (low, -1))
+        end = len(self.keys) if high is None else bisect_right(self.keys, (high, float('inf')))
+        return [seq for _, seq in self.keys[start:end]]
+
 
 class GameHistoryCollector:
     """
@@ -74,10 +151,18 @@ class GameHistoryCollector:
         self.auto_save = auto_save
         self.max_memory_games = max_memory_games
         
-        # State tracking
-        self.seen_game_ids: Set[str] = set()
+        # State tracking (seen IDs persist in storage_dir/.game_ids.sqlite)
+        self.seen_game_ids = GameIdIndex(self.storage_dir)
         self.collected_games: deque = deque(maxlen=max_memory_games)
         self.is_collecting = False
+
+        # In-memory indexes over collected_games, evicted with the window
+        self._seq = 0
+        self._seq_by_id: Dict[str, int] = {}
+        self._games_by_seq: Dict[int, Dict[str, Any]] = {}
+        self._range_indexes = {
+            field: _RangeIndex(field) for field in ('timestamp', 'rugPoint', 'peakMultiplier')
+        }
         
         # Statistics
         self.stats = {
@@ -87,28 +172,11 @@ class GameHistoryCollector:
             'last_game_collected': None
         }
         
-        # Session file for current collection run
+        # Session file (and its price-path sidecar) for current collection run
         self._session_file = None
+        self._session_prices: Optional[PricePathStore] = None
         self._cdp_capture = None
-        
-        # Load previously seen game IDs to avoid re-collecting
-        self._load_seen_game_ids()
-    
-    def _load_seen_game_ids(self):
-        """Load previously collected game IDs from storage directory."""
-        if not self.storage_dir.exists():
-            return
-        
-        for filepath in self.storage_dir.glob("*.jsonl"):
-            try:
-                with open(filepath, 'r') as f:
-                    for line in f:
-                        if line.strip():
-                            game = json.loads(line)
-                            if 'id' in game:
-                                self.seen_game_ids.add(game['id'])
-            except Exception as e:
-                print(f"Warning: Could not load game IDs from {filepath}: {e}")
+        self._subscription = None
     
     def start_collecting(self, session_name: Optional[str] = None):
         """
@@ -131,10 +199,58 @@ class GameHistoryCollector:
             
             session_file = self.storage_dir / f"{session_name}.jsonl"
             self._session_file = open(session_file, 'a')
+            self._session_prices = self._open_session_prices(session_file)
             print(f"Collecting games to: {session_file}")
         
         print("Game history collection started")
     
+    def _open_session_prices(self, session_file: Path) -> PricePathStore:
+        """
+        Price-path sidecar for a session file, continuing an earlier run.
+
+        The sidecar is only checkpointed every PRICES_SAVE_INTERVAL games,
+        so after a crash it can lag the session file. It is reused only if
+        its game count and last game ID match the session file; otherwise
+        it is rebuilt from the session file.
+        """
+        lines = 0
+        last_line = None
+        with open(session_file) as f:
+            for line in f:
+                if line.strip():
+                    lines += 1
+                    last_line = line
+        if not lines:
+            return PricePathStore()
+        try:
+            last_id = json.loads(last_line).get('id')
+        except json.JSONDecodeError:
+            last_id = None  # torn final write
+
+        prefix = session_file.with_suffix('')
+        if prefix.with_name(prefix.name + '.prices.npy').exists():
+            try:
+                store = PricePathStore.load(prefix)
+                if len(store) == lines and store.meta['id'][-1] == last_id:
+                    return store
+            except (OSError, ValueError) as e:
+                print(f"Warning: Could not load price paths for {session_file}: {e}")
+            print(f"Rebuilding price paths for {session_file}")
+
+        store = PricePathStore()
+        with open(session_file) as f:
+            for line in f:
+                try:
+                    game = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                _add_price_path(store, game)
+        return store
+
+    def _save_session_prices(self):
+        """Checkpoint the session's price-path sidecar next to its JSONL file."""
+        self._session_prices.save(Path(self._session_file.name).with_suffix(''))
+    
     def stop_collecting(self) -> Dict[str, Any]:
         """
         Stop collecting games and return statistics.
@@ -151,7 +267,10 @@ class GameHistoryCollector:
         # Close session file
         if self._session_file:
             self._session_file.close()
+            if self._session_prices:
+                self._save_session_prices()
             self._session_file = None
+            self._session_prices = None
         
         print(f"Collection stopped. Total collected: {self.stats['total_collected']}")
         return self.stats.copy()
@@ -194,9 +313,6 @@ class GameHistoryCollector:
             self.stats['duplicates_skipped'] += 1
             return
         
-        # Mark as seen
-        self.seen_game_ids.add(game_id)
-        
         # Add metadata
         game_record = {
             **game,
@@ -205,17 +321,50 @@ class GameHistoryCollector:
         }
         
         # Store in memory
-        self.collected_games.append(game_record)
+        self._remember(game_record)
         
         # Update statistics
         self.stats['total_collected'] += 1
         self.stats['last_game_collected'] = game_id
         
-        # Auto-save if enabled
+        # Auto-save if enabled, then mark as seen (the index records how
+        # far the session file has been written so it is never re-read)
         if self.auto_save and self._session_file:
+            offset = os.fstat(self._session_file.fileno()).st_size
             self._session_file.write(json.dumps(game_record) + '\n')
             self._session_file.flush()
+            self.seen_game_ids.add(
+                game_id, self._session_file.name, game=game_record, offset=offset
+            )
+            _add_price_path(self._session_prices, game_record)
+            if len(self._session_prices) % PRICES_SAVE_INTERVAL == 0:
+                self._save_session_prices()
+        else:
+            self.seen_game_ids.add(game_id)
     
+    def _remember(self, game: Dict[str, Any]):
+        """Append a game to the memory window, keeping the indexes in step."""
+        games = self.collected_games
+        if games.maxlen is not None and len(games) == games.maxlen:
+            self._forget(games[0])
+        games.append(game)
+
+        seq = self._seq
+        self._seq += 1
+        self._seq_by_id[game['id']] = seq
+        self._games_by_seq[seq] = game
+        for index in self._range_indexes.values():
+            index.add(game, seq)
+
+    def _forget(self, game: Dict[str, Any]):
+        """Drop a game leaving the memory window from the indexes."""
+        seq = self._seq_by_id.pop(game['id'], None)
+        if seq is None:
+            return
+        del self._games_by_seq[seq]
+        for index in self._range_indexes.values():
+            index.remove(game, seq)
+
     def attach_to_capture(self, cdp_capture):
         """
         Attach to an existing CDPCapture instance.
@@ -223,21 +372,16 @@ class GameHistoryCollector:
         Args:
             cdp_capture: CDPCapture instance to attach to
         """
+        if self._subscription is not None:
+            self._cdp_capture.unsubscribe(self._subscription)
         self._cdp_capture = cdp_capture
         
-        # Register callback for gameStateUpdate events
-        original_callback = cdp_capture._on_event_callback
-        
-        def combined_callback(event):
-            # Process for game history collection
-            if event.get('event_name') == 'gameStateUpdate':
-                self.process_game_state_update(event)
-            
-            # Call original callback if exists
-            if original_callback:
-                original_callback(event)
-        
-        cdp_capture.on_event(combined_callback)
+        # Only gameStateUpdate events are queued for us, on our own thread
+        self._subscription = cdp_capture.subscribe(
+            self.process_game_state_update,
+            topics=['gameStateUpdate'],
+            name='game_history_collector'
+        )
         
         # Start collecting
         if not self.is_collecting:
@@ -270,10 +414,83 @@ class GameHistoryCollector:
         Returns:
             Game record or None if not found
         """
-        for game in self.collected_games:
-            if game.get('id') == game_id:
-                return game
-        return None
+        seq = self._seq_by_id.get(game_id)
+        return self._games_by_seq[seq] if seq is not None else None
+
+    def query_games(
+        self,
+        start_ts: Optional[int] = None,
+        end_ts: Optional[int] = None,
+        min_rug_point: Optional[float] = None,
+        max_rug_point: Optional[float] = None,
+        min_peak: Optional[float] = None,
+        max_peak: Optional[float] = None,
+        limit: Optional[int] = None,
+        source: str = 'memory'
+    ) -> List[Dict[str, Any]]:
+        """
+        Find games by timestamp, rugPoint and peakMultiplier ranges.
+
+        All bounds are inclusive; games missing a bounded field never match.
+
+        Args:
+            start_ts: Minimum game timestamp (ms)
+            end_ts: Maximum game timestamp (ms)
+            min_rug_point: Minimum rugPoint
+            max_rug_point: Maximum rugPoint
+            min_peak: Minimum peakMultiplier
+            max_peak: Maximum peakMultiplier
+            limit: Maximum number of games to return (oldest first)
+            source: 'memory' (collected_games window), 'disk' (every stored
+                session via the game ID index) or 'all' (both, deduplicated)
+
+        Returns:
+            List of game records sorted by timestamp
+        """
+        if source not in QUERY_SOURCES:
+            raise ValueError(
+                f"Unknown source {source!r}; expected one of {', '.join(QUERY_SOURCES)}"
+            )
+        bounds = {
+            'timestamp': (start_ts, end_ts),
+            'rugPoint': (min_rug_point, max_rug_point),
+            'peakMultiplier': (min_peak, max_peak),
+        }
+
+        games: Dict[str, Dict[str, Any]] = {}
+        if source in ('disk', 'all'):
+            locations = self.seen_game_ids.query(
+                start_ts, end_ts, min_rug_point, max_rug_point, min_peak, max_peak, limit
+            )
+            for game in self.seen_game_ids.load(locations):
+                games[game['id']] = game
+        if source in ('memory', 'all'):
+            for game in self._query_memory(bounds):
+                games[game['id']] = game
+
+        results = sorted(games.values(), key=_timestamp_key)
+        return results[:limit] if limit is not None else results
+
+    def _query_memory(self, bounds: Dict[str, Tuple]) -> List[Dict[str, Any]]:
+        """In-memory games within bounds, using the first bounded index."""
+        active = {
+            field: (low, high) for field, (low, high) in bounds.items()
+            if low is not None or high is not None
+        }
+        if not active:
+            return list(self.collected_games)
+
+        field, (low, high) = next(iter(active.items()))
+        candidates = [self._games_by_seq[seq] for seq in self._range_indexes[field].range(low, high)]
+        results = []
+        for game in candidates:
+            for other, (lo, hi) in active.items():
+                value = numeric_value(game.get(other))
+                if value is None or (lo is not None and value < lo) or (hi is not None and value > hi):
+                    break
+            else:
+                results.append(game)
+        return results
     
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -289,30 +506,60 @@ class GameHistoryCollector:
             'is_collecting': self.is_collecting
         }
     
+    def get_price_paths(self, limit: Optional[int] = None) -> PricePathStore:
+        """
+        Get collected games' price paths as one float32 buffer.
+        
+        Args:
+            limit: Maximum number of games to include (most recent)
+        
+        Returns:
+            PricePathStore (see to_numpy() for tensors)
+        """
+        return PricePathStore.from_games(self.get_collected_games(limit))
+    
     def export_for_rl_training(
         self,
         output_file: Optional[Path] = None,
-        include_fields: Optional[List[str]] = None
-    ) -> Path:
+        include_fields: Optional[List[str]] = None,
+        format: str = 'jsonl'
+    ) -> Optional[Path]:
         """
         Export collected games in format suitable for RL training.
         
         Args:
-            output_file: Output file path (default: auto-generated)
-            include_fields: List of fields to include (default: all)
+            output_file: Output file path (default: auto-generated in
+                storage_dir/exports); for
+                'npy' and 'arrow' the suffix is replaced by the store's
+            include_fields: List of fields to include (default: all; 'jsonl' only)
+            format: 'jsonl', 'npy' (.prices.npy, .offsets.npy, .meta.json)
+                or 'arrow'
         
         Returns:
-            Path to exported file
+            Path to exported file (the prices file for 'npy'), or None if
+            pyarrow is missing for 'arrow'
         """
+        if format != 'jsonl' and format not in STORE_FORMATS:
+            raise ValueError(
+                f"Unknown format {format!r}; expected one of jsonl, {', '.join(STORE_FORMATS)}"
+            )
+        
         if output_file is None:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            output_file = self.storage_dir / f"rl_export_{timestamp}.jsonl"
+            output_file = self.storage_dir / EXPORTS_DIRNAME / f"rl_export_{timestamp}.jsonl"
         
         output_file = Path(output_file)
         output_file.parent.mkdir(parents=True, exist_ok=True)
         
         games = self.get_collected_games()
         
+        if format != 'jsonl':
+            paths = PricePathStore.from_games(games).save(output_file.with_suffix(''), format=format)
+            if not paths:
+                return None
+            print(f"Exported {len(games)} games to: {paths[0]}")
+            return paths[0]
+        
         with open(output_file, 'w') as f:
             for game in games:
                 # Filter fields if specified
@@ -326,9 +573,33 @@ class GameHistoryCollector:
         print(f"Exported {len(games)} games to: {output_file}")
         return output_file
     
+    def export_history(self, output_dir: Optional[Path] = None, **options) -> Dict[str, Any]:
+        """
+        Export every stored game (not just memory) as feature-engineered shards.
+        
+        Args:
+            output_dir: Output directory (default: auto-generated in storage_dir/exports)
+            **options: export_history() options (fields, features, format,
+                shard_size, workers) and query() bounds (start_ts, min_peak, ...)
+        
+        Returns:
+            Export manifest
+        """
+        if output_dir is None:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            output_dir = self.storage_dir / EXPORTS_DIRNAME / f"rl_export_{timestamp}"
+        
+        manifest = export_history(self.storage_dir, output_dir, index=self.seen_game_ids, **options)
+        print(f"Exported {manifest['games']} games in {len(manifest['shards'])} shards to: {output_dir}")
+        return manifest
+    
     def clear_memory(self):
         """Clear in-memory game collection (keeps disk storage)."""
         self.collected_games.clear()
+        self._seq_by_id.clear()
+        self._games_by_seq.clear()
+        for index in self._range_indexes.values():
+            index.keys.clear()
         print("In-memory game collection cleared")
     
     def validate_game_structure(self, sample_size: int = 10) -> Dict[str, Any]:
@@ -0,0 +1,395 @@
+"""
+Game ID Index - Persistent dedup index for GameHistoryCollector
+
+Rebuilding the set of seen game IDs by parsing every stored JSONL file
+makes collector startup grow with all history ever collected.
+GameIdIndex keeps the IDs in a small SQLite file inside the storage
+directory instead:
+
+- game IDs live in a primary-key table, so membership checks are an
+  index lookup and nothing is loaded into memory at startup
+- each ID's file, byte offset, timestamp, rugPoint and peakMultiplier
+  are stored with secondary indexes, so query() answers range queries
+  over all stored history and load() seeks straight to the games
+- the number of IDs is kept in a meta row, so len() does not count rows
+- only collector session files are indexed; RL exports (rl_export_*)
+  are skipped
+- each JSONL file's indexed size and mtime are recorded; at startup
+  only files that are new or have grown since (e.g. copied in, or
+  written by an older collector) are read, and only from the last
+  indexed byte
+- IDs recorded by the collector mark the session file as indexed up to
+  its current size, so its own writes are never re-read
+
+IDs are never removed when a JSONL file is deleted; call rebuild() to
+resync with the files on disk.
+
+Usage:
+    from jupyter.lib import GameIdIndex
+
+    index = GameIdIndex(storage_dir)        # catches up with new files
+    if game_id not in index:
+        offset = os.fstat(session_file.fileno()).st_size
+        session_file.write(json.dumps(game) + '\\n')
+        session_file.flush()
+        index.add(game_id, session_file.name, game=game, offset=offset)
+
+    big_rugs = index.load(index.query(min_peak=10.0, start_ts=since_ms))
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+# Bump when the table layout changes (older indexes are rebuilt)
+INDEX_VERSION = 2
+
+# Index file inside the storage directory (not matched by *.jsonl)
+INDEX_FILENAME = '.game_ids.sqlite'
+
+# JSONL files that are derived from the session files, never indexed
+# (older collectors wrote rl_export_*.jsonl into the storage directory;
+# their projected lines would otherwise become a game's stored location)
+EXCLUDED_PREFIXES = ('rl_export_',)
+
+_META_SCHEMA = "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS game_ids (
+    id TEXT PRIMARY KEY,
+    file TEXT,
+    offset INTEGER,
+    timestamp INTEGER,
+    rug_point REAL,
+    peak_multiplier REAL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS game_ids_timestamp ON game_ids (timestamp);
+CREATE INDEX IF NOT EXISTS game_ids_rug_point ON game_ids (rug_point);
+CREATE INDEX IF NOT EXISTS game_ids_peak ON game_ids (peak_multiplier);
+CREATE TABLE IF NOT EXISTS files (
+    name TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    offset INTEGER NOT NULL
+);
+"""
+
+
+def numeric_value(value: Any) -> Optional[float]:
+    """Numeric value for an indexed column, or None."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    return None
+
+
+def _game_row(game: Dict[str, Any], name: Optional[str], offset: Optional[int]) -> Tuple:
+    return (
+        game['id'],
+        name,
+        offset,
+        numeric_value(game.get('timestamp')),
+        numeric_value(game.get('rugPoint')),
+        numeric_value(game.get('peakMultiplier')),
+    )
+
+
+def load_games(storage_dir: Union[str, Path], locations: List[Tuple[str, str, int]]) -> List[Dict[str, Any]]:
+    """
+    Read games from JSONL files by (game_id, file name, byte offset).
+
+    Args:
+        storage_dir: Directory holding the JSONL files
+        locations: Locations as returned by GameIdIndex.query()
+
+    Returns:
+        Game records in the same order (missing or changed lines skipped)
+    """
+    storage_dir = Path(storage_dir)
+    games = []
+    handles: Dict[str, Any] = {}
+    try:
+        for game_id, name, offset in locations:
+            f = handles.get(name)
+            if f is None:
+                try:
+                    f = handles[name] = open(storage_dir / name, 'rb')
+                except OSError:
+                    continue
+            f.seek(offset)
+            try:
+                game = json.loads(f.readline())
+            except ValueError:
+                continue
+            if isinstance(game, dict) and game.get('id') == game_id:
+                games.append(game)
+    finally:
+        for f in handles.values():
+            f.close()
+    return games
+
+
+class GameIdIndex:
+    """
+    Set-like persistent index of collected game IDs.
+
+    Supports `in`, len(), add() and iteration, so it can stand in for the
+    set GameHistoryCollector used to rebuild at startup. Safe to use from
+    the capture callback thread.
+    """
+
+    def __init__(self, storage_dir: Union[str, Path], index_path: Optional[Path] = None):
+        """
+        Open (or create) the index and catch up with the JSONL files.
+
+        Args:
+            storage_dir: Directory holding the collector's JSONL files
+            index_path: Index location (default: storage_dir/INDEX_FILENAME)
+        """
+        self.storage_dir = Path(storage_dir)
+        self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = Path(index_path) if index_path else self.storage_dir / INDEX_FILENAME
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.index_path), check_same_thread=False)
+        self._conn.executescript(_META_SCHEMA)
+        self._count = 0
+
+        if self._meta('version') != str(INDEX_VERSION):
+            self.rebuild()
+        else:
+            self._conn.executescript(_SCHEMA)
+            self._count = int(self._meta('count') or 0)
+            self.refresh()
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value))
+        )
+
+    def __contains__(self, game_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM game_ids WHERE id = ?", (game_id,)
+            ).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            ids = [row[0] for row in self._conn.execute("SELECT id FROM game_ids")]
+        return iter(ids)
+
+    def add(
+        self,
+        game_id: str,
+        filepath: Optional[Union[str, Path]] = None,
+        game: Optional[Dict[str, Any]] = None,
+        offset: Optional[int] = None,
+    ) -> bool:
+        """
+        Record a game ID.
+
+        Args:
+            game_id: Game ID to add
+            filepath: JSONL file the game was just written (and flushed) to;
+                it is marked as indexed up to its current size
+            game: Game record, for the query() columns
+            offset: Byte offset of the game's line in filepath, for load()
+
+        Returns:
+            True if the ID was new
+        """
+        path = Path(filepath) if filepath is not None else None
+        row = _game_row(
+            {**(game or {}), 'id': game_id},
+            path.name if path is not None else None,
+            offset if path is not None else None,
+        )
+        with self._lock:
+            added = self._insert([row])
+            if path is not None:
+                stat = path.stat()
+                self._mark_file(path.name, stat.st_size, stat.st_mtime_ns, stat.st_size)
+            self._conn.commit()
+        return added > 0
+
+    def query(
+        self,
+        start_ts: Optional[int] = None,
+        end_ts: Optional[int] = None,
+        min_rug_point: Optional[float] = None,
+        max_rug_point: Optional[float] = None,
+        min_peak: Optional[float] = None,
+        max_peak: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[str, str, int]]:
+        """
+        Find stored games by timestamp, rugPoint and peakMultiplier ranges.
+
+        All bounds are inclusive. Games added without a file (auto_save
+        off) cannot be loaded and are not returned.
+
+        Args:
+            start_ts: Minimum game timestamp (ms)
+            end_ts: Maximum game timestamp (ms)
+            min_rug_point: Minimum rugPoint
+            max_rug_point: Maximum rugPoint
+            min_peak: Minimum peakMultiplier
+            max_peak: Maximum peakMultiplier
+            limit: Maximum results
+
+        Returns:
+            List of (game_id, file name, byte offset), oldest first
+        """
+        bounds = [
+            ('timestamp', start_ts, end_ts),
+            ('rug_point', min_rug_point, max_rug_point),
+            ('peak_multiplier', min_peak, max_peak),
+        ]
+        clauses = ['file IS NOT NULL', 'offset IS NOT NULL']
+        params: List[Any] = []
+        for column, low, high in bounds:
+            if low is not None:
+                clauses.append(f'{column} >= ?')
+                params.append(low)
+            if high is not None:
+                clauses.append(f'{column} <= ?')
+                params.append(high)
+
+        sql = (
+            'SELECT id, file, offset FROM game_ids WHERE ' + ' AND '.join(clauses)
+            + ' ORDER BY timestamp, file, offset'
+        )
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def load(self, locations: List[Tuple[str, str, int]]) -> List[Dict[str, Any]]:
+        """
+        Read games found by query() from their JSONL files.
+
+        Args:
+            locations: (game_id, file name, byte offset) tuples
+
+        Returns:
+            Game records in the same order (missing or changed lines skipped)
+        """
+        return load_games(self.storage_dir, locations)
+
+    def refresh(self) -> int:
+        """
+        Index JSONL files that are new or have changed since last indexed.
+
+        Returns:
+            Number of new game IDs found
+        """
+        added = 0
+        with self._lock:
+            known = {
+                name: (size, mtime_ns, offset)
+                for name, size, mtime_ns, offset in self._conn.execute(
+                    "SELECT name, size, mtime_ns, offset FROM files"
+                )
+            }
+            for filepath in sorted(self.storage_dir.glob('*.jsonl')):
+                if filepath.name.startswith(EXCLUDED_PREFIXES):
+                    continue
+                try:
+                    stat = filepath.stat()
+                except OSError:
+                    continue
+                size, mtime_ns, offset = known.get(filepath.name, (-1, -1, 0))
+                if size == stat.st_size and mtime_ns == stat.st_mtime_ns:
+                    continue
+                if stat.st_size < offset:
+                    offset = 0  # rewritten or truncated
+                added += self._index_file(filepath, offset, stat)
+            self._conn.commit()
+        return added
+
+    def rebuild(self) -> int:
+        """
+        Drop the index and re-read every JSONL file in the storage directory.
+
+        Returns:
+            Number of game IDs indexed
+        """
+        with self._lock:
+            self._conn.executescript(
+                "DROP TABLE IF EXISTS game_ids; DROP TABLE IF EXISTS files;" + _SCHEMA
+            )
+            self._count = 0
+            self._set_meta('version', INDEX_VERSION)
+            self._set_meta('count', 0)
+            self._conn.commit()
+        self.refresh()
+        return self._count
+
+    def close(self):
+        """Close the SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _insert(self, rows: List[Tuple]) -> int:
+        before = self._conn.total_changes
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO game_ids "
+            "(id, file, offset, timestamp, rug_point, peak_multiplier) VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        added = self._conn.total_changes - before
+        if added:
+            self._count += added
+            self._set_meta('count', self._count)
+        return added
+
+    def _mark_file(self, name: str, size: int, mtime_ns: int, offset: int):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO files (name, size, mtime_ns, offset) VALUES (?, ?, ?, ?)",
+            (name, size, mtime_ns, offset),
+        )
+
+    def _index_file(self, filepath: Path, offset: int, stat: os.stat_result) -> int:
+        """Read complete lines from offset and record their game IDs."""
+        rows = []
+        try:
+            with open(filepath, 'rb') as f:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break  # partial line still being written
+                    line_offset = offset
+                    offset += len(line)
+                    if not line.strip():
+                        continue
+                    try:
+                        game = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(game, dict) and isinstance(game.get('id'), str):
+                        rows.append(_game_row(game, filepath.name, line_offset))
+        except OSError as e:
+            print(f"Warning: Could not load game IDs from {filepath}: {e}")
+            return 0
+
+        self._mark_file(filepath.name, stat.st_size, stat.st_mtime_ns, offset)
+        return self._insert(rows)
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, *args):
+        """Context manager exit."""
+        self.close()
@@ -0,0 +1,337 @@
+"""
+History Export - Streaming, parallel RL export of all stored game history
+
+export_for_rl_training() only sees the in-memory window. export_history()
+exports every game in a collector's storage directory instead:
+
+- the GameIdIndex selects games (timestamp / rugPoint / peakMultiplier
+  bounds are answered by its SQLite indexes, so non-matching lines are
+  never read) and yields one (file, byte offset) per unique game ID
+- locations are cut into shards of `shard_size` games; each shard is
+  read, projected to `fields`, run through the feature hooks and written
+  by a worker process, so memory is bounded by shard size x workers
+- at most 2 x workers shards are in flight; the parent only holds the
+  locations and one summary per shard
+
+Feature hooks take (prices, game) and return a dict of new columns.
+Lists the length of the price path become per-tick columns aligned with
+`prices`; anything else is a per-game column. Built-ins: 'returns',
+'drawdown' (per-tick drawdown plus max_drawdown) and 'rug_tick'. Custom
+hooks must be module-level functions so they can be sent to workers.
+
+Shards are written as .npz (numpy), .parquet (pyarrow) or projected
+.jsonl, next to an export.json manifest.
+
+Usage:
+    from jupyter.lib import export_history
+
+    manifest = export_history(
+        collector.storage_dir, "exports/rl_2025q4",
+        fields=['id', 'timestamp', 'peakMultiplier'],
+        features=['returns', 'drawdown', 'rug_tick'],
+        format='npz', workers=4, start_ts=since_ms,
+    )
+    for shard in manifest['shards']:
+        data = np.load(Path("exports/rl_2025q4") / shard['file'])
+"""
+
+import json
+import os
+from array import array
+from itertools import accumulate
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from .game_id_index import GameIdIndex, load_games, numeric_value
+from .price_path_store import META_FIELDS
+
+# Shard formats (file extension = format)
+EXPORT_FORMATS = ('npz', 'parquet', 'jsonl')
+
+# Manifest written next to the shards
+MANIFEST_FILENAME = 'export.json'
+
+
+def feature_returns(prices: List[float], game: Dict[str, Any]) -> Dict[str, Any]:
+    """Per-tick simple returns (0.0 on the first tick)."""
+    returns = [
+        price / previous - 1.0 if previous else 0.0
+        for previous, price in zip(prices, prices[1:])
+    ]
+    return {'returns': [0.0] + returns if prices else []}
+
+
+def feature_drawdown(prices: List[float], game: Dict[str, Any]) -> Dict[str, Any]:
+    """Per-tick drawdown from the running peak, and the maximum drawdown."""
+    drawdown = [
+        price / peak - 1.0 if peak > 0 else 0.0
+        for price, peak in zip(prices, accumulate(prices, max))
+    ]
+    return {'drawdown': drawdown, 'max_drawdown': min(drawdown, default=0.0)}
+
+
+def feature_rug_tick(prices: List[float], game: Dict[str, Any]) -> Dict[str, Any]:
+    """Tick the game rugged on (last tick of a rugged game), else None."""
+    rugged = game.get('rugged', True)
+    return {'rug_tick': len(prices) - 1 if rugged and prices else None}
+
+
+# Built-in feature hooks by name
+FEATURE_HOOKS: Dict[str, Callable[[List[float], Dict[str, Any]], Dict[str, Any]]] = {
+    'returns': feature_returns,
+    'drawdown': feature_drawdown,
+    'rug_tick': feature_rug_tick,
+}
+
+
+def _resolve_features(features: Sequence[Union[str, Callable]]) -> List[Callable]:
+    hooks = []
+    for feature in features:
+        if callable(feature):
+            hooks.append(feature)
+        elif feature in FEATURE_HOOKS:
+            hooks.append(FEATURE_HOOKS[feature])
+        else:
+            raise ValueError(
+                f"Unknown feature {feature!r}; expected a callable or one of "
+                f"{', '.join(FEATURE_HOOKS)}"
+            )
+    return hooks
+
+
+class _ShardColumns:
+    """Columns of one shard: flat per-tick arrays with offsets, plus per-game lists."""
+
+    def __init__(self, fields: Sequence[str]):
+        self.offsets = array('q', [0])
+        self.ticks: Dict[str, array] = {'prices': array('f')}
+        self.games: Dict[str, List[Any]] = {field: [] for field in fields}
+        self.count = 0
+
+    def add(self, row: Dict[str, Any], prices: List[float], extra: Dict[str, Any]):
+        start = self.offsets[-1]
+        end = start + len(prices)
+        self.ticks['prices'].extend(prices)
+        for name, value in extra.items():
+            if isinstance(value, (list, tuple, array)):
+                if len(value) != len(prices):
+                    raise ValueError(
+                        f"Feature column {name!r} has {len(value)} values for "
+                        f"{len(prices)} prices (game {row.get('id')})"
+                    )
+                column = self.ticks.get(name)
+                if column is None:
+                    column = self.ticks[name] = array('f', bytes(4 * start))  # zeros
+                column.extend(value)
+            else:
+                row[name] = value
+        # Columns a hook did not return for this game are padded
+        for column in self.ticks.values():
+            if len(column) < end:
+                column.frombytes(bytes(4 * (end - len(column))))
+        for name, value in row.items():
+            self.games.setdefault(name, [None] * self.count).append(value)
+        for column in self.games.values():
+            if len(column) == self.count:
+                column.append(None)
+        self.offsets.append(end)
+        self.count += 1
+
+    def records(self):
+        """Per-game dicts for JSONL output."""
+        for i in range(self.count):
+            start, end = self.offsets[i], self.offsets[i + 1]
+            record = {name: column[i] for name, column in self.games.items()}
+            for name, column in self.ticks.items():
+                record[name] = column[start:end].tolist()
+            yield record
+
+
+def _npz_column(np, values: List[Any]):
+    """numpy array for a per-game column without object dtype (np.load refuses those)."""
+    if all(isinstance(v, bool) for v in values):
+        return np.array(values, dtype=bool)
+    if all(v is None or numeric_value(v) is not None for v in values):
+        if all(isinstance(v, int) and not isinstance(v, bool) for v in values):
+            return np.array(values, dtype=np.int64)
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    return np.array(['' if v is None else str(v) for v in values])
+
+
+def _write_npz(path: Path, columns: _ShardColumns):
+    import numpy as np
+
+    arrays = {'offsets': np.frombuffer(columns.offsets, dtype=np.int64)}
+    for name, column in columns.ticks.items():
+        arrays[name] = np.frombuffer(column, dtype=np.float32)
+    for name, column in columns.games.items():
+        arrays[name] = _npz_column(np, column)
+    with open(path, 'wb') as f:
+        np.savez(f, **arrays)
+
+
+def _write_parquet(path: Path, columns: _ShardColumns):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    offsets = pa.Array.from_buffers(
+        pa.int64(), len(columns.offsets), [None, pa.py_buffer(columns.offsets)]
+    )
+    table = {name: pa.array(column) for name, column in columns.games.items()}
+    for name, column in columns.ticks.items():
+        values = pa.Array.from_buffers(pa.float32(), len(column), [None, pa.py_buffer(column)])
+        table[name] = pa.LargeListArray.from_arrays(offsets, values)
+    pq.write_table(pa.table(table), str(path), compression='zstd')
+
+
+def _write_jsonl(path: Path, columns: _ShardColumns):
+    with open(path, 'w') as f:
+        for record in columns.records():
+            f.write(json.dumps(record) + '\n')
+
+
+_WRITERS = {'npz': _write_npz, 'parquet': _write_parquet, 'jsonl': _write_jsonl}
+
+
+def export_shard(
+    storage_dir: Union[str, Path],
+    locations: List[Tuple[str, str, int]],
+    path: Union[str, Path],
+    fields: Sequence[str],
+    features: Sequence[Union[str, Callable]],
+    format: str,
+) -> Dict[str, Any]:
+    """
+    Read, project, featurize and write one shard (runs in a worker process).
+
+    Args:
+        storage_dir: Directory holding the JSONL files
+        locations: (game_id, file name, byte offset) of the shard's games
+        path: Shard file to write (replaced atomically)
+        fields: Game fields to keep as per-game columns
+        features: Feature hook names or callables
+        format: One of EXPORT_FORMATS
+
+    Returns:
+        Shard summary for the manifest
+    """
+    path = Path(path)
+    hooks = _resolve_features(features)
+    columns = _ShardColumns(fields)
+    for game in load_games(storage_dir, locations):
+        prices = game.get('prices') or []
+        try:
+            prices = array('f', prices).tolist()
+        except TypeError:
+            prices = [float(p) for p in prices if numeric_value(p) is not None]
+        extra: Dict[str, Any] = {}
+        for hook in hooks:
+            extra.update(hook(prices, game))
+        columns.add({field: game.get(field) for field in fields}, prices, extra)
+
+    tmp_path = path.with_name(path.name + '.tmp')
+    _WRITERS[format](tmp_path, columns)
+    os.replace(tmp_path, path)
+    return {
+        'file': path.name,
+        'games': columns.count,
+        'ticks': len(columns.ticks['prices']),
+        'columns': sorted(columns.games),
+        'tick_columns': sorted(columns.ticks),
+    }
+
+
+def export_history(
+    storage_dir: Union[str, Path],
+    output_dir: Union[str, Path],
+    fields: Optional[Sequence[str]] = None,
+    features: Sequence[Union[str, Callable]] = ('returns', 'drawdown', 'rug_tick'),
+    format: str = 'npz',
+    shard_size: int = 10_000,
+    workers: Optional[int] = None,
+    index: Optional[GameIdIndex] = None,
+    **filters,
+) -> Dict[str, Any]:
+    """
+    Export all stored games as feature-engineered shards.
+
+    Args:
+        storage_dir: Collector storage directory (JSONL session files)
+        output_dir: Directory for shards and the export.json manifest
+        fields: Game fields to keep (default: id, timestamp, rugPoint,
+            peakMultiplier, rugged); prices are always exported
+        features: Feature hook names (see FEATURE_HOOKS) or module-level callables
+        format: 'npz' (numpy), 'parquet' (pyarrow) or 'jsonl'
+        shard_size: Games per shard (bounds worker memory)
+        workers: Worker processes (default: CPU count; 0 runs in this process)
+        index: Open GameIdIndex to reuse (default: opened on storage_dir)
+        **filters: GameIdIndex.query() bounds (start_ts, end_ts,
+            min_rug_point, max_rug_point, min_peak, max_peak)
+
+    Returns:
+        Manifest dict (also written to output_dir/export.json)
+    """
+    if format not in EXPORT_FORMATS:
+        raise ValueError(
+            f"Unknown format {format!r}; expected one of {', '.join(EXPORT_FORMATS)}"
+        )
+    if shard_size < 1:
+        raise ValueError(f"shard_size must be at least 1, got {shard_size}")
+    fields = list(fields) if fields is not None else list(META_FIELDS)
+    _resolve_features(features)  # fail before any work starts
+
+    storage_dir = Path(storage_dir)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    own_index = index is None
+    if own_index:
+        index = GameIdIndex(storage_dir)
+    try:
+        locations = index.query(**filters)
+    finally:
+        if own_index:
+            index.close()
+
+    tasks = [
+        (
+            storage_dir,
+            locations[start:start + shard_size],
+            output_dir / f"shard-{number:05d}.{format}",
+            fields,
+            list(features),
+            format,
+        )
+        for number, start in enumerate(range(0, len(locations), shard_size))
+    ]
+
+    shards: List[Dict[str, Any]] = [None] * len(tasks)
+    if workers == 0 or len(tasks) <= 1:
+        for number, task in enumerate(tasks):
+            shards[number] = export_shard(*task)
+    else:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = {}
+            for number, task in enumerate(tasks):
+                if len(pending) >= 2 * workers:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        shards[pending.pop(future)] = future.result()
+                pending[pool.submit(export_shard, *task)] = number
+            for future in pending:
+                shards[pending[future]] = future.result()
+
+    manifest = {
+        'format': format,
+        'fields': fields,
+        'features': [f if isinstance(f, str) else f.__name__ for f in features],
+        'filters': filters,
+        'games': sum(shard['games'] for shard in shards),
+        'ticks': sum(shard['ticks'] for shard in shards),
+        'shards': shards,
+    }
+    with open(output_dir / MANIFEST_FILENAME, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
@@ -0,0 +1,274 @@
+"""
+Price Path Store - Columnar float32 storage for game price paths
+
+Collected games keep `prices` as a list of Python floats, so every RL or
+analysis pass re-parses JSON and re-boxes thousands of floats per game.
+PricePathStore holds the price paths of many games in one contiguous
+buffer instead:
+
+- prices: array('f') with every game's path back to back (float32)
+- offsets: array('q') of length N+1; game i is prices[offsets[i]:offsets[i+1]]
+- a compact metadata table (id, timestamp, rugPoint, peakMultiplier,
+  rugged), one column per field
+
+save() writes `<prefix>.prices.npy`, `<prefix>.offsets.npy` and
+`<prefix>.meta.json` (the .npy files are written without numpy and load
+with np.load(..., mmap_mode='r')), or a single Arrow IPC file with a
+list<float32> prices column (requires pyarrow). to_numpy() exposes the
+buffer to numpy without copying.
+
+Usage:
+    from jupyter.lib import PricePathStore
+
+    store = PricePathStore.from_games(collector.get_collected_games())
+    store.save(Path("exports/session"))           # .npy + .meta.json
+    prices, offsets = store.to_numpy()            # zero-copy views
+    padded, lengths = store.to_numpy(padded=True) # (N, max_len), NaN padded
+
+    store = PricePathStore.load(Path("exports/session"))
+    path = store.prices_for("20251215-abc123")
+"""
+
+import ast
+import json
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+# save() formats
+STORE_FORMATS = ('npy', 'arrow')
+
+# Metadata columns kept per game (game field -> column)
+META_FIELDS = ('id', 'timestamp', 'rugPoint', 'peakMultiplier', 'rugged')
+
+_NPY_MAGIC = b'\x93NUMPY\x01\x00'
+
+# array typecode -> numpy dtype descr (byte order added at runtime)
+_NPY_DTYPES = {'f': 'f4', 'q': 'i8'}
+
+
+def _byte_order() -> str:
+    return '<' if sys.byteorder == 'little' else '>'
+
+
+def write_npy(path: Path, values: array):
+    """Write a 1-D array as a .npy file (format version 1.0)."""
+    header = (
+        f"{{'descr': '{_byte_order()}{_NPY_DTYPES[values.typecode]}', "
+        f"'fortran_order': False, 'shape': ({len(values)},), }}"
+    )
+    # Magic (8) + header length (2) + header, padded to a multiple of 64
+    padding = 64 - (len(_NPY_MAGIC) + 2 + len(header) + 1) % 64
+    header = (header + ' ' * (padding % 64) + '\n').encode('latin1')
+    with open(path, 'wb') as f:
+        f.write(_NPY_MAGIC)
+        f.write(len(header).to_bytes(2, 'little'))
+        f.write(header)
+        values.tofile(f)
+
+
+def read_npy(path: Path, typecode: str) -> array:
+    """Read a 1-D .npy file written by write_npy() (or numpy) into an array."""
+    with open(path, 'rb') as f:
+        magic = f.read(len(_NPY_MAGIC))
+        if magic[:6] != _NPY_MAGIC[:6] or magic[6] != 1:
+            raise ValueError(f"{path}: not a version 1 .npy file")
+        header_len = int.from_bytes(f.read(2), 'little')
+        header = ast.literal_eval(f.read(header_len).decode('latin1'))
+        descr = header['descr']
+        if descr[1:] != _NPY_DTYPES[typecode] or header['fortran_order'] or len(header['shape']) != 1:
+            raise ValueError(f"{path}: expected a 1-D {_NPY_DTYPES[typecode]} array, got {header}")
+        values = array(typecode)
+        values.frombytes(f.read())
+    if descr[0] in '<>' and descr[0] != _byte_order():
+        values.byteswap()
+    if len(values) != header['shape'][0]:
+        raise ValueError(f"{path}: truncated ({len(values)} of {header['shape'][0]} values)")
+    return values
+
+
+class PricePathStore:
+    """
+    Price paths of many games in one contiguous float32 buffer.
+
+    Append-only; games are addressed by position or by game ID.
+    """
+
+    def __init__(self):
+        """Create an empty store."""
+        self.prices = array('f')
+        self.offsets = array('q', [0])
+        self.meta: Dict[str, List[Any]] = {field: [] for field in META_FIELDS}
+        self._positions: Dict[str, int] = {}
+
+    @classmethod
+    def from_games(cls, games: Iterable[Dict[str, Any]]) -> 'PricePathStore':
+        """Build a store from game records (e.g. get_collected_games())."""
+        store = cls()
+        for game in games:
+            store.add(game)
+        return store
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __contains__(self, game_id: str) -> bool:
+        return game_id in self._positions
+
+    def add(self, game: Dict[str, Any]) -> int:
+        """
+        Append a game's price path and metadata.
+
+        Args:
+            game: Game record with 'id' and 'prices'
+
+        Returns:
+            Position of the game in the store
+
+        Raises:
+            TypeError: If prices holds a non-number (the store is unchanged)
+        """
+        # Convert first so a bad value cannot leave a partial path behind
+        prices = array('f', game.get('prices') or ())
+        position = len(self)
+        self.prices.extend(prices)
+        self.offsets.append(len(self.prices))
+        for field in META_FIELDS:
+            self.meta[field].append(game.get(field))
+        if game.get('id') is not None:
+            self._positions[game['id']] = position
+        return position
+
+    def position(self, game_id: str) -> Optional[int]:
+        """Position of a game ID, or None."""
+        return self._positions.get(game_id)
+
+    def prices_at(self, position: int) -> memoryview:
+        """float32 price path of the game at a position (no copy)."""
+        return memoryview(self.prices)[self.offsets[position]:self.offsets[position + 1]]
+
+    def prices_for(self, game_id: str) -> Optional[memoryview]:
+        """float32 price path of a game ID, or None."""
+        position = self._positions.get(game_id)
+        return self.prices_at(position) if position is not None else None
+
+    def lengths(self) -> List[int]:
+        """Number of prices per game."""
+        offsets = self.offsets
+        return [offsets[i + 1] - offsets[i] for i in range(len(self))]
+
+    def to_numpy(self, padded: bool = False, pad_value: float = float('nan')):
+        """
+        Expose the price buffer as numpy arrays.
+
+        Args:
+            padded: Return an (N, max_len) matrix instead of the flat buffer
+            pad_value: Fill value after each game's last price when padded
+
+        Returns:
+            (prices, offsets) zero-copy views of the buffer, or, when padded,
+            (matrix float32 (N, max_len), lengths int64 (N,));
+            None if numpy is not installed
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            print("Error: numpy not installed")
+            print("Run: pip install numpy")
+            return None
+
+        prices = np.frombuffer(self.prices, dtype=np.float32)
+        offsets = np.frombuffer(self.offsets, dtype=np.int64)
+        if not padded:
+            return prices, offsets
+
+        lengths = np.diff(offsets)
+        matrix = np.full((len(self), int(lengths.max(initial=0))), pad_value, dtype=np.float32)
+        # Column index of every price within its game, then one scatter
+        rows = np.repeat(np.arange(len(self)), lengths)
+        cols = np.arange(len(prices)) - np.repeat(offsets[:-1], lengths)
+        matrix[rows, cols] = prices
+        return matrix, lengths
+
+    def save(self, prefix: Union[str, Path], format: str = 'npy') -> List[Path]:
+        """
+        Write the store to disk.
+
+        Args:
+            prefix: Output path without extension (e.g. exports/session)
+            format: 'npy' (.prices.npy, .offsets.npy, .meta.json) or
+                'arrow' (one .arrow IPC file, requires pyarrow)
+
+        Returns:
+            Paths written
+        """
+        if format not in STORE_FORMATS:
+            raise ValueError(
+                f"Unknown format {format!r}; expected one of {', '.join(STORE_FORMATS)}"
+            )
+        prefix = Path(prefix)
+        prefix.parent.mkdir(parents=True, exist_ok=True)
+
+        if format == 'arrow':
+            path = self._save_arrow(prefix.with_name(prefix.name + '.arrow'))
+            return [path] if path else []
+
+        paths = [
+            prefix.with_name(prefix.name + '.prices.npy'),
+            prefix.with_name(prefix.name + '.offsets.npy'),
+            prefix.with_name(prefix.name + '.meta.json'),
+        ]
+        write_npy(paths[0], self.prices)
+        write_npy(paths[1], self.offsets)
+        with open(paths[2], 'w') as f:
+            json.dump({'games': len(self), 'columns': self.meta}, f)
+        return paths
+
+    def _save_arrow(self, path: Path) -> Optional[Path]:
+        try:
+            import pyarrow as pa
+        except ImportError:
+            print("Error: pyarrow not installed")
+            print("Run: pip install pyarrow")
+            return None
+
+        # Both buffers are handed to Arrow as-is (large_list uses int64 offsets)
+        values = pa.Array.from_buffers(
+            pa.float32(), len(self.prices), [None, pa.py_buffer(self.prices)]
+        )
+        offsets = pa.Array.from_buffers(
+            pa.int64(), len(self.offsets), [None, pa.py_buffer(self.offsets)]
+        )
+        columns = {field: pa.array(column) for field, column in self.meta.items()}
+        columns['prices'] = pa.LargeListArray.from_arrays(offsets, values)
+        table = pa.table(columns)
+        with pa.OSFile(str(path), 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        return path
+
+    @classmethod
+    def load(cls, prefix: Union[str, Path]) -> 'PricePathStore':
+        """
+        Load a store saved with format='npy'.
+
+        Args:
+            prefix: Path given to save()
+
+        Returns:
+            PricePathStore
+        """
+        prefix = Path(prefix)
+        store = cls()
+        store.prices = read_npy(prefix.with_name(prefix.name + '.prices.npy'), 'f')
+        store.offsets = read_npy(prefix.with_name(prefix.name + '.offsets.npy'), 'q')
+        with open(prefix.with_name(prefix.name + '.meta.json')) as f:
+            store.meta = json.load(f)['columns']
+        if len(store.offsets) - 1 != len(store.meta['id']) or store.offsets[-1] != len(store.prices):
+            raise ValueError(f"{prefix}: price buffer, offsets and metadata do not match")
+        store._positions = {
+            game_id: position for position, game_id in enumerate(store.meta['id'])
+            if game_id is not None
+        }
+        return store
@@ -0,0 +1,354 @@
+"""
+Buffered Recording Writer - Background JSONL writer for live captures
+
+Serializing and writing each WebSocket frame on the thread that receives
+it (the pychrome frame callback) stalls frame handling whenever the disk
+is slow. BufferedRecordingWriter moves that work to a background thread:
+
+- write() only enqueues onto a bounded queue and never does I/O
+- The writer thread serializes and writes events in batches, flushing
+  when a batch reaches batch_size events or its oldest event has waited
+  flush_interval seconds
+- Optional fsync after every batch or at most every fsync_interval seconds
+- Backpressure metrics: queue depth and high-water mark, time producers
+  spent blocked, dropped events, batch sizes and write latency
+- Optional sink (e.g. rag-pipeline's SegmentedRecordingWriter) that
+  receives each batch of events instead of a single JSONL file
+- Optional transform applied to each event on the writer thread before
+  it is serialized (CDPCapture uses it to decode keep_raw events)
+
+Usage:
+    from jupyter.lib import BufferedRecordingWriter
+
+    writer = BufferedRecordingWriter("session.jsonl", batch_size=256)
+    writer.start()
+    writer.write({'event_name': 'gameStateUpdate', 'data': {...}})
+    ...
+    stats = writer.close()
+    print(stats['written'], stats['dropped'])
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+# fsync policies: never, after every batch, or at most every fsync_interval
+FSYNC_POLICIES = ('never', 'batch', 'interval')
+
+# Queue markers for the writer thread
+_STOP = object()
+
+
+class _FlushRequest:
+    """Queue marker asking the writer thread to flush and signal back."""
+
+    __slots__ = ('done',)
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class BufferedRecordingWriter:
+    """
+    Writes JSON events to a JSONL file from a background thread.
+
+    Events are serialized on the writer thread, so an event must not be
+    mutated after it has been passed to write().
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_queue: int = 10000,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        fsync: str = 'never',
+        fsync_interval: float = 5.0,
+        block_timeout: float = 0.0,
+        sink: Any = None,
+        transform: Optional[Callable[[Any], Any]] = None,
+    ):
+        """
+        Initialize the writer (call start() before writing).
+
+        Args:
+            path: JSONL file to append to
+            max_queue: Maximum events waiting to be written
+            batch_size: Write a batch once this many events are buffered
+            flush_interval: Write a partial batch once its oldest event has
+                waited this many seconds
+            fsync: One of FSYNC_POLICIES
+            fsync_interval: Minimum seconds between fsyncs for 'interval'
+            block_timeout: Seconds write() may wait for queue space before
+                dropping the event (0 = never block the caller)
+            sink: Object with write_records(events) -> bytes, sync() and
+                close() that takes batches instead of the file at path
+            transform: Called with each event on the writer thread; its
+                result is what gets serialized or passed to the sink
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(
+                f"Unknown fsync policy {fsync!r}; expected one of {', '.join(FSYNC_POLICIES)}"
+            )
+        if max_queue < 1 or batch_size < 1:
+            raise ValueError("max_queue and batch_size must be positive")
+
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.block_timeout = block_timeout
+        self.sink = sink
+        self.transform = transform
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._file = None
+        self._closed = False
+        self._last_fsync = 0.0
+        self._lock = threading.Lock()
+
+        self.stats: Dict[str, Any] = {
+            'enqueued': 0,
+            'written': 0,
+            'dropped': 0,
+            'errors': 0,
+            'batches': 0,
+            'bytes': 0,
+            'fsyncs': 0,
+            'max_queue_depth': 0,
+            'blocked_seconds': 0.0,
+            'max_batch_seconds': 0.0,
+            'last_error': None,
+        }
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the writer thread is accepting events."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> 'BufferedRecordingWriter':
+        """Open the file and start the writer thread."""
+        if self.is_running:
+            return self
+        if self.sink is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'ab')
+        self._closed = False
+        self._last_fsync = time.monotonic()
+        self._thread = threading.Thread(
+            target=self._run, name=f'recording-writer:{self.path.name}', daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def write(self, event: Any) -> bool:
+        """
+        Enqueue an event for writing (does no I/O).
+
+        Args:
+            event: JSON-serializable object, or a pre-serialized line (str)
+
+        Returns:
+            True if queued, False if dropped (queue full or writer closed)
+        """
+        if self._closed:
+            return self._dropped()
+        q = self._queue
+        try:
+            q.put_nowait(event)
+        except queue.Full:
+            if self.block_timeout <= 0:
+                return self._dropped()
+            started = time.perf_counter()
+            try:
+                q.put(event, timeout=self.block_timeout)
+            except queue.Full:
+                return self._dropped()
+            finally:
+                with self._lock:
+                    self.stats['blocked_seconds'] += time.perf_counter() - started
+
+        depth = q.qsize()
+        with self._lock:
+            self.stats['enqueued'] += 1
+            if depth > self.stats['max_queue_depth']:
+                self.stats['max_queue_depth'] = depth
+        return True
+
+    def _dropped(self) -> bool:
+        with self._lock:
+            self.stats['dropped'] += 1
+        return False
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every event enqueued so far has been written.
+
+        Args:
+            timeout: Maximum seconds to wait (None = no limit)
+
+        Returns:
+            True if flushed within the timeout
+        """
+        if not self.is_running:
+            return True
+        request = _FlushRequest()
+        self._queue.put(request)
+        return request.done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Write everything still queued, stop the thread and close the file.
+
+        Args:
+            timeout: Maximum seconds to wait for the writer thread
+
+        Returns:
+            Final metrics (see get_metrics())
+        """
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+            self._thread = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self.sink is not None:
+            try:
+                self.sink.close()
+            except OSError as e:
+                self._error(f"close: {e}")
+        return self.get_metrics()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Snapshot of writer and backpressure metrics.
+
+        Returns:
+            Dict with enqueued, written, dropped and errors counts, batches,
+            bytes, fsyncs, queue_depth (now), max_queue_depth,
+            blocked_seconds (time write() waited for space),
+            max_batch_seconds (slowest batch write) and last_error
+        """
+        with self._lock:
+            metrics = dict(self.stats)
+        metrics['queue_depth'] = self._queue.qsize()
+        return metrics
+
+    # Writer thread
+
+    def _run(self):
+        q = self._queue
+        batch: List[Any] = []
+        deadline = 0.0
+        stopping = False
+
+        while not stopping:
+            timeout = max(0.0, deadline - time.monotonic()) if batch else None
+            try:
+                item = q.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            flush_requests = []
+            while item is not None:
+                if item is _STOP:
+                    stopping = True
+                elif isinstance(item, _FlushRequest):
+                    flush_requests.append(item)
+                else:
+                    if self.transform is not None:
+                        item = self._transform(item)
+                    line = item if self.sink is not None or item is None else self._serialize(item)
+                    if line is not None:
+                        if not batch:
+                            deadline = time.monotonic() + self.flush_interval
+                        batch.append(line)
+                if len(batch) >= self.batch_size or stopping:
+                    break
+                try:
+                    item = q.get_nowait()
+                except queue.Empty:
+                    item = None
+
+            if batch and (
+                len(batch) >= self.batch_size
+                or stopping
+                or flush_requests
+                or time.monotonic() >= deadline
+            ):
+                self._write_batch(batch)
+                batch = []
+            for request in flush_requests:
+                request.done.set()
+
+    def _error(self, message: str):
+        with self._lock:
+            self.stats['errors'] += 1
+            self.stats['last_error'] = message
+
+    def _transform(self, event: Any) -> Any:
+        try:
+            return self.transform(event)
+        except Exception as e:
+            self._error(f"transform: {e}")
+            return None
+
+    def _serialize(self, event: Any) -> Optional[str]:
+        if isinstance(event, str):
+            return event if event.endswith('\n') else event + '\n'
+        try:
+            return json.dumps(event) + '\n'
+        except (TypeError, ValueError) as e:
+            self._error(f"serialize: {e}")
+            return None
+
+    def _write_batch(self, batch: List[Any]):
+        started = time.perf_counter()
+        synced = False
+        try:
+            if self.sink is not None:
+                size = self.sink.write_records(batch)
+            else:
+                data = ''.join(batch).encode('utf-8')
+                size = len(data)
+                self._file.write(data)
+                self._file.flush()
+            if self.fsync == 'batch' or (
+                self.fsync == 'interval'
+                and time.monotonic() - self._last_fsync >= self.fsync_interval
+            ):
+                if self.sink is not None:
+                    self.sink.sync()
+                else:
+                    os.fsync(self._file.fileno())
+                self._last_fsync = time.monotonic()
+                synced = True
+        except OSError as e:
+            self._error(f"write: {e}")
+            return
+
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            stats = self.stats
+            stats['written'] += len(batch)
+            stats['batches'] += 1
+            stats['bytes'] += size
+            stats['fsyncs'] += synced
+            if elapsed > stats['max_batch_seconds']:
+                stats['max_batch_seconds'] = elapsed
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self.start()
+
+    def __exit__(self, *args):
+        """Context manager exit."""
+        self.close()
@@ -66,6 +66,20 @@ def load_discovered_fields():
     return {}
 
 
+def load_discovery_result():
+    """Load the DiscoveryResult snapshot written by the ingestion pipeline.
+
+    Restores the full discovery (field stats included) in one read instead
+    of re-deriving it from the JSON outputs. Returns None if no snapshot
+    has been generated yet.
+    """
+    from ingestion.discovery_snapshot import SNAPSHOT_FILENAME, load_snapshot
+    snapshot_path = KNOWLEDGE_PATH / "generated" / SNAPSHOT_FILENAME
+    if snapshot_path.exists():
+        return load_snapshot(snapshot_path)
+    return None
+
+
 def load_canonical_spec():
     """Load the canonical WebSocket events spec."""
     spec_path = KNOWLEDGE_PATH / "WEBSOCKET_EVENTS_SPEC.md"
@@ -104,6 +118,7 @@ __all__ = [
     'get_knowledge_collection',
     'load_discovered_schemas',
     'load_discovered_fields',
+    'load_discovery_result',
     'load_canonical_spec',
     'print_env',
 ]
@@ -0,0 +1,187 @@
+"""
+Tests for CDPCapture frame handling
+
+Tests Socket.IO frame parsing including:
+- Event-name extraction from the frame prefix
+- Skipping frames nobody keeps or subscribes to without decoding them
+- keep_raw deferred decoding
+- Stored events carrying either data or raw, never both
+- Per-type counters and buffers kept in step with eviction and clear()
+"""
+
+import json
+import threading
+from pathlib import Path
+
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib import cdp_notebook
+from lib.cdp_notebook import CDPCapture, frame_event_name
+
+
+def frame(name, data):
+    return '42' + json.dumps([name, data])
+
+
+def feed(capture, *payloads):
+    for n, payload in enumerate(payloads):
+        capture._on_ws_frame('req', float(n), {'payloadData': payload})
+
+
+class TestFrameEventName:
+    """Test the prefix fast path."""
+
+    def test_plain_and_escaped_names(self):
+        assert frame_event_name(frame('gameStateUpdate', {'a': 1})) == 'gameStateUpdate'
+        assert frame_event_name(frame('standard/newTrade', {})) == 'standard/newTrade'
+        assert frame_event_name('42["we\\"ird", {}]') is None
+        assert frame_event_name('42[1, {}]') is None
+        assert frame_event_name('2') is None
+
+
+class TestFrameHandling:
+    """Test what gets decoded and stored."""
+
+    def test_default_stores_parsed_data_only(self):
+        """Decoded events no longer also keep the raw payload."""
+        capture = CDPCapture()
+        feed(capture, frame('gameStateUpdate', {'price': 1.5}))
+
+        event = capture.events[0]
+        assert event['data'] == {'price': 1.5}
+        assert 'raw' not in event
+        assert capture.get_frame_stats()['decoded'] == 1
+
+    def test_unkept_unsubscribed_frames_are_never_decoded(self, monkeypatch):
+        """event_types drops other frames before json.loads."""
+        capture = CDPCapture(event_types=['gameStateUpdate'])
+        decoded = []
+        real_loads = cdp_notebook.json.loads
+        monkeypatch.setattr(
+            cdp_notebook.json, 'loads', lambda s, *a, **k: decoded.append(s) or real_loads(s, *a, **k)
+        )
+
+        feed(capture, frame('playerUpdate', {}), frame('gameStateUpdate', {}), frame('playerUpdate', {}))
+
+        assert len(decoded) == 1
+        assert [e['event_name'] for e in capture.events] == ['gameStateUpdate']
+        assert capture.get_frame_stats()['skipped'] == 2
+
+    def test_subscribed_types_bypass_event_types(self):
+        """Subscribers get their topics even when not kept in memory."""
+        capture = CDPCapture(event_types=[])
+        received = []
+        capture.subscribe(received.append, topics=['standard/newTrade'])
+
+        feed(capture, frame('standard/newTrade', {'qty': 2}), frame('playerUpdate', {}))
+        assert capture.bus.flush(timeout=1)
+
+        assert [e['data'] for e in received] == [{'qty': 2}]
+        assert len(capture.events) == 0
+        capture.bus.close()
+
+    def test_keep_raw_defers_decoding(self):
+        """keep_raw stores unsubscribed frames raw and decodes on demand."""
+        capture = CDPCapture(keep_raw=True)
+        received = []
+        capture.subscribe(received.append, topics=['gameStateUpdate'])
+        trade = frame('standard/newTrade', {'qty': 2})
+
+        feed(capture, trade, frame('gameStateUpdate', {'tick': 1}))
+        assert capture.bus.flush(timeout=1)
+
+        stored_trade, stored_game = capture.events
+        assert stored_trade['raw'] == trade and 'data' not in stored_trade
+        assert stored_game['data'] == {'tick': 1} and 'raw' not in stored_game
+        assert received[0] is stored_game
+        assert capture.filter_events('standard/newTrade', decode=True)[0]['data'] == {'qty': 2}
+        assert capture.get_frame_stats() == {
+            'frames': 2, 'decoded': 1, 'deferred': 1, 'skipped': 0, 'errors': 0,
+        }
+        capture.bus.close()
+
+    def test_invalid_frames_counted(self):
+        """Undecodable frames are counted as errors, not stored."""
+        capture = CDPCapture()
+        feed(capture, '42["gameStateUpdate", {broken', '42["onlyName"]')
+
+        assert len(capture.events) == 0
+        assert capture.get_frame_stats()['errors'] == 2
+
+
+class TestEventTypeIndexes:
+    """Test incremental per-type counters and buffers."""
+
+    def test_counts_and_filters_follow_eviction(self):
+        """Evicted events leave the per-type counts and buffers."""
+        capture = CDPCapture(max_events=3)
+        for n, name in enumerate(['a', 'b', 'a', 'c', 'a']):
+            capture._process_event({'event_name': name, 'data': {'n': n}}, float(n))
+
+        assert [e['event_name'] for e in capture.events] == ['a', 'c', 'a']
+        assert capture.get_event_counts() == {'a': 2, 'c': 1}
+        assert capture.get_event_counts(total=True) == {'a': 3, 'b': 1, 'c': 1}
+        assert [e['data']['n'] for e in capture.filter_events('a')] == [2, 4]
+        assert capture.filter_events('b') == []
+        assert capture.get_latest_event('a')['data'] == {'n': 4}
+        assert capture.get_latest_event('b') is None
+
+    def test_matches_full_scan(self):
+        """Counters agree with scanning the buffer after many evictions."""
+        capture = CDPCapture(max_events=50)
+        names = ['gameStateUpdate', 'playerUpdate', 'standard/newTrade', None]
+        for n in range(500):
+            capture._process_event({'event_name': names[(n * 7) % 4 if n % 5 else 0]}, float(n))
+
+        scanned = {}
+        for event in capture.events:
+            name = event.get('event_name') or 'unknown'
+            scanned[name] = scanned.get(name, 0) + 1
+        assert capture.get_event_counts() == scanned
+        for name in names[:3]:
+            assert capture.filter_events(name) == [e for e in capture.events if e['event_name'] == name]
+
+    def test_clear_resets_indexes(self, capsys):
+        """clear() empties counts, totals and per-type buffers."""
+        capture = CDPCapture()
+        capture._process_event({'event_name': 'a'}, 0.0)
+        capture.clear()
+
+        assert capture.get_event_counts(total=True) == {}
+        assert capture.filter_events('a') == []
+
+    def test_clear_during_capture_keeps_indexes_consistent(self, capsys):
+        """clear() from another thread never splits an insert/evict."""
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # interleave the threads as often as possible
+        capture = CDPCapture(max_events=5)
+        errors = []
+        done = threading.Event()
+
+        def store():
+            try:
+                for n in range(20000):
+                    capture._store_event({'event_name': 'abc'[n % 3]})
+            except Exception as e:
+                errors.append(e)
+            finally:
+                done.set()
+
+        thread = threading.Thread(target=store)
+        try:
+            thread.start()
+            while not done.is_set():
+                capture.clear()
+            thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        assert errors == []
+        scanned = {}
+        for event in capture.events:
+            scanned[event['event_name']] = scanned.get(event['event_name'], 0) + 1
+        assert capture.get_event_counts() == scanned
+        assert sum(len(events) for events in capture._events_by_type.values()) == len(capture.events)
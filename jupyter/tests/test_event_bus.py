@@ -0,0 +1,137 @@
+"""
+Tests for EventBus
+
+Tests the publish/subscribe fan-out including:
+- Topic filtering before dispatch
+- Per-subscriber worker threads (a slow subscriber does not block others)
+- Bounded queues, overflow policies and drop counters
+- Callback errors and unsubscribe
+- CDPCapture and GameHistoryCollector integration
+"""
+
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.event_bus import EventBus
+from lib.cdp_notebook import CDPCapture
+from lib.game_history_collector import GameHistoryCollector
+
+
+def event(name, n=0):
+    return {'event_name': name, 'data': {'n': n}}
+
+
+class TestEventBus:
+    """Test EventBus behaviour."""
+
+    def test_topics_filter_before_dispatch(self):
+        """Subscribers only receive (and queue) their topics."""
+        bus = EventBus()
+        games, everything = [], []
+        game_sub = bus.subscribe(games.append, topics=['gameStateUpdate'], name='games')
+        bus.subscribe(everything.append, name='all')
+
+        bus.publish(event('gameStateUpdate'))
+        bus.publish(event('playerUpdate'))
+        assert bus.flush(timeout=1)
+
+        assert [e['event_name'] for e in games] == ['gameStateUpdate']
+        assert len(everything) == 2
+        assert game_sub.stats['queued'] == 1
+        bus.close()
+
+    def test_slow_subscriber_does_not_block_publisher_or_others(self):
+        """A blocked callback only backs up its own queue."""
+        bus = EventBus()
+        release = threading.Event()
+        fast = []
+        slow = bus.subscribe(lambda e: release.wait(), max_queue=3, name='slow')
+        bus.subscribe(fast.append, name='fast')
+
+        for n in range(10):
+            bus.publish(event('tick', n))
+        assert bus.subscriptions[1].flush(timeout=1)
+
+        assert len(fast) == 10
+        metrics = bus.get_metrics()
+        assert metrics['published'] == 10
+        assert metrics['subscribers']['slow']['dropped'] >= 6
+        assert metrics['dropped'] == metrics['subscribers']['slow']['dropped']
+
+        release.set()
+        assert slow.flush(timeout=1)
+        bus.close()
+
+    def test_drop_oldest_keeps_latest_events(self):
+        """drop_oldest evicts queued events in favour of new ones."""
+        bus = EventBus()
+        release = threading.Event()
+        received = []
+
+        def handler(e):
+            release.wait()
+            received.append(e['data']['n'])
+
+        sub = bus.subscribe(handler, max_queue=2, overflow='drop_oldest')
+        for n in range(6):
+            bus.publish(event('tick', n))
+        release.set()
+        sub.flush(timeout=1)
+
+        # The first event may already be in the callback when the rest arrive
+        assert received[-2:] == [4, 5]
+        assert sub.stats['dropped'] == 6 - len(received)
+        bus.close()
+
+    def test_errors_counted_and_unrouted_events(self):
+        """Callback exceptions are counted; events nobody wants are unrouted."""
+        bus = EventBus()
+        sub = bus.subscribe(lambda e: 1 / 0, topics=['a'])
+
+        bus.publish(event('a'))
+        bus.publish(event('b'))
+        final = bus.unsubscribe(sub)
+
+        assert final['errors'] == 1
+        assert final['last_error'].startswith('ZeroDivisionError')
+        assert bus.stats['unrouted'] == 1
+        assert not sub.is_running
+        assert bus.publish(event('a')) == 0
+
+    def test_invalid_overflow_rejected(self):
+        """Unknown overflow policies raise ValueError."""
+        with pytest.raises(ValueError, match="Unknown overflow policy"):
+            EventBus().subscribe(print, overflow='block')
+
+
+class TestCaptureIntegration:
+    """Test CDPCapture and GameHistoryCollector on the bus."""
+
+    def test_on_event_and_collector_are_independent(self, tmp_path):
+        """attach_to_capture() no longer wraps the on_event callback."""
+        capture = CDPCapture()
+        seen = []
+        capture.on_event(seen.append)
+        collector = GameHistoryCollector(storage_dir=tmp_path, auto_save=False)
+        collector.attach_to_capture(capture)
+        capture.on_event(seen.append)  # replaces, does not duplicate
+
+        capture._process_event(
+            {'event_name': 'gameStateUpdate', 'data': {'gameHistory': [{'id': 'g1', 'prices': [1.0]}]}},
+            1.0,
+        )
+        capture._process_event({'event_name': 'playerUpdate', 'data': {}}, 2.0)
+        assert capture.bus.flush(timeout=1)
+
+        assert [e['event_name'] for e in seen] == ['gameStateUpdate', 'playerUpdate']
+        assert collector.get_game_by_id('g1') is not None
+        metrics = capture.get_bus_metrics()['subscribers']
+        assert metrics['game_history_collector']['queued'] == 1
+        assert metrics['on_event']['delivered'] == 2
+        capture.bus.close()
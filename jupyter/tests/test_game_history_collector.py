@@ -163,6 +163,70 @@ class TestMockGameHistoryCollector:
         assert len(game['id'].split('-')[0]) == 8  # YYYYMMDD
 
 
+def make_game(n, rug_point, peak):
+    return {
+        'id': f'game-{n:03d}',
+        'timestamp': 1_000_000 + n * 1000,
+        'prices': [1.0, peak],
+        'rugged': True,
+        'rugPoint': rug_point,
+        'peakMultiplier': peak,
+    }
+
+
+class TestGameQueries:
+    """Test indexed lookup and range queries."""
+
+    def test_lookup_and_eviction(self, tmp_path):
+        """get_game_by_id() and queries follow the max_memory_games window."""
+        collector = GameHistoryCollector(storage_dir=tmp_path, auto_save=False, max_memory_games=3)
+        collector.start_collecting()
+        for n in range(5):
+            collector._process_game(make_game(n, rug_point=0.1 * n, peak=float(n)))
+
+        assert collector.get_game_by_id('game-001') is None
+        assert collector.get_game_by_id('game-004')['peakMultiplier'] == 4.0
+        assert [g['id'] for g in collector.query_games()] == ['game-002', 'game-003', 'game-004']
+        assert [g['id'] for g in collector.query_games(max_peak=3.0)] == ['game-002', 'game-003']
+
+    def test_combined_ranges(self, tmp_path):
+        """Every bound must hold; limit keeps the oldest matches."""
+        collector = GameHistoryCollector(storage_dir=tmp_path, auto_save=False)
+        collector.start_collecting()
+        for n in range(10):
+            collector._process_game(make_game(n, rug_point=n % 3, peak=float(n)))
+
+        games = collector.query_games(
+            start_ts=1_002_000, end_ts=1_008_000, min_rug_point=1, max_rug_point=1, min_peak=2.0
+        )
+        assert [g['id'] for g in games] == ['game-004', 'game-007']
+        assert len(collector.query_games(min_peak=0, limit=4)) == 4
+
+        collector.clear_memory()
+        assert collector.query_games(min_peak=0) == []
+
+    def test_disk_and_all_sources(self, tmp_path):
+        """Stored sessions are queried through the game ID index."""
+        first = GameHistoryCollector(storage_dir=tmp_path, max_memory_games=2)
+        first.start_collecting('run1')
+        for n in range(4):
+            first._process_game(make_game(n, rug_point=1.0, peak=float(n)))
+        first.stop_collecting()
+
+        collector = GameHistoryCollector(storage_dir=tmp_path)
+        collector.start_collecting('run2')
+        collector._process_game(make_game(4, rug_point=1.0, peak=9.0))
+
+        disk = collector.query_games(min_peak=1.0, source='disk')
+        assert [g['id'] for g in disk] == ['game-001', 'game-002', 'game-003', 'game-004']
+        every = collector.query_games(min_peak=3.0, source='all')
+        assert [g['id'] for g in every] == ['game-003', 'game-004']
+        assert collector.query_games(min_peak=3.0, source='memory')[0]['id'] == 'game-004'
+
+        with pytest.raises(ValueError, match='Unknown source'):
+            collector.query_games(source='cloud')
+
+
 @pytest.fixture
 def tmp_path():
     """Provide a temporary directory for tests."""
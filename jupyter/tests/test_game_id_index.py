@@ -0,0 +1,202 @@
+"""
+Tests for GameIdIndex
+
+Tests the persistent game ID dedup index including:
+- Set-like membership and length
+- Persistence across reopen without re-reading files
+- Catching up with new, grown and rewritten JSONL files
+- Range queries over stored games
+- GameHistoryCollector startup using the index
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.game_id_index import GameIdIndex, INDEX_FILENAME
+from lib.game_history_collector import GameHistoryCollector
+
+
+def write_games(path, ids, mode='a'):
+    with open(path, mode) as f:
+        for game_id in ids:
+            f.write(json.dumps({'id': game_id, 'prices': [1.0]}) + '\n')
+
+
+class TestGameIdIndex:
+    """Test GameIdIndex behaviour."""
+
+    def test_indexes_existing_files(self, tmp_path):
+        """Opening an index reads the JSONL files already in storage."""
+        write_games(tmp_path / 'a.jsonl', ['g1', 'g2'])
+        write_games(tmp_path / 'b.jsonl', ['g2', 'g3'])
+
+        index = GameIdIndex(tmp_path)
+
+        assert len(index) == 3
+        assert 'g3' in index
+        assert 'g4' not in index
+        assert sorted(index) == ['g1', 'g2', 'g3']
+        assert (tmp_path / INDEX_FILENAME).exists()
+
+    def test_reopen_does_not_reread_indexed_files(self, tmp_path, monkeypatch):
+        """Unchanged files are skipped on the next startup."""
+        write_games(tmp_path / 'a.jsonl', ['g1', 'g2'])
+        GameIdIndex(tmp_path).close()
+
+        reads = []
+        real_index_file = GameIdIndex._index_file
+        monkeypatch.setattr(
+            GameIdIndex, '_index_file',
+            lambda self, path, *args: reads.append(path.name) or real_index_file(self, path, *args),
+        )
+        index = GameIdIndex(tmp_path)
+
+        assert reads == []
+        assert len(index) == 2
+        assert 'g1' in index
+
+    def test_add_marks_session_file_indexed(self, tmp_path, monkeypatch):
+        """IDs added with their file are not re-read from it later."""
+        index = GameIdIndex(tmp_path)
+        session = tmp_path / 'session.jsonl'
+        write_games(session, ['g1'])
+
+        assert index.add('g1', session)
+        assert not index.add('g1')
+        index.close()
+
+        monkeypatch.setattr(GameIdIndex, '_index_file', lambda *args: pytest.fail('re-read'))
+        assert len(GameIdIndex(tmp_path)) == 1
+
+    def test_catches_up_with_appended_lines(self, tmp_path):
+        """Lines appended outside the index are read from the last offset."""
+        path = tmp_path / 'a.jsonl'
+        write_games(path, ['g1'])
+        GameIdIndex(tmp_path).close()
+
+        write_games(path, ['g2'])
+        with open(path, 'a') as f:
+            f.write('{"id": "partial"')  # still being written
+
+        index = GameIdIndex(tmp_path)
+        assert 'g2' in index
+        assert 'partial' not in index
+
+        with open(path, 'a') as f:
+            f.write('}\n')
+        assert index.refresh() == 1
+        assert 'partial' in index
+        assert len(index) == 3
+
+    def test_rewritten_file_is_reread(self, tmp_path):
+        """A file that shrank is indexed again from the start."""
+        path = tmp_path / 'a.jsonl'
+        write_games(path, ['g1', 'g2', 'g3'])
+        GameIdIndex(tmp_path).close()
+
+        write_games(path, ['g9'], mode='w')
+        index = GameIdIndex(tmp_path)
+
+        assert 'g9' in index
+        assert len(index) == 4
+
+    def test_rebuild_resyncs_with_disk(self, tmp_path):
+        """rebuild() forgets IDs from deleted files."""
+        write_games(tmp_path / 'a.jsonl', ['g1'])
+        write_games(tmp_path / 'b.jsonl', ['g2'])
+        index = GameIdIndex(tmp_path)
+        (tmp_path / 'b.jsonl').unlink()
+
+        assert index.rebuild() == 1
+        assert 'g2' not in index
+
+
+class TestCollectorStartup:
+    """Test GameHistoryCollector with the persistent index."""
+
+    def test_collector_dedups_across_restarts(self, tmp_path):
+        """Games saved in one run are skipped by the next."""
+        collector = GameHistoryCollector(storage_dir=tmp_path)
+        collector.start_collecting('run1')
+        collector._process_game({'id': 'g1', 'prices': [1.0]})
+        collector.stop_collecting()
+
+        collector2 = GameHistoryCollector(storage_dir=tmp_path)
+        collector2.start_collecting('run2')
+        collector2._process_game({'id': 'g1', 'prices': [1.0]})
+        collector2._process_game({'id': 'g2', 'prices': [1.0]})
+        collector2.stop_collecting()
+
+        assert 'g1' in collector2.seen_game_ids
+        assert len(collector2.seen_game_ids) == 2
+        assert collector2.stats['duplicates_skipped'] == 1
+        assert collector2.stats['total_collected'] == 1
+
+
+class TestGameIdIndexQueries:
+    """Test range queries over stored games."""
+
+    def test_query_and_load(self, tmp_path):
+        """query() finds games by range and load() seeks to their lines."""
+        with open(tmp_path / 'a.jsonl', 'w') as f:
+            for n in range(6):
+                f.write(json.dumps({
+                    'id': f'g{n}', 'timestamp': 100 + n, 'rugPoint': n / 10, 'peakMultiplier': n,
+                }) + '\n')
+        index = GameIdIndex(tmp_path)
+
+        locations = index.query(start_ts=101, end_ts=104, min_peak=2)
+        games = index.load(locations)
+
+        assert [loc[0] for loc in locations] == ['g2', 'g3', 'g4']
+        assert [g['peakMultiplier'] for g in games] == [2, 3, 4]
+        assert index.query(max_rug_point=0.1, limit=1)[0][0] == 'g0'
+
+    def test_ids_without_file_are_not_queryable(self, tmp_path):
+        """Games added without a file count for dedup only."""
+        index = GameIdIndex(tmp_path)
+        index.add('g1', game={'timestamp': 5, 'peakMultiplier': 2.0})
+
+        assert 'g1' in index
+        assert index.query() == []
+
+    def test_old_index_version_is_rebuilt(self, tmp_path):
+        """An index written with an older layout is rebuilt on open."""
+        import sqlite3
+
+        write_games(tmp_path / 'a.jsonl', ['g1'])
+        conn = sqlite3.connect(str(tmp_path / INDEX_FILENAME))
+        conn.executescript(
+            "CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);"
+            "CREATE TABLE game_ids (id TEXT PRIMARY KEY) WITHOUT ROWID;"
+            "INSERT INTO meta VALUES ('version', '1');"
+        )
+        conn.close()
+
+        index = GameIdIndex(tmp_path)
+
+        assert 'g1' in index
+        assert index.query()[0][0] == 'g1'
+
+    def test_rl_exports_are_not_indexed(self, tmp_path, capsys):
+        """Projected export lines never become a game's stored location."""
+        collector = GameHistoryCollector(storage_dir=tmp_path)
+        collector.start_collecting('run')
+        collector._process_game({'id': 'g1', 'timestamp': 5, 'peakMultiplier': 3.0, 'prices': [1.0]})
+        export = collector.export_for_rl_training(include_fields=['id', 'prices'])
+        # Exports written into storage_dir by older collectors
+        write_games(tmp_path / 'rl_export_20250101_000000.jsonl', ['g1', 'g2'])
+
+        collector.seen_game_ids.rebuild()
+        games = collector.query_games(source='disk')
+        collector.stop_collecting()
+
+        assert export.parent == tmp_path / 'exports'
+        assert 'g2' not in collector.seen_game_ids
+        assert [(g['id'], g['timestamp'], g['peakMultiplier']) for g in games] == [('g1', 5, 3.0)]
@@ -0,0 +1,164 @@
+"""
+Tests for export_history
+
+Tests the streaming RL export over stored game history including:
+- Built-in feature hooks (returns, drawdown, rug tick)
+- Field projection and index-backed filters
+- Sharding, the manifest and the process pool
+- NPZ output
+- GameHistoryCollector.export_history over memory-evicted games
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.history_export import (
+    export_history,
+    feature_drawdown,
+    feature_returns,
+    feature_rug_tick,
+    MANIFEST_FILENAME,
+)
+from lib.game_history_collector import GameHistoryCollector
+
+
+def write_history(storage_dir, count=5, per_file=2):
+    """Write games g0..g{count-1} across several session files."""
+    for n in range(count):
+        with open(storage_dir / f'session_{n // per_file}.jsonl', 'a') as f:
+            f.write(json.dumps({
+                'id': f'g{n}',
+                'timestamp': 1000 + n,
+                'rugPoint': n / 10,
+                'peakMultiplier': 1.0 + n,
+                'rugged': True,
+                'prices': [1.0, 2.0, 1.0 + n],
+                'trades': [{'qty': 1}] * 3,
+            }) + '\n')
+
+
+def read_shards(output_dir, manifest):
+    records = []
+    for shard in manifest['shards']:
+        with open(Path(output_dir) / shard['file']) as f:
+            records.extend(json.loads(line) for line in f)
+    return records
+
+
+def tick_count(prices, game):
+    """Custom hook (module level so it can be sent to workers)."""
+    return {'ticks': len(prices)}
+
+
+class TestFeatureHooks:
+    """Test the built-in feature hooks."""
+
+    def test_returns(self):
+        assert feature_returns([1.0, 2.0, 1.0], {}) == {'returns': [0.0, 1.0, -0.5]}
+
+    def test_drawdown(self):
+        result = feature_drawdown([1.0, 2.0, 1.0, 1.5], {})
+        assert result == {'drawdown': [0.0, 0.0, -0.5, -0.25], 'max_drawdown': -0.5}
+
+    def test_rug_tick(self):
+        assert feature_rug_tick([1.0, 2.0, 0.1], {'rugged': True}) == {'rug_tick': 2}
+        assert feature_rug_tick([1.0], {'rugged': False}) == {'rug_tick': None}
+
+
+class TestExportHistory:
+    """Test export_history behaviour."""
+
+    def test_projection_features_and_shards(self, tmp_path):
+        """Fields are projected, features added and games split into shards."""
+        storage = tmp_path / 'history'
+        storage.mkdir()
+        write_history(storage)
+
+        manifest = export_history(
+            storage, tmp_path / 'out', fields=['id', 'peakMultiplier'],
+            features=['returns', 'rug_tick', tick_count], format='jsonl',
+            shard_size=2, workers=0,
+        )
+        records = read_shards(tmp_path / 'out', manifest)
+
+        assert [s['games'] for s in manifest['shards']] == [2, 2, 1]
+        assert manifest['games'] == 5
+        assert manifest['features'] == ['returns', 'rug_tick', 'tick_count']
+        assert [r['id'] for r in records] == ['g0', 'g1', 'g2', 'g3', 'g4']
+        assert records[1] == {
+            'id': 'g1', 'peakMultiplier': 2.0, 'rug_tick': 2, 'ticks': 3,
+            'prices': [1.0, 2.0, 2.0], 'returns': [0.0, 1.0, 0.0],
+        }
+        assert json.loads((tmp_path / 'out' / MANIFEST_FILENAME).read_text()) == manifest
+
+    def test_filters_use_index(self, tmp_path):
+        """Query bounds select games before any line is read."""
+        storage = tmp_path / 'history'
+        storage.mkdir()
+        write_history(storage)
+
+        manifest = export_history(
+            storage, tmp_path / 'out', features=[], format='jsonl',
+            workers=0, start_ts=1001, max_peak=4.0,
+        )
+
+        assert [r['id'] for r in read_shards(tmp_path / 'out', manifest)] == ['g1', 'g2', 'g3']
+        assert manifest['filters'] == {'start_ts': 1001, 'max_peak': 4.0}
+
+    def test_process_pool_matches_inline(self, tmp_path):
+        """Worker processes write the same shards as an inline run."""
+        storage = tmp_path / 'history'
+        storage.mkdir()
+        write_history(storage, count=9)
+
+        inline = export_history(storage, tmp_path / 'a', format='jsonl', shard_size=2, workers=0)
+        pooled = export_history(storage, tmp_path / 'b', format='jsonl', shard_size=2, workers=2)
+
+        assert pooled['shards'] == inline['shards']
+        assert read_shards(tmp_path / 'b', pooled) == read_shards(tmp_path / 'a', inline)
+
+    def test_invalid_options_rejected(self, tmp_path):
+        """Unknown formats and features raise ValueError before exporting."""
+        with pytest.raises(ValueError, match="Unknown format"):
+            export_history(tmp_path, tmp_path / 'out', format='tfrecord')
+        with pytest.raises(ValueError, match="Unknown feature"):
+            export_history(tmp_path, tmp_path / 'out', features=['sharpe'])
+
+    def test_npz_shards(self, tmp_path):
+        """NPZ shards hold flat per-tick arrays with offsets and per-game columns."""
+        np = pytest.importorskip('numpy')
+        storage = tmp_path / 'history'
+        storage.mkdir()
+        write_history(storage, count=3)
+
+        manifest = export_history(storage, tmp_path / 'out', workers=0)
+        with np.load(tmp_path / 'out' / manifest['shards'][0]['file']) as data:
+            assert data['offsets'].tolist() == [0, 3, 6, 9]
+            assert data['prices'].dtype == np.float32
+            assert data['drawdown'][3:6].tolist() == [0.0, 0.0, 0.0]
+            assert data['max_drawdown'].tolist() == [-0.5, 0.0, 0.0]
+            assert data['id'].tolist() == ['g0', 'g1', 'g2']
+            assert data['timestamp'].dtype == np.int64
+
+
+class TestCollectorExportHistory:
+    """Test GameHistoryCollector.export_history."""
+
+    def test_exports_games_evicted_from_memory(self, tmp_path):
+        """All stored games are exported, not just the memory window."""
+        collector = GameHistoryCollector(storage_dir=tmp_path, max_memory_games=2)
+        collector.start_collecting('run')
+        for n in range(5):
+            collector._process_game({'id': f'g{n}', 'timestamp': n, 'prices': [1.0, 1.0 + n]})
+
+        manifest = collector.export_history(tmp_path / 'out', format='jsonl', workers=0)
+        collector.stop_collecting()
+
+        assert len(collector.collected_games) == 2
+        assert manifest['games'] == 5
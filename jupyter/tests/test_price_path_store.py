@@ -0,0 +1,218 @@
+"""
+Tests for PricePathStore
+
+Tests the columnar price-path store including:
+- Contiguous float32 buffer with per-game offsets
+- .npy/.meta.json round trip without numpy
+- numpy views and padded tensors
+- Arrow IPC export
+- GameHistoryCollector session sidecar and RL export formats
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.price_path_store import PricePathStore
+from lib.game_history_collector import GameHistoryCollector
+
+
+GAMES = [
+    {'id': 'g1', 'timestamp': 100, 'rugPoint': 0.5, 'peakMultiplier': 2.0, 'rugged': True,
+     'prices': [1.0, 1.5, 2.0]},
+    {'id': 'g2', 'timestamp': 200, 'rugPoint': 0.2, 'peakMultiplier': 1.0, 'rugged': True,
+     'prices': []},
+    {'id': 'g3', 'timestamp': 300, 'rugPoint': 0.1, 'peakMultiplier': 1.25, 'rugged': False,
+     'prices': [1.0, 1.25]},
+]
+
+
+class TestPricePathStore:
+    """Test PricePathStore behaviour."""
+
+    def test_offsets_address_each_game(self):
+        """Games are stored back to back and sliced by offsets."""
+        store = PricePathStore.from_games(GAMES)
+
+        assert len(store) == 3
+        assert list(store.offsets) == [0, 3, 3, 5]
+        assert store.lengths() == [3, 0, 2]
+        assert list(store.prices_for('g3')) == [1.0, 1.25]
+        assert list(store.prices_at(1)) == []
+        assert store.prices_for('missing') is None
+        assert store.meta['peakMultiplier'] == [2.0, 1.0, 1.25]
+
+    def test_npy_round_trip(self, tmp_path):
+        """save() and load() round-trip without numpy."""
+        store = PricePathStore.from_games(GAMES)
+        paths = store.save(tmp_path / 'session')
+
+        loaded = PricePathStore.load(tmp_path / 'session')
+
+        assert [p.name for p in paths] == [
+            'session.prices.npy', 'session.offsets.npy', 'session.meta.json',
+        ]
+        assert loaded.prices == store.prices
+        assert loaded.offsets == store.offsets
+        assert loaded.meta == store.meta
+        assert list(loaded.prices_for('g1')) == [1.0, 1.5, 2.0]
+
+    def test_mismatched_files_rejected(self, tmp_path):
+        """Offsets that do not match the metadata raise ValueError."""
+        PricePathStore.from_games(GAMES).save(tmp_path / 'a')
+        PricePathStore.from_games(GAMES[:1]).save(tmp_path / 'b')
+        (tmp_path / 'b.meta.json').replace(tmp_path / 'a.meta.json')
+
+        with pytest.raises(ValueError, match="do not match"):
+            PricePathStore.load(tmp_path / 'a')
+
+    def test_unknown_format_rejected(self, tmp_path):
+        """Unknown save formats raise ValueError."""
+        with pytest.raises(ValueError, match="Unknown format"):
+            PricePathStore().save(tmp_path / 'x', format='parquet')
+
+    def test_bad_prices_leave_store_unchanged(self):
+        """A non-number in prices raises before anything is appended."""
+        store = PricePathStore.from_games(GAMES[:1])
+
+        with pytest.raises(TypeError):
+            store.add({'id': 'bad', 'prices': [1.0, None, 3.0]})
+        store.add({'id': 'g4', 'prices': [5.0]})
+
+        assert len(store) == 2 and 'bad' not in store
+        assert list(store.prices_for('g4')) == [5.0]
+
+    def test_numpy_loads_saved_files(self, tmp_path):
+        """Files are valid .npy and to_numpy() views share the buffer."""
+        np = pytest.importorskip('numpy')
+        store = PricePathStore.from_games(GAMES)
+        store.save(tmp_path / 'session')
+
+        prices = np.load(tmp_path / 'session.prices.npy', mmap_mode='r')
+        offsets = np.load(tmp_path / 'session.offsets.npy')
+        view, view_offsets = store.to_numpy()
+
+        assert prices.dtype == np.float32
+        assert prices.tolist() == [1.0, 1.5, 2.0, 1.0, 1.25]
+        assert offsets.tolist() == [0, 3, 3, 5]
+        assert np.shares_memory(view, np.frombuffer(store.prices, dtype=np.float32))
+        assert view_offsets.tolist() == [0, 3, 3, 5]
+
+    def test_numpy_padded(self):
+        """Padded tensors have one row per game and NaN after each path."""
+        np = pytest.importorskip('numpy')
+        matrix, lengths = PricePathStore.from_games(GAMES).to_numpy(padded=True)
+
+        assert matrix.shape == (3, 3)
+        assert lengths.tolist() == [3, 0, 2]
+        assert matrix[0].tolist() == [1.0, 1.5, 2.0]
+        assert np.isnan(matrix[1]).all()
+        assert matrix[2, :2].tolist() == [1.0, 1.25]
+
+    def test_arrow_export(self, tmp_path):
+        """Arrow export holds one list of prices per game."""
+        pa = pytest.importorskip('pyarrow')
+        paths = PricePathStore.from_games(GAMES).save(tmp_path / 'session', format='arrow')
+
+        with pa.memory_map(str(paths[0])) as source:
+            table = pa.ipc.open_file(source).read_all()
+
+        assert table.column('id').to_pylist() == ['g1', 'g2', 'g3']
+        assert table.column('prices').to_pylist() == [[1.0, 1.5, 2.0], [], [1.0, 1.25]]
+
+
+class TestCollectorPricePaths:
+    """Test GameHistoryCollector integration."""
+
+    def test_session_sidecar_continues_across_runs(self, tmp_path):
+        """Each session file gets price-path files that grow with it."""
+        for games in (GAMES[:2], GAMES[2:]):
+            collector = GameHistoryCollector(storage_dir=tmp_path)
+            collector.start_collecting('run')
+            for game in games:
+                collector._process_game(game)
+            collector.stop_collecting()
+
+        store = PricePathStore.load(tmp_path / 'run')
+        assert store.meta['id'] == ['g1', 'g2', 'g3']
+        assert list(store.prices_for('g3')) == [1.0, 1.25]
+
+    def test_stale_sidecar_rebuilt_after_crash(self, tmp_path, capsys):
+        """A sidecar lagging its session file is rebuilt, not extended."""
+        collector = GameHistoryCollector(storage_dir=tmp_path)
+        collector.start_collecting('run')
+        collector._process_game(GAMES[0])
+        collector.stop_collecting()
+
+        # Crash: games reach the JSONL but stop_collecting() never runs
+        crashed = GameHistoryCollector(storage_dir=tmp_path)
+        crashed.start_collecting('run')
+        crashed._process_game(GAMES[1])
+        crashed._session_file.close()
+
+        collector = GameHistoryCollector(storage_dir=tmp_path)
+        collector.start_collecting('run')
+        collector._process_game(GAMES[2])
+        collector.stop_collecting()
+
+        store = PricePathStore.load(tmp_path / 'run')
+        assert store.meta['id'] == ['g1', 'g2', 'g3']
+        assert store.lengths() == [3, 0, 2]
+        assert 'Rebuilding price paths' in capsys.readouterr().out
+
+    def test_sidecar_checkpointed_while_collecting(self, tmp_path, monkeypatch, capsys):
+        """The sidecar is written without stop_collecting() (attach_to_capture flow)."""
+        monkeypatch.setattr('lib.game_history_collector.PRICES_SAVE_INTERVAL', 2)
+        collector = GameHistoryCollector(storage_dir=tmp_path)
+        collector.start_collecting('run')
+        for game in GAMES:
+            collector._process_game(game)
+
+        assert PricePathStore.load(tmp_path / 'run').meta['id'] == ['g1', 'g2']
+        collector.stop_collecting()
+
+    def test_bad_prices_game_still_marked_seen(self, tmp_path, capsys):
+        """A game the sidecar rejects is stored once and keeps the sidecar aligned."""
+        bad = {'id': 'bad', 'prices': [1.0, None, 3.0]}
+        collector = GameHistoryCollector(storage_dir=tmp_path)
+        collector.start_collecting('run')
+        for game in (GAMES[0], bad, bad, GAMES[2]):
+            collector._process_game(game)
+        collector.stop_collecting()
+
+        lines = (tmp_path / 'run.jsonl').read_text().splitlines()
+        store = PricePathStore.load(tmp_path / 'run')
+        assert [json.loads(line)['id'] for line in lines] == ['g1', 'bad', 'g3']
+        assert store.meta['id'] == ['g1', 'bad', 'g3']
+        assert store.lengths() == [3, 0, 2]
+        assert list(store.prices_for('g3')) == [1.0, 1.25]
+        assert collector.stats['duplicates_skipped'] == 1
+        assert 'Bad prices for game bad' in capsys.readouterr().out
+
+        # Reopening finds the sidecar in step with the session file
+        collector = GameHistoryCollector(storage_dir=tmp_path)
+        collector.start_collecting('run')
+        assert 'Rebuilding' not in capsys.readouterr().out
+        collector.stop_collecting()
+
+    def test_export_formats(self, tmp_path):
+        """export_for_rl_training() writes JSONL or the columnar store."""
+        collector = GameHistoryCollector(storage_dir=tmp_path, auto_save=False)
+        collector.start_collecting()
+        for game in GAMES:
+            collector._process_game(game)
+
+        jsonl = collector.export_for_rl_training(tmp_path / 'out.jsonl', include_fields=['id'])
+        npy = collector.export_for_rl_training(tmp_path / 'out.jsonl', format='npy')
+
+        assert [json.loads(line) for line in jsonl.read_text().splitlines()][0] == {'id': 'g1'}
+        assert npy.name == 'out.prices.npy'
+        assert PricePathStore.load(tmp_path / 'out').lengths() == [3, 0, 2]
+        assert collector.get_price_paths(limit=1).meta['id'] == ['g3']
+        with pytest.raises(ValueError, match="Unknown format"):
+            collector.export_for_rl_training(format='csv')
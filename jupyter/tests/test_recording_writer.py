@@ -0,0 +1,199 @@
+"""
+Tests for BufferedRecordingWriter
+
+Tests the background recording writer including:
+- Batched writes and explicit flushes
+- Drop-on-full backpressure metrics
+- fsync policies
+- Integration with CDPCapture recordings
+"""
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.cdp_notebook import CDPCapture
+from lib.recording_writer import BufferedRecordingWriter
+
+
+def read_lines(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+class TestBufferedRecordingWriter:
+    """Test BufferedRecordingWriter batching and metrics."""
+
+    def test_writes_all_events_in_order(self, tmp_path):
+        """Every enqueued event is written, in order, by close()."""
+        path = tmp_path / 'rec.jsonl'
+        writer = BufferedRecordingWriter(path, batch_size=16, flush_interval=10)
+        writer.start()
+        for i in range(100):
+            assert writer.write({'event_name': 'tick', 'data': {'i': i}})
+        metrics = writer.close()
+
+        assert [e['data']['i'] for e in read_lines(path)] == list(range(100))
+        assert metrics['enqueued'] == 100
+        assert metrics['written'] == 100
+        assert metrics['dropped'] == 0
+        assert metrics['batches'] >= 100 // 16
+        assert metrics['bytes'] == path.stat().st_size
+        assert not writer.is_running
+
+    def test_flush_writes_partial_batch(self, tmp_path):
+        """flush() writes a batch that has not reached batch_size yet."""
+        path = tmp_path / 'rec.jsonl'
+        with BufferedRecordingWriter(path, batch_size=1000, flush_interval=60) as writer:
+            writer.write({'n': 1})
+            writer.write('{"n": 2}')
+            assert writer.flush(timeout=5)
+            assert read_lines(path) == [{'n': 1}, {'n': 2}]
+
+    def test_flush_interval_writes_without_flush(self, tmp_path):
+        """A partial batch is written once flush_interval has elapsed."""
+        path = tmp_path / 'rec.jsonl'
+        with BufferedRecordingWriter(path, batch_size=1000, flush_interval=0.01) as writer:
+            writer.write({'n': 1})
+            for _ in range(200):
+                if writer.get_metrics()['written']:
+                    break
+                time.sleep(0.01)
+            assert writer.get_metrics()['written'] == 1
+
+    def test_drops_when_queue_full(self, tmp_path):
+        """A full queue drops events instead of blocking the caller."""
+        writer = BufferedRecordingWriter(tmp_path / 'rec.jsonl', max_queue=2)
+        # Not started: nothing drains the queue
+        assert writer.write({'n': 1})
+        assert writer.write({'n': 2})
+        assert not writer.write({'n': 3})
+
+        metrics = writer.get_metrics()
+        assert metrics['enqueued'] == 2
+        assert metrics['dropped'] == 1
+        assert metrics['queue_depth'] == 2
+        assert metrics['max_queue_depth'] == 2
+        assert metrics['blocked_seconds'] == 0
+
+    def test_block_timeout_records_blocked_time(self, tmp_path):
+        """With block_timeout, write() waits for space before dropping."""
+        writer = BufferedRecordingWriter(tmp_path / 'rec.jsonl', max_queue=1, block_timeout=0.02)
+        writer.write({'n': 1})
+
+        assert not writer.write({'n': 2})
+        assert writer.get_metrics()['blocked_seconds'] >= 0.02
+
+    def test_write_after_close_is_dropped(self, tmp_path):
+        """Events arriving after close() are counted as dropped."""
+        writer = BufferedRecordingWriter(tmp_path / 'rec.jsonl').start()
+        writer.close()
+
+        assert not writer.write({'n': 1})
+        assert writer.get_metrics()['dropped'] == 1
+
+    def test_unserializable_event_counted_as_error(self, tmp_path):
+        """Events json cannot encode are skipped and recorded as errors."""
+        path = tmp_path / 'rec.jsonl'
+        with BufferedRecordingWriter(path) as writer:
+            writer.write({'bad': object()})
+            writer.write({'n': 1})
+        metrics = writer.get_metrics()
+
+        assert read_lines(path) == [{'n': 1}]
+        assert metrics['errors'] == 1
+        assert metrics['last_error'].startswith('serialize:')
+
+    def test_fsync_policies(self, tmp_path):
+        """'batch' syncs every batch; unknown policies are rejected."""
+        with BufferedRecordingWriter(tmp_path / 'rec.jsonl', batch_size=1, fsync='batch') as writer:
+            writer.write({'n': 1})
+            writer.write({'n': 2})
+        assert writer.get_metrics()['fsyncs'] == writer.get_metrics()['batches']
+
+        with pytest.raises(ValueError, match='fsync policy'):
+            BufferedRecordingWriter(tmp_path / 'rec.jsonl', fsync='always')
+
+
+class TestCDPCaptureRecording:
+    """Test CDPCapture recording through the buffered writer."""
+
+    def test_process_event_enqueues_to_writer(self, tmp_path, capsys):
+        """Recorded events reach the file after stop_recording()."""
+        path = tmp_path / 'session.jsonl'
+        capture = CDPCapture()
+        capture.start_recording(str(path), batch_size=4)
+
+        for i in range(10):
+            capture._process_event({'event_name': 'gameStateUpdate', 'data': {'tick': i}}, i)
+        assert capture.get_recording_metrics()['enqueued'] == 10
+
+        assert capture.stop_recording() == str(path)
+        assert capture.get_recording_metrics() is None
+        assert 'Written: 10, dropped: 0' in capsys.readouterr().out
+
+        events = read_lines(path)
+        assert [e['data']['tick'] for e in events] == list(range(10))
+        assert events[0]['timestamp'] == 0
+        assert 'captured_at' in events[0]
+
+    def test_stop_without_recording(self):
+        """stop_recording() is a no-op when nothing is being recorded."""
+        assert CDPCapture().stop_recording() is None
+
+    def test_segmented_recording_writes_manifest(self, tmp_path, monkeypatch, capsys):
+        """segmented=True hands batches to the rag-pipeline segment writer."""
+        monkeypatch.syspath_prepend(str(Path(__file__).parent.parent.parent / 'rag-pipeline'))
+        segments = pytest.importorskip('ingestion.recording_segments')
+
+        capture = CDPCapture()
+        capture.start_recording(
+            str(tmp_path / 'session.jsonl'), segmented=True, compression='gzip', rotate_per_game=True
+        )
+        for i in range(6):
+            capture._process_event(
+                {'event_name': 'gameStateUpdate', 'data': {'gameId': f'g{i // 3}', 'tick': i}}, i
+            )
+        manifest_path = capture.stop_recording()
+
+        manifest = segments.load_manifest(Path(manifest_path))
+        assert [s['game_ids'] for s in manifest['segments']] == [['g0'], ['g1']]
+        records = list(segments.iter_segment_records(Path(manifest_path), game_ids=['g1']))
+        assert [r['data']['tick'] for r in records] == [3, 4, 5]
+
+    def test_keep_raw_recordings_hold_data(self, tmp_path, capsys):
+        """Deferred (raw) events are decoded before they are written."""
+        path = tmp_path / 'session.jsonl'
+        capture = CDPCapture(keep_raw=True)
+        capture.start_recording(str(path))
+        for i in range(3):
+            payload = '42' + json.dumps(['gameStateUpdate', {'tick': i}])
+            capture._on_ws_frame('req', float(i), {'payloadData': payload})
+        capture.stop_recording()
+
+        events = read_lines(path)
+        assert 'raw' in capture.events[0]
+        assert [e['data'] for e in events] == [{'tick': 0}, {'tick': 1}, {'tick': 2}]
+        assert not any('raw' in e for e in events)
+
+    def test_keep_raw_segmented_recording_sees_game_ids(self, tmp_path, monkeypatch, capsys):
+        """Per-game rotation works on keep_raw captures."""
+        monkeypatch.syspath_prepend(str(Path(__file__).parent.parent.parent / 'rag-pipeline'))
+        segments = pytest.importorskip('ingestion.recording_segments')
+
+        capture = CDPCapture(keep_raw=True)
+        capture.start_recording(
+            str(tmp_path / 'session.jsonl'), segmented=True, compression='gzip', rotate_per_game=True
+        )
+        for i in range(4):
+            payload = '42' + json.dumps(['gameStateUpdate', {'gameId': f'g{i // 2}', 'tick': i}])
+            capture._on_ws_frame('req', float(i), {'payloadData': payload})
+        manifest = segments.load_manifest(Path(capture.stop_recording()))
+
+        assert [s['game_ids'] for s in manifest['segments']] == [['g0'], ['g1']]
@@ -268,6 +268,60 @@ def search_by_topic(
         return [{"error": f"Search failed: {str(e)}"}]
 
 
+@mcp.tool()
+def search_rugs_events(
+    query: str,
+    event_type: str | None = None,
+    doc_type: str | None = None,
+    top_k: int = 5,
+) -> list[dict[str, Any]]:
+    """Search rugs.fun WebSocket event schemas, fields and sample events.
+    
+    Args:
+        query: Question about the event protocol (e.g., "where is the rug tick?")
+        event_type: Optional event filter (e.g., "gameStateUpdate")
+        doc_type: Optional chunk kind ("schema", "field", "overview", "raw_event")
+        top_k: Number of results to return
+    
+    Returns:
+        Matching chunks with event_type, doc_type, field_path and score
+    """
+    try:
+        from retrieval.retrieve import search_events
+        return search_events(query, top_k, event_type=event_type, doc_type=doc_type)
+    except Exception as e:
+        return [{"error": f"Search failed: {str(e)}"}]
+
+
+@mcp.tool()
+def lookup_field(
+    path_or_fragment: str,
+    event_type: str | None = None,
+    limit: int = 10,
+) -> dict[str, Any]:
+    """Look up rugs.fun WebSocket field paths in the generated field index.
+    
+    Exact answers without vector search: full paths ("data.leaderboard[].pnl",
+    "[]" optional), prefixes ("data.provablyFair.") and fuzzy fragments ("rugtick").
+    
+    Args:
+        path_or_fragment: Full path, prefix or fragment of a field
+        event_type: Optional event filter (e.g., "gameStateUpdate")
+        limit: Maximum prefix and fuzzy matches each (default: 10)
+    
+    Returns:
+        Dict with "exact" match (or None), "prefix" and scored "fuzzy" matches,
+        each with path, events, type, frequency and samples
+    """
+    try:
+        from retrieval.field_lookup import lookup_field as lookup
+        return lookup(path_or_fragment, event_type=event_type, limit=limit)
+    except FileNotFoundError:
+        return {"error": "Field index not generated. Run: python -m ingestion.jsonl_ingest"}
+    except Exception as e:
+        return {"error": f"Lookup failed: {str(e)}"}
+
+
 @mcp.tool()
 def get_quick_reference() -> dict[str, Any]:
     """Get quick reference guide for common commands and workflows.
@@ -6,6 +6,9 @@ PROJECT_ROOT = Path(__file__).parent.parent
 RAG_ROOT = Path(__file__).parent
 CHROMA_PATH = RAG_ROOT / "storage" / "chroma"
 
+# Run logs and --profile dumps of the knowledge ingestion (ingest.py)
+RUNS_PATH = RAG_ROOT / "storage" / "runs"
+
 # Knowledge sources to index
 KNOWLEDGE_PATHS = [
     # Claude-flow core knowledge
@@ -4,13 +4,28 @@ from .ingest import ingest_all, ingest_file, clear_index
 
 # WebSocket recording ingestion pipeline
 from .event_discovery import (
+    accumulate_fields,
     discover_fields,
     scan_jsonl_file,
+    scan_jsonl_range,
     scan_recordings,
+    ArraySampling,
     DiscoveryResult,
     EventInfo,
     FieldInfo,
 )
+from .jsonl_reader import (
+    iter_lines,
+    iter_records,
+    recording_files,
+    shard_boundaries,
+)
+from .field_stats import (
+    FieldStats,
+    HyperLogLog,
+    ReservoirSample,
+    TDigest,
+)
 from .schema_generator import (
     generate_event_schema,
     generate_all_schemas,
@@ -19,8 +34,11 @@ from .schema_generator import (
 from .coverage_report import (
     generate_coverage_report,
     generate_diff_report,
+    generate_drift_report,
     parse_field_dictionary,
+    scan_with_presence,
 )
+from .field_presence import PresenceMatrix
 from .event_chunker import (
     EventChunk,
     SchemaChunk,
@@ -29,8 +47,31 @@ from .event_chunker import (
     chunk_field_index,
     chunk_discovery_result,
 )
+from .capture_index import CaptureIndex
+from .columnar import (
+    convert_capture,
+    convert_recordings,
+    scan_columns,
+)
+from .event_embedder import chunk_id, embed_chunks
+from .event_reducer import EventReducer, reduce_capture, reduce_events
+from .discovery_snapshot import (
+    cached_scan,
+    load_snapshot,
+    merge_snapshots,
+    save_snapshot,
+)
+from .run_metrics import PhaseMetrics, RunMetrics
+from .decoder_codegen import build_decoder_source, load_decoders, write_decoders
+from .recording_segments import (
+    SegmentedRecordingWriter,
+    iter_segment_records,
+    load_manifest,
+    select_segments,
+)
 from .jsonl_ingest import (
     ingest_websocket_recordings,
+    write_discovery_outputs,
     IngestionResult,
 )
 
@@ -42,12 +83,25 @@ __all__ = [
     "ingest_file",
     "clear_index",
     # WebSocket discovery
+    "accumulate_fields",
     "discover_fields",
     "scan_jsonl_file",
+    "scan_jsonl_range",
     "scan_recordings",
+    "ArraySampling",
     "DiscoveryResult",
     "EventInfo",
     "FieldInfo",
+    # JSONL reading
+    "iter_lines",
+    "iter_records",
+    "recording_files",
+    "shard_boundaries",
+    # Field statistics
+    "FieldStats",
+    "HyperLogLog",
+    "ReservoirSample",
+    "TDigest",
     # Schema generation
     "generate_event_schema",
     "generate_all_schemas",
@@ -55,7 +109,11 @@ __all__ = [
     # Coverage reporting
     "generate_coverage_report",
     "generate_diff_report",
+    "generate_drift_report",
+    "scan_with_presence",
     "parse_field_dictionary",
+    # Field drift
+    "PresenceMatrix",
     # Event chunking
     "EventChunk",
     "SchemaChunk",
@@ -63,7 +121,38 @@ __all__ = [
     "chunk_event_schema",
     "chunk_field_index",
     "chunk_discovery_result",
+    # Capture indexing
+    "CaptureIndex",
+    # Columnar datasets
+    "convert_capture",
+    "convert_recordings",
+    "scan_columns",
+    # Event embedding
+    "chunk_id",
+    "embed_chunks",
+    # Event reduction
+    "EventReducer",
+    "reduce_capture",
+    "reduce_events",
+    # Discovery snapshots
+    "cached_scan",
+    "load_snapshot",
+    "merge_snapshots",
+    "save_snapshot",
+    # Run metrics
+    "PhaseMetrics",
+    "RunMetrics",
+    # Event decoders
+    "build_decoder_source",
+    "load_decoders",
+    "write_decoders",
+    # Segmented recordings
+    "SegmentedRecordingWriter",
+    "iter_segment_records",
+    "load_manifest",
+    "select_segments",
     # Orchestrator
     "ingest_websocket_recordings",
+    "write_discovery_outputs",
     "IngestionResult",
 ]
@@ -0,0 +1,327 @@
+"""Sidecar byte-offset index for raw WebSocket captures.
+
+Finding one game or one event type in a capture otherwise means parsing
+every line. CaptureIndex scans a capture once and records, per line,
+its byte offset and length alongside the event type, gameId and
+timestamp in a small SQLite file next to the capture:
+
+    2025-12-14_11-51-33_raw.jsonl
+    2025-12-14_11-51-33_raw.jsonl.idx.sqlite
+
+Queries then seek straight to the matching lines. The index is stale
+when the capture's size or mtime changes; captures that only grew
+(a recorder still appending) are indexed incrementally from the last
+indexed byte.
+
+Example:
+    >>> with CaptureIndex.open(Path("capture.jsonl")) as index:
+    ...     for event in index.iter_events(game_id="20251215-abc123"):
+    ...         print(event["event"], event["ts"])
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Iterator
+
+from ingestion.columnar import record_ts_ms
+from ingestion.event_chunker import extract_game_id
+from ingestion.jsonl_reader import iter_lines
+
+# Bump when the table layout or extraction rules change
+INDEX_VERSION = 1
+
+# Sidecar file suffix appended to the capture's name
+INDEX_SUFFIX = ".idx.sqlite"
+
+# Bytes hashed to detect a capture that was rewritten rather than appended
+_HEAD_BYTES = 4096
+
+# Rows per executemany() batch while indexing
+_BATCH_SIZE = 10_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS lines (
+    offset INTEGER PRIMARY KEY,
+    length INTEGER NOT NULL,
+    event TEXT NOT NULL,
+    game_id TEXT,
+    active_game TEXT,
+    ts_ms INTEGER
+);
+"""
+
+_INDEXES = """
+CREATE INDEX IF NOT EXISTS lines_event ON lines (event, ts_ms);
+CREATE INDEX IF NOT EXISTS lines_game ON lines (game_id, ts_ms);
+CREATE INDEX IF NOT EXISTS lines_active_game ON lines (active_game, ts_ms);
+CREATE INDEX IF NOT EXISTS lines_ts ON lines (ts_ms);
+"""
+
+
+def index_path_for(file_path: Path) -> Path:
+    """Default sidecar index path for a capture."""
+    return file_path.with_name(file_path.name + INDEX_SUFFIX)
+
+
+def _head_digest(file_path: Path) -> str:
+    with open(file_path, "rb") as f:
+        return hashlib.sha1(f.read(_HEAD_BYTES)).hexdigest()
+
+
+class CaptureIndex:
+    """Byte-offset index over one JSONL capture.
+
+    Use CaptureIndex.open() to get an index that is guaranteed to be
+    current for the capture.
+    """
+
+    def __init__(self, file_path: Path, index_path: Path | None = None):
+        self.file_path = Path(file_path)
+        self.index_path = index_path or index_path_for(self.file_path)
+        self._conn = sqlite3.connect(str(self.index_path))
+        self._conn.executescript(_SCHEMA)
+
+    @classmethod
+    def open(cls, file_path: Path, index_path: Path | None = None) -> "CaptureIndex":
+        """Open the index for a capture, building or updating it if stale.
+
+        Args:
+            file_path: Raw capture JSONL file
+            index_path: Sidecar location (default: next to the capture)
+
+        Returns:
+            CaptureIndex ready for queries
+        """
+        index = cls(file_path, index_path)
+        index.refresh()
+        return index
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "CaptureIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # -------------------------------------------------------------------------
+    # Building
+    # -------------------------------------------------------------------------
+
+    def _meta(self) -> dict[str, str]:
+        return dict(self._conn.execute("SELECT key, value FROM meta"))
+
+    def is_current(self) -> bool:
+        """Check whether the index matches the capture's size and mtime."""
+        stat = self.file_path.stat()
+        meta = self._meta()
+        return (
+            meta.get("version") == str(INDEX_VERSION)
+            and meta.get("size") == str(stat.st_size)
+            and meta.get("mtime_ns") == str(stat.st_mtime_ns)
+        )
+
+    def refresh(self) -> int:
+        """Bring the index up to date with the capture.
+
+        Returns:
+            Number of lines indexed by this call (0 if already current)
+        """
+        if self.is_current():
+            return 0
+
+        stat = self.file_path.stat()
+        meta = self._meta()
+        head = _head_digest(self.file_path)
+        indexed = int(meta.get("indexed_bytes", 0))
+
+        appended = (
+            meta.get("version") == str(INDEX_VERSION)
+            and meta.get("head") == head
+            and 0 < indexed <= stat.st_size
+        )
+        if not appended:
+            self._conn.execute("DELETE FROM lines")
+            indexed = 0
+            active_game = None
+        else:
+            row = self._conn.execute(
+                "SELECT active_game FROM lines ORDER BY offset DESC LIMIT 1"
+            ).fetchone()
+            active_game = row[0] if row else None
+
+        count, indexed = self._index_from(indexed, active_game)
+
+        self._conn.executescript(_INDEXES)
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            [
+                ("version", str(INDEX_VERSION)),
+                ("size", str(stat.st_size)),
+                ("mtime_ns", str(stat.st_mtime_ns)),
+                ("head", head),
+                ("indexed_bytes", str(indexed)),
+            ],
+        )
+        self._conn.commit()
+        return count
+
+    def _index_from(self, start: int, active_game: str | None) -> tuple[int, int]:
+        """Index complete lines from a byte offset.
+
+        A trailing line without a newline (a recorder mid-write) is left
+        for the next refresh.
+
+        Returns:
+            (lines indexed, byte offset after the last complete line)
+        """
+        count = 0
+        batch: list[tuple] = []
+        insert = (
+            "INSERT OR REPLACE INTO lines "
+            "(offset, length, event, game_id, active_game, ts_ms) "
+            "VALUES (?, ?, ?, ?, ?, ?)"
+        )
+
+        offset = start
+        for line_offset, line in iter_lines(self.file_path, start, complete_only=True):
+            offset = line_offset + len(line)
+
+            stripped = line.strip()
+            if not stripped or stripped.startswith(b"#"):
+                continue
+            try:
+                record = json.loads(stripped)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+            if not isinstance(record, dict):
+                continue
+
+            game_id = extract_game_id(record.get("data")) or None
+            if game_id:
+                active_game = game_id
+            batch.append((
+                line_offset,
+                len(line),
+                record.get("event", "unknown"),
+                game_id,
+                active_game,
+                record_ts_ms(record),
+            ))
+            count += 1
+
+            if len(batch) >= _BATCH_SIZE:
+                self._conn.executemany(insert, batch)
+                batch = []
+
+        if batch:
+            self._conn.executemany(insert, batch)
+        return count, offset
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def find(
+        self,
+        event_types: list[str] | None = None,
+        game_id: str | None = None,
+        start_ms: int | None = None,
+        end_ms: int | None = None,
+        include_context: bool = False,
+    ) -> list[tuple[int, int]]:
+        """Find lines matching all given filters.
+
+        Args:
+            event_types: Event types to include (None = all)
+            game_id: Only lines belonging to this game
+            start_ms: Inclusive lower bound on ts_ms
+            end_ms: Inclusive upper bound on ts_ms
+            include_context: With game_id, also match lines without their
+                own gameId (chat, trades) received while the game was the
+                most recent one seen
+
+        Returns:
+            List of (offset, length) in file order
+        """
+        clauses = []
+        params: list[Any] = []
+
+        if event_types is not None:
+            if not event_types:
+                return []
+            clauses.append(f"event IN ({','.join('?' * len(event_types))})")
+            params.extend(event_types)
+        if game_id is not None:
+            column = "active_game" if include_context else "game_id"
+            clauses.append(f"{column} = ?")
+            params.append(game_id)
+        if start_ms is not None:
+            clauses.append("ts_ms >= ?")
+            params.append(start_ms)
+        if end_ms is not None:
+            clauses.append("ts_ms <= ?")
+            params.append(end_ms)
+
+        sql = "SELECT offset, length FROM lines"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY offset"
+        return self._conn.execute(sql, params).fetchall()
+
+    def iter_lines(self, **filters) -> Iterator[bytes]:
+        """Seek to and yield raw lines matching find() filters."""
+        with open(self.file_path, "rb") as f:
+            for offset, length in self.find(**filters):
+                f.seek(offset)
+                yield f.read(length)
+
+    def iter_events(self, **filters) -> Iterator[dict[str, Any]]:
+        """Yield parsed events matching find() filters."""
+        for line in self.iter_lines(**filters):
+            yield json.loads(line)
+
+    def event_counts(self) -> dict[str, int]:
+        """Count lines per event type."""
+        return dict(self._conn.execute(
+            "SELECT event, COUNT(*) FROM lines GROUP BY event"
+        ))
+
+    def game_ids(self) -> list[str]:
+        """List gameIds in order of first appearance."""
+        rows = self._conn.execute(
+            "SELECT game_id FROM lines WHERE game_id IS NOT NULL "
+            "GROUP BY game_id ORDER BY MIN(offset)"
+        )
+        return [row[0] for row in rows]
+
+    def game_range(self, game_id: str) -> tuple[int, int] | None:
+        """Get the (first, last) ts_ms of a game, or None if unknown."""
+        row = self._conn.execute(
+            "SELECT MIN(ts_ms), MAX(ts_ms) FROM lines WHERE game_id = ?",
+            (game_id,),
+        ).fetchone()
+        return None if row[0] is None else (row[0], row[1])
+
+    def edge_lines(self) -> tuple[bytes | None, bytes | None]:
+        """Get the first and last indexed lines."""
+        first = self._conn.execute(
+            "SELECT offset, length FROM lines ORDER BY offset LIMIT 1"
+        ).fetchone()
+        last = self._conn.execute(
+            "SELECT offset, length FROM lines ORDER BY offset DESC LIMIT 1"
+        ).fetchone()
+        if first is None:
+            return None, None
+
+        with open(self.file_path, "rb") as f:
+            f.seek(first[0])
+            first_line = f.read(first[1])
+            f.seek(last[0])
+            last_line = f.read(last[1])
+        return first_line, last_line
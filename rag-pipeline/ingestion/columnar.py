@@ -0,0 +1,484 @@
+"""Convert raw WebSocket captures into a partitioned columnar dataset.
+
+Every downstream consumer (discovery, chunking, notebooks, RL export)
+otherwise re-parses raw JSONL text. This module converts captures once
+into Parquet files laid out as a hive-partitioned dataset:
+
+    <dataset>/event=gameStateUpdate/date=2025-12-15/<capture>.parquet
+    <dataset>/event=standard%2FnewTrade/date=2025-12-15/<capture>.parquet
+
+Columns per event type come from the discovered schema: every scalar
+(string/number/boolean) field path outside of arrays becomes its own
+column (e.g. ``data.price``). Numbers that were always ints in the
+discovered captures (``tickCount``, ``seq``) become int64 columns, other
+numbers float64. Everything else - arrays, dynamic-key objects, values
+whose type disagrees with the column (including a float in an int64
+column) - goes into a ``_payload`` column holding zlib-compressed JSON,
+so no data is lost. scan_columns() promotes a column that is int64 in
+some partitions and float64 in others to float64.
+
+Requires pyarrow (optional dependency).
+
+Example:
+    >>> from ingestion.columnar import convert_capture, scan_columns
+    >>> convert_capture(Path("capture.jsonl"), Path("./dataset"))
+    >>> table = scan_columns(
+    ...     Path("./dataset"), "gameStateUpdate", ["data.price"],
+    ...     start_date="2025-12-01", end_date="2025-12-31",
+    ... )
+"""
+from __future__ import annotations
+
+import json
+import sys
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+from urllib.parse import quote, unquote
+
+from ingestion.event_discovery import DiscoveryResult, EventInfo, scan_jsonl_file
+from ingestion.jsonl_reader import iter_records, recording_files
+
+# Name of the compressed residual column
+PAYLOAD_COLUMN = "_payload"
+
+# Epoch-millisecond timestamp column (from ts_ms or parsed ts)
+TS_COLUMN = "_ts_ms"
+
+# Rows buffered per partition before a row group is written
+DEFAULT_ROW_GROUP_SIZE = 50_000
+
+# Column type (discovered JSON type, or "integer" for int-only numbers)
+# -> Python types accepted in the column (bool is never a number)
+_COLUMN_TYPES: dict[str, tuple[type, ...]] = {
+    "string": (str,),
+    "number": (int, float),
+    "integer": (int,),
+    "boolean": (bool,),
+}
+
+# Marker for tree leaves that hold a column name
+_LEAF = object()
+
+
+def _import_pyarrow():
+    """Import pyarrow and pyarrow.parquet lazily."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("Error: pyarrow not installed.")
+        print("Run: pip install pyarrow")
+        sys.exit(1)
+    return pa, pq
+
+
+def flat_columns(event: EventInfo) -> dict[str, str]:
+    """Select the flattened scalar columns for an event type.
+
+    Args:
+        event: EventInfo from discovery
+
+    Returns:
+        Dict mapping column (field path) to discovered JSON type, for
+        string/number/boolean fields that are not inside arrays; numbers
+        that were only ever ints map to "integer"
+    """
+    return {
+        path: "integer" if field.type == "number" and field.stats.integral else field.type
+        for path, field in sorted(event.fields.items())
+        if field.type in _COLUMN_TYPES and "[]" not in path and path != "event"
+    }
+
+
+def _column_tree(columns: dict[str, str]) -> dict[str, Any]:
+    """Build a nested key tree for splitting records into columns.
+
+    Leaves are (``_LEAF``, column name, accepted Python types) tuples.
+    """
+    tree: dict[str, Any] = {}
+    for path, json_type in columns.items():
+        node = tree
+        parts = path.split(".")
+        for part in parts[:-1]:
+            child = node.setdefault(part, {})
+            if isinstance(child, tuple):
+                # Scalar in some records, object in others: keep the
+                # object branch; the scalar goes to the payload.
+                child = node[part] = {}
+            node = child
+        if parts[-1] not in node:
+            node[parts[-1]] = (_LEAF, path, _COLUMN_TYPES[json_type])
+    return tree
+
+
+def split_record(
+    record: dict[str, Any],
+    tree: dict[str, Any],
+    row: dict[str, Any],
+) -> dict[str, Any]:
+    """Split a record into flattened column values and a residual.
+
+    Args:
+        record: Parsed JSON object (or nested object)
+        tree: Column tree from _column_tree()
+        row: Dict receiving column -> value for matched scalars
+
+    Returns:
+        Residual object holding everything not stored in a column
+    """
+    residual: dict[str, Any] = {}
+    for key, value in record.items():
+        node = tree.get(key)
+        if node is None:
+            residual[key] = value
+        elif type(node) is tuple:
+            _, column, accepted = node
+            if isinstance(value, accepted) and (
+                accepted is _COLUMN_TYPES["boolean"]
+                or not isinstance(value, bool)
+            ):
+                row[column] = value
+            elif value is not None:
+                residual[key] = value
+        elif isinstance(value, dict):
+            nested = split_record(value, node, row)
+            if nested:
+                residual[key] = nested
+        elif value is not None:
+            residual[key] = value
+    return residual
+
+
+def encode_payload(residual: dict[str, Any]) -> bytes | None:
+    """Compress a residual object for the payload column."""
+    if not residual:
+        return None
+    return zlib.compress(
+        json.dumps(residual, separators=(",", ":")).encode("utf-8"), 6
+    )
+
+
+def decode_payload(blob: bytes | None) -> dict[str, Any]:
+    """Decompress a payload column value back into a dict."""
+    if not blob:
+        return {}
+    return json.loads(zlib.decompress(blob))
+
+
+def record_ts_ms(record: dict[str, Any]) -> int | None:
+    """Get a record's epoch-millisecond timestamp.
+
+    Prefers ``ts_ms`` (GoldenHourRecorder) and falls back to parsing the
+    ISO ``ts`` string (CDP captures) or ``captured_at`` (CDPCapture
+    recordings).
+    """
+    ts_ms = record.get("ts_ms")
+    if isinstance(ts_ms, (int, float)) and not isinstance(ts_ms, bool):
+        return int(ts_ms)
+    ts = record.get("ts") or record.get("captured_at")
+    if isinstance(ts, str) and ts:
+        try:
+            return int(datetime.fromisoformat(ts).timestamp() * 1000)
+        except ValueError:
+            return None
+    return None
+
+
+def _partition_date(ts_ms: int | None) -> str:
+    """UTC date string for the date partition."""
+    if ts_ms is None:
+        return "unknown"
+    return datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def partition_dir(dataset_dir: Path, event_name: str, date: str) -> Path:
+    """Directory of one (event, date) partition.
+
+    Event names are percent-encoded so "standard/newTrade" stays a
+    single path segment.
+    """
+    return dataset_dir / f"event={quote(event_name, safe='')}" / f"date={date}"
+
+
+class _PartitionWriter:
+    """Buffers rows for one (event, date) partition and writes row groups."""
+
+    def __init__(self, path: Path, columns: dict[str, str], row_group_size: int):
+        self.path = path
+        self.columns = columns
+        self.row_group_size = row_group_size
+        self.rows: list[dict[str, Any]] = []
+        self.rows_written = 0
+        self._writer = None
+        self._schema = None
+
+    def _arrow_schema(self, pa):
+        arrow_types = {
+            "string": pa.string(),
+            "number": pa.float64(),
+            "integer": pa.int64(),
+            "boolean": pa.bool_(),
+        }
+        fields = [pa.field(TS_COLUMN, pa.int64())]
+        fields.extend(
+            pa.field(column, arrow_types[json_type])
+            for column, json_type in self.columns.items()
+        )
+        fields.append(pa.field(PAYLOAD_COLUMN, pa.binary()))
+        return pa.schema(fields)
+
+    def add(self, row: dict[str, Any]) -> None:
+        self.rows.append(row)
+        if len(self.rows) >= self.row_group_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.rows:
+            return
+        pa, pq = _import_pyarrow()
+        if self._writer is None:
+            self._schema = self._arrow_schema(pa)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._writer = pq.ParquetWriter(
+                str(self.path), self._schema, compression="zstd"
+            )
+        table = pa.Table.from_pylist(self.rows, schema=self._schema)
+        self._writer.write_table(table)
+        self.rows_written += len(self.rows)
+        self.rows = []
+
+    def close(self) -> None:
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def _iter_records(file_path: Path) -> Iterator[dict[str, Any]]:
+    """Yield parsed JSON objects from a capture or segment, skipping bad lines."""
+    for _, record in iter_records(file_path):
+        yield record
+
+
+def convert_capture(
+    file_path: Path,
+    dataset_dir: Path,
+    discovery: DiscoveryResult | None = None,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+) -> dict[str, int]:
+    """Convert one JSONL capture into the partitioned dataset.
+
+    Args:
+        file_path: Raw capture JSONL file
+        dataset_dir: Root directory of the columnar dataset
+        discovery: Discovery result whose schemas define the columns
+            (default: scan this capture first)
+        row_group_size: Rows buffered per partition per row group
+
+    Returns:
+        Dict mapping event name to rows written
+    """
+    if discovery is None:
+        discovery = scan_jsonl_file(file_path)
+
+    dataset_dir.mkdir(parents=True, exist_ok=True)
+    columns = {
+        name: flat_columns(event) for name, event in discovery.events.items()
+    }
+    trees = {name: _column_tree(cols) for name, cols in columns.items()}
+
+    writers: dict[tuple[str, str], _PartitionWriter] = {}
+    try:
+        for record in _iter_records(file_path):
+            event_name = record.pop("event", "unknown")
+            if event_name not in trees:
+                columns[event_name] = {}
+                trees[event_name] = {}
+
+            ts_ms = record_ts_ms(record)
+            key = (event_name, _partition_date(ts_ms))
+            writer = writers.get(key)
+            if writer is None:
+                path = partition_dir(dataset_dir, *key) / f"{file_path.stem}.parquet"
+                writer = writers[key] = _PartitionWriter(
+                    path, columns[event_name], row_group_size
+                )
+
+            row: dict[str, Any] = {TS_COLUMN: ts_ms}
+            residual = split_record(record, trees[event_name], row)
+            row[PAYLOAD_COLUMN] = encode_payload(residual)
+            writer.add(row)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    _write_column_manifest(dataset_dir, columns)
+
+    rows: dict[str, int] = {}
+    for (event_name, _), writer in writers.items():
+        rows[event_name] = rows.get(event_name, 0) + writer.rows_written
+    return rows
+
+
+def convert_recordings(
+    recordings_dir: Path,
+    dataset_dir: Path,
+    pattern: str = "*.jsonl",
+) -> dict[str, int]:
+    """Convert every capture in a directory.
+
+    Columns come from one discovery pass over all files, so each event
+    type has the same column set in every partition.
+
+    Args:
+        recordings_dir: Directory containing JSONL captures
+        dataset_dir: Root directory of the columnar dataset
+        pattern: Glob pattern for capture files
+
+    Returns:
+        Dict mapping event name to total rows written
+    """
+    from ingestion.event_discovery import scan_recordings
+
+    discovery = scan_recordings(recordings_dir, pattern)
+    totals: dict[str, int] = {}
+    for file_path in recording_files(recordings_dir, pattern):
+        for event_name, count in convert_capture(
+            file_path, dataset_dir, discovery
+        ).items():
+            totals[event_name] = totals.get(event_name, 0) + count
+    return totals
+
+
+def _write_column_manifest(dataset_dir: Path, columns: dict[str, dict[str, str]]) -> None:
+    """Merge this conversion's columns into ``_columns.json``."""
+    manifest_path = dataset_dir / "_columns.json"
+    manifest: dict[str, dict[str, str]] = {}
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    for event_name, cols in columns.items():
+        known = manifest.setdefault(event_name, {})
+        for column, column_type in cols.items():
+            # int64 in one conversion and float64 in another reads as float64
+            if {known.get(column), column_type} == {"integer", "number"}:
+                column_type = "number"
+            known[column] = column_type
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def list_partitions(
+    dataset_dir: Path,
+    event_name: str,
+    start_date: str | None = None,
+    end_date: str | None = None,
+) -> list[Path]:
+    """List Parquet files of an event type within a date range.
+
+    Only directory names are inspected, so unrelated events and dates
+    are never opened.
+
+    Args:
+        dataset_dir: Root directory of the columnar dataset
+        event_name: Event type (e.g. "gameStateUpdate")
+        start_date: Inclusive YYYY-MM-DD lower bound
+        end_date: Inclusive YYYY-MM-DD upper bound
+
+    Returns:
+        Sorted list of Parquet file paths
+    """
+    event_dir = dataset_dir / f"event={quote(event_name, safe='')}"
+    if not event_dir.exists():
+        return []
+
+    files = []
+    for date_dir in sorted(event_dir.glob("date=*")):
+        date = date_dir.name.split("=", 1)[1]
+        if start_date and date < start_date:
+            continue
+        if end_date and date > end_date:
+            continue
+        files.extend(sorted(date_dir.glob("*.parquet")))
+    return files
+
+
+def list_events(dataset_dir: Path) -> list[str]:
+    """List event types present in a dataset."""
+    return sorted(
+        unquote(p.name.split("=", 1)[1]) for p in dataset_dir.glob("event=*")
+    )
+
+
+def scan_columns(
+    dataset_dir: Path,
+    event_name: str,
+    columns: list[str],
+    start_date: str | None = None,
+    end_date: str | None = None,
+):
+    """Read selected columns of one event type across a date range.
+
+    Only the requested column chunks are read from each file; columns
+    missing from older files come back as nulls.
+
+    Args:
+        dataset_dir: Root directory of the columnar dataset
+        event_name: Event type (e.g. "gameStateUpdate")
+        columns: Column names (e.g. ["_ts_ms", "data.price"])
+        start_date: Inclusive YYYY-MM-DD lower bound
+        end_date: Inclusive YYYY-MM-DD upper bound
+
+    Returns:
+        pyarrow.Table with the requested columns
+    """
+    pa, pq = _import_pyarrow()
+
+    tables = []
+    for path in list_partitions(dataset_dir, event_name, start_date, end_date):
+        available = set(pq.read_schema(str(path)).names)
+        present = [c for c in columns if c in available]
+        table = pq.read_table(str(path), columns=present)
+        for column in columns:
+            if column not in available:
+                table = table.append_column(column, pa.nulls(table.num_rows))
+        tables.append(table.select(columns))
+
+    if not tables:
+        return pa.table({column: pa.array([]) for column in columns})
+    return pa.concat_tables(tables, promote_options="permissive")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Convert WebSocket captures to a partitioned Parquet dataset"
+    )
+    parser.add_argument(
+        "path",
+        type=Path,
+        help="JSONL file or directory of captures",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        required=True,
+        help="Dataset root directory",
+    )
+    parser.add_argument(
+        "--pattern",
+        default="*.jsonl",
+        help="Glob pattern for files (default: *.jsonl)",
+    )
+
+    args = parser.parse_args()
+
+    if args.path.is_file():
+        written = convert_capture(args.path, args.output)
+    else:
+        written = convert_recordings(args.path, args.output, args.pattern)
+
+    for event_name, count in sorted(written.items(), key=lambda x: -x[1]):
+        print(f"{event_name}: {count:,} rows")
+    print(f"\nDataset written to {args.output}")
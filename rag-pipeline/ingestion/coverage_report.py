@@ -4,6 +4,7 @@ This module generates markdown reports showing:
 1. Complete coverage of discovered events and fields
 2. Diff against existing FIELD_DICTIONARY.md (validate-and-augment)
 3. Identification of undocumented and stale fields
+4. Field drift over time across many captures (field_presence)
 
 Example:
     >>> from ingestion.event_discovery import scan_recordings
@@ -17,16 +18,19 @@ from __future__ import annotations
 import re
 from datetime import datetime
 from pathlib import Path
-from typing import Set
+from typing import Any, Set
 
-from ingestion.event_discovery import DiscoveryResult
+from ingestion.event_discovery import DiscoveryResult, EventInfo, FieldInfo, scan_jsonl_file
+from ingestion.field_presence import PresenceMatrix
+from ingestion.jsonl_reader import recording_files
 
 
 def generate_coverage_report(result: DiscoveryResult) -> str:
     """Generate markdown coverage report.
 
     Creates a comprehensive report showing all discovered events,
-    their field counts, frequencies, and sample values.
+    their field counts, frequencies, distribution statistics, and
+    sample values.
 
     Args:
         result: Discovery results from scanning
@@ -34,76 +38,143 @@ def generate_coverage_report(result: DiscoveryResult) -> str:
     Returns:
         Markdown formatted report string
     """
-    lines = [
-        "# WebSocket Recording Coverage Report",
-        "",
-        f"*Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*",
-        "",
-        "## Coverage Summary",
-        "",
-        f"- **Files Scanned**: {result.files_scanned} files",
-        f"- **Total Events**: {result.total_lines:,} events",
-        f"- **Unique Event Types**: {len(result.events)} unique event types",
-        f"- **Parse Errors**: {len(result.errors)}",
-        "",
-    ]
+    builder = CoverageReportBuilder(result)
+    for name, event in result.events.items():
+        builder.add_event(event)
+        for path, field in sorted(event.fields.items()):
+            builder.add_field(name, path, field)
+    return builder.result()
 
-    # Calculate total unique fields
-    total_fields = sum(len(e.fields) for e in result.events.values())
-    lines.append(f"- **Total Unique Field Paths**: {total_fields:,}")
-    lines.append("")
 
-    # Event breakdown table
-    lines.append("## Event Types")
-    lines.append("")
-    lines.append("| Event | Count | % of Total | Unique Fields |")
-    lines.append("|-------|------:|:----------:|:-------------:|")
-
-    for name, event in sorted(
-        result.events.items(), key=lambda x: -x[1].count
-    ):
-        pct = (
-            (event.count / result.total_lines * 100)
-            if result.total_lines
-            else 0
-        )
-        lines.append(
-            f"| `{name}` | {event.count:,} | {pct:.1f}% | {len(event.fields)} |"
-        )
+class CoverageReportBuilder:
+    """Builds the coverage report incrementally from a single traversal.
 
-    lines.append("")
+    Feed every event via add_event() followed by its fields in sorted
+    path order via add_field(), optionally with each field's precomputed
+    stats summary. Event sections are assembled in name order by result().
+    """
 
-    # Field details per event
-    lines.append("## Field Coverage by Event")
-    lines.append("")
+    def __init__(self, result: DiscoveryResult):
+        self.discovery = result
+        self._sections: dict[str, list[str]] = {}
+
+    def add_event(self, event: EventInfo) -> None:
+        self._sections[event.name] = [
+            f"### {event.name}",
+            "",
+            f"**Occurrences**: {event.count:,}",
+            "",
+            "| Field Path | Type | Count | Null % | Distinct | "
+            "Min / p50 / p99 / Max | Sample Values |",
+            "|------------|:----:|------:|-------:|---------:|"
+            "-----------------------|---------------|",
+        ]
+
+    def add_field(
+        self,
+        event_name: str,
+        path: str,
+        field: FieldInfo,
+        summary: dict[str, Any] | None = None,
+    ) -> None:
+        samples = ", ".join(str(s)[:40] for s in field.sample_values[:3])
+        null_pct, distinct, spread = _format_field_stats(field, summary)
+        self._sections[event_name].append(
+            f"| `{path}` | {field.type_label()} | {field.count:,} | {null_pct} | "
+            f"{distinct} | {spread} | {samples} |"
+        )
 
-    for name, event in sorted(result.events.items()):
-        lines.append(f"### {name}")
+    def result(self) -> str:
+        result = self.discovery
+        lines = [
+            "# WebSocket Recording Coverage Report",
+            "",
+            f"*Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*",
+            "",
+            "## Coverage Summary",
+            "",
+            f"- **Files Scanned**: {result.files_scanned} files",
+            f"- **Total Events**: {result.total_lines:,} events",
+            f"- **Unique Event Types**: {len(result.events)} unique event types",
+            f"- **Parse Errors**: {len(result.errors)}",
+            "",
+        ]
+
+        # Calculate total unique fields
+        total_fields = sum(len(e.fields) for e in result.events.values())
+        lines.append(f"- **Total Unique Field Paths**: {total_fields:,}")
         lines.append("")
-        lines.append(f"**Occurrences**: {event.count:,}")
-        lines.append("")
-        lines.append("| Field Path | Type | Count | Sample Values |")
-        lines.append("|------------|:----:|------:|---------------|")
 
-        for path, field in sorted(event.fields.items()):
-            samples = ", ".join(str(s)[:40] for s in field.sample_values[:3])
+        # Event breakdown table
+        lines.append("## Event Types")
+        lines.append("")
+        lines.append("| Event | Count | % of Total | Unique Fields |")
+        lines.append("|-------|------:|:----------:|:-------------:|")
+
+        for name, event in sorted(
+            result.events.items(), key=lambda x: -x[1].count
+        ):
+            pct = (
+                (event.count / result.total_lines * 100)
+                if result.total_lines
+                else 0
+            )
             lines.append(
-                f"| `{path}` | {field.type} | {field.count:,} | {samples} |"
+                f"| `{name}` | {event.count:,} | {pct:.1f}% | {len(event.fields)} |"
             )
 
         lines.append("")
 
-    # Parse errors section
-    if result.errors:
-        lines.append("## Parse Errors")
-        lines.append("")
-        for error in result.errors[:20]:
-            lines.append(f"- {error}")
-        if len(result.errors) > 20:
-            lines.append(f"- *... and {len(result.errors) - 20} more*")
+        # Field details per event
+        lines.append("## Field Coverage by Event")
         lines.append("")
 
-    return "\n".join(lines)
+        for name in sorted(self._sections):
+            lines.extend(self._sections[name])
+            lines.append("")
+
+        # Parse errors section
+        if result.errors:
+            lines.append("## Parse Errors")
+            lines.append("")
+            for error in result.errors[:20]:
+                lines.append(f"- {error}")
+            if len(result.errors) > 20:
+                lines.append(f"- *... and {len(result.errors) - 20} more*")
+            lines.append("")
+
+        return "\n".join(lines)
+
+
+def _format_field_stats(
+    field: FieldInfo,
+    summary: dict[str, Any] | None = None,
+) -> tuple[str, str, str]:
+    """Format null rate, distinct estimate and numeric spread for a row.
+
+    Args:
+        field: FieldInfo with streaming statistics
+        summary: Precomputed field.stats_summary(), if available
+
+    Returns:
+        Tuple of (null %, distinct count, min/p50/p99/max) cell strings,
+        "-" where no primitive values were observed
+    """
+    stats = field.stats
+    if not stats.count:
+        return "-", "-", "-"
+
+    if summary is None:
+        summary = field.stats_summary()
+    null_pct = f"{summary['null_rate'] * 100:.1f}%"
+    distinct = f"~{summary['distinct_estimate']:,}"
+    if "min" not in summary:
+        return null_pct, distinct, "-"
+
+    spread = " / ".join(
+        f"{summary[key]:.4g}" for key in ("min", "p50", "p99", "max")
+    )
+    return null_pct, distinct, spread
 
 
 def parse_field_dictionary(content: str) -> Set[str]:
@@ -234,6 +305,105 @@ def generate_diff_report(
     return "\n".join(lines)
 
 
+def generate_drift_report(
+    matrix: PresenceMatrix,
+    documented: Set[str] | None = None,
+) -> str:
+    """Generate a time-series report of field drift across captures.
+
+    Lists, per capture date, the fields that appeared for the first time,
+    the fields last seen on the previous date, and type changes between
+    consecutive dates.
+
+    Args:
+        matrix: Presence matrix covering the captures
+        documented: Optional documented field paths; new fields missing
+            from it are flagged
+
+    Returns:
+        Markdown drift report
+    """
+    timeline = matrix.timeline()
+    latest = matrix.file_mask(start_date=timeline[-1].date) if timeline else 0
+    stable = matrix.all_fields()
+
+    lines = [
+        "# Field Drift Report",
+        "",
+        f"*Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*",
+        "",
+        "## Summary",
+        "",
+        f"- **Captures**: {len(matrix)}",
+        f"- **Capture Dates**: {len(timeline)}"
+        + (f" ({timeline[0].date} to {timeline[-1].date})" if timeline else ""),
+        f"- **Fields Ever Seen**: {len(matrix.fields)}",
+        f"- **Fields In Every Capture**: {stable.bit_count()}",
+        f"- **Fields On Latest Date**: {matrix.any_fields(latest).bit_count()}",
+        "",
+        "## Timeline",
+        "",
+        "| Date | Captures | Fields | Appeared | Disappeared | Type Changes |",
+        "|------|----------|--------|----------|-------------|--------------|",
+    ]
+    for day in timeline:
+        lines.append(
+            f"| {day.date} | {day.files} | {day.fields} | {len(day.appeared)} "
+            f"| {len(day.disappeared)} | {len(day.type_changes)} |"
+        )
+    lines.append("")
+
+    changes = [
+        day for day in timeline
+        if day.appeared or day.disappeared or day.type_changes
+    ]
+    if changes:
+        lines.append("## Changes")
+        lines.append("")
+    for day in changes:
+        lines.append(f"### {day.date}")
+        lines.append("")
+        for path in day.appeared:
+            flag = " (undocumented)" if documented is not None and path not in documented else ""
+            lines.append(f"- Appeared: `{path}`{flag}")
+        for path in day.disappeared:
+            lines.append(f"- Disappeared: `{path}`")
+        for path, (before, after) in day.type_changes.items():
+            lines.append(f"- Type changed: `{path}` {'|'.join(before)} -> {'|'.join(after)}")
+        lines.append("")
+
+    return "\n".join(lines)
+
+
+def scan_with_presence(
+    directory: Path,
+    matrix: PresenceMatrix,
+    pattern: str = "*.jsonl",
+) -> DiscoveryResult:
+    """Update a presence matrix and discover every capture in a directory.
+
+    Captures that PresenceMatrix.update() (re)scans are reused for the
+    discovery result, so each file is scanned once; only captures the
+    matrix already covered are scanned again.
+
+    Args:
+        directory: Directory containing JSONL recordings
+        matrix: Presence matrix to bring up to date
+        pattern: Glob pattern for files (default: *.jsonl)
+
+    Returns:
+        Combined DiscoveryResult for all captures
+    """
+    scanned: dict[str, DiscoveryResult] = {}
+    matrix.update(directory, pattern, results=scanned)
+
+    combined = DiscoveryResult()
+    for file_path in recording_files(directory, pattern):
+        result = scanned.get(file_path.name)
+        combined.merge(result if result is not None else scan_jsonl_file(file_path))
+    return combined
+
+
 def generate_full_report(
     result: DiscoveryResult,
     dictionary_path: Path | None = None,
@@ -269,7 +439,7 @@ def generate_full_report(
 if __name__ == "__main__":
     import argparse
 
-    from ingestion.event_discovery import scan_recordings, scan_jsonl_file
+    from ingestion.event_discovery import scan_recordings
 
     parser = argparse.ArgumentParser(
         description="Generate coverage report from WebSocket recordings"
@@ -289,18 +459,35 @@ if __name__ == "__main__":
         type=Path,
         help="Output file (default: stdout)",
     )
+    parser.add_argument(
+        "--presence",
+        type=Path,
+        help="Field presence matrix to update and append a drift report from "
+        "(directories only, e.g. field_presence.json)",
+    )
 
     args = parser.parse_args()
 
-    # Discover
+    # Discover (captures the presence matrix scans are not scanned twice)
+    matrix = None
     if args.path.is_file():
         result = scan_jsonl_file(args.path)
+    elif args.presence:
+        matrix = PresenceMatrix.load_or_create(args.presence)
+        result = scan_with_presence(args.path, matrix)
+        matrix.save(args.presence)
     else:
         result = scan_recordings(args.path)
 
     # Generate report
     report = generate_full_report(result, args.dictionary)
 
+    if matrix is not None:
+        documented = (
+            load_field_dictionary(args.dictionary) if args.dictionary else None
+        )
+        report += "\n---\n\n" + generate_drift_report(matrix, documented)
+
     # Output
     if args.output:
         args.output.write_text(report, encoding="utf-8")
@@ -0,0 +1,712 @@
+"""Generate typed per-event payload decoders from discovered schemas.
+
+Consumers of captures (embedding formatters, RL export, live trackers)
+otherwise walk raw dicts with ``.get()`` chains and no type checks. This
+module turns discovered_schemas.json into Python source with one class
+per event payload (the record's ``data`` object), one per nested object
+and one per array-of-objects element type:
+
+- ``slots`` backend (no dependencies): ``__slots__`` classes with a
+  ``from_dict()`` that reads only the declared keys and checks each
+  scalar against its discovered type
+- ``msgspec`` backend (optional dependency): ``msgspec.Struct`` types,
+  so ``decode_line()`` decodes straight from the JSONL bytes and skips
+  every key that is not declared
+
+Both generated modules expose the same API: ``DECODERS`` (event name ->
+class), ``decode(event, data)`` for already-parsed payloads (e.g. live
+Socket.IO arguments) and ``decode_line(line)`` for capture lines,
+returning ``(event, payload)`` or None for events without a decoder.
+Invalid payloads raise ValueError. Union-typed fields (``anyOf``) and
+dynamic-key objects are passed through undecoded.
+
+Passing ``fields`` restricts each decoder to the payload fields a
+consumer needs, which is what makes decoding cheaper than json.loads().
+
+Example:
+    >>> decoders = load_decoders(fields={"gameStateUpdate": ["gameId", "price"]})
+    >>> event, state = decoders.decode_line(line)
+    >>> state.price
+    1.234
+"""
+from __future__ import annotations
+
+import json
+import keyword
+import re
+import sys
+import types
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import RUGS_GENERATED_PATH
+from ingestion.schema_generator import schema_branch, schema_types
+
+# Default schemas written by the ingestion pipeline
+DEFAULT_SCHEMAS = RUGS_GENERATED_PATH / "discovered_schemas.json"
+
+# Generated module written next to the schemas
+DECODERS_FILENAME = "event_decoders.py"
+
+# Code generation targets
+DECODER_BACKENDS = ("slots", "msgspec")
+
+# Discovered scalar type -> Python annotation
+_SCALAR_ANNOTATIONS = {
+    "string": "str",
+    "number": "int | float",
+    "boolean": "bool",
+}
+
+# Discovered scalar type -> exact-class check on ``value``
+_SCALAR_CHECKS = {
+    "string": "value.__class__ is not str",
+    "number": "value.__class__ is not float and value.__class__ is not int",
+    "boolean": "value.__class__ is not bool",
+}
+
+# Attribute names the generated classes define themselves
+_RESERVED = frozenset({"from_dict", "to_dict"})
+
+_NON_WORD = re.compile(r"\W")
+
+
+@dataclass
+class _Field:
+    """One decoded key of a generated class.
+
+    ``kind`` is "scalar", "object" (nested class), "objects" (array of
+    nested class), "dict" (dynamic-key object), "list" (other arrays)
+    or "any" (union types, passed through).
+    """
+
+    key: str
+    attr: str
+    kind: str
+    scalar: str | None = None
+    decoder: _Class | None = None
+
+
+@dataclass
+class _Class:
+    """A generated decoder class."""
+
+    name: str
+    where: str
+    fields: list[_Field] = field(default_factory=list)
+
+
+def _class_name(*parts: str) -> str:
+    """CamelCase class name from event and key names."""
+    name = "".join(
+        token[0].upper() + token[1:]
+        for part in parts
+        for token in re.findall(r"[A-Za-z0-9]+", part)
+    )
+    if not name or name[0].isdigit():
+        name = "E" + name
+    return name
+
+
+def _attr_name(key: str, used: set[str]) -> str:
+    """Python attribute name for a JSON key, unique within its class."""
+    attr = key
+    if not attr.isidentifier():
+        attr = _NON_WORD.sub("_", attr) or "_"
+        if attr[0].isdigit():
+            attr = "_" + attr
+    if keyword.iskeyword(attr) or attr in _RESERVED:
+        attr += "_"
+    while attr in used:
+        attr += "_"
+    used.add(attr)
+    return attr
+
+
+def _selection_tree(paths: list[str]) -> dict[str, Any]:
+    """Nested selection from payload paths ("rugpool.rugpoolAmount").
+
+    Leaves are True, meaning the whole subtree is selected.
+    """
+    tree: dict[str, Any] = {}
+    for path in paths:
+        node = tree
+        segments = [segment.rstrip("[]") for segment in path.split(".") if segment]
+        for segment in segments[:-1]:
+            child = node.get(segment)
+            if child is True:
+                break
+            node = node.setdefault(segment, {})
+        else:
+            if segments:
+                node[segments[-1]] = True
+    return tree
+
+
+class _Builder:
+    """Collects _Class specs for a set of event schemas."""
+
+    def __init__(self):
+        self.classes: list[_Class] = []
+        self._names: set[str] = set()
+
+    def _new_class(self, name: str, where: str) -> _Class:
+        unique, suffix = name, 2
+        while unique in self._names:
+            unique, suffix = f"{name}{suffix}", suffix + 1
+        self._names.add(unique)
+        return _Class(unique, where)
+
+    def build(
+        self,
+        name: str,
+        where: str,
+        properties: dict[str, Any],
+        selection: dict[str, Any] | None,
+    ) -> _Class:
+        """Build a class for ``properties``; nested classes are added first."""
+        spec = self._new_class(name, where)
+        if selection is not None:
+            unknown = sorted(set(selection) - set(properties))
+            if unknown:
+                raise ValueError(
+                    f"{where}: no discovered field(s) {', '.join(unknown)}"
+                )
+
+        used: set[str] = set()
+        for key, node in sorted(properties.items()):
+            if selection is not None and key not in selection:
+                continue
+            sub = None if selection is None or selection[key] is True else selection[key]
+            spec.fields.append(
+                self._field(key, _attr_name(key, used), node, spec, sub)
+            )
+        self.classes.append(spec)
+        return spec
+
+    def _field(
+        self,
+        key: str,
+        attr: str,
+        node: dict[str, Any],
+        parent: _Class,
+        selection: dict[str, Any] | None,
+    ) -> _Field:
+        non_null = [t for t in schema_types(node) if t != "null"]
+        where = f"{parent.where}.{key}"
+        if len(non_null) != 1:
+            return _Field(key, attr, "any")
+
+        value_type = non_null[0]
+        if value_type in _SCALAR_ANNOTATIONS:
+            return _Field(key, attr, "scalar", scalar=value_type)
+
+        if value_type == "object":
+            properties = node.get("properties")
+            if not properties:
+                return _Field(key, attr, "dict")
+            nested = self.build(_class_name(parent.name, key), where, properties, selection)
+            return _Field(key, attr, "object", decoder=nested)
+
+        items = node.get("items")
+        if items is not None:
+            item_types = [t for t in schema_types(items) if t != "null"]
+            objects = schema_branch(items, "object")
+            if item_types == ["object"] and objects.get("properties"):
+                nested = self.build(
+                    _class_name(parent.name, key, "Item"),
+                    f"{where}[]",
+                    objects["properties"],
+                    selection,
+                )
+                return _Field(key, attr, "objects", decoder=nested)
+        return _Field(key, attr, "list")
+
+
+def _annotation(spec: _Field) -> str:
+    if spec.kind == "scalar":
+        annotation = _SCALAR_ANNOTATIONS[spec.scalar]
+    elif spec.kind == "object":
+        annotation = spec.decoder.name
+    elif spec.kind == "objects":
+        annotation = f"list[{spec.decoder.name} | None]"
+    elif spec.kind == "dict":
+        annotation = "dict[str, Any]"
+    elif spec.kind == "list":
+        annotation = "list[Any]"
+    else:
+        return "Any"
+    return f"{annotation} | None"
+
+
+def _slots_class(spec: _Class, validate: bool) -> list[str]:
+    """Source lines of a __slots__ decoder class."""
+    attrs = [f.attr for f in spec.fields]
+    lines = [
+        "",
+        "",
+        f"class {spec.name}:",
+        f'    """Decoder for {spec.where}."""',
+        "",
+        f"    __slots__ = {tuple(attrs)!r}",
+        "",
+    ]
+    for f in spec.fields:
+        lines.append(f"    {f.attr}: {_annotation(f)}")
+    if spec.fields:
+        lines.append("")
+
+    params = "".join(f", {f.attr}: {_annotation(f)} = None" for f in spec.fields)
+    lines.append(f"    def __init__(self{params}) -> None:")
+    lines.extend(f"        self.{a} = {a}" for a in attrs)
+    if not attrs:
+        lines.append("        pass")
+
+    lines += [
+        "",
+        "    @classmethod",
+        f"    def from_dict(cls, data: dict[str, Any]) -> {spec.name}:",
+        "        self = cls.__new__(cls)",
+    ]
+    if spec.fields:
+        lines.append("        get = data.get")
+    for f in spec.fields:
+        where = f"{spec.where}.{f.key}"
+        lines.append(f"        value = get({f.key!r})")
+        if f.kind == "scalar" and validate:
+            lines += [
+                f"        if value is not None and {_SCALAR_CHECKS[f.scalar]}:",
+                f"            _invalid({where!r}, {f.scalar!r}, value)",
+            ]
+        elif f.kind == "object":
+            decoder = f"{f.decoder.name}.from_dict"
+            if validate:
+                lines += [
+                    "        if value is not None:",
+                    "            if value.__class__ is not dict:",
+                    f"                _invalid({where!r}, 'object', value)",
+                    f"            value = {decoder}(value)",
+                ]
+            else:
+                lines.append(
+                    f"        if value.__class__ is dict:\n"
+                    f"            value = {decoder}(value)"
+                )
+        elif f.kind == "objects":
+            decoder = f"{f.decoder.name}.from_dict"
+            if validate:
+                lines += [
+                    "        if value is not None:",
+                    f"            value = _decode_list({decoder}, value, {where!r})",
+                ]
+            else:
+                lines.append(
+                    f"        if value.__class__ is list:\n"
+                    f"            value = [{decoder}(item) if item.__class__ is dict else item"
+                    f" for item in value]"
+                )
+        elif f.kind in ("dict", "list") and validate:
+            expected = "object" if f.kind == "dict" else "array"
+            lines += [
+                f"        if value is not None and value.__class__ is not {f.kind}:",
+                f"            _invalid({where!r}, {expected!r}, value)",
+            ]
+        lines.append(f"        self.{f.attr} = value")
+    lines.append("        return self")
+
+    lines += [
+        "",
+        "    def to_dict(self) -> dict[str, Any]:",
+        '        """Plain JSON-compatible dict (None for missing fields)."""',
+        "        return {",
+    ]
+    for f in spec.fields:
+        value = f"self.{f.attr}"
+        if f.kind in ("object", "objects"):
+            value = f"_plain({value})"
+        lines.append(f"            {f.key!r}: {value},")
+    lines += [
+        "        }",
+        "",
+        "    __repr__ = _repr",
+        "    __eq__ = _eq",
+    ]
+    return lines
+
+
+_SLOTS_PRELUDE = '''
+
+def _invalid(where: str, expected: str, value: Any) -> None:
+    raise ValueError(f"{where}: expected {expected}, got {type(value).__name__}")
+
+
+def _decode_list(decoder, value: Any, where: str) -> list:
+    if value.__class__ is not list:
+        _invalid(where, "array", value)
+    items = []
+    for item in value:
+        if item is not None:
+            if item.__class__ is not dict:
+                _invalid(where + "[]", "object", item)
+            item = decoder(item)
+        items.append(item)
+    return items
+
+
+def _plain(value: Any) -> Any:
+    if value.__class__ is list:
+        return [_plain(item) for item in value]
+    to_dict = getattr(value, "to_dict", None)
+    return value if to_dict is None else to_dict()
+
+
+def _repr(self) -> str:
+    fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+    return f"{type(self).__name__}({fields})"
+
+
+def _eq(self, other: Any) -> bool:
+    if type(other) is not type(self):
+        return NotImplemented
+    return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)'''
+
+_SLOTS_API = '''
+
+def decode(event: str, data: Any) -> Any:
+    """Decode an event payload; None if the event has no decoder or no data.
+
+    Raises:
+        ValueError: If the payload does not match the discovered schema
+    """
+    decoder = DECODERS.get(event)
+    if decoder is None or data is None:
+        return None
+    if data.__class__ is list and len(data) > 1:  # [trace, payload]
+        data = data[1]
+    if data.__class__ is not dict:
+        if not VALIDATE:
+            return None
+        _invalid(event + " data", "object", data)
+    return decoder.from_dict(data)
+
+
+def decode_line(line: bytes | str) -> tuple[str, Any] | None:
+    """Decode one capture line into (event, payload object).
+
+    Returns None for events without a decoder.
+
+    Raises:
+        ValueError: If the line is not JSON or the payload is invalid
+    """
+    record = json.loads(line)
+    event = record.get("event")
+    if event not in DECODERS:
+        return None
+    return event, decode(event, record.get("data"))
+'''
+
+
+def _msgspec_class(spec: _Class) -> list[str]:
+    """Source lines of a msgspec.Struct decoder class."""
+    lines = [
+        "",
+        "",
+        f"class {spec.name}(msgspec.Struct):",
+        f'    """Decoder for {spec.where}."""',
+    ]
+    if spec.fields:
+        lines.append("")
+    for f in spec.fields:
+        default = "None"
+        if f.attr != f.key:
+            default = f"msgspec.field(default=None, name={f.key!r})"
+        lines.append(f"    {f.attr}: {_annotation(f)} = {default}")
+    return lines
+
+
+_MSGSPEC_API = '''
+
+class _Tag(msgspec.Struct):
+    event: str = ""
+
+
+_TAG = msgspec.json.Decoder(_Tag)
+
+_LINE_DECODERS = {
+    event: msgspec.json.Decoder(
+        msgspec.defstruct(decoder.__name__ + "Record", [("data", decoder | None, None)])
+    )
+    for event, decoder in DECODERS.items()
+}
+
+
+def decode(event: str, data: Any) -> Any:
+    """Decode an event payload; None if the event has no decoder or no data.
+
+    Raises:
+        ValueError: If the payload does not match the discovered schema
+    """
+    decoder = DECODERS.get(event)
+    if decoder is None or data is None:
+        return None
+    if data.__class__ is list and len(data) > 1:  # [trace, payload]
+        data = data[1]
+    try:
+        return msgspec.convert(data, decoder)
+    except msgspec.ValidationError as e:
+        raise ValueError(f"{event} data: {e}") from None
+
+
+def decode_line(line: bytes | str) -> tuple[str, Any] | None:
+    """Decode one capture line into (event, payload object).
+
+    Only declared keys are materialized. Returns None for events without
+    a decoder.
+
+    Raises:
+        ValueError: If the line is not JSON or the payload is invalid
+    """
+    event = ""
+    try:
+        event = _TAG.decode(line).event
+        decoder = _LINE_DECODERS.get(event)
+        if decoder is None:
+            return None
+        return event, decoder.decode(line).data
+    except msgspec.DecodeError as e:
+        raise ValueError(f"{event or 'capture line'}: {e}") from None
+'''
+
+
+def build_decoder_source(
+    schemas: dict[str, dict[str, Any]],
+    fields: dict[str, list[str]] | None = None,
+    backend: str = "slots",
+    validate: bool = True,
+) -> str:
+    """Generate the source of a decoder module.
+
+    Args:
+        schemas: Event name -> JSON Schema (discovered_schemas.json)
+        fields: Event name -> payload field paths to decode (e.g.
+            "rugpool.rugpoolAmount", "leaderboard[].pnl"); when given,
+            only these events get decoders. Default: every field of
+            every event with an object payload
+        backend: One of DECODER_BACKENDS
+        validate: Check scalar types in the slots backend (msgspec
+            always validates)
+
+    Returns:
+        Python source code
+
+    Raises:
+        ValueError: On an unknown backend, event or field path
+    """
+    if backend not in DECODER_BACKENDS:
+        raise ValueError(
+            f"Unknown decoder backend {backend!r}; "
+            f"expected one of {', '.join(DECODER_BACKENDS)}"
+        )
+    if fields is not None:
+        unknown = sorted(set(fields) - set(schemas))
+        if unknown:
+            raise ValueError(f"No discovered schema for event(s) {', '.join(unknown)}")
+
+    builder = _Builder()
+    roots: dict[str, _Class] = {}
+    for event in sorted(schemas if fields is None else fields):
+        data = schemas[event].get("properties", {}).get("data")
+        payload = schema_branch(data, "object") if data else None
+        if payload is None or not payload.get("properties"):
+            if fields is not None:
+                raise ValueError(f"{event}: payload is not an object with fields")
+            continue
+        selection = None if fields is None else _selection_tree(fields[event])
+        roots[event] = builder.build(
+            _class_name(event), f"{event} data", payload["properties"], selection
+        )
+
+    lines = [
+        f"# Generated by ingestion.decoder_codegen ({backend} backend) - do not edit.",
+        f'"""Typed payload decoders for rugs.fun WebSocket events ({len(roots)} types)."""',
+    ]
+    if backend == "slots":
+        lines += [
+            "from __future__ import annotations",
+            "",
+            "import json",
+            "from typing import Any",
+            "",
+            f"VALIDATE = {validate!r}",
+            _SLOTS_PRELUDE,
+        ]
+        for spec in builder.classes:
+            lines += _slots_class(spec, validate)
+    else:
+        lines += [
+            "from typing import Any",
+            "",
+            "import msgspec",
+        ]
+        for spec in builder.classes:
+            lines += _msgspec_class(spec)
+
+    lines += ["", "", "DECODERS: dict[str, type] = {"]
+    lines += [f"    {event!r}: {spec.name}," for event, spec in roots.items()]
+    lines.append("}")
+    lines.append(_SLOTS_API if backend == "slots" else _MSGSPEC_API)
+    return "\n".join(lines)
+
+
+def _import_msgspec():
+    """Check that msgspec is importable."""
+    try:
+        import msgspec  # noqa: F401
+    except ImportError:
+        print("Error: msgspec not installed.")
+        print("Run: pip install msgspec")
+        sys.exit(1)
+
+
+def compile_decoders(source: str, name: str = "event_decoders") -> types.ModuleType:
+    """Execute generated decoder source as an in-memory module.
+
+    Args:
+        source: Output of build_decoder_source()
+        name: Module name
+
+    Returns:
+        Module exposing DECODERS, decode() and decode_line()
+    """
+    module = types.ModuleType(name)
+    exec(compile(source, f"<{name}>", "exec", dont_inherit=True), module.__dict__)
+    return module
+
+
+def write_decoders(
+    schemas: dict[str, dict[str, Any]],
+    output_path: Path,
+    fields: dict[str, list[str]] | None = None,
+    backend: str = "slots",
+    validate: bool = True,
+) -> Path:
+    """Generate a decoder module and write it to ``output_path``.
+
+    Args:
+        schemas: Event name -> JSON Schema
+        output_path: .py file to write
+        fields: Event name -> payload field paths (default: all)
+        backend: One of DECODER_BACKENDS
+        validate: Check scalar types in the slots backend
+
+    Returns:
+        The written path
+    """
+    source = build_decoder_source(schemas, fields, backend, validate)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(source, encoding="utf-8")
+    return output_path
+
+
+_cached: dict[tuple, tuple[int, types.ModuleType]] = {}
+
+
+def load_decoders(
+    schemas_path: Path | None = None,
+    fields: dict[str, list[str]] | None = None,
+    backend: str = "slots",
+    validate: bool = True,
+) -> types.ModuleType:
+    """Build decoders from a schemas file, reusing them until it changes.
+
+    Args:
+        schemas_path: discovered_schemas.json (default: DEFAULT_SCHEMAS)
+        fields: Event name -> payload field paths (default: all)
+        backend: One of DECODER_BACKENDS
+        validate: Check scalar types in the slots backend
+
+    Returns:
+        Module exposing DECODERS, decode() and decode_line()
+
+    Raises:
+        FileNotFoundError: If the schemas have not been generated yet
+    """
+    path = Path(schemas_path or DEFAULT_SCHEMAS)
+    mtime = path.stat().st_mtime_ns
+    key = (
+        path,
+        None if fields is None else tuple(sorted((e, tuple(p)) for e, p in fields.items())),
+        backend,
+        validate,
+    )
+    cached = _cached.get(key)
+    if cached is None or cached[0] != mtime:
+        with open(path) as f:
+            schemas = json.load(f)
+        if backend == "msgspec":
+            _import_msgspec()
+        module = compile_decoders(build_decoder_source(schemas, fields, backend, validate))
+        cached = _cached[key] = (mtime, module)
+    return cached[1]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Generate typed event decoders from discovered schemas"
+    )
+    parser.add_argument(
+        "--schemas",
+        type=Path,
+        default=DEFAULT_SCHEMAS,
+        help=f"Schemas JSON (default: {DEFAULT_SCHEMAS})",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help=f"Module to write (default: {DECODERS_FILENAME} next to the schemas)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=DECODER_BACKENDS,
+        default="slots",
+        help="Generate __slots__ classes or msgspec Structs (default: slots)",
+    )
+    parser.add_argument(
+        "--field",
+        action="append",
+        default=[],
+        metavar="EVENT:PATH",
+        help="Only decode this payload field (repeatable), e.g. gameStateUpdate:price",
+    )
+    parser.add_argument(
+        "--no-validate",
+        action="store_true",
+        help="Skip scalar type checks (slots backend)",
+    )
+
+    args = parser.parse_args()
+
+    selected = None
+    if args.field:
+        selected = {}
+        for spec in args.field:
+            event, _, path = spec.rpartition(":")
+            selected.setdefault(event, []).append(path)
+
+    try:
+        with open(args.schemas) as f:
+            schemas = json.load(f)
+        output = args.output or args.schemas.parent / DECODERS_FILENAME
+        write_decoders(schemas, output, selected, args.backend, not args.no_validate)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print(f"Wrote {output}")
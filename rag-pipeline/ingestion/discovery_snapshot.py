@@ -0,0 +1,320 @@
+"""Versioned binary snapshots of DiscoveryResult.
+
+The generated JSON outputs (discovered_schemas.json, field_index.json)
+are derived views: loading them back cannot restore the streaming
+statistics, so every consumer that needs a DiscoveryResult rescans the
+recordings. A snapshot stores the DiscoveryResult itself:
+
+    offset  size  field
+    0       8     magic b"RUGSDISC"
+    8       2     format version (little-endian)
+    10      2     flags (bit 0: payload is zlib-compressed)
+    12      4     CRC-32 of the payload
+    16      8     payload length
+    24      ...   payload: pickle (protocol 5) of
+                  {"result": DiscoveryResult, "sources": {...}, "options": {...}}
+
+Loading uses a restricted unpickler that only resolves the discovery and
+field-statistics classes, so a snapshot cannot import arbitrary code.
+``sources`` maps each scanned file name to its (size, mtime_ns), which
+lets cached_scan() reuse a snapshot until the recordings change;
+``options`` records scan settings that change the result (array sampling).
+
+Example:
+    >>> save_snapshot(scan_recordings(recordings), Path("discovery.snapshot"))
+    >>> result = load_snapshot(Path("discovery.snapshot"))
+    >>> combined = merge_snapshots([Path("a.snapshot"), Path("b.snapshot")])
+"""
+from __future__ import annotations
+
+import io
+import os
+import pickle
+import struct
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+
+from ingestion.event_discovery import ArraySampling, DiscoveryResult, scan_jsonl_file
+from ingestion.jsonl_reader import recording_files
+
+# File signature and current layout version (2: FieldInfo type histograms,
+# 3: FieldStats float counts)
+SNAPSHOT_MAGIC = b"RUGSDISC"
+SNAPSHOT_VERSION = 3
+
+# Default snapshot file name next to the other generated outputs
+SNAPSHOT_FILENAME = "discovery.snapshot"
+
+# Header flag: payload is zlib-compressed
+FLAG_ZLIB = 0x1
+
+# Level 1 is ~2x faster than the default for ~15% more bytes
+_ZLIB_LEVEL = 1
+
+_HEADER = struct.Struct("<8sHHIQ")
+
+# Globals a snapshot may reference; anything else is rejected on load
+_ALLOWED_GLOBALS = {
+    "ingestion.event_discovery": frozenset({"DiscoveryResult", "EventInfo", "FieldInfo"}),
+    "ingestion.field_stats": frozenset(
+        {"FieldStats", "ReservoirSample", "TDigest", "HyperLogLog", "_UNSET"}
+    ),
+}
+
+
+@dataclass(frozen=True)
+class SnapshotHeader:
+    """Fixed-size header of a snapshot file."""
+
+    version: int
+    flags: int
+    crc32: int
+    length: int
+
+    @property
+    def compressed(self) -> bool:
+        return bool(self.flags & FLAG_ZLIB)
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    """Unpickler limited to discovery and field-statistics classes."""
+
+    def find_class(self, module: str, name: str) -> Any:
+        if name in _ALLOWED_GLOBALS.get(module, ()):
+            return super().find_class(module, name)
+        raise pickle.UnpicklingError(f"Snapshot references disallowed global {module}.{name}")
+
+
+def file_sources(paths: Iterable[Path]) -> dict[str, tuple[int, int]]:
+    """Map file names to (size, mtime_ns) for snapshot freshness checks."""
+    sources = {}
+    for path in paths:
+        stat = path.stat()
+        sources[path.name] = (stat.st_size, stat.st_mtime_ns)
+    return sources
+
+
+def save_snapshot(
+    result: DiscoveryResult,
+    path: Path,
+    sources: dict[str, tuple[int, int]] | None = None,
+    compress: bool = True,
+    options: dict[str, Any] | None = None,
+) -> int:
+    """Write a DiscoveryResult snapshot.
+
+    The file is written to a temporary name and renamed into place, so
+    readers never see a partial snapshot.
+
+    Args:
+        result: Discovery result to store
+        path: Snapshot file to write
+        sources: Optional file name -> (size, mtime_ns) of the scanned files
+        compress: zlib-compress the payload
+        options: Scan settings the result depends on
+
+    Returns:
+        Bytes written
+    """
+    payload = pickle.dumps(
+        {"result": result, "sources": dict(sources or {}), "options": dict(options or {})},
+        protocol=5,
+    )
+    flags = 0
+    if compress:
+        payload = zlib.compress(payload, _ZLIB_LEVEL)
+        flags |= FLAG_ZLIB
+    header = _HEADER.pack(
+        SNAPSHOT_MAGIC, SNAPSHOT_VERSION, flags, zlib.crc32(payload), len(payload)
+    )
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return len(header) + len(payload)
+
+
+def read_snapshot_header(path: Path) -> SnapshotHeader:
+    """Read and validate the header of a snapshot file.
+
+    Raises:
+        ValueError: If the file is not a snapshot or has an unsupported version
+    """
+    with open(path, "rb") as f:
+        raw = f.read(_HEADER.size)
+    return _parse_header(raw, path)
+
+
+def _parse_header(raw: bytes, path: Path) -> SnapshotHeader:
+    if len(raw) < _HEADER.size:
+        raise ValueError(f"{path}: too short to be a discovery snapshot")
+    magic, version, flags, crc32, length = _HEADER.unpack_from(raw)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError(f"{path}: not a discovery snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(
+            f"{path}: snapshot version {version} is not supported "
+            f"(expected {SNAPSHOT_VERSION}); regenerate it"
+        )
+    return SnapshotHeader(version, flags, crc32, length)
+
+
+def _load_state(path: Path) -> dict[str, Any]:
+    data = Path(path).read_bytes()
+    header = _parse_header(data, path)
+    payload = memoryview(data)[_HEADER.size:]
+    if len(payload) != header.length or zlib.crc32(payload) != header.crc32:
+        raise ValueError(f"{path}: snapshot is truncated or corrupt")
+    if header.compressed:
+        payload = zlib.decompress(payload)
+    return _SnapshotUnpickler(io.BytesIO(payload)).load()
+
+
+def load_snapshot(path: Path) -> DiscoveryResult:
+    """Load the DiscoveryResult stored in a snapshot.
+
+    Args:
+        path: Snapshot file
+
+    Returns:
+        The stored DiscoveryResult
+
+    Raises:
+        ValueError: If the file is not a valid snapshot of this version
+    """
+    return _load_state(path)["result"]
+
+
+def snapshot_sources(path: Path) -> dict[str, tuple[int, int]]:
+    """Return the file name -> (size, mtime_ns) recorded in a snapshot."""
+    return {name: tuple(stat) for name, stat in _load_state(path)["sources"].items()}
+
+
+def merge_snapshots(paths: Iterable[Path]) -> DiscoveryResult:
+    """Merge several snapshots into one DiscoveryResult.
+
+    Use this to combine discoveries made on different machines or from
+    different recording directories without rescanning.
+
+    Args:
+        paths: Snapshot files
+
+    Returns:
+        Combined DiscoveryResult
+    """
+    combined = DiscoveryResult()
+    for path in paths:
+        combined.merge(load_snapshot(path))
+    return combined
+
+
+def cached_scan(
+    directory: Path,
+    snapshot_path: Path | None = None,
+    pattern: str = "*.jsonl",
+    array_sampling: ArraySampling | None = None,
+) -> DiscoveryResult:
+    """Scan a recordings directory, reusing a snapshot when still valid.
+
+    Files whose name, size and mtime match the snapshot are not rescanned.
+    If only new files were added, they are scanned and merged into the
+    stored result; any other change, or a different array sampling
+    setting, triggers a full rescan. The snapshot is rewritten whenever
+    anything was scanned.
+
+    Args:
+        directory: Directory containing JSONL recordings
+        snapshot_path: Snapshot file (default: directory/SNAPSHOT_FILENAME)
+        pattern: Glob pattern for files (default: *.jsonl); compressed
+            segments are included (see recording_files())
+        array_sampling: Per-array element sampling (default: visit all)
+
+    Returns:
+        DiscoveryResult covering every matching file
+    """
+    if snapshot_path is None:
+        snapshot_path = directory / SNAPSHOT_FILENAME
+    files = recording_files(directory, pattern)
+    current = file_sources(files)
+    options = _scan_options(array_sampling)
+
+    result, stored = None, {}
+    if snapshot_path.exists():
+        try:
+            state = _load_state(snapshot_path)
+        except (ValueError, pickle.UnpicklingError, EOFError):
+            state = None
+        if state is not None and state.get("options", {}) == options:
+            stored = {name: tuple(stat) for name, stat in state["sources"].items()}
+            if all(current.get(name) == stat for name, stat in stored.items()):
+                result = state["result"]
+            else:
+                stored = {}
+
+    new_files = [f for f in files if f.name not in stored]
+    if result is not None and not new_files:
+        return result
+
+    if result is None:
+        result = DiscoveryResult()
+    for file_path in new_files:
+        result.merge(scan_jsonl_file(file_path, array_sampling=array_sampling))
+
+    save_snapshot(result, snapshot_path, current, options=options)
+    return result
+
+
+def _scan_options(array_sampling: ArraySampling | None) -> dict[str, Any]:
+    if array_sampling is None or not array_sampling.enabled:
+        return {}
+    return {"array_sampling": (array_sampling.strategy, array_sampling.size)}
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(
+        description="Create, inspect or merge discovery snapshots"
+    )
+    parser.add_argument(
+        "paths",
+        type=Path,
+        nargs="+",
+        help="Recordings directory to snapshot, or snapshot files to inspect/merge",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Snapshot to write (merge target, or directory snapshot location)",
+    )
+
+    args = parser.parse_args()
+
+    if len(args.paths) == 1 and args.paths[0].is_dir():
+        result = cached_scan(args.paths[0], args.output)
+        target = args.output or args.paths[0] / SNAPSHOT_FILENAME
+        print(f"Snapshot: {target} ({target.stat().st_size:,} bytes)")
+    elif all(p.is_file() for p in args.paths):
+        try:
+            result = merge_snapshots(args.paths)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        if args.output:
+            size = save_snapshot(result, args.output)
+            print(f"Merged {len(args.paths)} snapshots into {args.output} ({size:,} bytes)")
+    else:
+        print("Error: pass one recordings directory or one or more snapshot files")
+        sys.exit(1)
+
+    print(f"Files scanned: {result.files_scanned}")
+    print(f"Total events: {result.total_lines:,}")
+    print(f"Unique event types: {len(result.events)}")
+    print(f"Unique field paths: {sum(len(e.fields) for e in result.events.values())}")
@@ -4,6 +4,9 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterator
 
+from ingestion.jsonl_reader import iter_lines, iter_records
+from ingestion.schema_generator import schema_branch, schema_types
+
 
 @dataclass
 class EventChunk:
@@ -212,86 +215,102 @@ def chunk_raw_capture(
     """
     source = str(file_path)
 
-    with open(file_path) as f:
-        for line_num, line in enumerate(f, 1):
-            if not line.strip():
-                continue
-
-            # Apply sample rate
-            if sample_rate > 1 and line_num % sample_rate != 0:
-                continue
-
-            try:
-                event = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-
-            event_type = event.get("event", "unknown")
-            timestamp = event.get("ts", "")
-            seq = event.get("seq", 0)
-            data = event.get("data")
-
-            # Extract game_id
-            game_id = extract_game_id(data)
-
-            # Format for embedding
-            text = format_event_for_embedding(event)
-
-            yield EventChunk(
-                text=text,
-                source=source,
-                event_type=event_type,
-                game_id=game_id,
-                timestamp=timestamp,
-                seq=seq,
-                doc_type="raw_event",
-            )
+    for line_num, (_, line) in enumerate(iter_lines(file_path), 1):
+        if not line.strip():
+            continue
+
+        # Apply sample rate
+        if sample_rate > 1 and line_num % sample_rate != 0:
+            continue
+
+        try:
+            event = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
+
+        yield _event_to_chunk(event, source)
+
+
+def _event_to_chunk(event: dict, source: str) -> EventChunk:
+    """Build an EventChunk from a parsed capture line."""
+    return EventChunk(
+        text=format_event_for_embedding(event),
+        source=source,
+        event_type=event.get("event", "unknown"),
+        game_id=extract_game_id(event.get("data")),
+        timestamp=event.get("ts", ""),
+        seq=event.get("seq", 0),
+        doc_type="raw_event",
+    )
 
 
 def chunk_raw_capture_by_type(
     file_path: Path,
     event_types: list[str] | None = None,
+    game_id: str | None = None,
+    use_index: bool = False,
 ) -> Iterator[EventChunk]:
     """Chunk raw capture, filtering by event type.
 
     Args:
         file_path: Path to JSONL file
         event_types: List of event types to include (None = all)
+        game_id: Only include events carrying this gameId
+        use_index: Seek via the sidecar CaptureIndex instead of scanning
+                   (built on first use, reused while the file is unchanged)
 
     Yields:
         EventChunk for matching events
     """
-    for chunk in chunk_raw_capture(file_path):
-        if event_types is None or chunk.event_type in event_types:
-            yield chunk
+    if use_index:
+        from ingestion.capture_index import CaptureIndex
+
+        source = str(file_path)
+        with CaptureIndex.open(file_path) as index:
+            for event in index.iter_events(event_types=event_types, game_id=game_id):
+                yield _event_to_chunk(event, source)
+        return
+
+    source = str(file_path)
+    for _, event in iter_records(file_path, event_types=event_types):
+        chunk = _event_to_chunk(event, source)
+        if game_id is not None and chunk.game_id != game_id:
+            continue
+        yield chunk
 
 
-def get_capture_summary(file_path: Path) -> dict:
+def get_capture_summary(file_path: Path, use_index: bool = False) -> dict:
     """Get summary statistics for a raw capture file.
 
+    Args:
+        file_path: Path to JSONL file
+        use_index: Answer from the sidecar CaptureIndex instead of scanning
+
     Returns:
         Dict with event counts, games, time range, etc.
     """
     from collections import Counter
 
+    if use_index:
+        return _indexed_capture_summary(file_path)
+
     event_counts = Counter()
     games = set()
     timestamps = []
 
-    with open(file_path) as f:
-        for line in f:
-            if not line.strip():
-                continue
-            try:
-                event = json.loads(line)
-                event_counts[event.get("event", "unknown")] += 1
-                timestamps.append(event.get("ts", ""))
-
-                game_id = extract_game_id(event.get("data"))
-                if game_id:
-                    games.add(game_id)
-            except json.JSONDecodeError:
-                continue
+    for _, line in iter_lines(file_path):
+        if not line.strip():
+            continue
+        try:
+            event = json.loads(line)
+            event_counts[event.get("event", "unknown")] += 1
+            timestamps.append(event.get("ts", ""))
+
+            game_id = extract_game_id(event.get("data"))
+            if game_id:
+                games.add(game_id)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
 
     return {
         "total_events": sum(event_counts.values()),
@@ -303,6 +322,25 @@ def get_capture_summary(file_path: Path) -> dict:
     }
 
 
+def _indexed_capture_summary(file_path: Path) -> dict:
+    """get_capture_summary() answered from the sidecar index."""
+    from ingestion.capture_index import CaptureIndex
+
+    with CaptureIndex.open(file_path) as index:
+        event_counts = index.event_counts()
+        games = index.game_ids()
+        first_line, last_line = index.edge_lines()
+
+    return {
+        "total_events": sum(event_counts.values()),
+        "event_types": event_counts,
+        "unique_games": len(games),
+        "games": games,
+        "first_timestamp": json.loads(first_line).get("ts", "") if first_line else None,
+        "last_timestamp": json.loads(last_line).get("ts", "") if last_line else None,
+    }
+
+
 # =============================================================================
 # Schema Chunking (for discovered schemas and field indexes)
 # =============================================================================
@@ -376,7 +414,7 @@ def _chunk_schema_properties(
     """
     for name, prop in properties.items():
         path = f"{prefix}.{name}" if prefix else name
-        prop_type = prop.get("type", "unknown")
+        prop_type = " | ".join(schema_types(prop)) or "unknown"
 
         # Build field description
         lines = [
@@ -401,17 +439,19 @@ def _chunk_schema_properties(
         )
 
         # Recurse into nested objects
-        if prop_type == "object" and "properties" in prop:
+        objects = schema_branch(prop, "object")
+        if objects is not None and "properties" in objects:
             yield from _chunk_schema_properties(
-                prop["properties"],
+                objects["properties"],
                 event_name,
                 path,
             )
 
         # Recurse into array items
-        if prop_type == "array" and "items" in prop:
-            items = prop["items"]
-            if items.get("type") == "object" and "properties" in items:
+        arrays = schema_branch(prop, "array")
+        if arrays is not None and "items" in arrays:
+            items = schema_branch(arrays["items"], "object")
+            if items is not None and "properties" in items:
                 yield from _chunk_schema_properties(
                     items["properties"],
                     event_name,
@@ -439,7 +479,7 @@ def chunk_field_index(index: dict) -> Iterator[SchemaChunk]:
 
         lines = [
             f"Field Path: {path}",
-            f"Type: {info.get('type', 'unknown')}",
+            f"Type: {_index_type(info)}",
             f"Events: {', '.join(events)}",
             f"Frequency: {info.get('frequency', 0):,} occurrences",
         ]
@@ -457,6 +497,14 @@ def chunk_field_index(index: dict) -> Iterator[SchemaChunk]:
         )
 
 
+def _index_type(info: dict) -> str:
+    """Field index type, with the histogram when several types were seen."""
+    types = info.get("types")
+    if not types:
+        return info.get("type", "unknown")
+    return " | ".join(f"{t} ({count:,})" for t, count in types.items())
+
+
 def chunk_discovery_result(result) -> Iterator[SchemaChunk]:
     """Chunk all events from a discovery result.
 
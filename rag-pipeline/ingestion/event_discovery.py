@@ -14,24 +14,184 @@ Example:
 from __future__ import annotations
 
 import json
+import random
+import sys
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Iterator
 
+from ingestion.field_stats import FieldStats
+from ingestion.jsonl_reader import is_compressed, iter_lines, recording_files, shard_boundaries
 
-@dataclass
+# Primitive JSON types whose values are kept as samples
+_PRIMITIVE_TYPES = frozenset(("string", "number", "boolean", "null"))
+
+# Exact-type fast path for get_type(); subclasses fall back to isinstance
+_TYPE_NAMES: dict[type, str] = {
+    type(None): "null",
+    bool: "boolean",
+    int: "number",
+    float: "number",
+    str: "string",
+    list: "array",
+    dict: "object",
+}
+
+# Interned child paths keyed by parent prefix, so every record that visits
+# "data.leaderboard[].pnl" reuses one string instead of formatting a new one.
+_PATH_CACHE: dict[str, dict[str, str]] = {}
+_PATH_CACHE_LIMIT = 100_000
+
+# Element selection strategies for ArraySampling ("all" visits every element)
+ARRAY_SAMPLING_STRATEGIES = ("all", "first", "last", "stride", "reservoir")
+
+
+class ArraySampling:
+    """Per-array element sampling for field discovery.
+
+    By default discovery recurses into every element of an array of
+    objects, so a 100-entry leaderboard costs 100 recursions per event.
+    With a sampling strategy, each array of more than ``size`` objects
+    is grouped by element shape (keys and value types, recursively
+    through nested objects and the distinct shapes of nested array
+    elements) and discovery visits:
+
+    - the first element of every distinct shape, so the union of keys
+      across all elements is still discovered (100% path coverage)
+    - up to ``size`` further elements chosen by the strategy, which feed
+      sample values and statistics
+
+    Visited elements are weighted by the number of same-shaped elements
+    they stand for, so counts and null rates of element fields match a
+    full scan; numeric sketches and samples come from the visited
+    elements only.
+
+    Attributes:
+        strategy: One of ARRAY_SAMPLING_STRATEGIES
+        size: Elements chosen by the strategy per array
+    """
+
+    __slots__ = ("strategy", "size", "_rng")
+
+    def __init__(self, strategy: str = "all", size: int = 3, seed: int | None = None):
+        if strategy not in ARRAY_SAMPLING_STRATEGIES:
+            raise ValueError(
+                f"Unknown array sampling strategy {strategy!r}; "
+                f"expected one of {', '.join(ARRAY_SAMPLING_STRATEGIES)}"
+            )
+        if size < 1:
+            raise ValueError(f"Array sample size must be positive, got {size}")
+        self.strategy = strategy
+        self.size = size
+        self._rng = random.Random(seed)
+
+    def __repr__(self) -> str:
+        return f"ArraySampling({self.strategy!r}, size={self.size})"
+
+    @property
+    def enabled(self) -> bool:
+        """Whether arrays are sampled rather than fully visited."""
+        return self.strategy != "all"
+
+    def indices(self, length: int) -> range | list[int]:
+        """Indices the strategy picks from an array of ``length`` elements."""
+        size = self.size
+        if length <= size or self.strategy == "all":
+            return range(length)
+        if self.strategy == "first":
+            return range(size)
+        if self.strategy == "last":
+            return range(length - size, length)
+        if self.strategy == "stride":
+            return [i * length // size for i in range(size)]
+        return sorted(self._rng.sample(range(length), size))
+
+    def select(self, items: list) -> list[tuple[dict, int]]:
+        """Pick the object elements of an array to visit, with weights.
+
+        Args:
+            items: Array value (non-object elements are ignored)
+
+        Returns:
+            (element, weight) pairs in array order; weights of the
+            elements picked for one shape sum to that shape's count
+        """
+        if len(items) <= self.size:
+            return [(item, 1) for item in items if isinstance(item, dict)]
+
+        shapes: list[tuple | None] = []
+        groups: dict[tuple, list[int]] = {}  # shape -> [elements, first index]
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                shapes.append(None)
+                continue
+            shape = _element_shape(item)
+            shapes.append(shape)
+            group = groups.get(shape)
+            if group is None:
+                groups[shape] = [1, index]
+            else:
+                group[0] += 1
+
+        picked = {first for _, first in groups.values()}
+        picked.update(i for i in self.indices(len(items)) if shapes[i] is not None)
+
+        picked_per_shape: dict[tuple, int] = {}
+        for index in picked:
+            shape = shapes[index]
+            picked_per_shape[shape] = picked_per_shape.get(shape, 0) + 1
+
+        selected = []
+        for index in sorted(picked):
+            shape = shapes[index]
+            elements, first = groups[shape]
+            share, remainder = divmod(elements, picked_per_shape[shape])
+            selected.append((items[index], share + remainder if index == first else share))
+        return selected
+
+
+def _element_shape(item: dict) -> tuple:
+    """Shape key of an array element for key-union detection.
+
+    Elements with the same shape produce the same field paths at every
+    depth, so visiting one of them per shape covers every path.
+    """
+    return tuple((key, _value_shape(value)) for key, value in item.items())
+
+
+def _value_shape(value: Any) -> Any:
+    kind = type(value)
+    if kind is dict:
+        return _element_shape(value)
+    if kind is list:
+        return ("[]", frozenset(_value_shape(element) for element in value))
+    return kind
+
+
+@dataclass(slots=True)
 class FieldInfo:
     """Information about a discovered field path.
 
-    Tracks the JSON path, inferred type, occurrence count, and
-    sample values for documentation.
+    Tracks the JSON path, observed types, occurrence count, sample
+    values for documentation, and streaming statistics over every
+    primitive value observed.
+
+    A path may hold different types in different records (a number that
+    is sometimes null, a value that is sometimes a scalar and sometimes
+    an object). ``types`` counts every type seen and ``type`` is the
+    most common non-null one. For array element paths ("x[]") the
+    histogram counts the types of the elements examined.
 
     Attributes:
         path: Full JSON path (e.g., "data.leaderboard[].pnl")
-        type: JSON type name (string, number, boolean, object, array, null)
+        type: Primary JSON type name (string, number, boolean, object,
+            array, null); "null" only if no other type was seen
         count: Number of times this field was observed
-        sample_values: Up to max_samples example values
+        sample_values: Up to max_samples distinct example values
         max_samples: Maximum sample values to keep (default 5)
+        stats: Mergeable sketches (reservoir, min/max/mean, quantiles,
+            distinct count, null rate)
+        types: JSON type name -> occurrences
     """
 
     path: str
@@ -39,6 +199,23 @@ class FieldInfo:
     count: int = 0
     sample_values: list = field(default_factory=list)
     max_samples: int = 5
+    stats: FieldStats = field(default_factory=FieldStats)
+    types: dict[str, int] = field(default_factory=dict)
+
+    def add_type(self, value_type: str, weight: int = 1) -> None:
+        """Count an observed type, keeping ``type`` on the primary one."""
+        types = self.types
+        types[value_type] = types.get(value_type, 0) + weight
+        if value_type != self.type:
+            self.type = primary_type(types)
+
+    def type_counts(self) -> dict[str, int]:
+        """Type histogram ({type: count} if none was recorded)."""
+        return self.types or {self.type: self.count}
+
+    def type_label(self) -> str:
+        """Display type: "number", or "number / null" for a union."""
+        return " / ".join(ordered_types(self.type_counts()))
 
     def add_sample(self, value: Any) -> None:
         """Add a sample value if we haven't reached max.
@@ -57,8 +234,31 @@ class FieldInfo:
         if display_value not in self.sample_values:
             self.sample_values.append(display_value)
 
+    def merge(self, other: FieldInfo) -> None:
+        """Fold another FieldInfo for the same path into this one.
 
-@dataclass
+        Args:
+            other: FieldInfo observed elsewhere (another file or shard)
+        """
+        types = dict(self.type_counts())
+        for value_type, count in other.type_counts().items():
+            types[value_type] = types.get(value_type, 0) + count
+        self.types = {value_type: count for value_type, count in types.items() if count}
+        if self.types:
+            self.type = primary_type(self.types)
+        self.count += other.count
+        self.stats.merge(other.stats)
+        for sample in other.sample_values:
+            if len(self.sample_values) >= self.max_samples:
+                break
+            self.add_sample(sample)
+
+    def stats_summary(self) -> dict[str, Any]:
+        """Summarize field statistics for reports and the field index."""
+        return self.stats.summary(total=self.count)
+
+
+@dataclass(slots=True)
 class EventInfo:
     """Information about a discovered event type.
 
@@ -75,6 +275,21 @@ class EventInfo:
     count: int = 0
     fields: dict[str, FieldInfo] = field(default_factory=dict)
 
+    def merge(self, other: EventInfo) -> None:
+        """Fold another EventInfo for the same event type into this one.
+
+        Args:
+            other: EventInfo observed elsewhere (another file or shard)
+        """
+        self.count += other.count
+        fields = self.fields
+        for path, info in other.fields.items():
+            existing = fields.get(path)
+            if existing is None:
+                fields[path] = info
+            else:
+                existing.merge(info)
+
 
 @dataclass
 class DiscoveryResult:
@@ -95,6 +310,26 @@ class DiscoveryResult:
     files_scanned: int = 0
     errors: list[str] = field(default_factory=list)
 
+    def merge(self, other: DiscoveryResult) -> None:
+        """Fold another DiscoveryResult into this one.
+
+        The other result's EventInfo/FieldInfo objects may be adopted
+        rather than copied, so it should not be reused afterwards.
+
+        Args:
+            other: Result from another file or shard
+        """
+        self.files_scanned += other.files_scanned
+        self.total_lines += other.total_lines
+        self.errors.extend(other.errors)
+
+        for event_name, event_info in other.events.items():
+            existing = self.events.get(event_name)
+            if existing is None:
+                self.events[event_name] = event_info
+            else:
+                existing.merge(event_info)
+
 
 def get_type(value: Any) -> str:
     """Get JSON type name for a Python value.
@@ -105,6 +340,9 @@ def get_type(value: Any) -> str:
     Returns:
         JSON type name: string, number, boolean, object, array, null
     """
+    name = _TYPE_NAMES.get(type(value))
+    if name is not None:
+        return name
     if value is None:
         return "null"
     if isinstance(value, bool):
@@ -120,11 +358,29 @@ def get_type(value: Any) -> str:
     return "unknown"
 
 
+def primary_type(types: dict[str, int]) -> str:
+    """Most common non-null type of a histogram ("null" if only nulls).
+
+    Ties go to the type seen first.
+    """
+    best, best_count = "null", 0
+    for value_type, count in types.items():
+        if count > best_count and value_type != "null":
+            best, best_count = value_type, count
+    return best
+
+
+def ordered_types(types: dict[str, int]) -> list[str]:
+    """Type names by descending count, "null" last."""
+    return sorted(types, key=lambda value_type: (value_type == "null", -types[value_type]))
+
+
 def discover_fields(
     obj: dict,
     prefix: str = "",
     max_depth: int = 10,
     _current_depth: int = 0,
+    array_sampling: ArraySampling | None = None,
 ) -> dict[str, FieldInfo]:
     """Extract all field paths from a JSON object.
 
@@ -138,72 +394,163 @@ def discover_fields(
         prefix: Current path prefix for recursion
         max_depth: Maximum recursion depth (prevents infinite loops)
         _current_depth: Internal depth counter
+        array_sampling: Per-array element sampling (default: visit all)
 
     Returns:
         Dictionary mapping field paths to FieldInfo objects
     """
+    fields: dict[str, FieldInfo] = {}
+    accumulate_fields(obj, fields, prefix, max_depth, _current_depth, array_sampling)
+    return fields
+
+
+def accumulate_fields(
+    obj: dict,
+    fields: dict[str, FieldInfo],
+    prefix: str = "",
+    max_depth: int = 10,
+    _current_depth: int = 0,
+    array_sampling: ArraySampling | None = None,
+    _weight: int = 1,
+) -> None:
+    """Fold all field paths of a JSON object into an existing field map.
+
+    Same traversal as discover_fields(), but updates ``fields`` in place
+    so a scan keeps one accumulator per event type instead of building
+    and merging a fresh dict of FieldInfo objects for every record.
+
+    Args:
+        obj: Dictionary to analyze
+        fields: Field map to update (e.g. EventInfo.fields)
+        prefix: Current path prefix for recursion
+        max_depth: Maximum recursion depth (prevents infinite loops)
+        _current_depth: Internal depth counter
+        array_sampling: Per-array element sampling (default: visit all)
+        _weight: Occurrences this object stands for (sampled elements)
+    """
     if _current_depth >= max_depth:
-        return {}
+        return
+    if array_sampling is not None and not array_sampling.enabled:
+        array_sampling = None
 
-    fields: dict[str, FieldInfo] = {}
+    children = _child_paths(prefix)
 
     for key, value in obj.items():
         # Build the path
-        path = f"{prefix}.{key}" if prefix else key
-        value_type = get_type(value)
+        path = children.get(key)
+        if path is None:
+            path = _join_path(children, prefix, key)
 
-        # Create or update field info
-        if path not in fields:
-            fields[path] = FieldInfo(path=path, type=value_type)
-        fields[path].count += 1
+        value_type = _TYPE_NAMES.get(type(value)) or get_type(value)
 
-        # Add sample value for primitives
-        if value_type in ("string", "number", "boolean", "null"):
-            fields[path].add_sample(value)
+        # Create or update field info
+        info = fields.get(path)
+        if info is None:
+            info = fields[path] = FieldInfo(path=path, type=value_type)
+        info.count += _weight
+        # Inlined FieldInfo.add_type()
+        types = info.types
+        types[value_type] = types.get(value_type, 0) + _weight
+        if value_type != info.type:
+            info.type = primary_type(types)
+
+        # Add sample value and statistics for primitives
+        if value_type in _PRIMITIVE_TYPES:
+            # A repeat of the previous value cannot be a new sample
+            if (
+                info.stats.add(value, _weight)
+                and len(info.sample_values) < info.max_samples
+            ):
+                info.add_sample(value)
 
         # Recurse into nested structures
-        if isinstance(value, dict):
+        elif value_type == "object":
             # For objects with many dynamic keys (like partialPrices.values),
             # don't recurse into each key - treat as object type
             if _is_dynamic_keys_object(value):
-                fields[path].add_sample(f"<object with {len(value)} keys>")
+                if len(info.sample_values) < info.max_samples:
+                    info.add_sample(f"<object with {len(value)} keys>")
             else:
-                nested = discover_fields(
-                    value, path, max_depth, _current_depth + 1
+                accumulate_fields(
+                    value, fields, path, max_depth, _current_depth + 1,
+                    array_sampling, _weight,
                 )
-                fields.update(nested)
 
-        elif isinstance(value, list) and value:
+        elif value_type == "array" and value:
             # Mark the array itself
-            array_path = f"{path}[]"
+            array_path = children.get(key + "[]")
+            if array_path is None:
+                array_path = _join_path(children, prefix, key + "[]")
             first_elem = value[0]
             elem_type = get_type(first_elem)
 
-            if array_path not in fields:
-                fields[array_path] = FieldInfo(path=array_path, type=elem_type)
-            fields[array_path].count += 1
-
-            # If array contains primitives, sample them
-            if elem_type in ("string", "number", "boolean"):
-                for item in value[:3]:  # Sample first 3
-                    fields[array_path].add_sample(item)
+            array_info = fields.get(array_path)
+            if array_info is None:
+                array_info = fields[array_path] = FieldInfo(
+                    path=array_path, type=elem_type
+                )
+            array_info.count += _weight
 
             # If array contains objects, discover their fields
-            elif elem_type == "object":
-                for item in value:
-                    if isinstance(item, dict):
-                        nested = discover_fields(
-                            item, array_path, max_depth, _current_depth + 1
+            if elem_type == "object":
+                objects = 0
+                if array_sampling is None:
+                    for item in value:
+                        if isinstance(item, dict):
+                            objects += 1
+                            accumulate_fields(
+                                item, fields, array_path, max_depth,
+                                _current_depth + 1, None, _weight,
+                            )
+                        else:
+                            array_info.add_type(get_type(item), _weight)
+                else:
+                    for item, weight in array_sampling.select(value):
+                        objects += weight
+                        accumulate_fields(
+                            item, fields, array_path, max_depth,
+                            _current_depth + 1, array_sampling, weight * _weight,
                         )
-                        for nested_path, nested_info in nested.items():
-                            if nested_path not in fields:
-                                fields[nested_path] = nested_info
-                            else:
-                                fields[nested_path].count += nested_info.count
-                                for sample in nested_info.sample_values:
-                                    fields[nested_path].add_sample(sample)
-
-    return fields
+                    if objects < len(value):
+                        for item in value:
+                            if not isinstance(item, dict):
+                                array_info.add_type(get_type(item), _weight)
+                if objects:
+                    array_info.add_type("object", objects * _weight)
+
+            # Otherwise sample the first elements (primitives, nested arrays)
+            else:
+                array_stats = array_info.stats
+                if array_sampling is None:
+                    items = value[:3]  # Sample first 3
+                else:
+                    items = [value[i] for i in array_sampling.indices(len(value))]
+                for item in items:
+                    item_type = get_type(item)
+                    array_info.add_type(item_type, _weight)
+                    if (
+                        item_type in _PRIMITIVE_TYPES
+                        and array_stats.add(item, _weight)
+                        and len(array_info.sample_values) < array_info.max_samples
+                    ):
+                        array_info.add_sample(item)
+
+
+def _child_paths(prefix: str) -> dict[str, str]:
+    """Return the interned child-path table for a prefix."""
+    children = _PATH_CACHE.get(prefix)
+    if children is None:
+        if len(_PATH_CACHE) >= _PATH_CACHE_LIMIT:
+            _PATH_CACHE.clear()
+        children = _PATH_CACHE[prefix] = {}
+    return children
+
+
+def _join_path(children: dict[str, str], prefix: str, key: str) -> str:
+    """Build, intern and cache the path for ``key`` under ``prefix``."""
+    path = sys.intern(f"{prefix}.{key}" if prefix else key)
+    children[key] = path
+    return path
 
 
 def _is_dynamic_keys_object(obj: dict) -> bool:
@@ -227,7 +574,11 @@ def _is_dynamic_keys_object(obj: dict) -> bool:
     return False
 
 
-def scan_jsonl_file(file_path: Path) -> DiscoveryResult:
+def scan_jsonl_file(
+    file_path: Path,
+    workers: int = 1,
+    array_sampling: ArraySampling | None = None,
+) -> DiscoveryResult:
     """Scan a JSONL file for events and fields.
 
     Processes each line, extracts the event type, and discovers
@@ -235,48 +586,81 @@ def scan_jsonl_file(file_path: Path) -> DiscoveryResult:
 
     Args:
         file_path: Path to JSONL file
+        workers: Number of processes; above 1 the file is split into
+                 newline-aligned byte shards whose results are merged
+                 (compressed segments are always scanned in one pass)
+        array_sampling: Per-array element sampling (default: visit all)
 
     Returns:
         DiscoveryResult with all discovered events/fields
     """
+    if workers > 1 and not is_compressed(file_path):
+        from concurrent.futures import ProcessPoolExecutor
+
+        shards = shard_boundaries(file_path, workers)
+        result = DiscoveryResult()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(scan_jsonl_range, file_path, start, end, array_sampling)
+                for start, end in shards
+            ]
+            for future in futures:
+                result.merge(future.result())
+        result.files_scanned = 1
+        return result
+
+    return scan_jsonl_range(file_path, array_sampling=array_sampling)
+
+
+def scan_jsonl_range(
+    file_path: Path,
+    start: int = 0,
+    end: int | None = None,
+    array_sampling: ArraySampling | None = None,
+) -> DiscoveryResult:
+    """Scan the lines of a JSONL file within a byte range.
+
+    Args:
+        file_path: Path to JSONL file
+        start: Byte offset of the first line (must be a line start)
+        end: Byte offset to stop at (default: end of file)
+        array_sampling: Per-array element sampling (default: visit all)
+
+    Returns:
+        DiscoveryResult for the lines in the range
+    """
     result = DiscoveryResult()
     result.files_scanned = 1
+    events = result.events
+    if array_sampling is not None and not array_sampling.enabled:
+        array_sampling = None
 
-    with open(file_path, "r", encoding="utf-8") as f:
-        for line_num, line in enumerate(f, 1):
-            line = line.strip()
-            if not line:
-                continue
+    for line_num, (offset, line) in enumerate(iter_lines(file_path, start, end), 1):
+        line = line.strip()
+        if not line:
+            continue
 
-            result.total_lines += 1
+        result.total_lines += 1
 
-            try:
-                record = json.loads(line)
-            except json.JSONDecodeError as e:
-                result.errors.append(f"{file_path}:{line_num}: {e}")
-                continue
+        try:
+            record = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            where = line_num if start == 0 else f"byte {offset}"
+            result.errors.append(f"{file_path}:{where}: {e}")
+            continue
 
-            # Extract event name
-            event_name = record.get("event", "unknown")
+        # Extract event name
+        event_name = record.get("event", "unknown")
 
-            # Initialize event info if new
-            if event_name not in result.events:
-                result.events[event_name] = EventInfo(name=event_name)
+        # Initialize event info if new
+        event_info = events.get(event_name)
+        if event_info is None:
+            event_info = events[event_name] = EventInfo(name=event_name)
 
-            result.events[event_name].count += 1
+        event_info.count += 1
 
-            # Discover all fields in this record
-            fields = discover_fields(record)
-
-            for path, info in fields.items():
-                event_fields = result.events[event_name].fields
-                if path not in event_fields:
-                    event_fields[path] = info
-                else:
-                    existing = event_fields[path]
-                    existing.count += info.count
-                    for sample in info.sample_values:
-                        existing.add_sample(sample)
+        # Fold all fields of this record into the event accumulator
+        accumulate_fields(record, event_info.fields, array_sampling=array_sampling)
 
     return result
 
@@ -284,44 +668,26 @@ def scan_jsonl_file(file_path: Path) -> DiscoveryResult:
 def scan_recordings(
     directory: Path,
     pattern: str = "*.jsonl",
+    array_sampling: ArraySampling | None = None,
 ) -> DiscoveryResult:
     """Scan all JSONL files in a directory.
 
-    Aggregates discoveries across multiple recording files.
+    Aggregates discoveries across multiple recording files, including
+    compressed recording segments (``*.jsonl.gz`` / ``*.jsonl.zst``).
 
     Args:
         directory: Directory containing JSONL recordings
-        pattern: Glob pattern for files (default: *.jsonl)
+        pattern: Glob pattern for files (default: *.jsonl); compressed
+            segments matching it plus .gz/.zst are included
+        array_sampling: Per-array element sampling (default: visit all)
 
     Returns:
         Aggregated DiscoveryResult from all files
     """
     combined = DiscoveryResult()
 
-    for file_path in sorted(directory.glob(pattern)):
-        file_result = scan_jsonl_file(file_path)
-
-        combined.files_scanned += 1
-        combined.total_lines += file_result.total_lines
-        combined.errors.extend(file_result.errors)
-
-        # Merge events
-        for event_name, event_info in file_result.events.items():
-            if event_name not in combined.events:
-                combined.events[event_name] = EventInfo(name=event_name)
-
-            combined.events[event_name].count += event_info.count
-
-            # Merge fields
-            for path, field_info in event_info.fields.items():
-                combined_fields = combined.events[event_name].fields
-                if path not in combined_fields:
-                    combined_fields[path] = field_info
-                else:
-                    existing = combined_fields[path]
-                    existing.count += field_info.count
-                    for sample in field_info.sample_values:
-                        existing.add_sample(sample)
+    for file_path in recording_files(directory, pattern):
+        combined.merge(scan_jsonl_file(file_path, array_sampling=array_sampling))
 
     return combined
 
@@ -360,13 +726,26 @@ if __name__ == "__main__":
         default="*.jsonl",
         help="Glob pattern for files (default: *.jsonl)",
     )
+    parser.add_argument(
+        "--array-sampling",
+        choices=ARRAY_SAMPLING_STRATEGIES,
+        default="all",
+        help="Element sampling for arrays of objects (default: all)",
+    )
+    parser.add_argument(
+        "--array-sample-size",
+        type=int,
+        default=3,
+        help="Elements sampled per array besides one per shape (default: 3)",
+    )
 
     args = parser.parse_args()
+    sampling = ArraySampling(args.array_sampling, args.array_sample_size)
 
     if args.path.is_file():
-        result = scan_jsonl_file(args.path)
+        result = scan_jsonl_file(args.path, array_sampling=sampling)
     elif args.path.is_dir():
-        result = scan_recordings(args.path, args.pattern)
+        result = scan_recordings(args.path, args.pattern, sampling)
     else:
         print(f"Error: {args.path} not found")
         sys.exit(1)
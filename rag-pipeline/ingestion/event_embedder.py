@@ -0,0 +1,158 @@
+"""Embed WebSocket event and schema chunks into their own collection.
+
+SchemaChunk and EventChunk streams from event_chunker are embedded in
+batches and upserted into RUGS_EVENTS_COLLECTION, separate from the
+main knowledge collection. Chunk IDs hash the chunk kind plus its
+whitespace-normalized text, so:
+
+- identical chunks within a run (the same raw event text seen twice)
+  are embedded once
+- chunks already stored by a previous run are skipped without
+  re-embedding
+
+Example:
+    >>> from ingestion.event_chunker import chunk_discovery_result
+    >>> embedded = embed_chunks(chunk_discovery_result(discovery))
+"""
+from __future__ import annotations
+
+import hashlib
+import sys
+import time
+from pathlib import Path
+from typing import Any, Iterable
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import RUGS_EVENTS_COLLECTION
+from ingestion.event_chunker import EventChunk, SchemaChunk
+
+# Chunks embedded and upserted per round trip
+DEFAULT_BATCH_SIZE = 256
+
+
+def chunk_id(chunk: SchemaChunk | EventChunk) -> str:
+    """Content-derived ID for a chunk.
+
+    The source path is deliberately excluded: the same schema text
+    generated from a different recordings directory is the same document.
+
+    Args:
+        chunk: Schema or event chunk
+
+    Returns:
+        32-character hex ID
+    """
+    text = " ".join(chunk.text.split())
+    key = "\x1f".join((
+        chunk.doc_type,
+        chunk.event_type,
+        getattr(chunk, "field_path", None) or "",
+        text,
+    ))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
+
+def chunk_metadata(chunk: SchemaChunk | EventChunk) -> dict[str, Any]:
+    """Build Chroma metadata for a chunk.
+
+    Chroma rejects None values, so missing fields are stored as "".
+
+    Args:
+        chunk: Schema or event chunk
+
+    Returns:
+        Dict with source, event_type, doc_type, field_path and game_id
+        (plus timestamp and seq for raw events)
+    """
+    metadata: dict[str, Any] = {
+        "source": chunk.source,
+        "event_type": chunk.event_type,
+        "doc_type": chunk.doc_type,
+        "field_path": getattr(chunk, "field_path", None) or "",
+        "game_id": getattr(chunk, "game_id", None) or "",
+    }
+    if isinstance(chunk, EventChunk):
+        metadata["timestamp"] = chunk.timestamp or ""
+        metadata["seq"] = chunk.seq or 0
+    return metadata
+
+
+def embed_chunks(
+    chunks: Iterable[SchemaChunk | EventChunk],
+    collection_name: str = RUGS_EVENTS_COLLECTION,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    verbose: bool = False,
+    timings: dict[str, float] | None = None,
+) -> int:
+    """Embed and upsert a stream of chunks.
+
+    Chunks are consumed lazily, so raw-capture streams never have to be
+    materialized in memory.
+
+    Args:
+        chunks: Schema and/or event chunks
+        collection_name: Target Chroma collection
+        batch_size: Chunks per embedding batch and upsert
+        verbose: Print a line per batch
+        timings: Optional dict that receives "chunks" (distinct chunks
+            seen) and the seconds spent in "encode_s" (embedding model)
+            and "store_s" (existing-ID checks and upserts)
+
+    Returns:
+        Number of chunks newly embedded
+    """
+    from embeddings.embedder import embed_batch
+    from storage.store import existing_ids, upsert_documents
+
+    seen: set[str] = set()
+    embedded = 0
+    skipped = 0
+    encode_s = store_s = 0.0
+    batch: dict[str, SchemaChunk | EventChunk] = {}
+
+    def flush() -> None:
+        nonlocal embedded, skipped, encode_s, store_s
+        if not batch:
+            return
+        started = time.perf_counter()
+        stored = existing_ids(list(batch), collection_name)
+        new = [(cid, c) for cid, c in batch.items() if cid not in stored]
+        skipped += len(batch) - len(new)
+        batch.clear()
+        store_s += time.perf_counter() - started
+        if not new:
+            return
+
+        texts = [c.text for _, c in new]
+        started = time.perf_counter()
+        embeddings = embed_batch(texts)
+        encoded = time.perf_counter()
+        encode_s += encoded - started
+        embedded += upsert_documents(
+            ids=[cid for cid, _ in new],
+            documents=texts,
+            embeddings=embeddings,
+            metadatas=[chunk_metadata(c) for _, c in new],
+            collection_name=collection_name,
+        )
+        store_s += time.perf_counter() - encoded
+        if verbose:
+            print(f"  Embedded {embedded:,} chunks ({skipped:,} already stored)")
+
+    for chunk in chunks:
+        cid = chunk_id(chunk)
+        if cid in seen:
+            continue
+        seen.add(cid)
+        batch[cid] = chunk
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+
+    if timings is not None:
+        timings["chunks"] = len(seen)
+        timings["encode_s"] = round(encode_s, 4)
+        timings["store_s"] = round(store_s, 4)
+    return embedded
@@ -0,0 +1,370 @@
+"""Reduce raw capture events to a small set of summary chunks.
+
+chunk_raw_capture() yields one chunk per event, and most of a capture
+is gameStateUpdate ticks whose texts differ only in a few numbers.
+Embedding those buries game-level facts under near-identical vectors.
+EventReducer streams events and emits instead:
+
+- one ``game_summary`` chunk per game, folding every gameStateUpdate and
+  standard/newTrade of that game into its price path, peak, rug tick,
+  phase durations, trade counts and leaderboard changes
+- one ``raw_event`` chunk per run of consecutive near-duplicate events of
+  any other type (texts equal after masking numbers), annotated with the
+  run length
+- nothing for events whose normalized text was already emitted (exact
+  dedupe by text hash)
+
+Example:
+    >>> for chunk in reduce_capture(Path("capture.jsonl")):
+    ...     print(chunk.doc_type, chunk.game_id)
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from ingestion.event_chunker import EventChunk, extract_game_id, format_event_for_embedding
+from ingestion.jsonl_reader import iter_records
+
+# Events folded into per-game summaries instead of emitted individually
+GAME_EVENTS = frozenset({"gameStateUpdate", "standard/newTrade"})
+
+# Points kept when downsampling a game's price path for its summary text
+PRICE_PATH_POINTS = 20
+
+# Leaderboard leader changes listed per game summary
+MAX_LEADER_CHANGES = 10
+
+# Games whose summaries stay open for late trades after a new game starts
+_OPEN_GAMES = 2
+
+# Lines of format_event_for_embedding() output that vary per event
+_VOLATILE_PREFIXES = ("Timestamp:", "Sequence:")
+
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?")
+
+
+def normalize_text(text: str) -> str:
+    """Drop per-event timestamp/sequence lines and collapse whitespace."""
+    return "\n".join(
+        " ".join(line.split())
+        for line in text.splitlines()
+        if line.strip() and not line.startswith(_VOLATILE_PREFIXES)
+    )
+
+
+def text_hash(text: str) -> bytes:
+    """Compact digest used for exact deduplication."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=12).digest()
+
+
+def game_phase(data: dict[str, Any]) -> str:
+    """Classify a gameStateUpdate payload into a game phase."""
+    if data.get("rugged"):
+        return "rugged"
+    if data.get("active"):
+        return "active"
+    if data.get("cooldownTimer"):
+        return "cooldown"
+    if data.get("allowPreRoundBuys"):
+        return "presale"
+    return "waiting"
+
+
+def _downsample(points: list[tuple[int, float]], limit: int) -> list[tuple[int, float]]:
+    """Evenly pick at most `limit` points, always keeping the last."""
+    if len(points) <= limit:
+        return points
+    step = (len(points) - 1) / (limit - 1)
+    return [points[round(i * step)] for i in range(limit)]
+
+
+@dataclass
+class GameSummary:
+    """Accumulated state of one game."""
+
+    game_id: str
+    source: str
+    first_ts: str = ""
+    last_ts: str = ""
+    first_seq: int = 0
+    updates: int = 0
+    prices: list[tuple[int, float]] = field(default_factory=list)
+    peak_price: float = 0.0
+    peak_tick: int = 0
+    rug_tick: int | None = None
+    phases: dict[str, int] = field(default_factory=dict)  # phase -> updates
+    last_phase: str = ""
+    phase_changes: int = 0
+    max_players: int = 0
+    buys: int = 0
+    sells: int = 0
+    volume: float = 0.0
+    traders: set[str] = field(default_factory=set)
+    leader_changes: list[tuple[int, str]] = field(default_factory=list)  # most recent
+    leader_change_count: int = 0
+
+    def _touch(self, event: dict[str, Any]) -> None:
+        ts = event.get("ts", "")
+        if not self.first_ts:
+            self.first_ts = ts
+            self.first_seq = event.get("seq", 0)
+        if ts:
+            self.last_ts = ts
+
+    def add_update(self, event: dict[str, Any], data: dict[str, Any]) -> None:
+        """Fold a gameStateUpdate into the summary."""
+        self._touch(event)
+        self.updates += 1
+
+        tick = data.get("tickCount") or 0
+        price = data.get("price")
+        if isinstance(price, (int, float)):
+            if self.prices and self.prices[-1][0] == tick:
+                self.prices[-1] = (tick, price)
+            else:
+                self.prices.append((tick, price))
+            if price > self.peak_price:
+                self.peak_price, self.peak_tick = price, tick
+
+        phase = game_phase(data)
+        self.phases[phase] = self.phases.get(phase, 0) + 1
+        if phase != self.last_phase:
+            if self.last_phase:
+                self.phase_changes += 1
+            self.last_phase = phase
+        if phase == "rugged" and self.rug_tick is None:
+            self.rug_tick = tick
+
+        players = data.get("connectedPlayers")
+        if isinstance(players, int) and players > self.max_players:
+            self.max_players = players
+
+        leaderboard = data.get("leaderboard")
+        if isinstance(leaderboard, list) and leaderboard and isinstance(leaderboard[0], dict):
+            leader = leaderboard[0].get("username") or leaderboard[0].get("id") or "unknown"
+            if not self.leader_changes or self.leader_changes[-1][1] != leader:
+                if self.leader_changes:
+                    self.leader_change_count += 1
+                self.leader_changes.append((tick, leader))
+                if len(self.leader_changes) > MAX_LEADER_CHANGES:
+                    del self.leader_changes[0]
+
+    def add_trade(self, event: dict[str, Any], data: dict[str, Any]) -> None:
+        """Fold a standard/newTrade into the summary."""
+        self._touch(event)
+        trade_type = data.get("type")
+        if trade_type == "buy":
+            self.buys += 1
+        elif trade_type == "sell":
+            self.sells += 1
+        amount = data.get("amount")
+        if isinstance(amount, (int, float)):
+            self.volume += amount
+        trader = data.get("username") or data.get("playerId")
+        if trader:
+            self.traders.add(trader)
+
+    def to_text(self) -> str:
+        """Format the summary for embedding."""
+        lines = [
+            "Event Type: game_summary",
+            f"Game ID: {self.game_id}",
+            f"Time Range: {self.first_ts} to {self.last_ts}",
+            f"State Updates: {self.updates}",
+        ]
+        if self.prices:
+            first_tick, first_price = self.prices[0]
+            last_tick, last_price = self.prices[-1]
+            lines.append(f"Ticks: {first_tick} to {last_tick}")
+            lines.append(f"Start Price: {first_price}")
+            lines.append(f"Final Price: {last_price}")
+            lines.append(f"Peak Price: {self.peak_price} at tick {self.peak_tick}")
+            path = ", ".join(
+                f"{tick}: {price:g}"
+                for tick, price in _downsample(self.prices, PRICE_PATH_POINTS)
+            )
+            lines.append(f"Price Path (tick: price): {path}")
+        lines.append(
+            f"Rug Tick: {self.rug_tick}" if self.rug_tick is not None
+            else "Rug Tick: not observed"
+        )
+        if self.phases:
+            lines.append("Phases: " + ", ".join(
+                f"{phase} ({count} updates)" for phase, count in self.phases.items()
+            ))
+            lines.append(f"Phase Changes: {self.phase_changes}")
+        if self.max_players:
+            lines.append(f"Peak Connected Players: {self.max_players}")
+        lines.append(
+            f"Trades: {self.buys + self.sells} ({self.buys} buys, {self.sells} sells), "
+            f"volume {self.volume:g} SOL, {len(self.traders)} traders"
+        )
+        if self.leader_changes:
+            lines.append(f"Leaderboard Leader Changes: {self.leader_change_count}")
+            lines.append("Leaders (tick: player): " + ", ".join(
+                f"{tick}: {leader}" for tick, leader in self.leader_changes
+            ))
+        return "\n".join(lines)
+
+    def to_chunk(self) -> EventChunk:
+        return EventChunk(
+            text=self.to_text(),
+            source=self.source,
+            event_type="game_summary",
+            game_id=self.game_id,
+            timestamp=self.first_ts,
+            seq=self.first_seq,
+            doc_type="game_summary",
+        )
+
+
+@dataclass
+class _Run:
+    """A run of consecutive near-duplicate events of one type."""
+
+    chunk: EventChunk
+    shape: str
+    digest: bytes
+    count: int = 1
+    last_ts: str = ""
+
+
+class EventReducer:
+    """Streaming reducer from raw events to summary chunks.
+
+    Feed events in capture order with feed(); call finish() at the end to
+    flush open games and runs. Counters record the reduction achieved.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self.events_in = 0
+        self.chunks_out = 0
+        self.duplicates = 0
+        self._games: dict[str, GameSummary] = {}
+        self._runs: dict[str, _Run] = {}
+        self._emitted: set[bytes] = set()
+
+    def feed(self, event: dict[str, Any]) -> Iterator[EventChunk]:
+        """Consume one event, yielding any chunks it completes."""
+        self.events_in += 1
+        event_type = event.get("event", "unknown")
+        data = event.get("data")
+
+        if event_type in GAME_EVENTS:
+            payload = data[1] if isinstance(data, list) and len(data) > 1 else data
+            game_id = extract_game_id(data)
+            if game_id and isinstance(payload, dict):
+                yield from self._feed_game(event, event_type, game_id, payload)
+                return
+
+        yield from self._feed_other(event, event_type)
+
+    def _feed_game(
+        self,
+        event: dict[str, Any],
+        event_type: str,
+        game_id: str,
+        payload: dict[str, Any],
+    ) -> Iterator[EventChunk]:
+        game = self._games.get(game_id)
+        if game is None:
+            game = self._games[game_id] = GameSummary(game_id, self.source)
+            # Dicts keep insertion order: close games beyond the window
+            while len(self._games) > _OPEN_GAMES:
+                oldest = next(iter(self._games))
+                yield from self._emit(self._games.pop(oldest).to_chunk())
+
+        if event_type == "gameStateUpdate":
+            game.add_update(event, payload)
+        else:
+            game.add_trade(event, payload)
+
+    def _feed_other(self, event: dict[str, Any], event_type: str) -> Iterator[EventChunk]:
+        text = normalize_text(format_event_for_embedding(event))
+        shape = _NUMBER.sub("#", text)
+
+        run = self._runs.get(event_type)
+        if run is not None and run.shape == shape:
+            run.count += 1
+            run.last_ts = event.get("ts", "") or run.last_ts
+            return
+        if run is not None:
+            yield from self._close_run(run)
+
+        digest = text_hash(text)
+        if digest in self._emitted:
+            self.duplicates += 1
+            self._runs.pop(event_type, None)
+            return
+
+        self._runs[event_type] = _Run(
+            chunk=EventChunk(
+                text=text,
+                source=self.source,
+                event_type=event_type,
+                game_id=extract_game_id(event.get("data")),
+                timestamp=event.get("ts", ""),
+                seq=event.get("seq", 0),
+                doc_type="raw_event",
+            ),
+            shape=shape,
+            digest=digest,
+            last_ts=event.get("ts", ""),
+        )
+
+    def _close_run(self, run: _Run) -> Iterator[EventChunk]:
+        chunk = run.chunk
+        if run.count > 1:
+            chunk.text += (
+                f"\nRepeated: {run.count} consecutive similar events "
+                f"({chunk.timestamp} to {run.last_ts})"
+            )
+        self._emitted.add(run.digest)
+        yield from self._emit(chunk)
+
+    def _emit(self, chunk: EventChunk) -> Iterator[EventChunk]:
+        self.chunks_out += 1
+        yield chunk
+
+    def finish(self) -> Iterator[EventChunk]:
+        """Flush all open games and runs."""
+        for game in self._games.values():
+            yield from self._emit(game.to_chunk())
+        self._games.clear()
+        for run in self._runs.values():
+            yield from self._close_run(run)
+        self._runs.clear()
+
+
+def reduce_events(events: Iterable[dict[str, Any]], source: str) -> Iterator[EventChunk]:
+    """Reduce an event stream to summary chunks.
+
+    Args:
+        events: Parsed capture records in capture order
+        source: Source label stored on every chunk
+
+    Yields:
+        game_summary and raw_event chunks
+    """
+    reducer = EventReducer(source)
+    for event in events:
+        yield from reducer.feed(event)
+    yield from reducer.finish()
+
+
+def reduce_capture(file_path: Path) -> Iterator[EventChunk]:
+    """Reduce a raw capture file to summary chunks.
+
+    Args:
+        file_path: Path to JSONL capture
+
+    Yields:
+        game_summary and raw_event chunks
+    """
+    records = (record for _, record in iter_records(file_path))
+    yield from reduce_events(records, str(file_path))
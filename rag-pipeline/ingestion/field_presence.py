@@ -0,0 +1,514 @@
+"""Per-capture field presence matrix for drift tracking across recordings.
+
+generate_diff_report() compares one discovered set against one
+documented set. PresenceMatrix keeps, for every capture file, which
+field paths (and which path/type pairs) it contained, so drift over
+hundreds of recordings can be answered with set algebra:
+
+- each capture is a row bitset over the field vocabulary
+  (bit j set = field j present in the capture)
+- each field is a column bitset over the captures
+  (bit i set = capture i contains the field)
+
+Row bitsets are Python ints, so unions, intersections and differences
+over thousands of files or fields are single C-level operations, and
+counts use int.bit_count(). Columns are kept as little-endian
+bytearrays so adding a capture sets one bit per field in place instead
+of reallocating a file-wide int. The matrix is saved as JSON and updated
+incrementally: only captures whose size or mtime changed are rescanned.
+
+Example:
+    >>> matrix = PresenceMatrix.load_or_create(Path("presence.json"))
+    >>> matrix.update(Path("./raw_captures"))
+    >>> matrix.save(Path("presence.json"))
+    >>> for day in matrix.timeline():
+    ...     print(day.date, day.appeared, day.disappeared)
+"""
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from ingestion.event_discovery import ArraySampling, DiscoveryResult, scan_jsonl_file
+from ingestion.jsonl_reader import recording_files
+
+# Bump when the saved layout changes; older files are rebuilt from scratch
+PRESENCE_VERSION = 1
+
+# Dates embedded in capture names: golden_hour_2025-12-15_..., session_20251215_...
+_NAME_DATE = re.compile(r"(20\d{2})-?(0[1-9]|1[0-2])-?(0[1-9]|[12]\d|3[01])")
+
+
+def capture_date(path: Path) -> str:
+    """Date of a capture (YYYY-MM-DD) from its name, else its mtime (UTC)."""
+    match = _NAME_DATE.search(path.name)
+    if match:
+        return "-".join(match.groups())
+    mtime = path.stat().st_mtime
+    return datetime.fromtimestamp(mtime, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def iter_bits(bits: int) -> Iterator[int]:
+    """Indices of the set bits of ``bits``, lowest first."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+def bits_from(indices: Iterable[int]) -> int:
+    """Build an int bitset with the given bit indices set."""
+    indices = list(indices)
+    if not indices:
+        return 0
+    buf = bytearray((max(indices) >> 3) + 1)
+    for index in indices:
+        buf[index >> 3] |= 1 << (index & 7)
+    return int.from_bytes(buf, "little")
+
+
+def discovery_types(result: DiscoveryResult) -> dict[str, set[str]]:
+    """Map every field path of a discovery to the types it was seen with."""
+    types: dict[str, set[str]] = {}
+    for event in result.events.values():
+        for path, info in event.fields.items():
+            types.setdefault(path, set()).update(info.type_counts())
+    return types
+
+
+@dataclass
+class CaptureRow:
+    """Presence bitsets of one capture file.
+
+    Attributes:
+        name: Capture file name
+        date: Capture date (YYYY-MM-DD)
+        fields: Bitset over PresenceMatrix.fields
+        typed: Bitset over PresenceMatrix.typed (path, type) pairs
+        size: File size when scanned
+        mtime_ns: File mtime when scanned
+    """
+
+    name: str
+    date: str
+    fields: int = 0
+    typed: int = 0
+    size: int = 0
+    mtime_ns: int = 0
+
+
+@dataclass
+class DateDrift:
+    """Field changes on one capture date relative to earlier dates.
+
+    Attributes:
+        date: Capture date (YYYY-MM-DD)
+        files: Captures recorded on this date
+        fields: Distinct fields present on this date
+        appeared: Fields seen for the first time on this date
+        disappeared: Fields last seen on the previous date and never again
+        type_changes: path -> (previous types, types on this date) for
+            fields present on both dates whose type set changed
+    """
+
+    date: str
+    files: int
+    fields: int
+    appeared: list[str] = field(default_factory=list)
+    disappeared: list[str] = field(default_factory=list)
+    type_changes: dict[str, tuple[list[str], list[str]]] = field(default_factory=dict)
+
+
+class PresenceMatrix:
+    """Files x fields presence bitsets with incremental updates.
+
+    Attributes:
+        fields: Field vocabulary (column order, append-only)
+        typed: (path, type) vocabulary for type-change tracking
+        rows: One CaptureRow per capture, in insertion order
+    """
+
+    def __init__(self):
+        self.fields: list[str] = []
+        self.typed: list[tuple[str, str]] = []
+        self.rows: list[CaptureRow] = []
+        self._columns: list[bytearray] = []
+        self._field_ids: dict[str, int] = {}
+        self._typed_ids: dict[tuple[str, str], int] = {}
+        self._row_ids: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @property
+    def columns(self) -> list[int]:
+        """Per-field bitsets over rows (bit i set = row i has the field)."""
+        return [int.from_bytes(column, "little") for column in self._columns]
+
+    def column(self, path: str) -> int:
+        """Bitset over rows of the captures containing a field."""
+        fid = self._field_ids.get(path)
+        return 0 if fid is None else int.from_bytes(self._columns[fid], "little")
+
+    def _field_id(self, path: str) -> int:
+        fid = self._field_ids.get(path)
+        if fid is None:
+            fid = self._field_ids[path] = len(self.fields)
+            self.fields.append(path)
+            self._columns.append(bytearray())
+        return fid
+
+    def _typed_id(self, key: tuple[str, str]) -> int:
+        tid = self._typed_ids.get(key)
+        if tid is None:
+            tid = self._typed_ids[key] = len(self.typed)
+            self.typed.append(key)
+        return tid
+
+    # -- building ---------------------------------------------------------
+
+    def add(
+        self,
+        name: str,
+        types: dict[str, Iterable[str]],
+        date: str,
+        size: int = 0,
+        mtime_ns: int = 0,
+    ) -> CaptureRow:
+        """Add or replace the row of one capture.
+
+        Args:
+            name: Capture file name (row key)
+            types: Field path -> types observed in the capture
+            date: Capture date (YYYY-MM-DD)
+            size: File size, for incremental updates
+            mtime_ns: File mtime, for incremental updates
+
+        Returns:
+            The new row
+        """
+        fids = [self._field_id(path) for path in types]
+        tids = [
+            self._typed_id((path, type_name))
+            for path, path_types in types.items()
+            for type_name in path_types
+        ]
+
+        row = CaptureRow(name, date, bits_from(fids), bits_from(tids), size, mtime_ns)
+        index = self._row_ids.get(name)
+        if index is None:
+            index = self._row_ids[name] = len(self.rows)
+            self.rows.append(row)
+        else:
+            self._clear_columns(index, self.rows[index].fields)
+            self.rows[index] = row
+
+        self._set_columns(index, fids)
+        return row
+
+    def add_discovery(
+        self,
+        name: str,
+        result: DiscoveryResult,
+        date: str,
+        size: int = 0,
+        mtime_ns: int = 0,
+    ) -> CaptureRow:
+        """Add or replace a capture's row from its DiscoveryResult."""
+        return self.add(name, discovery_types(result), date, size, mtime_ns)
+
+    def _set_columns(self, index: int, fids: Iterable[int]) -> None:
+        byte, mask = index >> 3, 1 << (index & 7)
+        columns = self._columns
+        for fid in fids:
+            column = columns[fid]
+            if len(column) <= byte:
+                column.extend(bytes(byte + 1 - len(column)))
+            column[byte] |= mask
+
+    def _clear_columns(self, index: int, fields: int) -> None:
+        byte, mask = index >> 3, ~(1 << (index & 7)) & 0xFF
+        columns = self._columns
+        for fid in iter_bits(fields):
+            column = columns[fid]
+            if len(column) > byte:
+                column[byte] &= mask
+
+    def remove(self, names: Iterable[str]) -> None:
+        """Drop captures and renumber the remaining rows."""
+        indices = sorted(
+            (self._row_ids[name] for name in set(names) if name in self._row_ids),
+            reverse=True,
+        )
+        if not indices:
+            return
+        columns = [int.from_bytes(column, "little") for column in self._columns]
+        for index in indices:
+            # Shift the bits of later rows down over the removed one
+            low = (1 << index) - 1
+            columns = [(c & low) | ((c >> (index + 1)) << index) for c in columns]
+            del self.rows[index]
+        width = (len(self.rows) + 7) >> 3
+        self._columns = [bytearray(c.to_bytes(width, "little")) for c in columns]
+        self._row_ids = {row.name: i for i, row in enumerate(self.rows)}
+
+    def update(
+        self,
+        directory: Path,
+        pattern: str = "*.jsonl",
+        array_sampling: ArraySampling | None = None,
+        results: dict[str, DiscoveryResult] | None = None,
+    ) -> list[str]:
+        """Bring the matrix in line with a recordings directory.
+
+        Captures whose size and mtime match their row are skipped; new or
+        changed captures are scanned, and rows of deleted captures are
+        removed.
+
+        Args:
+            directory: Directory containing JSONL recordings
+            pattern: Glob pattern for files (default: *.jsonl); compressed
+                segments are included (see recording_files())
+            array_sampling: Per-array element sampling for scans
+            results: If given, receives each scanned capture's
+                DiscoveryResult by name, so callers need not rescan it
+
+        Returns:
+            Names of the captures that were (re)scanned
+        """
+        files = recording_files(directory, pattern)
+        self.remove(set(self._row_ids) - {path.name for path in files})
+
+        scanned = []
+        for path in files:
+            stat = path.stat()
+            index = self._row_ids.get(path.name)
+            if index is not None:
+                row = self.rows[index]
+                if row.size == stat.st_size and row.mtime_ns == stat.st_mtime_ns:
+                    continue
+            result = scan_jsonl_file(path, array_sampling=array_sampling)
+            if results is not None:
+                results[path.name] = result
+            self.add_discovery(
+                path.name, result, capture_date(path), stat.st_size, stat.st_mtime_ns
+            )
+            scanned.append(path.name)
+        return scanned
+
+    # -- set algebra ------------------------------------------------------
+
+    def field_mask(self, paths: Iterable[str]) -> int:
+        """Bitset over fields for the given paths (unknown paths ignored)."""
+        mask = 0
+        for path in paths:
+            fid = self._field_ids.get(path)
+            if fid is not None:
+                mask |= 1 << fid
+        return mask
+
+    def file_mask(
+        self,
+        names: Iterable[str] | None = None,
+        start_date: str | None = None,
+        end_date: str | None = None,
+    ) -> int:
+        """Bitset over rows selected by name and/or inclusive date range."""
+        selected = set(names) if names is not None else None
+        mask = 0
+        for index, row in enumerate(self.rows):
+            if selected is not None and row.name not in selected:
+                continue
+            if start_date and row.date < start_date:
+                continue
+            if end_date and row.date > end_date:
+                continue
+            mask |= 1 << index
+        return mask
+
+    def _rows_in(self, file_mask: int | None) -> Iterator[CaptureRow]:
+        if file_mask is None:
+            yield from self.rows
+        else:
+            rows = self.rows
+            for index in iter_bits(file_mask):
+                yield rows[index]
+
+    def any_fields(self, file_mask: int | None = None) -> int:
+        """Field bitset present in at least one selected capture."""
+        bits = 0
+        for row in self._rows_in(file_mask):
+            bits |= row.fields
+        return bits
+
+    def all_fields(self, file_mask: int | None = None) -> int:
+        """Field bitset present in every selected capture."""
+        bits = None
+        for row in self._rows_in(file_mask):
+            bits = row.fields if bits is None else bits & row.fields
+        return bits or 0
+
+    def paths(self, field_bits: int) -> list[str]:
+        """Sorted field paths of a field bitset."""
+        fields = self.fields
+        return sorted(fields[fid] for fid in iter_bits(field_bits))
+
+    def files_with(self, path: str) -> list[str]:
+        """Names of the captures containing a field."""
+        rows = self.rows
+        return [rows[index].name for index in iter_bits(self.column(path))]
+
+    def coverage(self, path: str, file_mask: int | None = None) -> float:
+        """Fraction of (selected) captures containing a field."""
+        total = len(self.rows) if file_mask is None else file_mask.bit_count()
+        if not total:
+            return 0.0
+        column = self.column(path)
+        if file_mask is not None:
+            column &= file_mask
+        return column.bit_count() / total
+
+    # -- drift ------------------------------------------------------------
+
+    def timeline(self) -> list[DateDrift]:
+        """Per-date field drift, oldest date first.
+
+        Returns:
+            One DateDrift per capture date; the first date lists no
+            appearances (it is the baseline)
+        """
+        by_date: dict[str, list[CaptureRow]] = {}
+        for row in self.rows:
+            by_date.setdefault(row.date, []).append(row)
+        dates = sorted(by_date)
+
+        date_fields = []
+        date_typed = []
+        for date in dates:
+            fields = typed = 0
+            for row in by_date[date]:
+                fields |= row.fields
+                typed |= row.typed
+            date_fields.append(fields)
+            date_typed.append(typed)
+
+        # later[i]: fields present on any date after i
+        later = [0] * len(dates)
+        for i in range(len(dates) - 2, -1, -1):
+            later[i] = later[i + 1] | date_fields[i + 1]
+
+        timeline = []
+        seen = 0
+        for i, date in enumerate(dates):
+            fields = date_fields[i]
+            drift = DateDrift(date, len(by_date[date]), fields.bit_count())
+            if i:
+                previous = date_fields[i - 1]
+                drift.appeared = self.paths(fields & ~seen)
+                drift.disappeared = self.paths(previous & ~fields & ~later[i])
+                drift.type_changes = self._type_changes(
+                    date_typed[i - 1], date_typed[i], previous & fields
+                )
+            seen |= fields
+            timeline.append(drift)
+        return timeline
+
+    def _type_changes(
+        self, before: int, after: int, shared_fields: int
+    ) -> dict[str, tuple[list[str], list[str]]]:
+        changed = before ^ after
+        if not changed:
+            return {}
+        shared = {self.fields[fid] for fid in iter_bits(shared_fields)}
+        paths = {self.typed[tid][0] for tid in iter_bits(changed)} & shared
+        if not paths:
+            return {}
+
+        old: dict[str, list[str]] = {path: [] for path in paths}
+        new: dict[str, list[str]] = {path: [] for path in paths}
+        for bits, target in ((before, old), (after, new)):
+            for tid in iter_bits(bits):
+                path, type_name = self.typed[tid]
+                if path in target:
+                    target[path].append(type_name)
+        return {path: (sorted(old[path]), sorted(new[path])) for path in sorted(paths)}
+
+    # -- persistence ------------------------------------------------------
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize to a JSON-compatible dict (bitsets as hex)."""
+        return {
+            "version": PRESENCE_VERSION,
+            "fields": self.fields,
+            "columns": [column.hex() for column in self._columns],
+            "typed": [list(key) for key in self.typed],
+            "rows": [
+                {
+                    "name": row.name,
+                    "date": row.date,
+                    "fields": format(row.fields, "x"),
+                    "typed": format(row.typed, "x"),
+                    "size": row.size,
+                    "mtime_ns": row.mtime_ns,
+                }
+                for row in self.rows
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> PresenceMatrix:
+        """Rebuild a matrix from to_dict() output.
+
+        Raises:
+            ValueError: If the data was saved by another layout version
+        """
+        if data.get("version") != PRESENCE_VERSION:
+            raise ValueError(
+                f"Presence matrix version {data.get('version')} is not supported "
+                f"(expected {PRESENCE_VERSION})"
+            )
+        matrix = cls()
+        matrix.fields = list(data["fields"])
+        matrix._field_ids = {path: i for i, path in enumerate(matrix.fields)}
+        matrix.typed = [tuple(key) for key in data["typed"]]
+        matrix._typed_ids = {key: i for i, key in enumerate(matrix.typed)}
+        matrix.rows = [
+            CaptureRow(
+                name=row["name"],
+                date=row["date"],
+                fields=int(row["fields"], 16),
+                typed=int(row["typed"], 16),
+                size=row["size"],
+                mtime_ns=row["mtime_ns"],
+            )
+            for row in data["rows"]
+        ]
+        matrix._row_ids = {row.name: i for i, row in enumerate(matrix.rows)}
+        matrix._columns = [bytearray.fromhex(column) for column in data["columns"]]
+        return matrix
+
+    def save(self, path: Path) -> None:
+        """Write the matrix as compact JSON."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: Path) -> PresenceMatrix:
+        """Load a matrix saved with save()."""
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    @classmethod
+    def load_or_create(cls, path: Path) -> PresenceMatrix:
+        """Load a saved matrix, or start empty if missing or outdated."""
+        if path.exists():
+            try:
+                return cls.load(path)
+            except (ValueError, KeyError, json.JSONDecodeError):
+                pass
+        return cls()
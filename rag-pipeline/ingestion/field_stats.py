@@ -0,0 +1,598 @@
+"""Streaming, mergeable statistics sketches for discovered fields.
+
+Every field path tracked by event_discovery carries a FieldStats
+accumulator. All sketches use bounded memory regardless of how many
+values are observed, and every sketch can be merged with another one
+built from a different file or shard:
+
+- ReservoirSample: uniform random sample of observed values
+- TDigest: approximate quantiles of numeric values
+- HyperLogLog: approximate distinct-value count
+- FieldStats: null rate, min/max/mean plus the sketches above
+
+Example:
+    >>> stats = FieldStats()
+    >>> for price in (1.0, 1.2, 1.5, None):
+    ...     stats.add(price)
+    >>> stats.summary()["null_rate"]
+    0.25
+"""
+from __future__ import annotations
+
+import math
+import random
+import zlib
+from typing import Any
+
+# Mask for 64-bit arithmetic in the hash mixer
+_MASK64 = (1 << 64) - 1
+
+# Shared generator for reservoir decisions; one per reservoir would cost
+# ~2.5 KB of Mersenne Twister state per field.
+_RNG = random.Random(0x5EED)
+
+
+class _Unset:
+    """Sentinel type for 'no previous value' in FieldStats."""
+
+    __slots__ = ()
+
+    def __reduce__(self) -> str:
+        # Pickle as a reference to the module-level singleton
+        return "_UNSET"
+
+
+_UNSET: Any = _Unset()
+
+
+def _mix64(x: int) -> int:
+    """SplitMix64 finalizer: spread an integer over 64 well-mixed bits."""
+    x = (x + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+def stable_hash(value: Any) -> int:
+    """Hash a JSON primitive to 64 bits, identically in every process.
+
+    Python's built-in hash() of str is salted per process, which would
+    make sketches built on different machines impossible to merge.
+
+    Args:
+        value: JSON primitive (str, int, float, bool, None)
+
+    Returns:
+        64-bit unsigned integer hash
+    """
+    if isinstance(value, str):
+        data = value.encode("utf-8", "surrogatepass")
+        return _mix64((zlib.crc32(data) << 32) | zlib.adler32(data))
+    if value is None:
+        return _mix64(0x6E756C6C)
+    # bool, int and float hashes are deterministic in CPython; tag bools
+    # so True and 1 stay distinct values.
+    tag = 0x626F6F6C if isinstance(value, bool) else 0
+    return _mix64((hash(value) ^ tag) & _MASK64)
+
+
+class ReservoirSample:
+    """Uniform fixed-size sample of a stream (Vitter's Algorithm L).
+
+    Skips ahead between replacements, so the per-value cost after the
+    reservoir fills is a counter increment and one comparison.
+
+    Attributes:
+        size: Maximum number of values kept
+        seen: Number of values offered so far
+        items: Sampled values
+    """
+
+    __slots__ = ("size", "seen", "items", "_w", "_next", "_rng")
+
+    def __init__(self, size: int = 5, rng: random.Random | None = None):
+        self.size = size
+        self.seen = 0
+        self.items: list = []
+        self._rng = rng or _RNG
+        self._w = 1.0
+        self._next = size
+
+    def __getstate__(self) -> tuple:
+        # The shared generator is not pickled; it is re-attached on load
+        rng = None if self._rng is _RNG else self._rng
+        return (self.size, self.seen, self.items, self._w, self._next, rng)
+
+    def __setstate__(self, state: tuple) -> None:
+        self.size, self.seen, self.items, self._w, self._next, rng = state
+        self._rng = rng or _RNG
+
+    def add(self, value: Any) -> None:
+        """Offer a value to the reservoir."""
+        seen = self.seen
+        self.seen = seen + 1
+        if seen < self.size:
+            self.items.append(value)
+            if self.seen == self.size:
+                self._advance()
+        elif seen == self._next:
+            self.items[self._rng.randrange(self.size)] = value
+            self._advance()
+
+    def _advance(self) -> None:
+        """Draw the index of the next value that replaces a sample."""
+        rng = self._rng
+        self._w *= math.exp(math.log(rng.random() or 1e-300) / self.size)
+        skip = math.floor(
+            math.log(rng.random() or 1e-300) / math.log1p(-self._w)
+        ) if self._w < 1.0 else 0
+        self._next = self.seen + skip
+
+    def merge(self, other: ReservoirSample) -> None:
+        """Merge another reservoir, weighting each side by values seen."""
+        total = self.seen + other.seen
+        if not other.seen:
+            return
+        if not self.seen:
+            self.items = list(other.items)
+        else:
+            rng = self._rng
+            mine, theirs = list(self.items), list(other.items)
+            merged = []
+            for _ in range(min(self.size, len(mine) + len(theirs))):
+                take_mine = mine and (
+                    not theirs or rng.random() * total < self.seen
+                )
+                pool = mine if take_mine else theirs
+                merged.append(pool.pop(rng.randrange(len(pool))))
+            self.items = merged
+        self.seen = total
+        if self.seen >= self.size:
+            self._next = self.seen
+            self._advance()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize to a JSON-compatible dict."""
+        return {"size": self.size, "seen": self.seen, "items": list(self.items)}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ReservoirSample:
+        """Rebuild a reservoir from to_dict() output."""
+        sample = cls(data["size"])
+        sample.seen = data["seen"]
+        sample.items = list(data["items"])
+        if sample.seen >= sample.size:
+            sample._next = sample.seen
+            sample._advance()
+        return sample
+
+
+class TDigest:
+    """Merging t-digest for streaming quantile estimates.
+
+    Values are buffered and periodically folded into at most roughly
+    ``compression`` centroids, so memory is bounded independently of
+    the number of values. Runs of identical values are buffered as one
+    weighted point. Accuracy is best at the tails (p1, p99).
+
+    Attributes:
+        compression: Centroid budget (higher = more accurate, larger)
+        count: Total weight added
+    """
+
+    __slots__ = (
+        "compression",
+        "count",
+        "_means",
+        "_weights",
+        "_buf_values",
+        "_buf_weights",
+    )
+
+    def __init__(self, compression: int = 100):
+        self.compression = compression
+        self.count = 0.0
+        self._means: list[float] = []
+        self._weights: list[float] = []
+        self._buf_values: list[float] = []
+        self._buf_weights: list[float] = []
+
+    def add(self, value: float, weight: float = 1.0) -> None:
+        """Add a numeric value (optionally with a weight)."""
+        self.count += weight
+        values = self._buf_values
+        if values and values[-1] == value:
+            self._buf_weights[-1] += weight
+            return
+        values.append(value)
+        self._buf_weights.append(weight)
+        if len(values) >= self.compression * 10:
+            self._compress()
+
+    def _compress(self) -> None:
+        """Fold buffered points and existing centroids into centroids."""
+        values = self._buf_values + self._means
+        weights = self._buf_weights + self._weights
+        self._buf_values = []
+        self._buf_weights = []
+        if not values:
+            return
+
+        order = sorted(range(len(values)), key=values.__getitem__)
+        total = sum(weights)
+        self.count = total
+
+        means: list[float] = []
+        out_weights: list[float] = []
+        first = order[0]
+        cur_mean = values[first]
+        cur_weight = weights[first]
+        so_far = 0.0
+        q_limit = self._q_limit(0.0)
+        for i in order[1:]:
+            mean = values[i]
+            weight = weights[i]
+            if (so_far + cur_weight + weight) / total <= q_limit:
+                cur_weight += weight
+                cur_mean += (mean - cur_mean) * weight / cur_weight
+            else:
+                means.append(cur_mean)
+                out_weights.append(cur_weight)
+                so_far += cur_weight
+                q_limit = self._q_limit(so_far / total)
+                cur_mean = mean
+                cur_weight = weight
+        means.append(cur_mean)
+        out_weights.append(cur_weight)
+
+        self._means = means
+        self._weights = out_weights
+
+    def _q_limit(self, q: float) -> float:
+        """Upper quantile a centroid starting at q may grow to.
+
+        Uses the k1 scale function k(q) = delta/(2*pi) * asin(2q - 1):
+        each centroid spans at most one unit of k, which bounds the
+        digest to ~compression centroids and keeps the tails fine-grained.
+        """
+        k = self.compression / (2 * math.pi) * math.asin(2 * q - 1) + 1
+        if k >= self.compression / 4:
+            return 1.0
+        return (math.sin(k * 2 * math.pi / self.compression) + 1) / 2
+
+    def merge(self, other: TDigest) -> None:
+        """Merge another digest into this one.
+
+        The other digest's centroids are buffered like added points, so
+        merging many digests compresses once rather than per merge.
+        """
+        self.count += other.count
+        self._buf_values.extend(other._buf_values)
+        self._buf_values.extend(other._means)
+        self._buf_weights.extend(other._buf_weights)
+        self._buf_weights.extend(other._weights)
+        if len(self._buf_values) >= self.compression * 10:
+            self._compress()
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate the q-th quantile (0 <= q <= 1).
+
+        Returns:
+            Estimated value, or None if no values were added
+        """
+        if self._buf_values:
+            self._compress()
+        means, weights = self._means, self._weights
+        if not means:
+            return None
+        if len(means) == 1:
+            return means[0]
+
+        target = q * self.count
+        cumulative = 0.0
+        for i, weight in enumerate(weights):
+            center = cumulative + weight / 2
+            if target < center:
+                if i == 0:
+                    return means[0]
+                prev_center = cumulative - weights[i - 1] / 2
+                frac = (target - prev_center) / (center - prev_center)
+                return means[i - 1] + frac * (means[i] - means[i - 1])
+            cumulative += weight
+        return means[-1]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize to a JSON-compatible dict."""
+        if self._buf_values:
+            self._compress()
+        return {
+            "compression": self.compression,
+            "means": list(self._means),
+            "weights": list(self._weights),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> TDigest:
+        """Rebuild a digest from to_dict() output."""
+        digest = cls(data["compression"])
+        digest._means = list(data["means"])
+        digest._weights = list(data["weights"])
+        digest.count = sum(digest._weights)
+        return digest
+
+
+class HyperLogLog:
+    """HyperLogLog distinct-value estimator.
+
+    Uses 2**precision one-byte registers (1 KiB at the default
+    precision of 10, ~3% standard error).
+
+    Attributes:
+        precision: Number of index bits
+    """
+
+    __slots__ = ("precision", "_registers")
+
+    def __init__(self, precision: int = 10):
+        self.precision = precision
+        self._registers = bytearray(1 << precision)
+
+    def add(self, value: Any) -> None:
+        """Add a JSON primitive value."""
+        self.add_hash(stable_hash(value))
+
+    def add_hash(self, h: int) -> None:
+        """Add a precomputed 64-bit hash from stable_hash()."""
+        p = self.precision
+        index = h >> (64 - p)
+        rest = (h << p) & _MASK64
+        rank = 65 - rest.bit_length() if rest else 65 - p
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def merge(self, other: HyperLogLog) -> None:
+        """Merge another sketch of the same precision."""
+        if other.precision != self.precision:
+            raise ValueError(
+                f"Cannot merge HyperLogLog precision {other.precision} "
+                f"into {self.precision}"
+            )
+        # Register-wise max on all registers at once: ranks are < 0x80,
+        # so (b | 0x80) - a per byte never borrows across bytes and its
+        # high bit is set exactly where b >= a.
+        size = len(self._registers)
+        high = int.from_bytes(b"\x80" * size, "little")
+        a = int.from_bytes(self._registers, "little")
+        b = int.from_bytes(other._registers, "little")
+        mask = ((((b | high) - a) & high) >> 7) * 0xFF
+        self._registers = bytearray(((b & mask) | (a & ~mask)).to_bytes(size, "little"))
+
+    def estimate(self) -> int:
+        """Estimate the number of distinct values added."""
+        registers = self._registers
+        m = len(registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        # Only a handful of distinct ranks occur; count each in C
+        harmonic = sum(
+            registers.count(rank) * 2.0 ** -rank for rank in set(registers)
+        )
+        raw = alpha * m * m / harmonic
+        zeros = registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            # Small-range correction (linear counting)
+            return round(m * math.log(m / zeros))
+        return round(raw)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize to a JSON-compatible dict."""
+        return {
+            "precision": self.precision,
+            "registers": self._registers.hex(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> HyperLogLog:
+        """Rebuild a sketch from to_dict() output."""
+        sketch = cls(data["precision"])
+        sketch._registers = bytearray.fromhex(data["registers"])
+        return sketch
+
+
+class FieldStats:
+    """Per-field streaming statistics with O(1) memory.
+
+    Tracks null rate, numeric min/max/mean, t-digest quantiles,
+    HyperLogLog cardinality and a reservoir sample. Consecutive repeats
+    of the same value skip re-hashing, which keeps slowly-changing
+    fields (levels, flags, game IDs) cheap.
+
+    Attributes:
+        count: Values observed (including nulls)
+        nulls: Null values observed
+        numeric_count: Numeric (non-boolean) values observed
+        float_count: Numeric values that were floats (0 = integers only)
+        min: Smallest numeric value
+        max: Largest numeric value
+        total: Sum of numeric values
+    """
+
+    __slots__ = (
+        "count",
+        "nulls",
+        "numeric_count",
+        "float_count",
+        "total",
+        "_min",
+        "_max",
+        "reservoir",
+        "digest",
+        "distinct",
+        "_last",
+    )
+
+    def __init__(self, reservoir_size: int = 5):
+        self.count = 0
+        self.nulls = 0
+        self.numeric_count = 0
+        self.float_count = 0
+        self.total = 0.0
+        self._min = math.inf
+        self._max = -math.inf
+        self.reservoir = ReservoirSample(reservoir_size)
+        self.digest: TDigest | None = None
+        self.distinct = HyperLogLog()
+        self._last: Any = _UNSET
+
+    def add(self, value: Any, weight: int = 1) -> bool:
+        """Observe one primitive value.
+
+        Args:
+            value: Primitive JSON value
+            weight: Observations this value stands for when the caller
+                sampled it from a larger population; scales count and
+                nulls, while the numeric sketches see the value once
+
+        Returns:
+            False if the value repeats the previous one, so callers can
+            skip their own distinct-value bookkeeping
+        """
+        self.count += weight
+        kind = type(value)
+        if kind is int or kind is float:
+            self.numeric_count += 1
+            if kind is float:
+                self.float_count += 1
+            self.total += value
+            if value < self._min:
+                self._min = value
+            if value > self._max:
+                self._max = value
+            digest = self.digest
+            if digest is None:
+                digest = self.digest = TDigest()
+            digest.add(value)
+        elif value is None:
+            self.nulls += weight
+
+        self.reservoir.add(value)
+
+        last = self._last
+        if value is last or (value == last and kind is type(last)):
+            return False
+        self._last = value
+        self.distinct.add_hash(stable_hash(value))
+        return True
+
+    @property
+    def integral(self) -> bool:
+        """Whether numeric values were seen and every one was an int."""
+        return self.numeric_count > 0 and not self.float_count
+
+    @property
+    def min(self) -> float | None:
+        """Smallest numeric value, or None if none were seen."""
+        return self._min if self.numeric_count else None
+
+    @property
+    def max(self) -> float | None:
+        """Largest numeric value, or None if none were seen."""
+        return self._max if self.numeric_count else None
+
+    def null_rate(self, total: int | None = None) -> float:
+        """Fraction of observations that were null.
+
+        Args:
+            total: Observations of the field including non-primitive
+                values (FieldInfo.count); defaults to primitive count
+        """
+        total = total or self.count
+        return self.nulls / total if total else 0.0
+
+    @property
+    def mean(self) -> float | None:
+        """Mean of numeric values, or None if none were seen."""
+        return self.total / self.numeric_count if self.numeric_count else None
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate the q-th quantile of numeric values."""
+        return self.digest.quantile(q) if self.digest else None
+
+    def merge(self, other: FieldStats) -> None:
+        """Merge statistics gathered from another file or shard."""
+        self.count += other.count
+        self.nulls += other.nulls
+        self.numeric_count += other.numeric_count
+        self.float_count += other.float_count
+        self.total += other.total
+        self._min = min(self._min, other._min)
+        self._max = max(self._max, other._max)
+        if other.digest is not None:
+            if self.digest is None:
+                self.digest = TDigest(other.digest.compression)
+            self.digest.merge(other.digest)
+        self.reservoir.merge(other.reservoir)
+        self.distinct.merge(other.distinct)
+        self._last = _UNSET
+
+    def copy(self) -> FieldStats:
+        """Return an independent copy (for merging without mutation)."""
+        return FieldStats.from_dict(self.to_dict())
+
+    def summary(self, total: int | None = None) -> dict[str, Any]:
+        """Return a compact JSON-compatible summary for reports.
+
+        Args:
+            total: Observations of the field including non-primitive
+                values, used as the null-rate denominator
+        """
+        summary: dict[str, Any] = {
+            "null_rate": round(self.null_rate(total), 4),
+            "distinct_estimate": self.distinct.estimate(),
+            "reservoir": list(self.reservoir.items),
+        }
+        if self.numeric_count:
+            summary.update(
+                {
+                    "min": self.min,
+                    "max": self.max,
+                    "mean": self.mean,
+                    "p50": self.quantile(0.5),
+                    "p95": self.quantile(0.95),
+                    "p99": self.quantile(0.99),
+                }
+            )
+        return summary
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize all sketches to a JSON-compatible dict."""
+        return {
+            "count": self.count,
+            "nulls": self.nulls,
+            "numeric_count": self.numeric_count,
+            "float_count": self.float_count,
+            "min": self.min,
+            "max": self.max,
+            "total": self.total,
+            "reservoir": self.reservoir.to_dict(),
+            "digest": self.digest.to_dict() if self.digest else None,
+            "distinct": self.distinct.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> FieldStats:
+        """Rebuild statistics from to_dict() output."""
+        stats = cls(data["reservoir"]["size"])
+        stats.count = data["count"]
+        stats.nulls = data["nulls"]
+        stats.numeric_count = data["numeric_count"]
+        # Older dicts did not record ints vs floats; assume floats
+        stats.float_count = data.get("float_count", stats.numeric_count)
+        if data["min"] is not None:
+            stats._min = data["min"]
+            stats._max = data["max"]
+        stats.total = data["total"]
+        stats.reservoir = ReservoirSample.from_dict(data["reservoir"])
+        if data["digest"] is not None:
+            stats.digest = TDigest.from_dict(data["digest"])
+        stats.distinct = HyperLogLog.from_dict(data["distinct"])
+        return stats
@@ -6,8 +6,9 @@ from typing import Iterator
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from config import KNOWLEDGE_PATHS, INCLUDE_PATTERNS, CHUNK_SIZE, CHUNK_OVERLAP
+from config import KNOWLEDGE_PATHS, INCLUDE_PATTERNS, CHUNK_SIZE, CHUNK_OVERLAP, RUNS_PATH
 from ingestion.chunker import chunk_markdown, chunk_text, Chunk
+from ingestion.run_metrics import RUN_LOG_FILENAME, RunMetrics
 from embeddings.embedder import embed_batch
 from storage.store import add_documents, clear, count
 
@@ -66,15 +67,21 @@ def ingest_file(file_path: Path) -> list[dict]:
     ]
 
 
-def ingest_all(clear_first: bool = True) -> int:
+def ingest_all(clear_first: bool = True, profile: bool = False) -> int:
     """Ingest all knowledge sources.
     
+    Chunking, encoding and storing are timed as separate phases; the
+    metrics are printed at the end and appended to RUNS_PATH/run_log.jsonl.
+    
     Args:
         clear_first: Clear existing index before ingesting
+        profile: Run each phase under cProfile (dumps in RUNS_PATH/profiles)
         
     Returns:
         Total number of chunks indexed
     """
+    metrics = RunMetrics("ingest_all", profile_dir=RUNS_PATH / "profiles" if profile else None)
+
     if clear_first:
         print("Clearing existing index...")
         clear()
@@ -84,11 +91,14 @@ def ingest_all(clear_first: bool = True) -> int:
     print(f"Found {len(files)} files")
     
     all_chunks = []
-    for file_path in files:
-        chunks = ingest_file(file_path)
-        if chunks:
-            all_chunks.extend(chunks)
-            print(f"  {file_path.name}: {len(chunks)} chunks")
+    with metrics.phase("chunking") as phase:
+        for file_path in files:
+            chunks = ingest_file(file_path)
+            phase.bytes += file_path.stat().st_size
+            if chunks:
+                all_chunks.extend(chunks)
+                print(f"  {file_path.name}: {len(chunks)} chunks")
+        phase.chunks = len(all_chunks)
     
     if not all_chunks:
         print("No chunks to index!")
@@ -96,13 +106,22 @@ def ingest_all(clear_first: bool = True) -> int:
     
     print(f"\nGenerating embeddings for {len(all_chunks)} chunks...")
     texts = [c["text"] for c in all_chunks]
-    embeddings = embed_batch(texts, show_progress=True)
+    with metrics.phase("encoding") as phase:
+        embeddings = embed_batch(texts, show_progress=True)
+        phase.chunks = len(texts)
     
     print("Storing in ChromaDB...")
-    added = add_documents(all_chunks, embeddings)
+    with metrics.phase("storing") as phase:
+        added = add_documents(all_chunks, embeddings)
+        phase.chunks = added
     
     total = count()
     print(f"\nDone! Total documents in index: {total}")
+    print("\nPhase metrics:")
+    metrics.print_summary()
+
+    metrics.info["documents_total"] = total
+    metrics.append_log(RUNS_PATH / RUN_LOG_FILENAME)
     
     return added
 
@@ -120,9 +139,10 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="RAG Pipeline Ingestion")
     parser.add_argument("--clear", action="store_true", help="Clear index only")
     parser.add_argument("--no-clear", action="store_true", help="Don't clear before indexing")
+    parser.add_argument("--profile", action="store_true", help="Profile each phase with cProfile")
     args = parser.parse_args()
     
     if args.clear:
         clear_index()
     else:
-        ingest_all(clear_first=not args.no_clear)
+        ingest_all(clear_first=not args.no_clear, profile=args.profile)
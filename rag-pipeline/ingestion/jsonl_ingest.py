@@ -2,10 +2,11 @@
 
 This module coordinates the full ingestion pipeline:
 1. Discovery - Scan all JSONL recordings for events and fields
-2. Schema Generation - Create JSON schemas from discoveries
+2. Schema Generation - Create JSON schemas and typed payload decoders
 3. Coverage Report - Generate verification reports
 4. Diff Analysis - Compare against documented fields
 5. Chunking - Prepare for vector embedding (optional)
+6. Embedding - Upsert schema and event chunks into the events collection
 
 Example:
     >>> from ingestion.jsonl_ingest import ingest_websocket_recordings
@@ -17,11 +18,13 @@ Example:
 """
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import List
 
+from ingestion.jsonl_reader import recording_files
+from ingestion.run_metrics import RUN_LOG_FILENAME, PhaseMetrics, RunMetrics
+
 
 @dataclass
 class IngestionResult:
@@ -31,8 +34,9 @@ class IngestionResult:
         files_scanned: Number of JSONL files processed
         events_discovered: Number of unique event types found
         fields_discovered: Total unique field paths found
-        chunks_embedded: Number of chunks created for embedding
+        chunks_embedded: Number of chunks newly embedded into the events collection
         errors: List of error messages encountered
+        phases: Timing, throughput and memory metrics per pipeline phase
     """
 
     files_scanned: int
@@ -40,6 +44,114 @@ class IngestionResult:
     fields_discovered: int
     chunks_embedded: int
     errors: List[str] = field(default_factory=list)
+    phases: List[PhaseMetrics] = field(default_factory=list)
+
+
+def write_discovery_outputs(
+    discovery,
+    output_dir: Path,
+    dictionary_path: Path | None = None,
+    max_workers: int = 4,
+    compact_json: bool = False,
+) -> dict[str, int]:
+    """Generate and write schemas, field index, reports and decoders.
+
+    All generators are fed from one traversal of the discovery result,
+    computing each field's stats summary once. The documentation
+    dictionary is parsed while the traversal runs, and the output files
+    (including the event_decoders.py generated from the schemas) are
+    finalized and written concurrently. The JSON outputs are indented
+    unless compact_json is set: they are indexed into the knowledge base
+    by the line-based chunker, which keeps a one-line file as one chunk.
+
+    Args:
+        discovery: DiscoveryResult from scanning
+        output_dir: Directory for generated output files
+        dictionary_path: Optional FIELD_DICTIONARY.md for the diff report
+        max_workers: Threads for dictionary parsing and output writers
+        compact_json: Write the JSON outputs compact and streamed entry by
+            entry (faster, but not line-chunkable)
+
+    Returns:
+        Dict with counts: schemas, fields and, if a diff was written,
+        matched, undocumented and stale
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from ingestion.coverage_report import (
+        CoverageReportBuilder,
+        generate_diff_report,
+        load_field_dictionary,
+    )
+    from ingestion.schema_generator import (
+        FieldIndexBuilder,
+        SchemaBuilder,
+        write_json,
+    )
+    from ingestion.decoder_codegen import DECODERS_FILENAME, build_decoder_source
+
+    schema_builder = SchemaBuilder()
+    index_builder = FieldIndexBuilder()
+    report_builder = CoverageReportBuilder(discovery)
+    builders = (schema_builder, index_builder, report_builder)
+    discovered: set[str] = set()
+
+    def write_text(text_fn, path: Path) -> None:
+        text = text_fn()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def write_index() -> int:
+        index = index_builder.result()
+        write_json(index, output_dir / "discovered_fields.json", pretty=not compact_json)
+        return len(index)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        documented_future = None
+        if dictionary_path and dictionary_path.exists():
+            documented_future = pool.submit(load_field_dictionary, dictionary_path)
+
+        # Single traversal feeding every generator
+        for name, event in discovery.events.items():
+            for builder in builders:
+                builder.add_event(event)
+            for path, field in sorted(event.fields.items()):
+                summary = field.stats_summary() if field.stats.count else None
+                discovered.add(path)
+                for builder in builders:
+                    builder.add_field(name, path, field, summary)
+
+        schemas = schema_builder.result()
+        writers = [
+            pool.submit(
+                write_json, schemas, output_dir / "discovered_schemas.json", not compact_json
+            ),
+            pool.submit(write_index),
+            pool.submit(write_text, report_builder.result, output_dir / "coverage_report.md"),
+            pool.submit(
+                write_text,
+                lambda: build_decoder_source(schemas),
+                output_dir / DECODERS_FILENAME,
+            ),
+        ]
+
+        counts = {"schemas": len(schemas)}
+        if documented_future is not None:
+            documented = documented_future.result()
+            writers.append(pool.submit(
+                write_text,
+                lambda: generate_diff_report(discovered, documented),
+                output_dir / "diff_report.md",
+            ))
+            counts["matched"] = len(discovered & documented)
+            counts["undocumented"] = len(discovered - documented)
+            counts["stale"] = len(documented - discovered)
+
+        counts["fields"] = writers[1].result()
+        for writer in writers:
+            writer.result()
+
+    return counts
 
 
 def ingest_websocket_recordings(
@@ -48,17 +160,25 @@ def ingest_websocket_recordings(
     dictionary_path: Path | None = None,
     embed: bool = True,
     verbose: bool = True,
+    event_sample_rate: int = 100,
+    reduce_events: bool = True,
+    array_sampling: str = "all",
+    profile: bool = False,
+    compact_json: bool = False,
 ) -> IngestionResult:
     """Run full ingestion pipeline on WebSocket recordings.
 
     Orchestrates the complete pipeline:
-    1. Scans all JSONL files in recordings_dir
+    1. Scans all JSONL files in recordings_dir, including compressed
+       recording segments (files unchanged since the last run are loaded
+       from the discovery snapshot in output_dir)
     2. Discovers all unique events and field paths
     3. Generates JSON schemas for each event type
     4. Creates flat field index for lookups
     5. Generates coverage report
     6. Optionally compares against documented fields
-    7. Optionally creates chunks for embedding
+    7. Optionally embeds schema and raw event chunks into
+       RUGS_EVENTS_COLLECTION
 
     Args:
         recordings_dir: Directory containing JSONL recordings
@@ -66,29 +186,51 @@ def ingest_websocket_recordings(
         dictionary_path: Optional path to FIELD_DICTIONARY.md for diff
         embed: Whether to generate vector embeddings
         verbose: Whether to print progress messages
+        event_sample_rate: Embed every Nth raw event line alongside the
+            schema chunks when not reducing (0 = schema chunks only)
+        reduce_events: Embed per-game summaries and deduplicated event
+            runs (event_reducer) instead of sampled raw events
+        array_sampling: Element sampling strategy for arrays of objects
+            during discovery (see event_discovery.ArraySampling)
+        profile: Run each phase under cProfile, dumping stats to
+            output_dir/profiles/<phase>.prof
+        compact_json: Write discovered_schemas.json and
+            discovered_fields.json compact instead of indented
+
+    Per-phase metrics are returned in IngestionResult.phases and appended
+    to output_dir/run_log.jsonl.
 
     Returns:
         IngestionResult with statistics about the run
     """
-    from ingestion.event_discovery import scan_recordings, get_all_field_paths
-    from ingestion.schema_generator import (
-        generate_all_schemas,
-        generate_field_index,
-    )
-    from ingestion.coverage_report import (
-        generate_coverage_report,
-        generate_diff_report,
-        load_field_dictionary,
-    )
+    from ingestion.discovery_snapshot import SNAPSHOT_FILENAME, cached_scan
+    from ingestion.event_discovery import ArraySampling
 
     # Create output directory
     output_dir.mkdir(parents=True, exist_ok=True)
+    metrics = RunMetrics(
+        "jsonl_ingest", profile_dir=output_dir / "profiles" if profile else None
+    )
+    metrics.info["recordings_dir"] = str(recordings_dir)
 
     # Phase 1: Discovery
     if verbose:
         print(f"Phase 1: Scanning recordings in {recordings_dir}...")
 
-    discovery = scan_recordings(recordings_dir)
+    # Reuses output_dir/discovery.snapshot for recordings scanned before
+    snapshot_path = output_dir / SNAPSHOT_FILENAME
+    snapshot_mtime = snapshot_path.stat().st_mtime_ns if snapshot_path.exists() else None
+    with metrics.phase("discovery") as phase:
+        discovery = cached_scan(
+            recordings_dir,
+            snapshot_path,
+            array_sampling=ArraySampling(array_sampling),
+        )
+        phase.events = discovery.total_lines
+        phase.bytes = sum(p.stat().st_size for p in recording_files(recordings_dir))
+        phase.extra["snapshot_reused"] = (
+            snapshot_mtime is not None and snapshot_path.stat().st_mtime_ns == snapshot_mtime
+        )
 
     if verbose:
         print(f"  Found {len(discovery.events)} event types")
@@ -101,67 +243,26 @@ def ingest_websocket_recordings(
     if verbose:
         print(f"  Unique field paths: {total_fields}")
 
-    # Phase 2: Schema Generation
-    if verbose:
-        print("\nPhase 2: Generating schemas...")
-
-    schemas = generate_all_schemas(discovery)
-
-    schema_path = output_dir / "discovered_schemas.json"
-    with open(schema_path, "w", encoding="utf-8") as f:
-        json.dump(schemas, f, indent=2)
-
-    if verbose:
-        print(f"  Saved {len(schemas)} schemas to {schema_path.name}")
-
-    # Phase 3: Field Index
+    # Phases 2-5: Schemas, field index, coverage and diff reports
     if verbose:
-        print("\nPhase 3: Generating field index...")
+        print("\nPhases 2-5: Generating schemas, field index and reports...")
 
-    field_index = generate_field_index(discovery)
-
-    index_path = output_dir / "discovered_fields.json"
-    with open(index_path, "w", encoding="utf-8") as f:
-        json.dump(field_index, f, indent=2)
-
-    if verbose:
-        print(f"  Saved {len(field_index)} field paths to {index_path.name}")
-
-    # Phase 4: Coverage Report
-    if verbose:
-        print("\nPhase 4: Generating coverage report...")
-
-    report = generate_coverage_report(discovery)
-
-    report_path = output_dir / "coverage_report.md"
-    with open(report_path, "w", encoding="utf-8") as f:
-        f.write(report)
+    with metrics.phase("outputs") as phase:
+        outputs = write_discovery_outputs(
+            discovery, output_dir, dictionary_path, compact_json=compact_json
+        )
+        phase.extra["fields"] = outputs["fields"]
 
     if verbose:
-        print(f"  Saved coverage report to {report_path.name}")
-
-    # Phase 5: Diff Report (optional)
-    if dictionary_path and dictionary_path.exists():
-        if verbose:
-            print(f"\nPhase 5: Comparing with {dictionary_path.name}...")
-
-        documented = load_field_dictionary(dictionary_path)
-        discovered = get_all_field_paths(discovery)
-
-        diff = generate_diff_report(discovered, documented)
-
-        diff_path = output_dir / "diff_report.md"
-        with open(diff_path, "w", encoding="utf-8") as f:
-            f.write(diff)
-
-        undocumented = discovered - documented
-        stale = documented - discovered
-
-        if verbose:
-            print(f"  Matched: {len(discovered & documented)} fields")
-            print(f"  New (need docs): {len(undocumented)} fields")
-            print(f"  Stale (not in recordings): {len(stale)} fields")
-            print(f"  Saved diff report to {diff_path.name}")
+        print(f"  Saved {outputs['schemas']} schemas to discovered_schemas.json")
+        print(f"  Saved {outputs['fields']} field paths to discovered_fields.json")
+        print("  Saved coverage report to coverage_report.md")
+        print("  Saved payload decoders to event_decoders.py")
+        if "matched" in outputs:
+            print(f"  Matched: {outputs['matched']} fields")
+            print(f"  New (need docs): {outputs['undocumented']} fields")
+            print(f"  Stale (not in recordings): {outputs['stale']} fields")
+            print("  Saved diff report to diff_report.md")
 
     # Phase 6: Embedding (optional)
     chunks_embedded = 0
@@ -169,16 +270,30 @@ def ingest_websocket_recordings(
         if verbose:
             print("\nPhase 6: Generating embeddings...")
 
-        # TODO: Integrate with ChromaDB embedding
-        # For now, just count chunks that would be created
-        from ingestion.event_chunker import chunk_discovery_result
+        from itertools import chain
+
+        from ingestion.event_chunker import chunk_discovery_result, chunk_raw_capture
+        from ingestion.event_embedder import RUGS_EVENTS_COLLECTION, embed_chunks
+        from ingestion.event_reducer import reduce_capture
 
-        chunks = list(chunk_discovery_result(discovery))
-        chunks_embedded = len(chunks)
+        # The sample rate only applies to raw events; the reducer never samples
+        streams = [chunk_discovery_result(discovery)]
+        if reduce_events:
+            streams.extend(reduce_capture(f) for f in recording_files(recordings_dir))
+        elif event_sample_rate > 0:
+            streams.extend(
+                chunk_raw_capture(f, sample_rate=event_sample_rate)
+                for f in recording_files(recordings_dir)
+            )
+
+        with metrics.phase("embedding") as phase:
+            chunks_embedded = embed_chunks(
+                chain.from_iterable(streams), verbose=verbose, timings=phase.extra
+            )
+            phase.chunks = phase.extra.get("chunks", 0)
 
         if verbose:
-            print(f"  Would embed {chunks_embedded} chunks")
-            print("  (Embedding not yet implemented)")
+            print(f"  Embedded {chunks_embedded} new chunks into {RUGS_EVENTS_COLLECTION}")
 
     # Summary
     if verbose:
@@ -190,6 +305,13 @@ def ingest_websocket_recordings(
         print(f"  Fields discovered: {total_fields}")
         if discovery.errors:
             print(f"  Parse errors: {len(discovery.errors)}")
+        print("\nPhase metrics:")
+        metrics.print_summary()
+        if profile:
+            print(f"  Profiles saved to {metrics.profile_dir}")
+
+    metrics.info["chunks_embedded"] = chunks_embedded
+    metrics.append_log(output_dir / RUN_LOG_FILENAME)
 
     return IngestionResult(
         files_scanned=discovery.files_scanned,
@@ -197,6 +319,7 @@ def ingest_websocket_recordings(
         fields_discovered=total_fields,
         chunks_embedded=chunks_embedded,
         errors=discovery.errors,
+        phases=metrics.phases,
     )
 
 
@@ -204,6 +327,8 @@ def main():
     """CLI entry point for ingestion pipeline."""
     import argparse
 
+    from ingestion.event_discovery import ARRAY_SAMPLING_STRATEGIES
+
     parser = argparse.ArgumentParser(
         description="Ingest WebSocket recordings into knowledge base"
     )
@@ -233,6 +358,33 @@ def main():
         action="store_true",
         help="Skip embedding generation",
     )
+    parser.add_argument(
+        "--event-sample-rate",
+        type=int,
+        default=100,
+        help="Embed every Nth raw event with --no-reduce (0 = schemas only, default: 100)",
+    )
+    parser.add_argument(
+        "--no-reduce",
+        action="store_true",
+        help="Embed sampled raw events instead of per-game summaries",
+    )
+    parser.add_argument(
+        "--array-sampling",
+        choices=ARRAY_SAMPLING_STRATEGIES,
+        default="all",
+        help="Element sampling for arrays of objects during discovery (default: all)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile each phase with cProfile (stats in <output>/profiles/)",
+    )
+    parser.add_argument(
+        "--compact-json",
+        action="store_true",
+        help="Write the generated JSON files compact (not chunkable by line)",
+    )
     parser.add_argument(
         "--quiet",
         action="store_true",
@@ -265,6 +417,11 @@ def main():
         dictionary_path=args.dictionary,
         embed=not args.no_embed,
         verbose=not args.quiet,
+        event_sample_rate=args.event_sample_rate,
+        reduce_events=not args.no_reduce,
+        array_sampling=args.array_sampling,
+        profile=args.profile,
+        compact_json=args.compact_json,
     )
 
     if result.errors:
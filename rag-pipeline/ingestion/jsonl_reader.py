@@ -0,0 +1,246 @@
+"""Memory-mapped JSONL reading for large WebSocket captures.
+
+Text-mode iteration decodes every byte of a capture to str before the
+caller can decide whether the line matters. This reader maps the file
+and works on bytes instead:
+
+- newline boundaries are found with mmap.find(), so lines are sliced
+  without an intermediate decode
+- an optional event-type prefilter skips lines that cannot contain the
+  wanted ``"event": "..."`` value before json.loads() sees them
+- a file can be split into newline-aligned byte shards so N workers can
+  scan one huge capture in parallel
+
+Compressed recording segments (``*.jsonl.gz`` / ``*.jsonl.zst`` from
+recording_segments) cannot be mapped; they are streamed through
+open_segment() instead, with offsets into the decompressed stream and no
+byte ranges or shards. recording_files() lists a directory's captures
+including such segments.
+
+Example:
+    >>> for offset, record in iter_records(path, event_types=["gameStateUpdate"]):
+    ...     print(record["data"]["price"])
+    >>> shards = shard_boundaries(path, 4)  # [(0, 1048576), (1048576, ...), ...]
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+from pathlib import Path
+from typing import Any, Iterator
+
+# Segment suffixes (recording_segments) read as decompressed streams
+COMPRESSED_SUFFIXES = (".gz", ".zst")
+
+
+def is_compressed(file_path: Path) -> bool:
+    """Whether a capture is a compressed segment (streamed, not mapped)."""
+    return Path(file_path).suffix in COMPRESSED_SUFFIXES
+
+
+def recording_files(directory: Path, pattern: str = "*.jsonl") -> list[Path]:
+    """Captures in a directory, including compressed segments.
+
+    Args:
+        directory: Directory containing recordings
+        pattern: Glob pattern for plain captures; ``pattern + ".gz"`` and
+            ``pattern + ".zst"`` pick up compressed segments
+
+    Returns:
+        Sorted list of capture paths
+    """
+    files = set(directory.glob(pattern))
+    for suffix in COMPRESSED_SUFFIXES:
+        files.update(directory.glob(pattern + suffix))
+    return sorted(files)
+
+
+def event_needles(event_types: list[str]) -> tuple[bytes, ...]:
+    """Byte patterns that a line of one of these event types must contain.
+
+    Covers both the default json.dumps separator (``"event": "x"``) and
+    the compact one (``"event":"x"``).
+
+    Args:
+        event_types: Event names to match
+
+    Returns:
+        Tuple of byte patterns
+    """
+    needles = []
+    for name in event_types:
+        value = json.dumps(name).encode("utf-8")
+        needles.append(b'"event": ' + value)
+        needles.append(b'"event":' + value)
+    return tuple(needles)
+
+
+def shard_boundaries(file_path: Path, shards: int) -> list[tuple[int, int]]:
+    """Split a file into newline-aligned byte ranges.
+
+    Every range starts at the beginning of a line and ends just after a
+    newline (or at end of file), so each line belongs to exactly one
+    shard. Small files may yield fewer ranges than requested.
+
+    Args:
+        file_path: JSONL file
+        shards: Desired number of ranges
+
+    Returns:
+        List of (start, end) byte offsets covering the whole file
+    """
+    size = os.path.getsize(file_path)
+    if size == 0:
+        return []
+    shards = max(1, shards)
+
+    bounds = [0]
+    with open(file_path, "rb") as f:
+        for i in range(1, shards):
+            target = max(size * i // shards, bounds[-1])
+            f.seek(target)
+            f.readline()  # advance to the next line start
+            cut = f.tell()
+            if cut >= size:
+                break
+            if cut > bounds[-1]:
+                bounds.append(cut)
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def iter_lines(
+    file_path: Path,
+    start: int = 0,
+    end: int | None = None,
+    event_types: list[str] | None = None,
+    complete_only: bool = False,
+) -> Iterator[tuple[int, bytes]]:
+    """Iterate raw lines of a file via mmap.
+
+    Compressed segments are streamed instead (see is_compressed()); they
+    only support reading from the start.
+
+    Args:
+        file_path: JSONL file or compressed segment
+        start: Byte offset of the first line (must be a line start)
+        end: Byte offset to stop at (default: end of file)
+        event_types: If given, skip lines that lack every event needle.
+            Matching lines may still be false positives (the pattern can
+            appear inside a payload), so callers must check the parsed
+            event name.
+        complete_only: Stop before a final line lacking a newline (a
+            recorder still writing it)
+
+    Yields:
+        (byte offset, line bytes including its newline, if any)
+
+    Raises:
+        ValueError: If a byte range is requested for a compressed segment
+    """
+    needles = event_needles(event_types) if event_types is not None else None
+    if is_compressed(file_path):
+        if start or end is not None:
+            raise ValueError(f"{file_path}: compressed segments cannot be read by byte range")
+        yield from _iter_stream(file_path, needles, complete_only)
+        return
+
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield from _iter_mapped(
+                mm,
+                start,
+                size if end is None else min(end, size),
+                needles,
+                complete_only,
+            )
+
+
+def _iter_stream(
+    file_path: Path,
+    needles: tuple[bytes, ...] | None,
+    complete_only: bool,
+) -> Iterator[tuple[int, bytes]]:
+    # recording_segments imports modules that import this one
+    from ingestion.recording_segments import open_segment
+
+    pos = 0
+    with open_segment(file_path) as f:
+        for line in f:
+            if complete_only and not line.endswith(b"\n"):
+                return
+            if needles is None or any(needle in line for needle in needles):
+                yield pos, line
+            pos += len(line)
+
+
+def _iter_mapped(
+    mm: mmap.mmap,
+    pos: int,
+    end: int,
+    needles: tuple[bytes, ...] | None,
+    complete_only: bool,
+) -> Iterator[tuple[int, bytes]]:
+    find = mm.find
+    while pos < end:
+        nl = find(b"\n", pos, end)
+        if nl == -1:
+            if complete_only:
+                return
+            stop = end
+        else:
+            stop = nl + 1
+
+        if needles is None:
+            yield pos, mm[pos:stop]
+        else:
+            for needle in needles:
+                if find(needle, pos, stop) != -1:
+                    yield pos, mm[pos:stop]
+                    break
+        pos = stop
+
+
+def iter_records(
+    file_path: Path,
+    start: int = 0,
+    end: int | None = None,
+    event_types: list[str] | None = None,
+    errors: list[str] | None = None,
+) -> Iterator[tuple[int, dict[str, Any]]]:
+    """Iterate parsed JSON objects of a file via mmap.
+
+    Blank lines, ``#`` comment lines (recorder session headers) and
+    non-object lines are skipped. Event-type filtering is exact: the
+    byte prefilter is verified against the parsed record.
+
+    Args:
+        file_path: JSONL file
+        start: Byte offset of the first line (must be a line start)
+        end: Byte offset to stop at (default: end of file)
+        event_types: Only yield records with these event names
+        errors: If given, receives a message per unparseable line
+
+    Yields:
+        (byte offset, parsed record)
+    """
+    wanted = set(event_types) if event_types is not None else None
+    for offset, line in iter_lines(file_path, start, end, event_types):
+        line = line.strip()
+        if not line or line.startswith(b"#"):
+            continue
+        try:
+            record = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            if errors is not None:
+                errors.append(f"{file_path}:byte {offset}: {e}")
+            continue
+        if not isinstance(record, dict):
+            continue
+        if wanted is not None and record.get("event", "unknown") not in wanted:
+            continue
+        yield offset, record
@@ -0,0 +1,466 @@
+"""Segmented, compressed recordings with a per-segment manifest.
+
+A recorder left running for days otherwise produces one plain-text file
+that every reader has to scan end to end. SegmentedRecordingWriter
+splits a recording into numbered segments and keeps a JSON manifest
+next to them:
+
+    golden_hour.0001.jsonl.zst
+    golden_hour.0002.jsonl.zst
+    golden_hour.manifest.json
+
+A new segment starts after N bytes on disk, after N seconds, or (with
+``rotate_per_game``) whenever a new gameId appears. Each batch of lines
+is compressed independently and appended as a zstd frame or gzip
+member, so a segment still reads as one stream (zstdcat, zcat) and a
+crash loses at most the batch being written. The manifest records, per
+segment, the event counts, the ts_ms range and the gameIds seen, so
+readers pick segments from the manifest and only decompress those.
+
+Records are the recorders' JSON objects: the event name is read from
+``event`` (GoldenHourRecorder) or ``event_name`` (CDPCapture).
+
+Example:
+    >>> with SegmentedRecordingWriter(Path("rec.jsonl"), rotate_per_game=True) as writer:
+    ...     writer.write_records(batch)
+    >>> for record in iter_segment_records(Path("rec.jsonl"), game_ids=["20251215-abc123"]):
+    ...     print(record["event"], record["ts_ms"])
+"""
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+from ingestion.columnar import record_ts_ms
+from ingestion.event_chunker import extract_game_id
+
+# Bump when the manifest layout changes
+MANIFEST_VERSION = 1
+
+# Manifest file suffix, replacing the base path's extension
+MANIFEST_SUFFIX = ".manifest.json"
+
+# Segment compression -> file suffix
+COMPRESSION_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+# Compression level used when none is given
+DEFAULT_LEVELS = {"gzip": 6, "zstd": 3}
+
+
+def _import_zstandard():
+    """Import zstandard lazily."""
+    try:
+        import zstandard
+    except ImportError:
+        print("Error: zstandard not installed.")
+        print("Run: pip install zstandard")
+        sys.exit(1)
+    return zstandard
+
+
+def manifest_path_for(base_path: Path) -> Path:
+    """Manifest path for a recording's base path (rec.jsonl -> rec.manifest.json)."""
+    base_path = Path(base_path)
+    if base_path.name.endswith(MANIFEST_SUFFIX):
+        return base_path
+    return base_path.with_name(base_path.stem + MANIFEST_SUFFIX)
+
+
+def record_event_name(record: dict[str, Any]) -> str:
+    """Event name of a recorder record."""
+    return record.get("event") or record.get("event_name") or "unknown"
+
+
+def record_game_id(record: dict[str, Any]) -> str | None:
+    """gameId carried by a record's payload, if any.
+
+    GoldenHourRecorder stores the Socket.IO arguments as a list, so the
+    payload is its last element.
+    """
+    data = record.get("data")
+    if isinstance(data, list) and data:
+        data = data[-1]
+    return extract_game_id(data) or None
+
+
+class _Segment:
+    """Manifest entry for the segment being written."""
+
+    def __init__(self, number: int, path: Path):
+        self.number = number
+        self.path = path
+        self.opened_at = time.monotonic()
+        self.events = 0
+        self.event_counts: dict[str, int] = {}
+        self.ts_start_ms: int | None = None
+        self.ts_end_ms: int | None = None
+        self.game_ids: list[str] = []
+        self.raw_bytes = 0
+        self.bytes = 0
+        self.complete = False
+
+    def add(self, record: dict[str, Any], game_id: str | None, line_bytes: int) -> None:
+        self.events += 1
+        name = record_event_name(record)
+        self.event_counts[name] = self.event_counts.get(name, 0) + 1
+        ts_ms = record_ts_ms(record)
+        if ts_ms is not None:
+            if self.ts_start_ms is None or ts_ms < self.ts_start_ms:
+                self.ts_start_ms = ts_ms
+            if self.ts_end_ms is None or ts_ms > self.ts_end_ms:
+                self.ts_end_ms = ts_ms
+        if game_id is not None and game_id not in self.game_ids:
+            self.game_ids.append(game_id)
+        self.raw_bytes += line_bytes
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "file": self.path.name,
+            "events": self.events,
+            "event_counts": dict(sorted(self.event_counts.items())),
+            "ts_start_ms": self.ts_start_ms,
+            "ts_end_ms": self.ts_end_ms,
+            "game_ids": self.game_ids,
+            "raw_bytes": self.raw_bytes,
+            "bytes": self.bytes,
+            "complete": self.complete,
+        }
+
+
+class SegmentedRecordingWriter:
+    """Writes recorder records into rotating, compressed segments.
+
+    Not thread-safe: use it from one writer thread (or executor job) at
+    a time.
+    """
+
+    def __init__(
+        self,
+        base_path: Path,
+        compression: str = "zstd",
+        level: int | None = None,
+        rotate_bytes: int | None = None,
+        rotate_seconds: float | None = None,
+        rotate_per_game: bool = False,
+        header: Callable[[int], str] | None = None,
+    ):
+        """Set up the writer; the first segment opens on the first write.
+
+        Args:
+            base_path: Recording path without segment number (rec.jsonl)
+            compression: One of COMPRESSION_SUFFIXES
+            level: Compression level (default: DEFAULT_LEVELS)
+            rotate_bytes: Start a new segment after this many bytes on disk
+            rotate_seconds: Start a new segment after this many seconds
+            rotate_per_game: Start a new segment when a new gameId appears
+            header: Called with the segment number, returns a ``#`` comment
+                line written at the start of every segment
+
+        Raises:
+            ValueError: If compression is unknown
+        """
+        if compression not in COMPRESSION_SUFFIXES:
+            raise ValueError(
+                f"Unknown compression {compression!r}; "
+                f"expected one of {', '.join(COMPRESSION_SUFFIXES)}"
+            )
+        self.base_path = Path(base_path)
+        self.manifest_path = manifest_path_for(self.base_path)
+        self.compression = compression
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self.rotate_per_game = rotate_per_game
+        self.header = header
+        self.segments: list[_Segment] = []
+        self.stats = {"events": 0, "skipped": 0, "frames": 0, "raw_bytes": 0, "bytes": 0}
+
+        self._compress: Callable[[bytes], bytes] | None = None
+        if compression == "gzip":
+            gzip_level = DEFAULT_LEVELS["gzip"] if level is None else level
+            self._compress = lambda data: gzip.compress(data, compresslevel=gzip_level, mtime=0)
+        elif compression == "zstd":
+            zstd = _import_zstandard()
+            compressor = zstd.ZstdCompressor(level=DEFAULT_LEVELS["zstd"] if level is None else level)
+            self._compress = compressor.compress
+
+        self._file = None
+        self._game_id: str | None = None
+
+    @property
+    def paths(self) -> list[Path]:
+        """Segment files written so far."""
+        return [segment.path for segment in self.segments]
+
+    def segment_path(self, number: int) -> Path:
+        """File path of segment ``number`` (1-based)."""
+        base = self.base_path
+        return base.with_name(
+            f"{base.stem}.{number:04d}{base.suffix}{COMPRESSION_SUFFIXES[self.compression]}"
+        )
+
+    def write_records(self, records: Iterable[dict[str, Any]]) -> int:
+        """Append records, one frame per segment touched.
+
+        Records that json cannot encode are skipped and counted in
+        ``stats["skipped"]``.
+
+        Args:
+            records: Recorder records
+
+        Returns:
+            Bytes written to disk
+        """
+        written = 0
+        lines: list[str] = []
+        for record in records:
+            try:
+                line = json.dumps(record) + "\n"
+            except (TypeError, ValueError):
+                self.stats["skipped"] += 1
+                continue
+            game_id = record_game_id(record)
+            if self._file is None or self._rotation_due(game_id):
+                written += self._write_frame(lines)
+                lines = []
+                self._open_next()
+            if game_id is not None:
+                self._game_id = game_id
+            self.segments[-1].add(record, game_id, len(line))
+            lines.append(line)
+        written += self._write_frame(lines)
+        self.stats["events"] += len(lines)
+        return written
+
+    def sync(self) -> None:
+        """fsync the current segment."""
+        if self._file is not None:
+            os.fsync(self._file.fileno())
+
+    def close(self, footer: str | None = None) -> dict[str, Any]:
+        """Write an optional ``#`` footer line, close the segment and save the manifest.
+
+        Returns:
+            The final manifest
+        """
+        if footer is not None:
+            if self._file is None:
+                self._open_next()
+            self._write_frame([footer if footer.endswith("\n") else footer + "\n"])
+        self._close_segment()
+        return self._save_manifest()
+
+    def __enter__(self) -> "SegmentedRecordingWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _rotation_due(self, game_id: str | None) -> bool:
+        segment = self.segments[-1]
+        if self.rotate_bytes and segment.bytes >= self.rotate_bytes:
+            return True
+        if self.rotate_seconds and time.monotonic() - segment.opened_at >= self.rotate_seconds:
+            return True
+        return (
+            self.rotate_per_game
+            and game_id is not None
+            and self._game_id is not None
+            and game_id != self._game_id
+            and game_id not in segment.game_ids
+        )
+
+    def _open_next(self) -> None:
+        self._close_segment()
+        segment = _Segment(len(self.segments) + 1, self.segment_path(len(self.segments) + 1))
+        segment.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(segment.path, "ab")
+        self.segments.append(segment)
+        if self.header:
+            self._write_frame([self.header(segment.number)])
+        self._save_manifest()
+
+    def _close_segment(self) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        self.segments[-1].complete = True
+        self._save_manifest()
+
+    def _write_frame(self, lines: list[str]) -> int:
+        if not lines:
+            return 0
+        data = "".join(lines).encode("utf-8")
+        frame = self._compress(data) if self._compress else data
+        self._file.write(frame)
+        self._file.flush()
+        self.segments[-1].bytes += len(frame)
+        stats = self.stats
+        stats["frames"] += 1
+        stats["raw_bytes"] += len(data)
+        stats["bytes"] += len(frame)
+        return len(frame)
+
+    def _save_manifest(self) -> dict[str, Any]:
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "base": self.base_path.name,
+            "compression": self.compression,
+            "rotation": {
+                "bytes": self.rotate_bytes,
+                "seconds": self.rotate_seconds,
+                "per_game": self.rotate_per_game,
+            },
+            "segments": [segment.to_dict() for segment in self.segments],
+        }
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+        return manifest
+
+
+# -----------------------------------------------------------------------------
+# Reading
+# -----------------------------------------------------------------------------
+
+
+def load_manifest(path: Path) -> dict[str, Any]:
+    """Load a recording manifest.
+
+    Args:
+        path: Manifest file or the recording's base path
+
+    Returns:
+        Manifest dict
+
+    Raises:
+        ValueError: If the manifest version is not supported
+    """
+    with open(manifest_path_for(path), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(
+            f"Unsupported recording manifest version {manifest.get('version')!r} "
+            f"(expected {MANIFEST_VERSION})"
+        )
+    return manifest
+
+
+def select_segments(
+    manifest: dict[str, Any],
+    start_ms: int | None = None,
+    end_ms: int | None = None,
+    game_ids: list[str] | None = None,
+    event_types: list[str] | None = None,
+) -> list[dict[str, Any]]:
+    """Pick the segments that can hold matching records.
+
+    Segments still being written (``complete`` false) have partial
+    metadata and are always selected.
+
+    Args:
+        manifest: Loaded manifest
+        start_ms: Inclusive lower bound on ts_ms
+        end_ms: Inclusive upper bound on ts_ms
+        game_ids: Segments that saw any of these gameIds
+        event_types: Segments containing any of these event types
+
+    Returns:
+        Manifest segment entries in recording order
+    """
+    wanted_games = set(game_ids) if game_ids is not None else None
+    selected = []
+    for segment in manifest["segments"]:
+        if segment.get("complete"):
+            first, last = segment.get("ts_start_ms"), segment.get("ts_end_ms")
+            if start_ms is not None and (last is None or last < start_ms):
+                continue
+            if end_ms is not None and (first is None or first > end_ms):
+                continue
+            if wanted_games is not None and wanted_games.isdisjoint(segment["game_ids"]):
+                continue
+            if event_types is not None and not any(
+                name in segment["event_counts"] for name in event_types
+            ):
+                continue
+        selected.append(segment)
+    return selected
+
+
+def open_segment(path: Path):
+    """Open a segment as a binary stream, decompressing by file suffix."""
+    path = Path(path)
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb")
+    if path.suffix == ".zst":
+        zstd = _import_zstandard()
+        raw = open(path, "rb")
+        return io.BufferedReader(
+            zstd.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True)
+        )
+    return open(path, "rb")
+
+
+def iter_segment_records(
+    path: Path,
+    start_ms: int | None = None,
+    end_ms: int | None = None,
+    game_ids: list[str] | None = None,
+    event_types: list[str] | None = None,
+    errors: list[str] | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Yield records from the segments matching the filters.
+
+    Only selected segments are opened. Within them, event type and time
+    filters are exact; ``game_ids`` selects whole segments, so records
+    without a gameId (chat, trades) that share a segment with the game
+    are kept.
+
+    Args:
+        path: Manifest file or the recording's base path
+        start_ms: Inclusive lower bound on ts_ms
+        end_ms: Inclusive upper bound on ts_ms
+        game_ids: Only segments that saw any of these gameIds
+        event_types: Only records with these event names
+        errors: If given, receives a message per unparseable line
+
+    Yields:
+        Parsed records in recording order
+    """
+    manifest_path = manifest_path_for(path)
+    manifest = load_manifest(manifest_path)
+    wanted = set(event_types) if event_types is not None else None
+    for segment in select_segments(manifest, start_ms, end_ms, game_ids, event_types):
+        segment_path = manifest_path.with_name(segment["file"])
+        with open_segment(segment_path) as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line or line.startswith(b"#"):
+                    continue
+                try:
+                    record = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                    if errors is not None:
+                        errors.append(f"{segment_path}:{line_number}: {e}")
+                    continue
+                if not isinstance(record, dict):
+                    continue
+                if wanted is not None and record_event_name(record) not in wanted:
+                    continue
+                if start_ms is not None or end_ms is not None:
+                    ts_ms = record_ts_ms(record)
+                    if ts_ms is None:
+                        continue
+                    if start_ms is not None and ts_ms < start_ms:
+                        continue
+                    if end_ms is not None and ts_ms > end_ms:
+                        continue
+                yield record
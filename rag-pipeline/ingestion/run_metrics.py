@@ -0,0 +1,197 @@
+"""Per-phase timing, throughput and memory metrics for ingestion runs.
+
+RunMetrics wraps each pipeline phase in a context manager that records
+wall time, CPU time and the process's peak RSS, while the phase fills in
+what it processed (events, bytes, chunks). Rates are derived from those.
+With a profile directory set, each phase also runs under cProfile and
+its stats are dumped to ``<profile_dir>/<phase>.prof`` for inspection
+with ``python -m pstats`` or snakeviz.
+
+Example:
+    >>> metrics = RunMetrics("jsonl_ingest")
+    >>> with metrics.phase("discovery") as phase:
+    ...     result = scan_recordings(recordings)
+    ...     phase.events = result.total_lines
+    >>> metrics.append_log(Path("generated/run_log.jsonl"))
+"""
+from __future__ import annotations
+
+import json
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+# Name of the JSON-lines run log written next to the generated outputs
+RUN_LOG_FILENAME = "run_log.jsonl"
+
+
+def peak_rss_mb() -> float | None:
+    """Peak resident set size of this process in MiB (None if unavailable)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _rate(count: int, seconds: float) -> float | None:
+    return round(count / seconds, 1) if count and seconds > 0 else None
+
+
+@dataclass
+class PhaseMetrics:
+    """Measurements of one pipeline phase.
+
+    Attributes:
+        name: Phase name
+        wall_s: Elapsed wall-clock seconds
+        cpu_s: CPU seconds used by this process (worker processes excluded)
+        events: Events processed
+        bytes: Input bytes processed
+        chunks: Chunks produced or embedded
+        peak_rss_mb: Process peak RSS when the phase finished
+        extra: Phase-specific figures (e.g. seconds spent encoding)
+        profile: Path of the cProfile dump, if profiling
+    """
+
+    name: str
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    events: int = 0
+    bytes: int = 0
+    chunks: int = 0
+    peak_rss_mb: float | None = None
+    extra: dict[str, Any] = field(default_factory=dict)
+    profile: str | None = None
+
+    @property
+    def events_per_s(self) -> float | None:
+        return _rate(self.events, self.wall_s)
+
+    @property
+    def bytes_per_s(self) -> float | None:
+        return _rate(self.bytes, self.wall_s)
+
+    @property
+    def chunks_per_s(self) -> float | None:
+        return _rate(self.chunks, self.wall_s)
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-compatible dict including derived rates."""
+        data = {
+            "name": self.name,
+            "wall_s": round(self.wall_s, 4),
+            "cpu_s": round(self.cpu_s, 4),
+            "events": self.events,
+            "bytes": self.bytes,
+            "chunks": self.chunks,
+            "events_per_s": self.events_per_s,
+            "bytes_per_s": self.bytes_per_s,
+            "chunks_per_s": self.chunks_per_s,
+            "peak_rss_mb": None if self.peak_rss_mb is None else round(self.peak_rss_mb, 1),
+        }
+        if self.extra:
+            data["extra"] = self.extra
+        if self.profile:
+            data["profile"] = self.profile
+        return data
+
+    def format_line(self) -> str:
+        """One-line human-readable summary."""
+        parts = [f"{self.name}: {self.wall_s:.2f}s wall, {self.cpu_s:.2f}s cpu"]
+        if self.events:
+            parts.append(f"{self.events_per_s or 0:,.0f} events/s")
+        if self.bytes:
+            parts.append(f"{(self.bytes_per_s or 0) / 1e6:,.1f} MB/s")
+        if self.chunks:
+            parts.append(f"{self.chunks_per_s or 0:,.1f} chunks/s")
+        if self.peak_rss_mb is not None:
+            parts.append(f"peak RSS {self.peak_rss_mb:,.0f} MiB")
+        return ", ".join(parts)
+
+
+class RunMetrics:
+    """Collects PhaseMetrics for one run.
+
+    Args:
+        pipeline: Pipeline name recorded in the run log
+        profile_dir: Write a cProfile dump per phase to this directory
+    """
+
+    def __init__(self, pipeline: str, profile_dir: Path | None = None):
+        self.pipeline = pipeline
+        self.profile_dir = profile_dir
+        self.started = datetime.now(timezone.utc)
+        self.phases: list[PhaseMetrics] = []
+        self.info: dict[str, Any] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[PhaseMetrics]:
+        """Measure a phase; the body sets events/bytes/chunks on the yielded object."""
+        metrics = PhaseMetrics(name)
+        profiler = None
+        if self.profile_dir is not None:
+            import cProfile
+
+            profiler = cProfile.Profile()
+
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield metrics
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            metrics.wall_s = time.perf_counter() - wall
+            metrics.cpu_s = time.process_time() - cpu
+            metrics.peak_rss_mb = peak_rss_mb()
+            if profiler is not None:
+                self.profile_dir.mkdir(parents=True, exist_ok=True)
+                profile_path = self.profile_dir / f"{name}.prof"
+                profiler.dump_stats(str(profile_path))
+                metrics.profile = str(profile_path)
+            self.phases.append(metrics)
+
+    def total(self) -> PhaseMetrics:
+        """Sum of all phases (peak RSS is the maximum)."""
+        total = PhaseMetrics("total")
+        for phase in self.phases:
+            total.wall_s += phase.wall_s
+            total.cpu_s += phase.cpu_s
+            total.events = max(total.events, phase.events)
+            total.bytes = max(total.bytes, phase.bytes)
+            total.chunks += phase.chunks
+        peaks = [p.peak_rss_mb for p in self.phases if p.peak_rss_mb is not None]
+        total.peak_rss_mb = max(peaks) if peaks else None
+        return total
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-compatible run record."""
+        return {
+            "pipeline": self.pipeline,
+            "started": self.started.isoformat(),
+            "python": sys.version.split()[0],
+            **self.info,
+            "phases": [phase.to_dict() for phase in self.phases],
+            "total": self.total().to_dict(),
+        }
+
+    def append_log(self, path: Path) -> None:
+        """Append this run as one JSON line to a run log."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.to_dict(), separators=(",", ":")) + "\n")
+
+    def print_summary(self) -> None:
+        """Print one line per phase plus the total."""
+        for phase in self.phases:
+            print(f"  {phase.format_line()}")
+        print(f"  {self.total().format_line()}")
@@ -16,14 +16,22 @@ from __future__ import annotations
 import json
 from typing import Any
 
-from ingestion.event_discovery import DiscoveryResult, EventInfo, FieldInfo
+from ingestion.event_discovery import (
+    DiscoveryResult,
+    EventInfo,
+    FieldInfo,
+    ordered_types,
+    primary_type,
+)
 
 
 def generate_event_schema(event: EventInfo) -> dict[str, Any]:
     """Generate JSON Schema for an event type.
 
     Converts the flat field paths discovered into a properly nested
-    JSON Schema structure with type information and examples.
+    JSON Schema structure with type information and examples. Fields
+    seen with several types get ``anyOf`` (or a nullable type) and an
+    ``x-types`` histogram.
 
     Args:
         event: EventInfo from discovery
@@ -31,7 +39,18 @@ def generate_event_schema(event: EventInfo) -> dict[str, Any]:
     Returns:
         JSON Schema dict conforming to draft-07
     """
-    schema: dict[str, Any] = {
+    schema = _empty_event_schema(event)
+
+    # Group fields by their path structure
+    for path, field in sorted(event.fields.items()):
+        _add_field_to_schema(schema["properties"], path, field)
+
+    return finalize_schema(schema)
+
+
+def _empty_event_schema(event: EventInfo) -> dict[str, Any]:
+    """Top-level schema for an event, before any fields are added."""
+    return {
         "$schema": "http://json-schema.org/draft-07/schema#",
         "title": event.name,
         "type": "object",
@@ -39,11 +58,34 @@ def generate_event_schema(event: EventInfo) -> dict[str, Any]:
         "x-frequency": event.count,
     }
 
-    # Group fields by their path structure
-    for path, field in sorted(event.fields.items()):
-        _add_field_to_schema(schema["properties"], path, field)
 
-    return schema
+class SchemaBuilder:
+    """Builds all event schemas incrementally from a single traversal.
+
+    Feed every event via add_event() followed by its fields in sorted
+    path order via add_field(); result() returns the same dict as
+    generate_all_schemas().
+    """
+
+    def __init__(self):
+        self.schemas: dict[str, dict[str, Any]] = {}
+
+    def add_event(self, event: EventInfo) -> None:
+        self.schemas[event.name] = _empty_event_schema(event)
+
+    def add_field(
+        self,
+        event_name: str,
+        path: str,
+        field: FieldInfo,
+        summary: dict[str, Any] | None = None,
+    ) -> None:
+        _add_field_to_schema(self.schemas[event_name]["properties"], path, field)
+
+    def result(self) -> dict[str, dict[str, Any]]:
+        for schema in self.schemas.values():
+            finalize_schema(schema)
+        return self.schemas
 
 
 def _add_field_to_schema(
@@ -58,6 +100,11 @@ def _add_field_to_schema(
     - "data.leaderboard[]" -> properties.data.properties.leaderboard (array)
     - "data.leaderboard[].id" -> properties.data.properties.leaderboard.items.properties.id
 
+    Nodes are merged rather than overwritten, so a path that is an object
+    in some records and an array or scalar in others keeps every type.
+    While building, a union is a list of types next to the keywords of
+    each type; finalize_schema() turns it into anyOf branches.
+
     Args:
         properties: Current properties dict to add to
         path: Full field path
@@ -72,47 +119,149 @@ def _add_field_to_schema(
         clean_part = part.rstrip("[]")
 
         if is_last:
-            # Final field - add the actual type info
             if is_array:
-                # This is an array field
-                if clean_part not in current:
-                    current[clean_part] = {
-                        "type": "array",
-                        "items": {"type": field.type, "properties": {}},
-                    }
-                else:
-                    # Update existing array definition
-                    if "items" not in current[clean_part]:
-                        current[clean_part]["items"] = {
-                            "type": field.type,
-                            "properties": {},
-                        }
+                # Array elements: the field's histogram holds element types
+                node = current.setdefault(clean_part, {"type": "array"})
+                _add_types(node, {"array": 0})
+                _merge_node(node.setdefault("items", {}), _leaf_node(field, False))
             else:
-                # Regular field
-                field_schema: dict[str, Any] = {
-                    "type": field.type,
-                    "x-frequency": field.count,
-                }
-                if field.sample_values:
-                    field_schema["examples"] = field.sample_values
-                current[clean_part] = field_schema
+                _merge_node(current.setdefault(clean_part, {}), _leaf_node(field, True))
         else:
             # Intermediate path - ensure structure exists
+            node = current.setdefault(clean_part, {})
             if is_array:
                 # This is an intermediate array (e.g., leaderboard[] in leaderboard[].id)
-                if clean_part not in current:
-                    current[clean_part] = {
-                        "type": "array",
-                        "items": {"type": "object", "properties": {}},
-                    }
-                current = current[clean_part]["items"]["properties"]
-            else:
-                # Regular nested object
-                if clean_part not in current:
-                    current[clean_part] = {"type": "object", "properties": {}}
-                if "properties" not in current[clean_part]:
-                    current[clean_part]["properties"] = {}
-                current = current[clean_part]["properties"]
+                _add_types(node, {"array": 0})
+                node = node.setdefault("items", {})
+            _add_types(node, {"object": 0})
+            current = node.setdefault("properties", {})
+
+
+def _type_list(node: dict[str, Any]) -> list[str]:
+    node_type = node.get("type")
+    if node_type is None:
+        return []
+    return [node_type] if isinstance(node_type, str) else list(node_type)
+
+
+def _add_types(node: dict[str, Any], counts: dict[str, int]) -> None:
+    """Union ``counts``' types into a node's type, keeping "null" last."""
+    types = [t for t in _type_list(node) if t != "null"]
+    nullable = "null" in _type_list(node)
+    for value_type in ordered_types(counts):
+        if value_type == "null":
+            nullable = True
+        elif value_type not in types:
+            types.append(value_type)
+    if nullable:
+        types.append("null")
+    if types:
+        node["type"] = types[0] if len(types) == 1 else types
+
+
+def _leaf_node(field: FieldInfo, with_stats: bool) -> dict[str, Any]:
+    """Schema node for a field's own observations."""
+    counts = field.type_counts()
+    node: dict[str, Any] = {}
+    _add_types(node, counts)
+    if "object" in counts:
+        node["properties"] = {}
+    if with_stats:
+        node["x-frequency"] = field.count
+        if field.sample_values:
+            node["examples"] = field.sample_values
+    if len(counts) > 1:
+        node["x-types"] = {t: counts[t] for t in ordered_types(counts)}
+    return node
+
+
+def _merge_node(target: dict[str, Any], source: dict[str, Any]) -> None:
+    """Merge schema node ``source`` into ``target`` in place.
+
+    Types are unioned, properties and items merged recursively, examples
+    combined (up to 5) and type histograms summed.
+    """
+    _add_types(target, {t: 0 for t in _type_list(source)})
+    for name, child in source.get("properties", {}).items():
+        _merge_node(target.setdefault("properties", {}).setdefault(name, {}), child)
+    if "properties" in source:
+        target.setdefault("properties", {})
+    if "items" in source:
+        _merge_node(target.setdefault("items", {}), source["items"])
+    if "x-frequency" in source:
+        target["x-frequency"] = target.get("x-frequency", 0) + source["x-frequency"]
+    if "examples" in source:
+        examples = target.setdefault("examples", [])
+        for example in source["examples"]:
+            if example not in examples and len(examples) < 5:
+                examples.append(example)
+    if "x-types" in source:
+        histogram = target.setdefault("x-types", {})
+        for value_type, count in source["x-types"].items():
+            histogram[value_type] = histogram.get(value_type, 0) + count
+
+
+def finalize_schema(node: dict[str, Any]) -> dict[str, Any]:
+    """Rewrite built schema nodes into standard JSON Schema, in place.
+
+    A node with one type plus null becomes nullable (``"type": ["number",
+    "null"]``). A node with several non-null types becomes ``anyOf`` with
+    one branch per type, carrying that type's ``properties`` or ``items``,
+    plus a ``{"type": "null"}`` branch if nulls were seen.
+
+    Args:
+        node: Schema (or property node) produced by _add_field_to_schema()
+
+    Returns:
+        The same node
+    """
+    for child in node.get("properties", {}).values():
+        finalize_schema(child)
+    if "items" in node:
+        finalize_schema(node["items"])
+
+    types = _type_list(node)
+    non_null = [t for t in types if t != "null"]
+    if len(non_null) <= 1:
+        return node
+
+    branches = []
+    for value_type in non_null:
+        branch: dict[str, Any] = {"type": value_type}
+        if value_type == "object" and "properties" in node:
+            branch["properties"] = node.pop("properties")
+        elif value_type == "array" and "items" in node:
+            branch["items"] = node.pop("items")
+        branches.append(branch)
+    if "null" in types:
+        branches.append({"type": "null"})
+
+    rest = {key: value for key, value in node.items() if key != "type"}
+    node.clear()
+    node["anyOf"] = branches
+    node.update(rest)
+    return node
+
+
+def schema_types(node: dict[str, Any]) -> list[str]:
+    """JSON types a finalized schema node accepts (from type or anyOf)."""
+    if "anyOf" in node:
+        return [t for branch in node["anyOf"] for t in _type_list(branch)]
+    return _type_list(node)
+
+
+def schema_branch(node: dict[str, Any], value_type: str) -> dict[str, Any] | None:
+    """The part of a finalized node describing ``value_type`` values.
+
+    Returns the anyOf branch of that type, the node itself if it has the
+    type, or None.
+    """
+    if "anyOf" in node:
+        for branch in node["anyOf"]:
+            if value_type in _type_list(branch):
+                return branch
+        return None
+    return node if value_type in _type_list(node) else None
 
 
 def generate_field_index(result: DiscoveryResult) -> dict[str, dict[str, Any]]:
@@ -120,7 +269,9 @@ def generate_field_index(result: DiscoveryResult) -> dict[str, dict[str, Any]]:
 
     Creates a searchable index where each unique field path maps to
     metadata about that field including which events it appears in,
-    its type, frequency, and sample values.
+    its primary type (plus a "types" histogram if several were seen),
+    frequency, sample values, and (for primitive fields) distribution
+    statistics merged across events.
 
     Args:
         result: Complete discovery result
@@ -128,38 +279,114 @@ def generate_field_index(result: DiscoveryResult) -> dict[str, dict[str, Any]]:
     Returns:
         Dict mapping field paths to metadata
     """
-    index: dict[str, dict[str, Any]] = {}
-
+    builder = FieldIndexBuilder()
     for event_name, event in result.events.items():
         for path, field in event.fields.items():
-            if path not in index:
-                index[path] = {
-                    "events": [event_name],
-                    "type": field.type,
-                    "frequency": field.count,
-                    "samples": field.sample_values[:5],
-                }
-            else:
-                # Field appears in multiple events
-                if event_name not in index[path]["events"]:
-                    index[path]["events"].append(event_name)
-                index[path]["frequency"] += field.count
+            builder.add_field(event_name, path, field)
+    return builder.result()
+
+
+class FieldIndexBuilder:
+    """Builds the flat field index incrementally from a single traversal.
 
-                # Merge sample values
-                for sample in field.sample_values:
-                    if (
-                        sample not in index[path]["samples"]
-                        and len(index[path]["samples"]) < 5
-                    ):
-                        index[path]["samples"].append(sample)
+    add_field() may be given the field's precomputed stats summary; it
+    is reused for paths that occur in only one event instead of being
+    recomputed. result() returns the same dict as generate_field_index().
+    """
+
+    def __init__(self):
+        self.index: dict[str, dict[str, Any]] = {}
+        self._path_fields: dict[str, list[FieldInfo]] = {}
+        self._summaries: dict[str, dict[str, Any] | None] = {}
+        self._types: dict[str, dict[str, int]] = {}
+
+    def add_event(self, event: EventInfo) -> None:
+        pass
+
+    def add_field(
+        self,
+        event_name: str,
+        path: str,
+        field: FieldInfo,
+        summary: dict[str, Any] | None = None,
+    ) -> None:
+        index = self.index
+        self._path_fields.setdefault(path, []).append(field)
+        if summary is not None:
+            self._summaries[path] = summary
+
+        types = self._types.setdefault(path, {})
+        for value_type, count in field.type_counts().items():
+            types[value_type] = types.get(value_type, 0) + count
+
+        if path not in index:
+            index[path] = {
+                "events": [event_name],
+                "type": field.type,
+                "frequency": field.count,
+                "samples": field.sample_values[:5],
+            }
+        else:
+            # Field appears in multiple events
+            if event_name not in index[path]["events"]:
+                index[path]["events"].append(event_name)
+            index[path]["frequency"] += field.count
+
+            # Merge sample values
+            for sample in field.sample_values:
+                if (
+                    sample not in index[path]["samples"]
+                    and len(index[path]["samples"]) < 5
+                ):
+                    index[path]["samples"].append(sample)
+
+    def result(self) -> dict[str, dict[str, Any]]:
+        # Simplify single-event fields
+        for path, info in self.index.items():
+            if "events" in info and len(info["events"]) == 1:
+                info["event"] = info["events"][0]
+                del info["events"]
+
+            # Fields seen with several types (e.g. nullable) keep the histogram
+            types = self._types[path]
+            if len(types) > 1:
+                info["type"] = primary_type(types)
+                info["types"] = {t: types[t] for t in ordered_types(types)}
+
+            stats = _merged_stats_summary(
+                self._path_fields[path], self._summaries.get(path)
+            )
+            if stats:
+                info["stats"] = stats
+
+        return self.index
+
+
+def _merged_stats_summary(
+    fields: list[FieldInfo],
+    summary: dict[str, Any] | None = None,
+) -> dict[str, Any] | None:
+    """Summarize field statistics merged across every event a path occurs in.
+
+    Args:
+        fields: FieldInfo for the same path from each event
+        summary: Precomputed stats_summary() of the observed field, used
+            when only one event observed values for the path
 
-    # Simplify single-event fields
-    for path, info in index.items():
-        if len(info["events"]) == 1:
-            info["event"] = info["events"][0]
-            del info["events"]
+    Returns:
+        Stats summary dict, or None if no primitive values were observed
+    """
+    observed = [f for f in fields if f.stats.count]
+    if not observed:
+        return None
+    if len(observed) == 1:
+        return summary if summary is not None else observed[0].stats_summary()
 
-    return index
+    # Copy so merging does not mutate the discovery result
+    merged = observed[0].stats.copy()
+    for field in observed[1:]:
+        merged.merge(field.stats)
+    return merged.summary(total=sum(f.count for f in fields))
 
 
 def generate_all_schemas(result: DiscoveryResult) -> dict[str, dict[str, Any]]:
@@ -177,15 +404,44 @@ def generate_all_schemas(result: DiscoveryResult) -> dict[str, dict[str, Any]]:
     return schemas
 
 
+def write_json(obj: dict[str, Any], path, pretty: bool = False) -> None:
+    """Stream a dict to a JSON file one top-level entry at a time.
+
+    json.dump() always uses the pure-Python encoder; encoding each entry
+    with json.dumps() uses the C encoder while still writing
+    incrementally. With pretty=True the file is indented (slower).
+
+    Args:
+        obj: Dict to serialize
+        path: Output file path
+        pretty: Indent the output for human reading
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        if pretty:
+            json.dump(obj, f, indent=2)
+            return
+        f.write("{")
+        for i, (key, value) in enumerate(obj.items()):
+            if i:
+                f.write(",")
+            f.write(json.dumps(str(key)))
+            f.write(":")
+            f.write(json.dumps(value, separators=(",", ":")))
+        f.write("}")
+
+
 def save_schemas(
     schemas: dict[str, dict],
     output_path: str | None = None,
+    pretty: bool = True,
 ) -> str:
     """Save schemas to JSON file.
 
     Args:
         schemas: Dict of event name -> schema
         output_path: Output file path (default: discovered_schemas.json)
+        pretty: Indent the output (default); the knowledge base chunks
+            these files by line, so compact output is opt-in
 
     Returns:
         Path to saved file
@@ -196,8 +452,7 @@ def save_schemas(
         output_path = "discovered_schemas.json"
 
     path = Path(output_path)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(schemas, f, indent=2)
+    write_json(schemas, path, pretty=pretty)
 
     return str(path)
 
@@ -205,12 +460,15 @@ def save_schemas(
 def save_field_index(
     index: dict[str, dict],
     output_path: str | None = None,
+    pretty: bool = True,
 ) -> str:
     """Save field index to JSON file.
 
     Args:
         index: Field index dict
         output_path: Output file path (default: discovered_fields.json)
+        pretty: Indent the output (default); the knowledge base chunks
+            these files by line, so compact output is opt-in
 
     Returns:
         Path to saved file
@@ -221,8 +479,7 @@ def save_field_index(
         output_path = "discovered_fields.json"
 
     path = Path(output_path)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(index, f, indent=2)
+    write_json(index, path, pretty=pretty)
 
     return str(path)
 
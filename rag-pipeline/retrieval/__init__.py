@@ -1,4 +1,5 @@
 """Retrieval module for RAG pipeline."""
-from .retrieve import search, search_with_filter
+from .retrieve import search, search_with_filter, search_events
+from .field_lookup import FieldIndex, lookup_field
 
-__all__ = ["search", "search_with_filter"]
+__all__ = ["search", "search_with_filter", "search_events", "FieldIndex", "lookup_field"]
@@ -0,0 +1,374 @@
+"""Exact, prefix and fuzzy lookups over the generated field index.
+
+discovered_fields.json (schema_generator.generate_field_index) maps
+every field path to its events, type, frequency and samples. FieldIndex
+loads it once and builds three structures so agents get exact field
+answers without vector search over schema chunks:
+
+- a trie over lowercased path segments ("data" -> "leaderboard[]" ->
+  "pnl") for exact and prefix lookups, tolerant of omitted "[]" markers
+- a reverse map from event type to its field paths
+- a character trigram index for fuzzy matching of fragments and typos
+
+Example:
+    >>> index = FieldIndex.load()
+    >>> index.lookup("data.leaderboard.pnl")["exact"]["path"]
+    'data.leaderboard[].pnl'
+    >>> [m["path"] for m in index.fuzzy("rugtick")]
+"""
+from __future__ import annotations
+
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Any
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import RUGS_GENERATED_PATH
+
+# Default field index written by the ingestion pipeline
+DEFAULT_FIELD_INDEX = RUGS_GENERATED_PATH / "discovered_fields.json"
+
+# Fuzzy matches scoring below this Dice coefficient are dropped
+MIN_FUZZY_SCORE = 0.2
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def field_events(meta: dict[str, Any]) -> list[str]:
+    """Event types of a field index entry.
+
+    generate_field_index() stores single-event fields under "event" and
+    multi-event fields under "events".
+    """
+    if meta.get("events"):
+        return list(meta["events"])
+    return [meta["event"]] if meta.get("event") else []
+
+
+def split_path(path: str) -> list[str]:
+    """Split a field path into segments ("a.b[].c" -> ["a", "b[]", "c"])."""
+    return [segment for segment in path.split(".") if segment]
+
+
+def _variants(segment: str) -> tuple[str, ...]:
+    """Trie keys a query segment may stand for (its array form too)."""
+    segment = segment.lower()
+    if segment.endswith("[]"):
+        return (segment,)
+    return (segment, segment + "[]")
+
+
+def trigrams(text: str) -> set[str]:
+    """Character trigrams of the alphanumeric tokens of ``text``.
+
+    Tokens are padded so short names ("id", "pnl") still produce grams
+    and word boundaries count towards the match.
+    """
+    grams = set()
+    for token in _TOKEN.findall(text.lower()):
+        padded = f"  {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class _TrieNode:
+    """One path segment; ``path`` is set where a full field path ends."""
+
+    __slots__ = ("children", "path")
+
+    def __init__(self):
+        self.children: dict[str, _TrieNode] = {}
+        self.path: str | None = None
+
+
+class FieldIndex:
+    """Query structures over a field index dict.
+
+    Attributes:
+        fields: Field path -> metadata, as produced by generate_field_index()
+        event_fields: Event type -> sorted field paths seen in that event
+    """
+
+    def __init__(self, fields: dict[str, dict[str, Any]]):
+        self.fields = fields
+        self.event_fields: dict[str, list[str]] = {}
+        self._root = _TrieNode()
+        self._grams: dict[str, list[str]] = {}
+        self._gram_counts: dict[str, int] = {}
+        self._leaf_grams: dict[str, set[str]] = {}
+
+        for path, meta in fields.items():
+            node = self._root
+            for segment in split_path(path):
+                key = segment.lower()
+                child = node.children.get(key)
+                if child is None:
+                    child = node.children[key] = _TrieNode()
+                node = child
+            node.path = path
+
+            for event in field_events(meta):
+                self.event_fields.setdefault(event, []).append(path)
+
+            grams = trigrams(path)
+            self._gram_counts[path] = len(grams)
+            self._leaf_grams[path] = trigrams(split_path(path)[-1])
+            for gram in grams:
+                self._grams.setdefault(gram, []).append(path)
+
+        for paths in self.event_fields.values():
+            paths.sort()
+
+    @classmethod
+    def load(cls, path: Path | None = None) -> FieldIndex:
+        """Load discovered_fields.json (default: the pipeline output).
+
+        Raises:
+            FileNotFoundError: If the index has not been generated yet
+        """
+        path = Path(path or DEFAULT_FIELD_INDEX)
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def __contains__(self, path: str) -> bool:
+        return self.get(path) is not None
+
+    def _entry(self, path: str) -> dict[str, Any]:
+        return {"path": path, **self.fields[path]}
+
+    def _walk(self, segments: list[str]) -> list[_TrieNode]:
+        """Nodes reached by ``segments``, exact spellings first."""
+        nodes = [self._root]
+        for segment in segments:
+            nodes = [
+                child
+                for node in nodes
+                for key in _variants(segment)
+                if (child := node.children.get(key)) is not None
+            ]
+            if not nodes:
+                break
+        return nodes
+
+    def get(self, path: str) -> dict[str, Any] | None:
+        """Exact lookup; "[]" markers and case may be omitted.
+
+        Returns:
+            Field metadata with its canonical "path", or None
+        """
+        if path in self.fields:
+            return self._entry(path)
+        for node in self._walk(split_path(path)):
+            if node.path is not None:
+                return self._entry(node.path)
+        return None
+
+    def prefix(self, fragment: str, limit: int | None = None) -> list[str]:
+        """Field paths starting with ``fragment``.
+
+        Complete segments must match exactly (case and "[]" may be omitted);
+        the last segment may be partial, so "data.leader" finds every
+        path under "data.leaderboard[]".
+
+        Args:
+            fragment: Path prefix
+            limit: Maximum paths to return (default: all)
+
+        Returns:
+            Matching canonical paths in sorted order
+        """
+        segments = split_path(fragment)
+        if not segments:
+            return []
+        if fragment.endswith("."):
+            starts = [
+                child for parent in self._walk(segments)
+                for child in parent.children.values()
+            ]
+        else:
+            partial = segments[-1].lower()
+            starts = [
+                child
+                for parent in self._walk(segments[:-1])
+                for key, child in parent.children.items()
+                if key.startswith(partial)
+            ]
+
+        found: set[str] = set()
+        stack = starts
+        while stack:
+            node = stack.pop()
+            if node.path is not None:
+                found.add(node.path)
+            stack.extend(node.children.values())
+        paths = sorted(found)
+        return paths if limit is None else paths[:limit]
+
+    def for_event(self, event_type: str) -> list[str]:
+        """Field paths observed in an event type (empty if unknown)."""
+        return list(self.event_fields.get(event_type, ()))
+
+    def fuzzy(
+        self,
+        query: str,
+        limit: int = 10,
+        event_type: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Rank field paths by trigram similarity to ``query``.
+
+        The score is the Dice coefficient between the trigram sets of the
+        query and the path; matching only the leaf name is enough for a
+        high score, so "pnl" ranks every "...pnl" path first.
+
+        Args:
+            query: Path, fragment or misspelled name
+            limit: Maximum matches
+            event_type: Only consider fields of this event type
+
+        Returns:
+            Field metadata dicts with "path" and "score", best first
+        """
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+        allowed = set(self.event_fields.get(event_type, ())) if event_type else None
+
+        shared: dict[str, int] = {}
+        for gram in query_grams:
+            for path in self._grams.get(gram, ()):
+                shared[path] = shared.get(path, 0) + 1
+
+        scored = []
+        for path, hits in shared.items():
+            if allowed is not None and path not in allowed:
+                continue
+            full = 2 * hits / (len(query_grams) + self._gram_counts[path])
+            leaf_grams = self._leaf_grams[path]
+            leaf = 2 * len(query_grams & leaf_grams) / (len(query_grams) + len(leaf_grams))
+            score = max(full, leaf)
+            if score >= MIN_FUZZY_SCORE:
+                scored.append((score, path))
+
+        scored.sort(key=lambda item: (-item[0], len(item[1]), item[1]))
+        return [
+            {**self._entry(path), "score": round(score, 3)}
+            for score, path in scored[:limit]
+        ]
+
+    def lookup(
+        self,
+        path_or_fragment: str,
+        event_type: str | None = None,
+        limit: int = 10,
+    ) -> dict[str, Any]:
+        """Answer a field question with exact, prefix and fuzzy matches.
+
+        Args:
+            path_or_fragment: Full path, prefix or fragment of a field
+            event_type: Restrict matches to one event type
+            limit: Maximum prefix and fuzzy matches each
+
+        Returns:
+            Dict with "query", "exact" (metadata or None), "prefix"
+            (metadata list) and "fuzzy" (scored metadata list)
+        """
+        exact = self.get(path_or_fragment)
+        if exact is not None and event_type and event_type not in field_events(exact):
+            exact = None
+
+        prefix = self.prefix(path_or_fragment)
+        if event_type:
+            allowed = set(self.event_fields.get(event_type, ()))
+            prefix = [path for path in prefix if path in allowed]
+        exclude = {exact["path"]} if exact else set()
+        prefix = [path for path in prefix if path not in exclude][:limit]
+        exclude.update(prefix)
+
+        fuzzy = [
+            match
+            for match in self.fuzzy(path_or_fragment, limit + len(exclude), event_type)
+            if match["path"] not in exclude
+        ][:limit]
+
+        return {
+            "query": path_or_fragment,
+            "exact": exact,
+            "prefix": [self._entry(path) for path in prefix],
+            "fuzzy": fuzzy,
+        }
+
+
+_cached: tuple[Path, int, FieldIndex] | None = None
+
+
+def get_field_index(path: Path | None = None) -> FieldIndex:
+    """Return a FieldIndex, reloading only when the index file changed.
+
+    Args:
+        path: discovered_fields.json (default: DEFAULT_FIELD_INDEX)
+    """
+    global _cached
+    path = Path(path or DEFAULT_FIELD_INDEX)
+    mtime = path.stat().st_mtime_ns
+    if _cached is None or _cached[0] != path or _cached[1] != mtime:
+        _cached = (path, mtime, FieldIndex.load(path))
+    return _cached[2]
+
+
+def lookup_field(
+    path_or_fragment: str,
+    event_type: str | None = None,
+    limit: int = 10,
+    index_path: Path | None = None,
+) -> dict[str, Any]:
+    """Look up a field path in the generated field index.
+
+    Args:
+        path_or_fragment: Full path, prefix or fragment of a field
+        event_type: Restrict matches to one event type
+        limit: Maximum prefix and fuzzy matches each
+        index_path: discovered_fields.json (default: DEFAULT_FIELD_INDEX)
+
+    Returns:
+        FieldIndex.lookup() result
+    """
+    return get_field_index(index_path).lookup(path_or_fragment, event_type, limit)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Look up fields in the field index")
+    parser.add_argument("query", help="Field path, prefix or fragment")
+    parser.add_argument("--event", default=None, help="Restrict to an event type")
+    parser.add_argument("--limit", type=int, default=10, help="Matches per kind")
+    parser.add_argument(
+        "--index",
+        type=Path,
+        default=None,
+        help=f"Field index JSON (default: {DEFAULT_FIELD_INDEX})",
+    )
+
+    args = parser.parse_args()
+
+    try:
+        answer = lookup_field(args.query, args.event, args.limit, args.index)
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        print("Run: python -m ingestion.jsonl_ingest")
+        sys.exit(1)
+
+    exact = answer["exact"]
+    if exact:
+        print(f"Exact: {exact['path']} ({exact['type']}) in {', '.join(field_events(exact))}")
+    for match in answer["prefix"]:
+        print(f"Prefix: {match['path']} ({match['type']})")
+    for match in answer["fuzzy"]:
+        print(f"Fuzzy {match['score']:.2f}: {match['path']} ({match['type']})")
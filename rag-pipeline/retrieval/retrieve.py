@@ -7,7 +7,7 @@ from typing import Any
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from config import DEFAULT_TOP_K
+from config import DEFAULT_TOP_K, RUGS_EVENTS_COLLECTION
 from embeddings.embedder import embed_text
 from storage.store import query, count
 
@@ -17,6 +17,8 @@ def search(
     top_k: int = DEFAULT_TOP_K,
     *,
     backend: str | None = None,
+    collection: str | None = None,
+    where: dict | None = None,
 ) -> list[dict[str, Any]]:
     """Search for relevant documents.
     
@@ -24,16 +26,21 @@ def search(
         query_text: Natural language query
         top_k: Number of results to return
         backend: Optional backend override ("native" or "langchain_hybrid")
+        collection: Collection to search (default: knowledge collection).
+                    Other collections always use the native backend.
+        where: Optional ChromaDB metadata filter (native backend only)
         
     Returns:
         List of result dicts with text, source, line, headers, score
     """
-    if count() == 0:
+    if count(collection) == 0:
         print("Warning: Index is empty. Run ingestion first.")
         return []
 
     selected_backend = (backend or os.getenv("CLAUDE_FLOW_RAG_BACKEND", "native")).strip()
-    if selected_backend in {"langchain_hybrid", "hybrid", "langchain"}:
+    if collection is None and where is None and selected_backend in {
+        "langchain_hybrid", "hybrid", "langchain"
+    }:
         from retrieval import langchain_hybrid
 
         return langchain_hybrid.search(query_text, top_k=top_k)
@@ -42,11 +49,46 @@ def search(
     query_embedding = embed_text(query_text)
     
     # Search
-    results = query(query_embedding, top_k=top_k)
+    results = query(query_embedding, top_k=top_k, where=where, collection_name=collection)
     
     return results
 
 
+def search_events(
+    query_text: str,
+    top_k: int = DEFAULT_TOP_K,
+    *,
+    event_type: str | None = None,
+    doc_type: str | None = None,
+) -> list[dict[str, Any]]:
+    """Search the WebSocket event collection (schemas, fields, raw events).
+    
+    Args:
+        query_text: Natural language query
+        top_k: Number of results to return
+        event_type: Only return chunks of this event (e.g. "gameStateUpdate")
+        doc_type: Only return this chunk kind ("schema", "field", "overview",
+                  "raw_event")
+        
+    Returns:
+        List of result dicts, including event_type, doc_type, field_path
+        and game_id metadata
+    """
+    filters = []
+    if event_type:
+        filters.append({"event_type": event_type})
+    if doc_type:
+        filters.append({"doc_type": doc_type})
+    
+    where = None
+    if len(filters) == 1:
+        where = filters[0]
+    elif filters:
+        where = {"$and": filters}
+    
+    return search(query_text, top_k=top_k, collection=RUGS_EVENTS_COLLECTION, where=where)
+
+
 def search_with_filter(
     query_text: str,
     source_filter: str | None = None,
@@ -89,7 +131,13 @@ def format_results(results: list[dict[str, Any]]) -> str:
     for i, r in enumerate(results, 1):
         lines.append(f"\n{'='*60}")
         lines.append(f"Result {i} (score: {r['score']:.3f})")
-        lines.append(f"Source: {r['source']}:{r['line_start']}-{r['line_end']}")
+        if r.get("line_start") is not None:
+            lines.append(f"Source: {r['source']}:{r['line_start']}-{r['line_end']}")
+        else:
+            lines.append(f"Source: {r['source']}")
+        if r.get("event_type"):
+            field_path = f" / {r['field_path']}" if r.get("field_path") else ""
+            lines.append(f"Event: {r['event_type']}{field_path} ({r.get('doc_type', '')})")
         if r["headers"]:
             lines.append(f"Context: {' > '.join(r['headers'])}")
         lines.append("-" * 60)
@@ -109,6 +157,11 @@ if __name__ == "__main__":
     parser.add_argument("query", nargs="?", help="Search query")
     parser.add_argument("-k", "--top-k", type=int, default=5, help="Number of results")
     parser.add_argument("-f", "--filter", help="Source path filter")
+    parser.add_argument(
+        "--events",
+        action="store_true",
+        help="Search the WebSocket event collection instead",
+    )
     args = parser.parse_args()
     
     if not args.query:
@@ -116,7 +169,9 @@ if __name__ == "__main__":
         print(f"\nIndex contains {count()} documents")
         sys.exit(0)
     
-    if args.filter:
+    if args.events:
+        results = search_events(args.query, args.top_k)
+    elif args.filter:
         results = search_with_filter(args.query, args.filter, args.top_k)
     else:
         results = search(args.query, args.top_k)
@@ -1,4 +1,20 @@
 """Storage module for RAG pipeline."""
-from .store import get_collection, add_documents, query, clear, count
+from .store import (
+    get_collection,
+    add_documents,
+    upsert_documents,
+    existing_ids,
+    query,
+    clear,
+    count,
+)
 
-__all__ = ["get_collection", "add_documents", "query", "clear", "count"]
+__all__ = [
+    "get_collection",
+    "add_documents",
+    "upsert_documents",
+    "existing_ids",
+    "query",
+    "clear",
+    "count",
+]
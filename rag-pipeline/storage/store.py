@@ -5,7 +5,10 @@ from typing import Any
 
 # Lazy load
 _client = None
-_collection = None
+_collections: dict[str, Any] = {}
+
+# Metadata keys mapped to fixed result keys in query()
+_CORE_METADATA = {"source", "line_start", "line_end", "headers"}
 
 
 def _get_client():
@@ -34,24 +37,34 @@ def _get_client():
     return _client
 
 
-def get_collection():
-    """Get or create the knowledge collection.
+def _collection_name(name: str | None) -> str:
+    """Resolve a collection name, defaulting to the knowledge collection."""
+    if name is not None:
+        return name
+    sys.path.insert(0, str(__file__).rsplit('/', 2)[0])
+    from config import COLLECTION_NAME
+    return COLLECTION_NAME
+
+
+def get_collection(name: str | None = None):
+    """Get or create a collection.
     
+    Args:
+        name: Collection name (default: the knowledge collection)
+        
     Returns:
         ChromaDB collection
     """
-    global _collection
-    if _collection is None:
-        sys.path.insert(0, str(__file__).rsplit('/', 2)[0])
-        from config import COLLECTION_NAME
-        
+    name = _collection_name(name)
+    collection = _collections.get(name)
+    if collection is None:
         client = _get_client()
-        _collection = client.get_or_create_collection(
-            name=COLLECTION_NAME,
+        collection = _collections[name] = client.get_or_create_collection(
+            name=name,
             metadata={"hnsw:space": "cosine"},
         )
     
-    return _collection
+    return collection
 
 
 def _make_id(text: str, source: str) -> str:
@@ -100,10 +113,60 @@ def add_documents(
     return len(chunks)
 
 
+def existing_ids(ids: list[str], collection_name: str | None = None) -> set[str]:
+    """Find which of the given IDs are already stored.
+    
+    Args:
+        ids: Document IDs to check
+        collection_name: Collection to check (default: knowledge collection)
+        
+    Returns:
+        Set of IDs present in the collection
+    """
+    if not ids:
+        return set()
+    collection = get_collection(collection_name)
+    return set(collection.get(ids=ids, include=[])["ids"])
+
+
+def upsert_documents(
+    ids: list[str],
+    documents: list[str],
+    embeddings: list[list[float]],
+    metadatas: list[dict[str, Any]],
+    collection_name: str | None = None,
+) -> int:
+    """Insert or replace documents by ID.
+    
+    Args:
+        ids: Document IDs
+        documents: Document texts
+        embeddings: Corresponding embedding vectors
+        metadatas: Metadata dicts (str/int/float/bool values only)
+        collection_name: Target collection (default: knowledge collection)
+        
+    Returns:
+        Number of documents upserted
+    """
+    if not ids:
+        return 0
+    
+    collection = get_collection(collection_name)
+    collection.upsert(
+        ids=ids,
+        documents=documents,
+        embeddings=embeddings,
+        metadatas=metadatas,
+    )
+    
+    return len(ids)
+
+
 def query(
     embedding: list[float],
     top_k: int = 5,
     where: dict | None = None,
+    collection_name: str | None = None,
 ) -> list[dict[str, Any]]:
     """Query similar documents.
     
@@ -111,11 +174,13 @@ def query(
         embedding: Query embedding vector
         top_k: Number of results to return
         where: Optional filter dict
+        collection_name: Collection to query (default: knowledge collection)
         
     Returns:
-        List of result dicts with text, source, line, headers, score
+        List of result dicts with text, source, line, headers, score, plus
+        any extra metadata (e.g. event_type, doc_type, field_path, game_id)
     """
-    collection = get_collection()
+    collection = get_collection(collection_name)
     
     results = collection.query(
         query_embeddings=[embedding],
@@ -133,15 +198,20 @@ def query(
             # Convert distance to similarity score (cosine)
             score = 1 - distance
             
-            output.append({
+            result = {
+                key: value for key, value in meta.items()
+                if key not in _CORE_METADATA
+            }
+            result.update({
                 "id": doc_id,
                 "text": doc,
                 "source": meta["source"],
-                "line_start": meta["line_start"],
-                "line_end": meta["line_end"],
-                "headers": meta["headers"].split("|") if meta["headers"] else [],
+                "line_start": meta.get("line_start"),
+                "line_end": meta.get("line_end"),
+                "headers": meta["headers"].split("|") if meta.get("headers") else [],
                 "score": score,
             })
+            output.append(result)
     
     return output
 
@@ -174,25 +244,22 @@ def get_all_documents() -> list[dict[str, Any]]:
     return docs
 
 
-def clear():
-    """Delete all documents from the collection."""
-    global _collection
-    
-    sys.path.insert(0, str(__file__).rsplit('/', 2)[0])
-    from config import COLLECTION_NAME
+def clear(collection_name: str | None = None):
+    """Delete all documents from a collection (default: knowledge collection)."""
+    name = _collection_name(collection_name)
     
     client = _get_client()
     try:
-        client.delete_collection(COLLECTION_NAME)
+        client.delete_collection(name)
     except Exception:
         pass  # Collection might not exist
     
-    _collection = None
+    _collections.pop(name, None)
 
 
-def count() -> int:
-    """Get number of documents in collection."""
-    collection = get_collection()
+def count(collection_name: str | None = None) -> int:
+    """Get number of documents in a collection (default: knowledge collection)."""
+    collection = get_collection(collection_name)
     return collection.count()
 
 
@@ -0,0 +1,132 @@
+"""Tests for capture_index module - sidecar byte-offset index."""
+import json
+import shutil
+from pathlib import Path
+
+FIXTURE = Path(__file__).parent / "fixtures" / "sample_capture.jsonl"
+
+
+def _copy_fixture(tmp_path):
+    capture = tmp_path / "capture.jsonl"
+    shutil.copy(FIXTURE, capture)
+    return capture
+
+
+class TestCaptureIndex:
+    """Test building and querying the index."""
+
+    def test_builds_sidecar_next_to_capture(self, tmp_path):
+        """Opening an index writes the sidecar file and indexes every line."""
+        from ingestion.capture_index import CaptureIndex, index_path_for
+
+        capture = _copy_fixture(tmp_path)
+
+        with CaptureIndex.open(capture) as index:
+            counts = index.event_counts()
+
+        assert index_path_for(capture).exists()
+        assert sum(counts.values()) == sum(1 for line in open(capture) if line.strip())
+
+    def test_game_query_matches_linear_scan(self, tmp_path):
+        """Seeking by gameId returns the same events as filtering a scan."""
+        from ingestion.capture_index import CaptureIndex
+        from ingestion.event_chunker import extract_game_id
+
+        capture = _copy_fixture(tmp_path)
+        with open(capture) as f:
+            expected = [
+                json.loads(line) for line in f
+                if line.strip()
+                and extract_game_id(json.loads(line).get("data")) == "20251215-abc123"
+            ]
+
+        with CaptureIndex.open(capture) as index:
+            events = list(index.iter_events(game_id="20251215-abc123"))
+
+        assert events == expected
+        assert events
+
+    def test_event_and_time_filters(self, tmp_path):
+        """Event type and timestamp filters narrow the result."""
+        from ingestion.capture_index import CaptureIndex
+
+        capture = _copy_fixture(tmp_path)
+
+        with CaptureIndex.open(capture) as index:
+            updates = list(index.iter_events(event_types=["gameStateUpdate"]))
+            first_ms = 1765770299725  # 2025-12-15T03:44:59.725+00:00
+            late = index.find(event_types=["gameStateUpdate"], start_ms=first_ms + 1)
+
+        assert all(e["event"] == "gameStateUpdate" for e in updates)
+        assert len(late) == len(updates) - 1
+
+    def test_context_includes_events_without_game_id(self, tmp_path):
+        """include_context attributes chat lines to the active game."""
+        from ingestion.capture_index import CaptureIndex
+
+        capture = _copy_fixture(tmp_path)
+
+        with CaptureIndex.open(capture) as index:
+            own = index.find(game_id="20251215-abc123")
+            context = index.find(game_id="20251215-abc123", include_context=True)
+
+        assert len(context) > len(own)
+
+    def test_appended_lines_are_indexed_incrementally(self, tmp_path):
+        """A capture that grew is indexed from the last indexed byte."""
+        from ingestion.capture_index import CaptureIndex
+
+        capture = _copy_fixture(tmp_path)
+        with CaptureIndex.open(capture) as index:
+            before = sum(index.event_counts().values())
+
+        with open(capture, "a") as f:
+            f.write(json.dumps({"seq": 999, "event": "newChatMessage", "data": {}}) + "\n")
+            f.write('{"seq": 1000, "event": "partial')  # still being written
+
+        with CaptureIndex.open(capture) as index:
+            assert index.refresh() == 0
+            assert sum(index.event_counts().values()) == before + 1
+
+    def test_rewritten_capture_is_reindexed(self, tmp_path):
+        """A capture replaced with different content is indexed from scratch."""
+        from ingestion.capture_index import CaptureIndex
+
+        capture = _copy_fixture(tmp_path)
+        CaptureIndex.open(capture).close()
+
+        capture.write_text(json.dumps({"event": "only", "data": {}}) + "\n")
+
+        with CaptureIndex.open(capture) as index:
+            assert index.event_counts() == {"only": 1}
+
+
+class TestChunkerIntegration:
+    """Test chunker functions routed through the index."""
+
+    def test_summary_matches_linear_scan(self, tmp_path):
+        """Indexed summary equals the scanning summary."""
+        from ingestion.event_chunker import get_capture_summary
+
+        capture = _copy_fixture(tmp_path)
+
+        scanned = get_capture_summary(capture)
+        indexed = get_capture_summary(capture, use_index=True)
+
+        assert indexed["event_types"] == scanned["event_types"]
+        assert sorted(indexed["games"]) == sorted(scanned["games"])
+        assert indexed["first_timestamp"] == scanned["first_timestamp"]
+        assert indexed["last_timestamp"] == scanned["last_timestamp"]
+
+    def test_chunk_by_type_with_index(self, tmp_path):
+        """Indexed chunking yields the same chunks as scanning."""
+        from ingestion.event_chunker import chunk_raw_capture_by_type
+
+        capture = _copy_fixture(tmp_path)
+        types = ["standard/newTrade", "gameStateUpdate"]
+
+        scanned = list(chunk_raw_capture_by_type(capture, types))
+        indexed = list(chunk_raw_capture_by_type(capture, types, use_index=True))
+
+        assert [c.seq for c in indexed] == [c.seq for c in scanned]
+        assert [c.text for c in indexed] == [c.text for c in scanned]
@@ -0,0 +1,183 @@
+"""Tests for columnar module - Parquet conversion of captures."""
+import json
+
+import pytest
+
+
+def _write_capture(path, records):
+    with open(path, "w") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+class TestSplitRecord:
+    """Test splitting records into columns and a residual payload."""
+
+    def test_scalars_become_columns(self):
+        """Known scalar paths are flattened; the rest is residual."""
+        from ingestion.columnar import _column_tree, split_record
+
+        tree = _column_tree({"data.price": "number", "data.gameId": "string"})
+        record = {
+            "seq": 1,
+            "data": {"price": 1.5, "gameId": "g1", "trades": [{"qty": 2}]},
+        }
+        row = {}
+
+        residual = split_record(record, tree, row)
+
+        assert row == {"data.price": 1.5, "data.gameId": "g1"}
+        assert residual == {"seq": 1, "data": {"trades": [{"qty": 2}]}}
+
+    def test_type_mismatch_goes_to_payload(self):
+        """Values disagreeing with the column type are kept in the residual."""
+        from ingestion.columnar import _column_tree, split_record
+
+        tree = _column_tree({"data.price": "number", "data.active": "boolean"})
+        row = {}
+
+        residual = split_record(
+            {"data": {"price": "n/a", "active": True}}, tree, row
+        )
+
+        assert row == {"data.active": True}
+        assert residual == {"data": {"price": "n/a"}}
+
+    def test_bool_is_not_a_number(self):
+        """Booleans never land in numeric columns."""
+        from ingestion.columnar import _column_tree, split_record
+
+        tree = _column_tree({"data.price": "number"})
+        row = {}
+
+        residual = split_record({"data": {"price": True}}, tree, row)
+
+        assert row == {}
+        assert residual == {"data": {"price": True}}
+
+    def test_payload_round_trip(self):
+        """Payload blobs decode back to the residual object."""
+        from ingestion.columnar import decode_payload, encode_payload
+
+        residual = {"data": {"trades": [1, 2, 3]}}
+
+        assert decode_payload(encode_payload(residual)) == residual
+        assert encode_payload({}) is None
+        assert decode_payload(None) == {}
+
+
+class TestTimestamps:
+    """Test timestamp extraction for date partitioning."""
+
+    def test_prefers_ts_ms(self):
+        """ts_ms is used when present."""
+        from ingestion.columnar import record_ts_ms
+
+        assert record_ts_ms({"ts_ms": 1765800000000, "ts": "bad"}) == 1765800000000
+
+    def test_parses_iso_ts(self):
+        """ISO ts strings are converted to epoch milliseconds."""
+        from ingestion.columnar import record_ts_ms
+
+        assert record_ts_ms({"ts": "2025-12-15T12:00:00+00:00"}) == 1765800000000
+        assert record_ts_ms({"ts": "not a date"}) is None
+
+    def test_partition_dir_encodes_event_names(self, tmp_path):
+        """Namespaced event names stay one directory level."""
+        from ingestion.columnar import partition_dir
+
+        path = partition_dir(tmp_path, "standard/newTrade", "2025-12-15")
+
+        assert path.parent.name == "event=standard%2FnewTrade"
+        assert path.name == "date=2025-12-15"
+
+
+class TestConvertCapture:
+    """Test end-to-end conversion (requires pyarrow)."""
+
+    def test_convert_and_scan(self, tmp_path):
+        """Converted captures can be scanned by column and date."""
+        pytest.importorskip("pyarrow")
+        from ingestion.columnar import (
+            PAYLOAD_COLUMN,
+            convert_capture,
+            decode_payload,
+            list_events,
+            scan_columns,
+        )
+
+        capture = tmp_path / "capture.jsonl"
+        _write_capture(capture, [
+            {"ts": "2025-12-15T12:00:00+00:00", "event": "gameStateUpdate",
+             "data": {"price": 1.0, "gameId": "g1", "leaderboard": [{"id": "a"}]}},
+            {"ts": "2025-12-16T12:00:00+00:00", "event": "gameStateUpdate",
+             "data": {"price": 2.0, "gameId": "g2", "leaderboard": []}},
+            {"ts": "2025-12-16T12:00:01+00:00", "event": "standard/newTrade",
+             "data": {"qty": 3}},
+        ])
+        dataset = tmp_path / "dataset"
+
+        written = convert_capture(capture, dataset)
+
+        assert written == {"gameStateUpdate": 2, "standard/newTrade": 1}
+        assert list_events(dataset) == ["gameStateUpdate", "standard/newTrade"]
+
+        table = scan_columns(dataset, "gameStateUpdate", ["data.price"])
+        assert table.column("data.price").to_pylist() == [1.0, 2.0]
+
+        table = scan_columns(
+            dataset, "gameStateUpdate", ["data.price", PAYLOAD_COLUMN],
+            start_date="2025-12-16",
+        )
+        assert table.column("data.price").to_pylist() == [2.0]
+        payload = decode_payload(table.column(PAYLOAD_COLUMN)[0].as_py())
+        assert payload["data"] == {"leaderboard": []}
+
+    def test_integer_fields_stay_integers(self, tmp_path):
+        """Int-only numbers are int64; a stray float goes to the payload."""
+        pa = pytest.importorskip("pyarrow")
+        from ingestion.columnar import PAYLOAD_COLUMN, convert_capture, decode_payload, scan_columns
+        from ingestion.event_discovery import scan_jsonl_file
+
+        events = [
+            {"ts_ms": 1_765_800_000_000 + n, "event": "gameStateUpdate",
+             "data": {"tickCount": n, "price": 1.0 + n}}
+            for n in range(3)
+        ]
+        capture = tmp_path / "capture.jsonl"
+        _write_capture(capture, events)
+        dataset = tmp_path / "dataset"
+        convert_capture(capture, dataset)
+
+        table = scan_columns(dataset, "gameStateUpdate", ["data.tickCount", "data.price"])
+        assert table.schema.field("data.tickCount").type == pa.int64()
+        assert table.column("data.tickCount").to_pylist() == [0, 1, 2]
+        assert table.schema.field("data.price").type == pa.float64()
+
+        # Columns decided by another capture's discovery: 2.5 cannot be int64
+        later = tmp_path / "later.jsonl"
+        _write_capture(later, [{"ts_ms": 1_765_800_000_010, "event": "gameStateUpdate",
+                                "data": {"tickCount": 2.5, "price": 4.0}}])
+        convert_capture(later, dataset, discovery=scan_jsonl_file(capture))
+        table = scan_columns(dataset, "gameStateUpdate", ["data.tickCount", PAYLOAD_COLUMN])
+        assert table.column("data.tickCount").to_pylist() == [0, 1, 2, None]
+        assert decode_payload(table.column(PAYLOAD_COLUMN)[3].as_py()) == {"data": {"tickCount": 2.5}}
+
+    def test_int_and_float_partitions_promote(self, tmp_path):
+        """A column int64 in one capture and float64 in another reads as float64."""
+        pa = pytest.importorskip("pyarrow")
+        import json
+
+        from ingestion.columnar import convert_capture, scan_columns
+
+        dataset = tmp_path / "dataset"
+        for name, qty in (("a.jsonl", 3), ("b.jsonl", 0.5)):
+            _write_capture(tmp_path / name, [{"ts_ms": 1_765_800_000_000, "event": "trade",
+                                              "data": {"qty": qty}}])
+            convert_capture(tmp_path / name, dataset)
+
+        table = scan_columns(dataset, "trade", ["data.qty"])
+        assert table.schema.field("data.qty").type == pa.float64()
+        assert sorted(table.column("data.qty").to_pylist()) == [0.5, 3.0]
+        manifest = json.loads((dataset / "_columns.json").read_text())
+        assert manifest["trade"]["data.qty"] == "number"
@@ -209,6 +209,57 @@ class TestGenerateDiffReport:
         assert "100%" in report or "validated" in report.lower()
 
 
+class TestGenerateDriftReport:
+    """Test time-series drift report generation."""
+
+    def test_drift_report_lists_changes_per_date(self):
+        """Appearances, disappearances and type changes show per date."""
+        from ingestion.coverage_report import generate_drift_report
+        from ingestion.field_presence import PresenceMatrix
+
+        matrix = PresenceMatrix()
+        matrix.add("a.jsonl", {"data.price": {"number"}, "data.old": {"string"}}, "2025-12-01")
+        matrix.add("b.jsonl", {"data.price": {"string"}, "data.new": {"number"}}, "2025-12-02")
+
+        report = generate_drift_report(matrix, documented={"data.price"})
+
+        assert "| 2025-12-02 | 1 | 2 | 1 | 1 | 1 |" in report
+        assert "- Appeared: `data.new` (undocumented)" in report
+        assert "- Disappeared: `data.old`" in report
+        assert "- Type changed: `data.price` number -> string" in report
+
+    def test_presence_scan_reads_each_capture_once(self, tmp_path, monkeypatch):
+        """Captures scanned for the matrix are reused for the report."""
+        import ingestion.event_discovery
+        from ingestion.coverage_report import scan_with_presence
+        from ingestion.event_discovery import scan_recordings
+        from ingestion.field_presence import PresenceMatrix
+
+        fixture = Path(__file__).parent / "fixtures" / "sample_capture.jsonl"
+        for name in ("a_2025-12-14.jsonl", "b_2025-12-15.jsonl"):
+            (tmp_path / name).write_text(fixture.read_text())
+        scans = []
+        real_scan = ingestion.event_discovery.scan_jsonl_range
+        monkeypatch.setattr(
+            ingestion.event_discovery, "scan_jsonl_range",
+            lambda path, *args, **kwargs: scans.append(path.name) or real_scan(path, *args, **kwargs),
+        )
+        matrix = PresenceMatrix()
+
+        first = scan_with_presence(tmp_path, matrix)
+        rerun = scan_with_presence(tmp_path, matrix)
+
+        # First run: both files once; rerun: matrix unchanged, report scans again
+        assert scans == ["a_2025-12-14.jsonl", "b_2025-12-15.jsonl"] * 2
+        assert len(matrix) == 2
+        expected = scan_recordings(tmp_path)
+        for result in (first, rerun):
+            assert result.files_scanned == 2
+            assert {n: e.count for n, e in result.events.items()} == {
+                n: e.count for n, e in expected.events.items()
+            }
+
+
 class TestWithSampleFixture:
     """Test with sample capture fixture."""
 
@@ -0,0 +1,144 @@
+"""Tests for decoder_codegen module - typed payload decoders from schemas."""
+import json
+from pathlib import Path
+
+import pytest
+
+FIXTURE = Path(__file__).parent / "fixtures" / "sample_capture.jsonl"
+
+
+def _without_none(value):
+    """Drop None-valued keys recursively (missing and null compare equal)."""
+    if isinstance(value, dict):
+        return {k: _without_none(v) for k, v in value.items() if v is not None}
+    if isinstance(value, list):
+        return [_without_none(item) for item in value]
+    return value
+
+
+@pytest.fixture(scope="module")
+def schemas():
+    from ingestion.event_discovery import scan_jsonl_file
+    from ingestion.schema_generator import generate_all_schemas
+
+    return generate_all_schemas(scan_jsonl_file(FIXTURE))
+
+
+@pytest.fixture(scope="module")
+def first_line():
+    with open(FIXTURE, "rb") as f:
+        return f.readline()
+
+
+class TestSlotsDecoders:
+    """Test the dependency-free __slots__ backend."""
+
+    def test_decodes_nested_payload(self, schemas, first_line):
+        """Payload, nested objects and array elements become typed objects."""
+        from ingestion.decoder_codegen import build_decoder_source, compile_decoders
+
+        decoders = compile_decoders(build_decoder_source(schemas))
+        event, state = decoders.decode_line(first_line)
+        payload = json.loads(first_line)["data"]
+
+        assert event == "gameStateUpdate"
+        assert state.price == 1.234
+        assert state.rugpool.rugpoolAmount == 5.5
+        assert [entry.pnl for entry in state.leaderboard] == [1.5, -0.5]
+        assert state.partialPrices.values == payload["partialPrices"]["values"]
+        assert state.to_dict()["leaderboard"][0]["username"] == "whale_master"
+        assert not hasattr(state, "__dict__")
+
+    def test_every_fixture_event_round_trips(self, schemas):
+        """to_dict() reproduces each decoded payload's declared keys."""
+        from ingestion.decoder_codegen import build_decoder_source, compile_decoders
+
+        decoders = compile_decoders(build_decoder_source(schemas))
+        with open(FIXTURE, "rb") as f:
+            for line in f:
+                record = json.loads(line)
+                decoded = decoders.decode_line(line)
+                assert decoded is not None
+                assert _without_none(decoded[1].to_dict()) == _without_none(record["data"])
+
+    def test_rejects_wrong_types(self, schemas):
+        """Values that contradict the discovered type raise ValueError."""
+        from ingestion.decoder_codegen import build_decoder_source, compile_decoders
+
+        decoders = compile_decoders(build_decoder_source(schemas))
+
+        with pytest.raises(ValueError, match="data.price: expected number, got str"):
+            decoders.decode("gameStateUpdate", {"price": "1.2"})
+        with pytest.raises(ValueError, match=r"leaderboard\[\]: expected object"):
+            decoders.decode("gameStateUpdate", {"leaderboard": [1]})
+        assert decoders.decode("unknownEvent", {"price": 1}) is None
+
+        lenient = compile_decoders(build_decoder_source(schemas, validate=False))
+        assert lenient.decode("gameStateUpdate", {"price": "1.2"}).price == "1.2"
+
+    def test_field_selection(self, schemas, first_line):
+        """Only the selected payload fields are declared and decoded."""
+        from ingestion.decoder_codegen import build_decoder_source, compile_decoders
+
+        source = build_decoder_source(
+            schemas,
+            fields={"gameStateUpdate": ["price", "rugpool.rugpoolAmount", "leaderboard[].pnl"]},
+        )
+        decoders = compile_decoders(source)
+        _, state = decoders.decode_line(first_line)
+
+        assert list(decoders.DECODERS) == ["gameStateUpdate"]
+        assert state.__slots__ == ("leaderboard", "price", "rugpool")
+        assert state.rugpool.__slots__ == ("rugpoolAmount",)
+        assert state.leaderboard[1].pnl == -0.5
+
+    def test_unknown_selection_rejected(self, schemas):
+        """Selecting a field or event that was never discovered fails early."""
+        from ingestion.decoder_codegen import build_decoder_source
+
+        with pytest.raises(ValueError, match="no discovered field"):
+            build_decoder_source(schemas, fields={"gameStateUpdate": ["nope"]})
+        with pytest.raises(ValueError, match="No discovered schema"):
+            build_decoder_source(schemas, fields={"nope": ["price"]})
+
+    def test_load_decoders_from_file(self, schemas, tmp_path, first_line):
+        """load_decoders() compiles the schemas file and caches the module."""
+        from ingestion.decoder_codegen import load_decoders
+
+        path = tmp_path / "discovered_schemas.json"
+        path.write_text(json.dumps(schemas))
+
+        decoders = load_decoders(path)
+
+        assert load_decoders(path) is decoders
+        assert decoders.decode_line(first_line)[1].gameId == "20251215-abc123"
+
+
+class TestMsgspecDecoders:
+    """Test the msgspec Struct backend."""
+
+    def test_matches_slots_backend(self, schemas):
+        """Both backends decode every fixture line to the same values."""
+        msgspec = pytest.importorskip("msgspec")
+        from ingestion.decoder_codegen import build_decoder_source, compile_decoders
+
+        slots = compile_decoders(build_decoder_source(schemas))
+        structs = compile_decoders(build_decoder_source(schemas, backend="msgspec"))
+
+        with open(FIXTURE, "rb") as f:
+            for line in f:
+                event, expected = slots.decode_line(line)
+                decoded_event, decoded = structs.decode_line(line)
+                assert decoded_event == event
+                assert msgspec.to_builtins(decoded) == expected.to_dict()
+
+    def test_rejects_wrong_types(self, schemas):
+        """Validation errors surface as ValueError."""
+        pytest.importorskip("msgspec")
+        from ingestion.decoder_codegen import build_decoder_source, compile_decoders
+
+        structs = compile_decoders(build_decoder_source(schemas, backend="msgspec"))
+
+        with pytest.raises(ValueError, match="price"):
+            structs.decode_line(b'{"event": "gameStateUpdate", "data": {"price": "x"}}')
+        assert structs.decode_line(b'{"event": "pong"}') is None
@@ -0,0 +1,145 @@
+"""Tests for discovery_snapshot module - binary DiscoveryResult snapshots."""
+import pickle
+from pathlib import Path
+
+import pytest
+
+FIXTURE = Path(__file__).parent / "fixtures" / "sample_capture.jsonl"
+
+
+def _summaries(result):
+    return {
+        (name, path): (info.count, info.type, info.sample_values, info.stats.to_dict())
+        for name, event in result.events.items()
+        for path, info in event.fields.items()
+    }
+
+
+class TestSnapshotRoundTrip:
+    """Test saving and loading snapshots."""
+
+    @pytest.mark.parametrize("compress", [True, False])
+    def test_round_trip_preserves_result(self, tmp_path, compress):
+        """A loaded snapshot equals the scanned result, stats included."""
+        from ingestion.discovery_snapshot import load_snapshot, save_snapshot
+        from ingestion.event_discovery import scan_jsonl_file
+
+        result = scan_jsonl_file(FIXTURE)
+        path = tmp_path / "discovery.snapshot"
+
+        written = save_snapshot(result, path, compress=compress)
+        loaded = load_snapshot(path)
+
+        assert written == path.stat().st_size
+        assert loaded.total_lines == result.total_lines
+        assert loaded.files_scanned == result.files_scanned
+        assert _summaries(loaded) == _summaries(result)
+
+    def test_loaded_stats_keep_accumulating(self, tmp_path):
+        """Sketches restored from a snapshot still accept values."""
+        from ingestion.discovery_snapshot import load_snapshot, save_snapshot
+        from ingestion.event_discovery import scan_jsonl_file
+
+        path = tmp_path / "discovery.snapshot"
+        save_snapshot(scan_jsonl_file(FIXTURE), path)
+        stats = next(iter(load_snapshot(path).events.values())).fields["seq"].stats
+
+        for value in range(100):
+            stats.add(value)
+
+        assert stats.max == 99
+
+    def test_rejects_other_files_and_versions(self, tmp_path):
+        """Wrong magic, unknown versions and corruption raise ValueError."""
+        from ingestion import discovery_snapshot
+        from ingestion.discovery_snapshot import load_snapshot, save_snapshot
+        from ingestion.event_discovery import DiscoveryResult
+
+        not_snapshot = tmp_path / "x.snapshot"
+        not_snapshot.write_bytes(b"{}" * 20)
+        with pytest.raises(ValueError, match="not a discovery snapshot"):
+            load_snapshot(not_snapshot)
+
+        path = tmp_path / "d.snapshot"
+        save_snapshot(DiscoveryResult(), path)
+        data = bytearray(path.read_bytes())
+
+        data[-1] ^= 0xFF
+        path.write_bytes(bytes(data))
+        with pytest.raises(ValueError, match="corrupt"):
+            load_snapshot(path)
+
+        data[8] = discovery_snapshot.SNAPSHOT_VERSION + 1
+        path.write_bytes(bytes(data))
+        with pytest.raises(ValueError, match="version"):
+            load_snapshot(path)
+
+    def test_refuses_unexpected_globals(self, tmp_path):
+        """Payloads referencing other classes are not unpickled."""
+        import zlib
+
+        from ingestion.discovery_snapshot import (
+            _HEADER, SNAPSHOT_MAGIC, SNAPSHOT_VERSION, load_snapshot,
+        )
+
+        payload = pickle.dumps({"result": Path("/"), "sources": {}}, protocol=5)
+        path = tmp_path / "evil.snapshot"
+        path.write_bytes(
+            _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, zlib.crc32(payload), len(payload))
+            + payload
+        )
+
+        with pytest.raises(pickle.UnpicklingError):
+            load_snapshot(path)
+
+
+class TestMergeAndCache:
+    """Test merging snapshots and cached directory scans."""
+
+    def test_merge_snapshots_matches_combined_scan(self, tmp_path):
+        """Merging per-file snapshots equals scanning both files."""
+        from ingestion.discovery_snapshot import merge_snapshots, save_snapshot
+        from ingestion.event_discovery import scan_jsonl_file
+
+        paths = []
+        for i in range(2):
+            path = tmp_path / f"{i}.snapshot"
+            save_snapshot(scan_jsonl_file(FIXTURE), path)
+            paths.append(path)
+
+        merged = merge_snapshots(paths)
+        single = scan_jsonl_file(FIXTURE)
+
+        assert merged.files_scanned == 2
+        assert merged.total_lines == 2 * single.total_lines
+        for name, event in single.events.items():
+            assert merged.events[name].count == 2 * event.count
+
+    def test_cached_scan_only_scans_new_files(self, tmp_path, monkeypatch):
+        """Unchanged files come from the snapshot; new files are merged in."""
+        from ingestion import discovery_snapshot
+        from ingestion.discovery_snapshot import cached_scan
+        from ingestion.event_discovery import scan_jsonl_file
+
+        recordings = tmp_path / "recordings"
+        recordings.mkdir()
+        (recordings / "a.jsonl").write_text(FIXTURE.read_text())
+        snapshot = tmp_path / "discovery.snapshot"
+
+        scanned = []
+
+        def counting_scan(file_path, array_sampling=None):
+            scanned.append(file_path.name)
+            return scan_jsonl_file(file_path, array_sampling=array_sampling)
+
+        monkeypatch.setattr(discovery_snapshot, "scan_jsonl_file", counting_scan)
+
+        first = cached_scan(recordings, snapshot)
+        second = cached_scan(recordings, snapshot)
+        (recordings / "b.jsonl").write_text(FIXTURE.read_text())
+        third = cached_scan(recordings, snapshot)
+
+        assert scanned == ["a.jsonl", "b.jsonl"]
+        assert second.total_lines == first.total_lines
+        assert third.total_lines == 2 * first.total_lines
+        assert third.files_scanned == 2
@@ -161,6 +161,138 @@ class TestDiscoverFields:
         assert "data.gameHistory[].provablyFair.serverSeedHash" in fields
 
 
+    def test_accumulate_fields_updates_in_place(self):
+        """Repeated records fold into one accumulator without new FieldInfo."""
+        from ingestion.event_discovery import accumulate_fields
+
+        fields = {}
+        for price in (1.0, 2.0, 3.0):
+            accumulate_fields(
+                {
+                    "event": "gameStateUpdate",
+                    "data": {"price": price, "leaderboard": [{"pnl": 1}, {"pnl": 2}]},
+                },
+                fields,
+            )
+
+        price_info = fields["data.price"]
+        accumulate_fields({"data": {"price": 4.0}}, fields)
+
+        assert fields["data.price"] is price_info
+        assert price_info.count == 4
+        assert price_info.sample_values == [1.0, 2.0, 3.0, 4.0]
+        assert fields["data.leaderboard[]"].count == 3
+        assert fields["data.leaderboard[].pnl"].count == 6
+
+    def test_accumulate_fields_tracks_type_histogram(self):
+        """Fields seen with several types keep every type, not the first."""
+        from ingestion.event_discovery import accumulate_fields
+
+        fields = {}
+        for record in (
+            {"data": {"price": None, "meta": 1, "tags": ["a", 1]}},
+            {"data": {"price": 1.5, "meta": {"a": 1}, "tags": ["b"]}},
+            {"data": {"price": 2.0, "meta": {"a": 2}, "tags": [None]}},
+        ):
+            accumulate_fields(record, fields)
+
+        price = fields["data.price"]
+        assert price.types == {"null": 1, "number": 2}
+        assert price.type == "number"
+        assert price.type_label() == "number / null"
+        assert fields["data.meta"].types == {"number": 1, "object": 2}
+        assert fields["data.meta"].type == "object"
+        assert fields["data.tags[]"].types == {"string": 2, "number": 1, "null": 1}
+
+    def test_merge_combines_type_histograms(self):
+        """FieldInfo.merge sums histograms and re-picks the primary type."""
+        from ingestion.event_discovery import discover_fields
+
+        first = discover_fields({"value": None})["value"]
+        first.merge(discover_fields({"value": "x"})["value"])
+
+        assert first.types == {"null": 1, "string": 1}
+        assert first.type == "string"
+        assert first.count == 2
+
+
+class TestArraySampling:
+    """Test bounded per-array element sampling."""
+
+    @staticmethod
+    def _leaderboard():
+        entries = [
+            {"id": f"p{i}", "pnl": float(i), "level": i, "badge": None}
+            for i in range(100)
+        ]
+        entries[57]["shortPosition"] = {"amount": 1.0}
+        entries[83]["badge"] = "gold"
+        return {"event": "gameStateUpdate", "data": {"leaderboard": entries}}
+
+    @pytest.mark.parametrize("strategy", ["first", "last", "stride", "reservoir"])
+    def test_sampling_keeps_full_key_coverage(self, strategy):
+        """Keys present in a single element are still discovered."""
+        from ingestion.event_discovery import ArraySampling, discover_fields
+
+        event = self._leaderboard()
+
+        full = discover_fields(event)
+        sampled = discover_fields(event, array_sampling=ArraySampling(strategy, size=2))
+
+        assert set(sampled) == set(full)
+        assert "data.leaderboard[].shortPosition.amount" in sampled
+
+    @pytest.mark.parametrize("strategy", ["first", "last", "stride", "reservoir"])
+    def test_sampling_covers_keys_diverging_below_top_level(self, strategy):
+        """Elements differing only in grandchild keys or nested array elements are all covered."""
+        from ingestion.event_discovery import ArraySampling, discover_fields
+
+        arr = [{"a": {"b": {"c": i}}} for i in range(20)]
+        arr[11]["a"]["b"]["d"] = "deep"
+        arr2 = [{"x": [{"p": i}]} for i in range(20)]
+        arr2[7]["x"].append({"q": True})
+        event = {"event": "e", "data": {"arr": arr, "arr2": arr2}}
+
+        full = discover_fields(event)
+        sampled = discover_fields(event, array_sampling=ArraySampling(strategy, size=2, seed=1))
+
+        assert "data.arr[].a.b.d" in full and "data.arr2[].x[].q" in full
+        assert set(sampled) == set(full)
+        for path, info in full.items():
+            assert sampled[path].count == info.count, path
+
+    def test_sampling_preserves_counts_and_null_rate(self):
+        """Weighted elements reproduce the counts of a full scan."""
+        from ingestion.event_discovery import ArraySampling, discover_fields
+
+        event = self._leaderboard()
+
+        full = discover_fields(event)
+        sampled = discover_fields(event, array_sampling=ArraySampling("stride", size=4))
+
+        for path, info in full.items():
+            assert sampled[path].count == info.count, path
+        badge = sampled["data.leaderboard[].badge"]
+        assert badge.stats_summary()["null_rate"] == 0.99
+
+    def test_sampling_visits_few_elements(self):
+        """Only one element per shape plus the sample are recursed into."""
+        from ingestion.event_discovery import ArraySampling
+
+        items = self._leaderboard()["data"]["leaderboard"]
+
+        selected = ArraySampling("first", size=3).select(items)
+
+        assert [item["id"] for item, _ in selected] == ["p0", "p1", "p2", "p57", "p83"]
+        assert sum(weight for _, weight in selected) == len(items)
+
+    def test_unknown_strategy_rejected(self):
+        """A typo in the strategy name fails loudly."""
+        from ingestion.event_discovery import ArraySampling
+
+        with pytest.raises(ValueError):
+            ArraySampling("random")
+
 class TestScanJsonlFile:
     """Test JSONL file scanning and aggregation."""
 
@@ -309,6 +441,28 @@ class TestScanRecordings:
             assert result.events["standard/newTrade"].count == 1
 
 
+    def test_merge_combines_results(self):
+        """DiscoveryResult.merge folds counts, fields and errors together."""
+        from ingestion.event_discovery import DiscoveryResult, discover_fields, EventInfo
+
+        def make_result(price, error):
+            result = DiscoveryResult(total_lines=1, files_scanned=1, errors=[error])
+            event = EventInfo(name="gameStateUpdate", count=1)
+            event.fields = discover_fields({"data": {"price": price}})
+            result.events["gameStateUpdate"] = event
+            return result
+
+        combined = make_result(1.0, "a")
+        combined.merge(make_result(2.0, "b"))
+
+        price = combined.events["gameStateUpdate"].fields["data.price"]
+        assert combined.files_scanned == 2
+        assert combined.total_lines == 2
+        assert combined.errors == ["a", "b"]
+        assert combined.events["gameStateUpdate"].count == 2
+        assert price.count == 2
+        assert price.sample_values == [1.0, 2.0]
+
 class TestWithSampleFixture:
     """Test with the sample_capture.jsonl fixture."""
 
@@ -0,0 +1,130 @@
+"""Tests for event_embedder module - batched, deduplicated upserts."""
+from pathlib import Path
+
+import pytest
+
+FIXTURE = Path(__file__).parent / "fixtures" / "sample_capture.jsonl"
+
+
+@pytest.fixture
+def fake_store(monkeypatch):
+    """Replace the embedder and Chroma store with in-memory fakes."""
+    import embeddings.embedder
+    import storage.store
+
+    stored = {}
+    calls = {"embedded_texts": 0, "upserts": 0}
+
+    def embed_batch(texts, show_progress=False):
+        calls["embedded_texts"] += len(texts)
+        return [[float(len(t))] for t in texts]
+
+    def existing_ids(ids, collection_name=None):
+        return {i for i in ids if (collection_name, i) in stored}
+
+    def upsert_documents(ids, documents, embeddings, metadatas, collection_name=None):
+        calls["upserts"] += 1
+        for i, doc, meta in zip(ids, documents, metadatas):
+            assert all(v is not None for v in meta.values())
+            stored[(collection_name, i)] = (doc, meta)
+        return len(ids)
+
+    monkeypatch.setattr(embeddings.embedder, "embed_batch", embed_batch)
+    monkeypatch.setattr(storage.store, "existing_ids", existing_ids)
+    monkeypatch.setattr(storage.store, "upsert_documents", upsert_documents)
+    return stored, calls
+
+
+class TestChunkIdentity:
+    """Test content-derived chunk IDs and metadata."""
+
+    def test_id_ignores_source_and_whitespace(self):
+        """Same content from different sources shares an ID."""
+        from ingestion.event_chunker import SchemaChunk
+        from ingestion.event_embedder import chunk_id
+
+        a = SchemaChunk(text="Field: price\n type number", source="a.json",
+                        event_type="gameStateUpdate", doc_type="field",
+                        field_path="data.price")
+        b = SchemaChunk(text="Field: price type  number", source="b.json",
+                        event_type="gameStateUpdate", doc_type="field",
+                        field_path="data.price")
+        c = SchemaChunk(text="Field: price type number", source="a.json",
+                        event_type="gameStateUpdate", doc_type="schema")
+
+        assert chunk_id(a) == chunk_id(b)
+        assert chunk_id(a) != chunk_id(c)
+
+    def test_metadata_has_no_none_values(self):
+        """Missing field_path/game_id become empty strings for Chroma."""
+        from ingestion.event_chunker import SchemaChunk
+        from ingestion.event_embedder import chunk_metadata
+
+        chunk = SchemaChunk(text="x", source="s", event_type="e", doc_type="overview")
+
+        meta = chunk_metadata(chunk)
+
+        assert meta == {
+            "source": "s",
+            "event_type": "e",
+            "doc_type": "overview",
+            "field_path": "",
+            "game_id": "",
+        }
+
+
+class TestEmbedChunks:
+    """Test batched upserts into the events collection."""
+
+    def test_batches_and_dedupes(self, fake_store):
+        """Duplicates are embedded once and batches respect batch_size."""
+        from ingestion.event_chunker import chunk_raw_capture
+        from ingestion.event_embedder import embed_chunks
+
+        stored, calls = fake_store
+        chunks = list(chunk_raw_capture(FIXTURE))
+
+        embedded = embed_chunks(chunks + chunks, batch_size=4)
+
+        assert embedded == len(chunks)
+        assert calls["embedded_texts"] == len(chunks)
+        assert calls["upserts"] == -(-len(chunks) // 4)
+        _, meta = next(iter(stored.values()))
+        assert meta["doc_type"] == "raw_event"
+        assert {key[0] for key in stored} == {"rugs_events"}
+
+    def test_rerun_skips_stored_chunks(self, fake_store):
+        """A second run embeds nothing new."""
+        from ingestion.event_chunker import chunk_raw_capture
+        from ingestion.event_embedder import embed_chunks
+
+        _, calls = fake_store
+        embed_chunks(chunk_raw_capture(FIXTURE))
+        first = calls["embedded_texts"]
+
+        assert embed_chunks(chunk_raw_capture(FIXTURE)) == 0
+        assert calls["embedded_texts"] == first
+
+    def test_pipeline_phase_6_embeds_schemas_and_events(self, fake_store, tmp_path):
+        """ingest_websocket_recordings embeds schema and sampled event chunks."""
+        from ingestion.jsonl_ingest import ingest_websocket_recordings
+
+        stored, _ = fake_store
+        recordings = tmp_path / "recordings"
+        recordings.mkdir()
+        (recordings / "capture.jsonl").write_text(FIXTURE.read_text())
+
+        result = ingest_websocket_recordings(
+            recordings_dir=recordings,
+            output_dir=tmp_path / "out",
+            embed=True,
+            verbose=False,
+            event_sample_rate=1,
+        )
+
+        doc_types = {meta["doc_type"] for _, meta in stored.values()}
+        assert result.chunks_embedded == len(stored)
+        assert {"schema", "raw_event"} <= doc_types
+        assert any(
+            meta["game_id"] == "20251215-abc123" for _, meta in stored.values()
+        )
@@ -0,0 +1,120 @@
+"""Tests for event_reducer module - per-game summaries and dedupe."""
+from pathlib import Path
+
+FIXTURE = Path(__file__).parent / "fixtures" / "sample_capture.jsonl"
+
+
+def _update(seq, game_id, tick, price, **extra):
+    data = {"gameId": game_id, "tickCount": tick, "price": price, "active": True}
+    data.update(extra)
+    return {"seq": seq, "ts": f"2025-12-15T00:00:{seq:02d}+00:00",
+            "event": "gameStateUpdate", "data": data}
+
+
+def _trade(seq, game_id, trade_type, amount, username):
+    return {"seq": seq, "ts": f"2025-12-15T00:00:{seq:02d}+00:00",
+            "event": "standard/newTrade",
+            "data": {"gameId": game_id, "type": trade_type, "amount": amount,
+                     "username": username}}
+
+
+def _chat(seq, message):
+    return {"seq": seq, "ts": f"2025-12-15T00:00:{seq:02d}+00:00",
+            "event": "newChatMessage",
+            "data": {"username": "u", "level": 1, "message": message}}
+
+
+class TestGameSummaries:
+    """Test folding game events into per-game chunks."""
+
+    def test_one_summary_per_game(self):
+        """Each game yields a single summary with its key facts."""
+        from ingestion.event_reducer import reduce_events
+
+        events = [
+            _update(1, "g1", 1, 1.0, leaderboard=[{"username": "alice"}]),
+            _trade(2, "g1", "buy", 0.5, "bob"),
+            _update(3, "g1", 2, 3.5, leaderboard=[{"username": "bob"}]),
+            _trade(4, "g1", "sell", 0.25, "alice"),
+            _update(5, "g1", 3, 0.0, rugged=True),
+            _update(6, "g2", 1, 1.0),
+        ]
+
+        chunks = list(reduce_events(events, "test"))
+        summaries = {c.game_id: c for c in chunks if c.doc_type == "game_summary"}
+
+        assert set(summaries) == {"g1", "g2"}
+        text = summaries["g1"].text
+        assert "Peak Price: 3.5 at tick 2" in text
+        assert "Rug Tick: 3" in text
+        assert "Trades: 2 (1 buys, 1 sells), volume 0.75 SOL, 2 traders" in text
+        assert "Leaderboard Leader Changes: 1" in text
+        assert "Rug Tick: not observed" in summaries["g2"].text
+
+    def test_price_path_is_downsampled(self):
+        """Long games keep a bounded price path in their summary."""
+        from ingestion.event_reducer import PRICE_PATH_POINTS, reduce_events
+
+        events = [_update(i % 60, "g1", i, 1.0 + i / 100) for i in range(1000)]
+
+        (chunk,) = reduce_events(events, "test")
+        path = chunk.text.split("Price Path (tick: price): ")[1].split("\n")[0]
+
+        assert len(path.split(", ")) == PRICE_PATH_POINTS
+        assert path.endswith("999: 10.99")
+
+    def test_late_trades_join_previous_game(self):
+        """Trades arriving just after the next game starts are not lost."""
+        from ingestion.event_reducer import reduce_events
+
+        events = [
+            _update(1, "g1", 1, 1.0),
+            _update(2, "g2", 1, 1.0),
+            _trade(3, "g1", "buy", 1.0, "late"),
+        ]
+
+        summaries = {c.game_id: c.text for c in reduce_events(events, "test")}
+
+        assert "Trades: 1 (1 buys" in summaries["g1"]
+
+
+class TestDeduplication:
+    """Test collapsing and exact dedupe of other events."""
+
+    def test_consecutive_near_duplicates_collapse(self):
+        """Runs differing only in numbers become one annotated chunk."""
+        from ingestion.event_reducer import reduce_events
+
+        events = [_chat(i, f"price is {i}") for i in range(5)]
+
+        chunks = list(reduce_events(events, "test"))
+
+        assert len(chunks) == 1
+        assert "Repeated: 5 consecutive similar events" in chunks[0].text
+        assert "Timestamp:" not in chunks[0].text
+
+    def test_exact_duplicates_emitted_once(self):
+        """Identical texts separated by other events are emitted once."""
+        from ingestion.event_reducer import EventReducer
+
+        events = [_chat(1, "gm"), _chat(2, "wagmi"), _chat(3, "gm")]
+        reducer = EventReducer("test")
+
+        chunks = [c for e in events for c in reducer.feed(e)]
+        chunks.extend(reducer.finish())
+
+        assert len(chunks) == 2
+        assert "Message: gm\n" in chunks[0].text
+        assert "Message: wagmi\n" in chunks[1].text
+        assert reducer.duplicates == 1
+
+    def test_fixture_reduces_below_event_count(self):
+        """A capture reduces to fewer chunks than events."""
+        from ingestion.event_chunker import chunk_raw_capture
+        from ingestion.event_reducer import reduce_capture
+
+        raw = list(chunk_raw_capture(FIXTURE))
+        reduced = list(reduce_capture(FIXTURE))
+
+        assert len(reduced) < len(raw)
+        assert sum(c.doc_type == "game_summary" for c in reduced) == 1
@@ -0,0 +1,137 @@
+"""Tests for field_lookup module - trie, reverse map and fuzzy lookups."""
+import json
+from pathlib import Path
+
+import pytest
+
+FIXTURE = Path(__file__).parent / "fixtures" / "sample_capture.jsonl"
+
+
+RECORDS = [
+    {"event": "gameStateUpdate", "data": {
+        "gameId": "g1", "leaderboard": [{"pnl": 1.5, "username": "whale"}], "rugTick": 3,
+    }},
+    {"event": "standard/newTrade", "data": {"gameId": "g1", "amount": 0.5}},
+]
+
+
+@pytest.fixture
+def generated_index(tmp_path):
+    """generate_field_index() output for RECORDS (single-event fields use "event")."""
+    from ingestion.event_discovery import scan_jsonl_file
+    from ingestion.schema_generator import generate_field_index
+
+    path = tmp_path / "capture.jsonl"
+    path.write_text("".join(json.dumps(record) + "\n" for record in RECORDS))
+    return generate_field_index(scan_jsonl_file(path))
+
+
+@pytest.fixture
+def field_index(generated_index):
+    """FieldIndex over the generated field index."""
+    from retrieval.field_lookup import FieldIndex
+
+    return FieldIndex(generated_index)
+
+
+class TestExactAndPrefix:
+    """Test trie-backed exact and prefix lookups."""
+
+    def test_exact_tolerates_missing_array_marker(self, field_index):
+        """Paths resolve with or without "[]" and in any case."""
+        assert field_index.get("data.leaderboard[].pnl")["path"] == "data.leaderboard[].pnl"
+        assert field_index.get("DATA.Leaderboard.pnl")["path"] == "data.leaderboard[].pnl"
+        assert field_index.get("data.leaderboard")["type"] == "array"
+        assert field_index.get("data.leaderboard.missing") is None
+
+    def test_prefix_completes_partial_segment(self, field_index):
+        """A partial last segment matches every path below it."""
+        assert field_index.prefix("data.leader") == [
+            "data.leaderboard",
+            "data.leaderboard[]",
+            "data.leaderboard[].pnl",
+            "data.leaderboard[].username",
+        ]
+        assert field_index.prefix("data.leaderboard.") == [
+            "data.leaderboard[].pnl",
+            "data.leaderboard[].username",
+        ]
+
+    def test_reverse_event_map(self, field_index):
+        """Event types map back to their sorted field paths."""
+        assert field_index.for_event("standard/newTrade") == ["data", "data.amount", "data.gameId", "event"]
+        assert field_index.for_event("gameStateUpdate") == [
+            "data",
+            "data.gameId",
+            "data.leaderboard",
+            "data.leaderboard[]",
+            "data.leaderboard[].pnl",
+            "data.leaderboard[].username",
+            "data.rugTick",
+            "event",
+        ]
+        assert field_index.for_event("unknown") == []
+
+    def test_single_event_fields(self, field_index, generated_index):
+        """Fields stored under "event" (not "events") are found and filtered."""
+        from retrieval.field_lookup import field_events
+
+        assert "events" not in generated_index["data.amount"]
+        assert field_events(generated_index["data.amount"]) == ["standard/newTrade"]
+        assert field_index.lookup("data.amount", event_type="standard/newTrade")["exact"]["path"] == "data.amount"
+        assert field_index.lookup("data.amount", event_type="gameStateUpdate")["exact"] is None
+
+
+class TestFuzzy:
+    """Test trigram fuzzy matching and the combined lookup."""
+
+    def test_fuzzy_finds_fragment_and_typo(self, field_index):
+        """Leaf fragments and misspellings rank the intended field first."""
+        assert field_index.fuzzy("rugtick")[0]["path"] == "data.rugTick"
+        assert field_index.fuzzy("usrname")[0]["path"] == "data.leaderboard[].username"
+
+    def test_fuzzy_respects_event_filter(self, field_index):
+        """Filtered fuzzy matches only come from the event's fields."""
+        matches = field_index.fuzzy("game", event_type="standard/newTrade")
+
+        assert matches
+        assert {m["path"] for m in matches} <= set(field_index.for_event("standard/newTrade"))
+
+    def test_lookup_does_not_repeat_matches(self, field_index):
+        """Exact, prefix and fuzzy sections are disjoint."""
+        answer = field_index.lookup("data.leaderboard")
+
+        assert answer["exact"]["path"] == "data.leaderboard"
+        prefix = [m["path"] for m in answer["prefix"]]
+        fuzzy = [m["path"] for m in answer["fuzzy"]]
+        assert "data.leaderboard" not in prefix + fuzzy
+        assert not set(prefix) & set(fuzzy)
+
+    def test_lookup_field_reads_generated_index(self, tmp_path):
+        """lookup_field() answers from a discovered_fields.json file."""
+        from ingestion.event_discovery import scan_jsonl_file
+        from ingestion.schema_generator import generate_field_index
+        from retrieval.field_lookup import lookup_field
+
+        path = tmp_path / "discovered_fields.json"
+        path.write_text(json.dumps(generate_field_index(scan_jsonl_file(FIXTURE))))
+
+        answer = lookup_field("data.gameid", index_path=path)
+
+        assert answer["exact"]["path"] == "data.gameId"
+        assert "gameStateUpdate" in answer["exact"]["events"]
+
+    def test_cli_prints_single_event_exact_match(self, generated_index, tmp_path):
+        """The CLI lists the event of a single-event exact match."""
+        import subprocess
+        import sys
+
+        path = tmp_path / "discovered_fields.json"
+        path.write_text(json.dumps(generated_index))
+
+        result = subprocess.run(
+            [sys.executable, "-m", "retrieval.field_lookup", "data.rugTick", "--index", str(path)],
+            cwd=Path(__file__).parent.parent, capture_output=True, text=True, check=True,
+        )
+
+        assert "Exact: data.rugTick (number) in gameStateUpdate" in result.stdout
@@ -0,0 +1,99 @@
+"""Tests for field_presence module - files x fields bitsets and drift."""
+import os
+from pathlib import Path
+
+FIXTURE = Path(__file__).parent / "fixtures" / "sample_capture.jsonl"
+
+
+def _matrix():
+    from ingestion.field_presence import PresenceMatrix
+
+    matrix = PresenceMatrix()
+    matrix.add("d1.jsonl", {"a": {"number"}, "b": {"string"}, "c": {"number"}}, "2025-12-01")
+    matrix.add("d2.jsonl", {"a": {"number"}, "b": {"string"}}, "2025-12-02")
+    matrix.add("d2b.jsonl", {"a": {"number"}, "d": {"boolean"}}, "2025-12-02")
+    matrix.add("d3.jsonl", {"a": {"string"}, "d": {"boolean"}}, "2025-12-03")
+    return matrix
+
+
+class TestSetAlgebra:
+    """Test row and column bitset queries."""
+
+    def test_union_intersection_and_columns(self):
+        """Rows combine with set algebra and columns index captures."""
+        matrix = _matrix()
+        day2 = matrix.file_mask(start_date="2025-12-02", end_date="2025-12-02")
+
+        assert matrix.paths(matrix.any_fields(day2)) == ["a", "b", "d"]
+        assert matrix.paths(matrix.all_fields(day2)) == ["a"]
+        assert matrix.paths(matrix.all_fields()) == ["a"]
+        assert matrix.files_with("d") == ["d2b.jsonl", "d3.jsonl"]
+        assert matrix.coverage("b") == 0.5
+        assert matrix.coverage("b", day2) == 0.5
+
+    def test_replace_and_remove_rows(self):
+        """Replacing a row clears its old bits; removal renumbers rows."""
+        matrix = _matrix()
+
+        matrix.add("d1.jsonl", {"a": {"number"}}, "2025-12-01")
+        assert matrix.files_with("c") == []
+
+        matrix.remove(["d2.jsonl"])
+        assert [row.name for row in matrix.rows] == ["d1.jsonl", "d2b.jsonl", "d3.jsonl"]
+        assert matrix.files_with("d") == ["d2b.jsonl", "d3.jsonl"]
+        assert matrix.files_with("b") == []
+
+
+class TestTimeline:
+    """Test per-date drift."""
+
+    def test_timeline_reports_drift(self):
+        """Fields appear, disappear and change type on the right dates."""
+        day1, day2, day3 = _matrix().timeline()
+
+        assert (day1.files, day1.fields, day1.appeared) == (1, 3, [])
+        assert day2.appeared == ["d"]
+        assert day2.disappeared == ["c"]
+        assert day3.disappeared == ["b"]
+        assert day3.type_changes == {"a": (["number"], ["string"])}
+
+
+class TestPersistence:
+    """Test saving and incremental directory updates."""
+
+    def test_round_trip(self, tmp_path):
+        """A saved matrix loads with identical rows and columns."""
+        from ingestion.field_presence import PresenceMatrix
+
+        matrix = _matrix()
+        matrix.save(tmp_path / "presence.json")
+        loaded = PresenceMatrix.load(tmp_path / "presence.json")
+
+        assert loaded.fields == matrix.fields
+        assert loaded.columns == matrix.columns
+        assert [(r.name, r.fields, r.typed) for r in loaded.rows] == [
+            (r.name, r.fields, r.typed) for r in matrix.rows
+        ]
+
+    def test_update_rescans_only_changed_files(self, tmp_path):
+        """Unchanged captures are skipped; deleted ones are dropped."""
+        from ingestion.field_presence import PresenceMatrix
+
+        recordings = tmp_path / "recordings"
+        recordings.mkdir()
+        for name in ("golden_hour_2025-12-14_0100.jsonl", "session_20251215_0200.jsonl"):
+            (recordings / name).write_text(FIXTURE.read_text())
+
+        matrix = PresenceMatrix()
+        assert len(matrix.update(recordings)) == 2
+        assert [row.date for row in matrix.rows] == ["2025-12-14", "2025-12-15"]
+        assert matrix.update(recordings) == []
+
+        changed = recordings / "session_20251215_0200.jsonl"
+        changed.write_text(FIXTURE.read_text() + "\n")
+        os.utime(changed, ns=(1, 1))
+        (recordings / "golden_hour_2025-12-14_0100.jsonl").unlink()
+
+        assert matrix.update(recordings) == ["session_20251215_0200.jsonl"]
+        assert len(matrix) == 1
+        assert "data.gameId" in matrix.paths(matrix.all_fields())
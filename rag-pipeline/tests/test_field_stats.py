@@ -0,0 +1,241 @@
+"""Tests for field_stats module - streaming sketches for field statistics."""
+import random
+
+import pytest
+
+
+class TestReservoirSample:
+    """Test uniform reservoir sampling."""
+
+    def test_keeps_first_values_until_full(self):
+        """Reservoir holds every value until it reaches its size."""
+        from ingestion.field_stats import ReservoirSample
+
+        sample = ReservoirSample(size=5)
+        for i in range(3):
+            sample.add(i)
+
+        assert sample.items == [0, 1, 2]
+        assert sample.seen == 3
+
+    def test_sample_is_not_biased_to_stream_start(self):
+        """Late values are sampled about as often as early values."""
+        from ingestion.field_stats import ReservoirSample
+
+        early = late = 0
+        for _ in range(500):
+            sample = ReservoirSample(size=5, rng=random.Random())
+            for i in range(1000):
+                sample.add(i)
+            assert len(sample.items) == 5
+            early += sum(1 for v in sample.items if v < 500)
+            late += sum(1 for v in sample.items if v >= 500)
+
+        assert late > 0.4 * (early + late)
+
+    def test_merge_weights_by_values_seen(self):
+        """Merging keeps the reservoir size and sums values seen."""
+        from ingestion.field_stats import ReservoirSample
+
+        a = ReservoirSample(size=5)
+        b = ReservoirSample(size=5)
+        for i in range(100):
+            a.add(i)
+        for i in range(100, 110):
+            b.add(i)
+
+        a.merge(b)
+
+        assert a.seen == 110
+        assert len(a.items) == 5
+
+
+class TestTDigest:
+    """Test t-digest quantile estimation."""
+
+    def test_quantiles_match_exact_values(self):
+        """Quantile estimates land close to exact quantiles."""
+        from ingestion.field_stats import TDigest
+
+        rng = random.Random(7)
+        values = [rng.uniform(0, 100) for _ in range(20000)]
+        digest = TDigest()
+        for v in values:
+            digest.add(v)
+
+        values.sort()
+        for q in (0.01, 0.5, 0.99):
+            exact = values[int(q * len(values))]
+            assert digest.quantile(q) == pytest.approx(exact, abs=1.0)
+
+    def test_memory_is_bounded(self):
+        """Centroid count stays bounded by the compression budget."""
+        from ingestion.field_stats import TDigest
+
+        digest = TDigest(compression=100)
+        for i in range(50000):
+            digest.add(float(i % 977))
+        digest.to_dict()
+
+        assert len(digest._means) <= 100
+
+    def test_merge_equals_single_stream(self):
+        """Merged digests estimate the same median as one digest."""
+        from ingestion.field_stats import TDigest
+
+        a, b = TDigest(), TDigest()
+        for i in range(1000):
+            (a if i % 2 else b).add(float(i))
+
+        a.merge(b)
+
+        assert a.count == 1000
+        assert a.quantile(0.5) == pytest.approx(500, abs=10)
+
+
+class TestHyperLogLog:
+    """Test HyperLogLog cardinality estimation."""
+
+    def test_estimate_within_error(self):
+        """Estimate is within a few percent of the true cardinality."""
+        from ingestion.field_stats import HyperLogLog
+
+        sketch = HyperLogLog()
+        for i in range(20000):
+            sketch.add(f"did:privy:player{i}")
+            sketch.add(f"did:privy:player{i}")  # duplicates don't count
+
+        assert sketch.estimate() == pytest.approx(20000, rel=0.1)
+
+    def test_merge_is_union(self):
+        """Merged sketches estimate the size of the union."""
+        from ingestion.field_stats import HyperLogLog
+
+        a, b = HyperLogLog(), HyperLogLog()
+        for i in range(1000):
+            a.add(i)
+        for i in range(500, 1500):
+            b.add(i)
+
+        a.merge(b)
+
+        assert a.estimate() == pytest.approx(1500, rel=0.1)
+
+    def test_stable_hash_distinguishes_bool_and_int(self):
+        """True and 1 are different JSON values."""
+        from ingestion.field_stats import stable_hash
+
+        assert stable_hash(True) != stable_hash(1)
+        assert stable_hash("abc") == stable_hash("abc")
+
+
+class TestFieldStats:
+    """Test combined per-field statistics."""
+
+    def test_numeric_summary(self):
+        """Numeric fields get min/max/mean and quantiles."""
+        from ingestion.field_stats import FieldStats
+
+        stats = FieldStats()
+        for price in (1.0, 2.0, 3.0, None):
+            stats.add(price)
+
+        summary = stats.summary()
+
+        assert summary["null_rate"] == 0.25
+        assert summary["min"] == 1.0
+        assert summary["max"] == 3.0
+        assert summary["mean"] == 2.0
+        assert summary["distinct_estimate"] == 4
+
+    def test_string_summary_has_no_numeric_keys(self):
+        """String fields report cardinality and samples only."""
+        from ingestion.field_stats import FieldStats
+
+        stats = FieldStats()
+        for name in ("a", "b", "a"):
+            stats.add(name)
+
+        summary = stats.summary()
+
+        assert "min" not in summary
+        assert summary["distinct_estimate"] == 2
+        assert len(summary["reservoir"]) == 3
+
+    def test_round_trip_and_merge(self):
+        """Stats survive serialization and merge across shards."""
+        from ingestion.field_stats import FieldStats
+
+        a, b = FieldStats(), FieldStats()
+        for i in range(100):
+            a.add(i)
+            b.add(i + 100)
+
+        restored = FieldStats.from_dict(b.to_dict())
+        a.merge(restored)
+
+        assert a.count == 200
+        assert a.min == 0
+        assert a.max == 199
+        assert a.mean == pytest.approx(99.5)
+        assert a.integral
+
+    def test_integral_tracks_floats(self):
+        """integral holds only while every numeric value is an int."""
+        from ingestion.field_stats import FieldStats
+
+        ints, mixed, flags = FieldStats(), FieldStats(), FieldStats()
+        for value in (1, 2, None):
+            ints.add(value)
+            mixed.add(value)
+        mixed.add(2.0)
+        flags.add(True)
+
+        assert ints.integral and not mixed.integral and not flags.integral
+        ints.merge(FieldStats.from_dict(mixed.to_dict()))
+        assert not ints.integral
+
+
+class TestDiscoveryIntegration:
+    """Test that discovery feeds field statistics."""
+
+    def test_scan_collects_stats(self, tmp_path):
+        """Scanning records populates per-field stats."""
+        import json
+
+        from ingestion.event_discovery import scan_jsonl_file
+
+        capture = tmp_path / "capture.jsonl"
+        with open(capture, "w") as f:
+            for i in range(50):
+                price = None if i % 10 == 0 else float(i)
+                f.write(
+                    json.dumps({"event": "gameStateUpdate", "data": {"price": price}})
+                    + "\n"
+                )
+
+        result = scan_jsonl_file(capture)
+        field = result.events["gameStateUpdate"].fields["data.price"]
+        summary = field.stats_summary()
+
+        assert summary["null_rate"] == pytest.approx(0.1)
+        assert summary["max"] == 49.0
+        assert summary["distinct_estimate"] == pytest.approx(46, abs=3)
+
+    def test_field_index_and_report_include_stats(self):
+        """Field index and coverage report surface the statistics."""
+        from pathlib import Path
+
+        from ingestion.coverage_report import generate_coverage_report
+        from ingestion.event_discovery import scan_jsonl_file
+        from ingestion.schema_generator import generate_field_index
+
+        fixture = Path(__file__).parent / "fixtures" / "sample_capture.jsonl"
+        result = scan_jsonl_file(fixture)
+
+        index = generate_field_index(result)
+        report = generate_coverage_report(result)
+
+        assert index["data.price"]["stats"]["max"] == 1.256
+        assert "Null %" in report
+        assert "Distinct" in report
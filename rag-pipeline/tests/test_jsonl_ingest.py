@@ -55,6 +55,7 @@ class TestIngestionPipeline:
             assert (output_dir / "discovered_schemas.json").exists()
             assert (output_dir / "discovered_fields.json").exists()
             assert (output_dir / "coverage_report.md").exists()
+            assert (output_dir / "event_decoders.py").exists()
 
     def test_ingest_schema_content(self):
         """Ingestion produces valid schema content."""
@@ -209,3 +210,141 @@ class TestWithSampleFixture:
         assert "gameStateUpdate" in report
         assert "standard/newTrade" in report
         assert "playerUpdate" in report
+
+    def test_ingest_records_phase_metrics(self, sample_capture_dir, tmp_path):
+        """Each run returns phase metrics and appends them to the run log."""
+        import json
+
+        from ingestion.jsonl_ingest import ingest_websocket_recordings
+
+        output_dir = tmp_path / "output"
+
+        for profile in (False, True):
+            result = ingest_websocket_recordings(
+                recordings_dir=sample_capture_dir,
+                output_dir=output_dir,
+                embed=False,
+                verbose=False,
+                profile=profile,
+            )
+
+        assert [p.name for p in result.phases] == ["discovery", "outputs"]
+        discovery = result.phases[0]
+        assert discovery.events == 10
+        assert discovery.bytes == (sample_capture_dir / "sample.jsonl").stat().st_size
+        assert discovery.extra["snapshot_reused"] is True
+        assert (output_dir / "profiles" / "discovery.prof").exists()
+
+        runs = [json.loads(line) for line in (output_dir / "run_log.jsonl").open()]
+        assert len(runs) == 2
+        assert runs[0]["phases"][0]["extra"]["snapshot_reused"] is False
+        assert runs[1]["total"]["wall_s"] >= 0
+
+    @pytest.mark.parametrize(
+        "reduce_events, sample_rate, expected",
+        [
+            # The reducer also emits deduplicated event runs as raw_event
+            (True, 0, {"schema", "game_summary", "raw_event"}),
+            (True, 100, {"schema", "game_summary", "raw_event"}),
+            (False, 0, {"schema"}),
+            (False, 1, {"schema", "raw_event"}),
+        ],
+    )
+    def test_sample_rate_only_gates_raw_events(
+        self, sample_capture_dir, tmp_path, monkeypatch, reduce_events, sample_rate, expected
+    ):
+        """event_sample_rate=0 drops raw events but never the per-game summaries."""
+        import ingestion.event_embedder
+        from ingestion.jsonl_ingest import ingest_websocket_recordings
+
+        doc_types = set()
+
+        def embed_chunks(chunks, verbose=False, timings=None):
+            chunks = list(chunks)
+            doc_types.update(chunk.doc_type for chunk in chunks)
+            return len(chunks)
+
+        monkeypatch.setattr(ingestion.event_embedder, "embed_chunks", embed_chunks)
+
+        ingest_websocket_recordings(
+            recordings_dir=sample_capture_dir,
+            output_dir=tmp_path / "output",
+            verbose=False,
+            event_sample_rate=sample_rate,
+            reduce_events=reduce_events,
+        )
+
+        assert doc_types - {"field"} == expected
+
+
+class TestWriteDiscoveryOutputs:
+    """Test single-pass generation of schemas, index and reports."""
+
+    def test_outputs_match_standalone_generators(self, tmp_path):
+        """Single-traversal outputs equal the individual generator outputs."""
+        from ingestion.coverage_report import generate_coverage_report
+        from ingestion.event_discovery import scan_jsonl_file
+        from ingestion.jsonl_ingest import write_discovery_outputs
+        from ingestion.schema_generator import (
+            generate_all_schemas,
+            generate_field_index,
+        )
+
+        fixture = Path(__file__).parent / "fixtures" / "sample_capture.jsonl"
+        discovery = scan_jsonl_file(fixture)
+        dictionary = tmp_path / "FIELD_DICTIONARY.md"
+        dictionary.write_text("| `$.data.price` | number | SOL | Price |\n")
+
+        counts = write_discovery_outputs(discovery, tmp_path, dictionary)
+
+        schemas = json.loads((tmp_path / "discovered_schemas.json").read_text())
+        index = json.loads((tmp_path / "discovered_fields.json").read_text())
+        report = (tmp_path / "coverage_report.md").read_text()
+
+        assert schemas == json.loads(json.dumps(generate_all_schemas(discovery)))
+        # Merged reservoirs are random samples; compare everything else
+        expected_index = json.loads(json.dumps(generate_field_index(discovery)))
+        for info in list(index.values()) + list(expected_index.values()):
+            info.get("stats", {}).pop("reservoir", None)
+        assert index == expected_index
+        # Reports differ only in the generation timestamp line
+        expected = generate_coverage_report(discovery)
+        assert report.splitlines()[3:] == expected.splitlines()[3:]
+        assert counts["schemas"] == len(schemas)
+        assert counts["fields"] == len(index)
+        assert counts["matched"] == 1
+        assert (tmp_path / "diff_report.md").exists()
+
+    def test_json_outputs_are_indented_unless_compact(self, tmp_path):
+        """Knowledge-base JSON outputs chunk by line; compact is opt-in."""
+        from ingestion.event_discovery import scan_jsonl_file
+        from ingestion.jsonl_ingest import write_discovery_outputs
+
+        fixture = Path(__file__).parent / "fixtures" / "sample_capture.jsonl"
+        discovery = scan_jsonl_file(fixture)
+        compact_dir = tmp_path / "compact"
+        compact_dir.mkdir()
+
+        write_discovery_outputs(discovery, tmp_path)
+        write_discovery_outputs(discovery, compact_dir, compact_json=True)
+
+        for name in ("discovered_schemas.json", "discovered_fields.json"):
+            indented = (tmp_path / name).read_text()
+            compact = (compact_dir / name).read_text()
+            assert indented.startswith('{\n  "')
+            assert len(compact.splitlines()) == 1
+            assert json.loads(indented).keys() == json.loads(compact).keys()
+        schemas = "discovered_schemas.json"
+        assert json.loads((tmp_path / schemas).read_text()) == json.loads((compact_dir / schemas).read_text())
+
+    def test_write_json_is_compact_and_valid(self, tmp_path):
+        """Streamed JSON parses back and has no indentation."""
+        from ingestion.schema_generator import write_json
+
+        data = {"a": {"b": [1, 2]}, "c": "x"}
+        path = tmp_path / "out.json"
+
+        write_json(data, path)
+
+        assert json.loads(path.read_text()) == data
+        assert path.read_text() == '{"a":{"b":[1,2]},"c":"x"}'
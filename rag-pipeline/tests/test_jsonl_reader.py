@@ -0,0 +1,145 @@
+"""Tests for jsonl_reader module - mmap line iteration and sharding."""
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+FIXTURE = Path(__file__).parent / "fixtures" / "sample_capture.jsonl"
+
+
+def _write_lines(path, lines):
+    path.write_bytes(b"".join(lines))
+    return path
+
+
+class TestIterLines:
+    """Test byte-level line iteration."""
+
+    def test_matches_readlines(self):
+        """Lines and offsets match binary readline iteration."""
+        from ingestion.jsonl_reader import iter_lines
+
+        with open(FIXTURE, "rb") as f:
+            expected = f.readlines()
+
+        lines = list(iter_lines(FIXTURE))
+
+        assert [line for _, line in lines] == expected
+        assert lines[1][0] == len(expected[0])
+
+    def test_complete_only_drops_partial_tail(self, tmp_path):
+        """A final line without newline is withheld when complete_only."""
+        from ingestion.jsonl_reader import iter_lines
+
+        path = _write_lines(tmp_path / "a.jsonl", [b'{"a": 1}\n', b'{"b":'])
+
+        assert len(list(iter_lines(path))) == 2
+        assert len(list(iter_lines(path, complete_only=True))) == 1
+
+    def test_empty_file(self, tmp_path):
+        """Empty files yield nothing (mmap cannot map zero bytes)."""
+        from ingestion.jsonl_reader import iter_lines, shard_boundaries
+
+        path = _write_lines(tmp_path / "empty.jsonl", [])
+
+        assert list(iter_lines(path)) == []
+        assert shard_boundaries(path, 4) == []
+
+    def test_compressed_segment_streamed(self, tmp_path):
+        """gzip segments yield the same lines and decompressed offsets."""
+        from ingestion.jsonl_reader import iter_lines, recording_files
+
+        expected = list(iter_lines(FIXTURE))
+        path = tmp_path / "rec.0001.jsonl.gz"
+        path.write_bytes(gzip.compress(FIXTURE.read_bytes()))
+        (tmp_path / "rec.manifest.json").write_text("{}")
+        (tmp_path / "plain.jsonl").write_text("")
+
+        assert list(iter_lines(path)) == expected
+        assert [p.name for p in recording_files(tmp_path)] == ["plain.jsonl", "rec.0001.jsonl.gz"]
+        with pytest.raises(ValueError, match="byte range"):
+            list(iter_lines(path, start=10))
+
+
+class TestIterRecords:
+    """Test parsed iteration with the event prefilter."""
+
+    def test_prefilter_is_exact(self, tmp_path):
+        """Lines mentioning the event inside a payload are not matched."""
+        from ingestion.jsonl_reader import iter_records
+
+        path = _write_lines(tmp_path / "a.jsonl", [
+            b'{"event": "gameStateUpdate", "data": {}}\n',
+            b'{"event":"gameStateUpdate","data":{}}\n',
+            b'{"event": "newChatMessage", "data": {"message": "\\"event\\": \\"gameStateUpdate\\""}}\n',
+            b'# Session: header\n',
+            b'not json\n',
+        ])
+        errors = []
+
+        records = list(iter_records(path, event_types=["gameStateUpdate"], errors=errors))
+
+        assert len(records) == 2
+        assert errors == []
+
+        all_records = list(iter_records(path, errors=errors))
+        assert len(all_records) == 3
+        assert len(errors) == 1
+
+    def test_namespaced_event_names(self):
+        """Event names containing '/' are matched."""
+        from ingestion.jsonl_reader import iter_records
+
+        records = list(iter_records(FIXTURE, event_types=["standard/newTrade"]))
+
+        assert [r["event"] for _, r in records] == ["standard/newTrade"]
+
+
+class TestSharding:
+    """Test newline-aligned shard boundaries."""
+
+    def test_shards_cover_file_on_line_starts(self):
+        """Shards tile the file and each starts at a line start."""
+        from ingestion.jsonl_reader import iter_lines, shard_boundaries
+
+        line_starts = {offset for offset, _ in iter_lines(FIXTURE)}
+        shards = shard_boundaries(FIXTURE, 3)
+
+        assert shards[0][0] == 0
+        assert shards[-1][1] == FIXTURE.stat().st_size
+        for (_, end), (start, _) in zip(shards, shards[1:]):
+            assert end == start
+            assert start in line_starts
+
+        sharded = [line for start, end in shards for _, line in iter_lines(FIXTURE, start, end)]
+        assert sharded == [line for _, line in iter_lines(FIXTURE)]
+
+    def test_more_shards_than_lines(self, tmp_path):
+        """Asking for more shards than lines yields one shard per line at most."""
+        from ingestion.jsonl_reader import shard_boundaries
+
+        path = _write_lines(tmp_path / "a.jsonl", [b'{"a": 1}\n', b'{"b": 2}\n'])
+
+        assert shard_boundaries(path, 10) == [(0, 9), (9, 18)]
+
+    def test_parallel_scan_matches_serial(self, tmp_path):
+        """Sharded discovery produces the same events and field counts."""
+        from ingestion.event_discovery import scan_jsonl_file
+
+        path = tmp_path / "big.jsonl"
+        with open(path, "w") as f:
+            for i in range(400):
+                event = "gameStateUpdate" if i % 3 else "standard/newTrade"
+                f.write(json.dumps({"event": event, "data": {"price": i, "tick": i}}) + "\n")
+
+        serial = scan_jsonl_file(path)
+        parallel = scan_jsonl_file(path, workers=3)
+
+        assert parallel.total_lines == serial.total_lines
+        assert parallel.files_scanned == 1
+        for name, info in serial.events.items():
+            assert parallel.events[name].count == info.count
+            assert {
+                p: f.count for p, f in parallel.events[name].fields.items()
+            } == {p: f.count for p, f in info.fields.items()}
@@ -0,0 +1,105 @@
+"""Tests for scripts/record_golden_hour.py - asyncio recorder batching into segments."""
+import asyncio
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).resolve().parents[2] / "scripts" / "record_golden_hour.py"
+
+
+def _load_script():
+    """Import the recorder script (it needs the Socket.IO asyncio client)."""
+    pytest.importorskip("socketio")
+    pytest.importorskip("aiohttp")
+    spec = importlib.util.spec_from_file_location("record_golden_hour", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _events(games=3, ticks=5):
+    """(event, args) pairs as the Socket.IO handlers receive them."""
+    events = []
+    for game in range(games):
+        for tick in range(ticks):
+            events.append(("gameStateUpdate", ({"gameId": f"game-{game}", "tickCount": tick, "active": True},)))
+        events.append(("newChatMessage", ({"message": "gm"},)))
+    return events
+
+
+async def _record(recorder, events, yield_every=None):
+    """Run the writer and status tasks as run() does, feed events, then stop."""
+    recorder._queue = asyncio.Queue(maxsize=recorder.max_queue)
+    recorder._batch_ready = asyncio.Event()
+    recorder._tasks = [
+        asyncio.create_task(recorder._write_loop()),
+        asyncio.create_task(recorder._status_loop()),
+    ]
+    for number, (event_name, args) in enumerate(events, 1):
+        recorder._record_event(event_name, args)
+        if yield_every and number % yield_every == 0:
+            await asyncio.sleep(0.01)
+    await recorder.stop_async()
+
+
+class TestAsyncGoldenHourRecorder:
+    """Test that queued events all reach the segmented recording."""
+
+    def test_every_event_reaches_segments(self, tmp_path):
+        """Events written across batches, flush deadlines and stop all land in order."""
+        script = _load_script()
+        from ingestion.recording_segments import iter_segment_records, load_manifest
+
+        recorder = script.AsyncGoldenHourRecorder(
+            str(tmp_path / "rec.jsonl"),
+            compression="gzip",
+            rotate_per_game=True,
+            batch_size=4,
+            flush_interval=0.005,
+        )
+        events = _events()
+        asyncio.run(_record(recorder, events, yield_every=3))
+
+        records = list(iter_segment_records(tmp_path / "rec.jsonl"))
+        assert [(r["event"], r["data"]) for r in records] == [
+            (event_name, list(args)) for event_name, args in events
+        ]
+        manifest = load_manifest(tmp_path / "rec.jsonl")
+        assert [s["game_ids"] for s in manifest["segments"]] == [["game-0"], ["game-1"], ["game-2"]]
+        assert all(s["complete"] for s in manifest["segments"])
+        assert recorder.event_count == len(events)
+        assert recorder.dropped_count == 0
+        assert recorder.writer.stats["frames"] > 1
+        assert recorder.writer.paths[-1].name == "rec.0003.jsonl.gz"
+
+    def test_stop_writes_events_still_queued(self, tmp_path):
+        """Events queued right before stop_async() are written, not lost."""
+        script = _load_script()
+        from ingestion.recording_segments import iter_segment_records
+
+        recorder = script.AsyncGoldenHourRecorder(
+            str(tmp_path / "rec.jsonl"), batch_size=1000, flush_interval=60,
+        )
+        events = _events(games=1)
+        asyncio.run(_record(recorder, events))
+
+        assert len(list(iter_segment_records(tmp_path / "rec.jsonl"))) == len(events)
+        lines = recorder.writer.paths[-1].read_text().splitlines()
+        assert lines[0].startswith("# Session: ")
+        assert lines[-1].startswith("# Session End: ")
+
+    def test_full_queue_drops_and_counts(self, tmp_path):
+        """Events beyond max_queue are counted as dropped; the rest are written."""
+        script = _load_script()
+        from ingestion.recording_segments import iter_segment_records
+
+        recorder = script.AsyncGoldenHourRecorder(
+            str(tmp_path / "rec.jsonl"), max_queue=4, batch_size=1000, flush_interval=60,
+        )
+        events = _events(games=1)
+        asyncio.run(_record(recorder, events))
+
+        assert recorder.event_count == len(events)
+        assert recorder.dropped_count == len(events) - 4
+        assert len(list(iter_segment_records(tmp_path / "rec.jsonl"))) == 4
@@ -0,0 +1,231 @@
+"""Tests for recording_segments module - segmented recordings and manifest."""
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+FIXTURE = Path(__file__).parent / "fixtures" / "sample_capture.jsonl"
+
+
+def _game_records(games=3, ticks=4):
+    """GoldenHourRecorder-style records: ticks per game plus a chat line."""
+    records = []
+    ts_ms = 1_765_000_000_000
+    for game in range(games):
+        for tick in range(ticks):
+            ts_ms += 250
+            records.append({
+                "ts_ms": ts_ms,
+                "event": "gameStateUpdate",
+                "data": [{"gameId": f"game-{game}", "tickCount": tick}],
+            })
+        ts_ms += 250
+        records.append({"ts_ms": ts_ms, "event": "newChatMessage", "data": [{"message": "gm"}]})
+    return records
+
+
+class TestSegmentedRecordingWriter:
+    """Test rotation, compression and the manifest."""
+
+    def test_rotates_per_game(self, tmp_path):
+        """Each new gameId starts a segment listed in the manifest."""
+        from ingestion.recording_segments import SegmentedRecordingWriter, load_manifest
+
+        records = _game_records()
+        with SegmentedRecordingWriter(tmp_path / "rec.jsonl", compression="gzip", rotate_per_game=True) as writer:
+            writer.write_records(records[:7])
+            writer.write_records(records[7:])
+
+        manifest = load_manifest(tmp_path / "rec.jsonl")
+        segments = manifest["segments"]
+
+        assert [s["file"] for s in segments] == [
+            "rec.0001.jsonl.gz", "rec.0002.jsonl.gz", "rec.0003.jsonl.gz",
+        ]
+        assert [s["game_ids"] for s in segments] == [["game-0"], ["game-1"], ["game-2"]]
+        assert segments[1]["event_counts"] == {"gameStateUpdate": 4, "newChatMessage": 1}
+        assert segments[1]["ts_start_ms"] == records[5]["ts_ms"]
+        assert segments[1]["ts_end_ms"] == records[9]["ts_ms"]
+        assert all(s["complete"] for s in segments)
+
+        with gzip.open(tmp_path / "rec.0002.jsonl.gz", "rt") as f:
+            assert [json.loads(line) for line in f] == records[5:10]
+
+    def test_rotates_by_size_with_header_and_footer(self, tmp_path):
+        """Size rotation happens between batches; header and footer are comment lines."""
+        from ingestion.recording_segments import SegmentedRecordingWriter
+
+        writer = SegmentedRecordingWriter(
+            tmp_path / "rec.jsonl",
+            compression="none",
+            rotate_bytes=200,
+            header=lambda number: f"# Session: {{\"segment\": {number}}}\n",
+        )
+        for record in _game_records(games=1):
+            writer.write_records([record])
+        manifest = writer.close(footer="# Session End: {}")
+
+        assert len(manifest["segments"]) > 1
+        assert sum(s["events"] for s in manifest["segments"]) == 5
+        first = (tmp_path / "rec.0001.jsonl").read_text().splitlines()
+        last = writer.paths[-1].read_text().splitlines()
+        assert first[0] == '# Session: {"segment": 1}'
+        assert last[-1] == "# Session End: {}"
+
+    def test_skips_unserializable_records(self, tmp_path):
+        """Records json cannot encode are counted, not written."""
+        from ingestion.recording_segments import SegmentedRecordingWriter
+
+        with SegmentedRecordingWriter(tmp_path / "rec.jsonl", compression="none") as writer:
+            writer.write_records([{"event": "bad", "data": object()}, {"event": "ok"}])
+
+        assert writer.stats["skipped"] == 1
+        assert writer.stats["events"] == 1
+
+    def test_unknown_compression_rejected(self, tmp_path):
+        """Unknown compression names raise ValueError."""
+        from ingestion.recording_segments import SegmentedRecordingWriter
+
+        with pytest.raises(ValueError, match="Unknown compression"):
+            SegmentedRecordingWriter(tmp_path / "rec.jsonl", compression="lz4")
+
+    def test_zstd_frames_read_as_one_stream(self, tmp_path):
+        """Batches appended as zstd frames decompress as a single stream."""
+        pytest.importorskip("zstandard")
+        from ingestion.recording_segments import SegmentedRecordingWriter, open_segment
+
+        records = _game_records(games=1)
+        with SegmentedRecordingWriter(tmp_path / "rec.jsonl") as writer:
+            for record in records:
+                writer.write_records([record])
+
+        with open_segment(tmp_path / "rec.0001.jsonl.zst") as f:
+            assert [json.loads(line) for line in f] == records
+        assert writer.stats["frames"] == len(records)
+
+
+class TestSegmentSelection:
+    """Test manifest-driven reading."""
+
+    def _write(self, tmp_path, records, **options):
+        from ingestion.recording_segments import SegmentedRecordingWriter
+
+        with SegmentedRecordingWriter(tmp_path / "rec.jsonl", compression="gzip", **options) as writer:
+            writer.write_records(records)
+
+    def test_game_selection_skips_other_segments(self, tmp_path, monkeypatch):
+        """Only the segment that saw the game is opened."""
+        from ingestion import recording_segments
+
+        records = _game_records()
+        self._write(tmp_path, records, rotate_per_game=True)
+        opened = []
+        real_open = recording_segments.open_segment
+        monkeypatch.setattr(
+            recording_segments, "open_segment",
+            lambda path: opened.append(Path(path).name) or real_open(path),
+        )
+
+        result = list(recording_segments.iter_segment_records(tmp_path / "rec.jsonl", game_ids=["game-2"]))
+
+        assert result == records[10:]
+        assert opened == ["rec.0003.jsonl.gz"]
+
+    def test_time_and_event_filters_are_exact(self, tmp_path):
+        """ts_ms bounds and event types filter records inside selected segments."""
+        from ingestion.recording_segments import iter_segment_records, load_manifest, select_segments
+
+        records = _game_records()
+        self._write(tmp_path, records, rotate_per_game=True)
+        start, end = records[3]["ts_ms"], records[6]["ts_ms"]
+
+        result = list(iter_segment_records(
+            tmp_path / "rec.manifest.json", start_ms=start, end_ms=end,
+            event_types=["gameStateUpdate"],
+        ))
+        manifest = load_manifest(tmp_path / "rec.manifest.json")
+
+        assert result == [records[3], records[5], records[6]]
+        assert len(select_segments(manifest, start_ms=records[-1]["ts_ms"])) == 1
+        assert select_segments(manifest, event_types=["nope"]) == []
+
+    def test_incomplete_segments_always_selected(self, tmp_path):
+        """A segment still being written is read even if its metadata says no."""
+        from ingestion.recording_segments import SegmentedRecordingWriter, iter_segment_records
+
+        records = _game_records(games=1)
+        writer = SegmentedRecordingWriter(tmp_path / "rec.jsonl", compression="none")
+        writer.write_records(records)
+
+        # Manifest was last saved when the segment opened, before any events
+        result = list(iter_segment_records(tmp_path / "rec.jsonl", event_types=["newChatMessage"]))
+        writer.close()
+
+        assert result == [records[-1]]
+
+    def test_fixture_capture_round_trip(self, tmp_path):
+        """CDP captures (ISO ts, event key) keep their ts range in the manifest."""
+        from ingestion.recording_segments import iter_segment_records, load_manifest
+
+        with open(FIXTURE) as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        self._write(tmp_path, records)
+
+        segment = load_manifest(tmp_path / "rec.jsonl")["segments"][0]
+
+        assert list(iter_segment_records(tmp_path / "rec.jsonl")) == records
+        assert segment["game_ids"] == ["20251215-abc123"]
+        assert segment["ts_start_ms"] < segment["ts_end_ms"]
+
+    def test_unsupported_manifest_version(self, tmp_path):
+        """A manifest from a newer format version is rejected."""
+        from ingestion.recording_segments import load_manifest
+
+        (tmp_path / "rec.manifest.json").write_text(json.dumps({"version": 99, "segments": []}))
+
+        with pytest.raises(ValueError, match="manifest version"):
+            load_manifest(tmp_path / "rec.jsonl")
+
+
+class TestIngestionReaders:
+    """Test that discovery, presence and ingestion read compressed segments."""
+
+    def _record_dir(self, tmp_path):
+        from ingestion.recording_segments import SegmentedRecordingWriter
+
+        recordings = tmp_path / "recordings"
+        recordings.mkdir()
+        with SegmentedRecordingWriter(
+            recordings / "rec.jsonl", compression="gzip", rotate_per_game=True
+        ) as writer:
+            writer.write_records(_game_records())
+        return recordings
+
+    def test_scan_recordings_reads_segments(self, tmp_path):
+        """Every segment is scanned; the manifest is not a capture."""
+        from ingestion.event_discovery import scan_recordings
+
+        result = scan_recordings(self._record_dir(tmp_path))
+
+        assert result.files_scanned == 3
+        assert result.events["gameStateUpdate"].count == 12
+        assert result.events["newChatMessage"].count == 3
+        assert result.errors == []
+
+    def test_presence_matrix_and_ingest_read_segments(self, tmp_path):
+        """PresenceMatrix.update() and the ingestion pipeline pick up segments."""
+        from ingestion.field_presence import PresenceMatrix
+        from ingestion.jsonl_ingest import ingest_websocket_recordings
+
+        recordings = self._record_dir(tmp_path)
+        matrix = PresenceMatrix()
+
+        scanned = matrix.update(recordings)
+        result = ingest_websocket_recordings(
+            recordings, tmp_path / "out", embed=False, verbose=False
+        )
+
+        assert scanned == ["rec.0001.jsonl.gz", "rec.0002.jsonl.gz", "rec.0003.jsonl.gz"]
+        assert result.files_scanned == 3
+        assert result.events_discovered == 2
@@ -0,0 +1,60 @@
+"""Tests for run_metrics module - per-phase timing and run logs."""
+import json
+
+
+class TestRunMetrics:
+    """Test phase measurement, profiling and logging."""
+
+    def test_phase_records_time_and_rates(self):
+        """A phase measures wall/CPU time and derives rates from counters."""
+        from ingestion.run_metrics import RunMetrics
+
+        metrics = RunMetrics("test")
+        with metrics.phase("work") as phase:
+            sum(range(200_000))
+            phase.events = 1000
+            phase.bytes = 2000
+
+        (work,) = metrics.phases
+        assert work.wall_s > 0
+        assert work.cpu_s >= 0
+        assert work.events_per_s == round(1000 / work.wall_s, 1)
+        assert work.chunks_per_s is None
+        data = work.to_dict()
+        assert data["bytes_per_s"] == work.bytes_per_s
+        assert "extra" not in data
+
+    def test_phase_recorded_when_body_raises(self):
+        """Failed phases still leave their measurements."""
+        import pytest
+
+        from ingestion.run_metrics import RunMetrics
+
+        metrics = RunMetrics("test")
+        with pytest.raises(RuntimeError):
+            with metrics.phase("broken"):
+                raise RuntimeError("boom")
+
+        assert [p.name for p in metrics.phases] == ["broken"]
+
+    def test_profile_and_log(self, tmp_path):
+        """Profiling dumps one stats file per phase; runs append to the log."""
+        import pstats
+
+        from ingestion.run_metrics import RunMetrics
+
+        metrics = RunMetrics("test", profile_dir=tmp_path / "profiles")
+        with metrics.phase("a") as phase:
+            phase.chunks = 3
+        with metrics.phase("b"):
+            pass
+        metrics.append_log(tmp_path / "run_log.jsonl")
+        metrics.append_log(tmp_path / "run_log.jsonl")
+
+        pstats.Stats(str(tmp_path / "profiles" / "a.prof"))
+        lines = (tmp_path / "run_log.jsonl").read_text().splitlines()
+        run = json.loads(lines[-1])
+        assert len(lines) == 2
+        assert [p["name"] for p in run["phases"]] == ["a", "b"]
+        assert run["total"]["chunks"] == 3
+        assert run["phases"][0]["profile"].endswith("a.prof")
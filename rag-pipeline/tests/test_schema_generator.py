@@ -142,6 +142,56 @@ class TestGenerateEventSchema:
         assert "id" in lb["items"]["properties"]
         assert "pnl" in lb["items"]["properties"]
 
+    def test_nullable_field_schema(self):
+        """A field seen as number and null gets a nullable type."""
+        from ingestion.schema_generator import generate_event_schema
+
+        event = EventInfo(
+            name="gameStateUpdate",
+            count=3,
+            fields={
+                "data.price": FieldInfo(
+                    path="data.price",
+                    type="number",
+                    count=3,
+                    types={"number": 2, "null": 1},
+                ),
+            },
+        )
+
+        price = generate_event_schema(event)["properties"]["data"]["properties"]["price"]
+
+        assert price["type"] == ["number", "null"]
+        assert price["x-types"] == {"number": 2, "null": 1}
+
+    def test_union_field_schema_uses_any_of(self):
+        """Scalar-or-object fields keep both branches instead of overwriting."""
+        from ingestion.schema_generator import generate_event_schema, schema_branch
+
+        event = EventInfo(
+            name="playerUpdate",
+            count=4,
+            fields={
+                "data.meta": FieldInfo(
+                    path="data.meta",
+                    type="object",
+                    count=4,
+                    types={"object": 2, "number": 1, "null": 1},
+                ),
+                "data.meta.level": FieldInfo(path="data.meta.level", type="number", count=2),
+                "data.meta[]": FieldInfo(path="data.meta[]", type="string", count=1),
+            },
+        )
+
+        meta = generate_event_schema(event)["properties"]["data"]["properties"]["meta"]
+
+        assert "type" not in meta
+        assert [branch["type"] for branch in meta["anyOf"]] == [
+            "object", "number", "array", "null"
+        ]
+        assert "level" in schema_branch(meta, "object")["properties"]
+        assert schema_branch(meta, "array")["items"]["type"] == "string"
+
 
 class TestGenerateFieldIndex:
     """Test flat field index generation."""
@@ -213,6 +263,34 @@ class TestGenerateFieldIndex:
         assert isinstance(index["data.gameId"]["events"], list)
         assert len(index["data.gameId"]["events"]) == 2
 
+    def test_field_index_merges_types_across_events(self):
+        """A path with different types per event records the merged histogram."""
+        from ingestion.schema_generator import generate_field_index
+
+        result = DiscoveryResult()
+        result.events["gameStateUpdate"] = EventInfo(
+            name="gameStateUpdate",
+            count=10,
+            fields={"data.rugged": FieldInfo(path="data.rugged", type="boolean", count=10)},
+        )
+        result.events["playerUpdate"] = EventInfo(
+            name="playerUpdate",
+            count=30,
+            fields={
+                "data.rugged": FieldInfo(
+                    path="data.rugged",
+                    type="null",
+                    count=30,
+                    types={"null": 30},
+                )
+            },
+        )
+
+        index = generate_field_index(result)
+
+        assert index["data.rugged"]["type"] == "boolean"
+        assert index["data.rugged"]["types"] == {"boolean": 10, "null": 30}
+
 
 class TestGenerateAllSchemas:
     """Test generating all schemas from discovery result."""
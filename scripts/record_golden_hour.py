@@ -9,15 +9,33 @@ Usage:
     # Or with custom output:
     python scripts/record_golden_hour.py --output ~/rugs_recordings/golden_hour_2025-12-28.jsonl
 
+    # Asyncio client writing zstd segments, one per game, plus a manifest:
+    python scripts/record_golden_hour.py --async --compression zstd --rotate-per-game
+
+    # Against a local Socket.IO stand-in server (e.g. for testing):
+    python scripts/record_golden_hour.py --async --url http://127.0.0.1:5000
+
 Press Ctrl+C to stop recording.
+
+--async output is a segmented recording (rag-pipeline
+ingestion/recording_segments.py): numbered segments rotated by size, time
+or game, each batch appended as its own gzip member / zstd frame, and a
+<name>.manifest.json listing event counts, ts range and gameIds per
+segment so readers only decompress the segments they need.
 """
 
 import argparse
+import asyncio
 import json
 import signal
 import sys
 from datetime import datetime
 from pathlib import Path
+from typing import Dict, List, Optional
+
+# Segment writer lives with its readers in rag-pipeline/ingestion
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'rag-pipeline'))
+from ingestion.recording_segments import COMPRESSION_SUFFIXES, SegmentedRecordingWriter
 
 try:
     import socketio
@@ -26,15 +44,33 @@ except ImportError:
     print("Run: pip install 'python-socketio[client]'")
     sys.exit(1)
 
+BACKEND_URL = 'https://backend.rugs.fun'
+
+# Options shared by the sync and async clients' connect()
+CONNECT_OPTIONS = {
+    'transports': ['polling', 'websocket'],
+    'wait_timeout': 10,
+    'headers': {
+        'Origin': 'https://rugs.fun',
+        'Referer': 'https://rugs.fun/',
+        'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
+    },
+    'socketio_path': '/socket.io/',
+}
+
+# Queue marker that stops the async writer task
+_STOP = object()
+
 
 class GoldenHourRecorder:
     """Records all rugs.fun WebSocket events to JSONL file."""
 
-    def __init__(self, output_path: str):
+    def __init__(self, output_path: str, url: str = BACKEND_URL):
         self.output_path = Path(output_path)
         self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self.url = url
 
-        self.sio = socketio.Client(logger=False, engineio_logger=False)
+        self.sio = self._create_client()
         self.event_count = 0
         self.game_count = 0
         self.golden_hour_active = False
@@ -47,6 +83,10 @@ class GoldenHourRecorder:
 
         self._setup_handlers()
 
+    def _create_client(self):
+        """Create the Socket.IO client."""
+        return socketio.Client(logger=False, engineio_logger=False)
+
     def _setup_handlers(self):
         """Register Socket.IO event handlers."""
 
@@ -54,7 +94,7 @@ class GoldenHourRecorder:
         def connect():
             self.start_time = datetime.now()
             print(f"\n{'='*60}")
-            print(f"CONNECTED to backend.rugs.fun")
+            print(f"CONNECTED to {self.url}")
             print(f"Recording to: {self.output_path}")
             print(f"Started: {self.start_time.isoformat()}")
             print(f"{'='*60}")
@@ -89,18 +129,22 @@ class GoldenHourRecorder:
         for event_name in known_events:
             self.sio.on(event_name, lambda *args, e=event_name: self._record_event(e, args))
 
-    def _record_event(self, event_name: str, args: tuple):
-        """Record a single event to JSONL file."""
-        timestamp = datetime.now()
-
-        # Build record
-        record = {
+    def _build_record(self, event_name: str, args: tuple, timestamp: datetime) -> Dict:
+        """Build the JSONL record for one event."""
+        return {
             'ts': timestamp.isoformat(),
             'ts_ms': int(timestamp.timestamp() * 1000),
             'event': event_name,
             'data': list(args) if args else None
         }
 
+    def _record_event(self, event_name: str, args: tuple):
+        """Record a single event to JSONL file."""
+        timestamp = datetime.now()
+
+        # Build record
+        record = self._build_record(event_name, args, timestamp)
+
         # Write to file
         if self.file_handle:
             self.file_handle.write(json.dumps(record) + '\n')
@@ -172,18 +216,8 @@ class GoldenHourRecorder:
         self.file_handle.flush()
 
         try:
-            print("Connecting to backend.rugs.fun...")
-            self.sio.connect(
-                'https://backend.rugs.fun',
-                transports=['polling', 'websocket'],
-                wait_timeout=10,
-                headers={
-                    'Origin': 'https://rugs.fun',
-                    'Referer': 'https://rugs.fun/',
-                    'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
-                },
-                socketio_path='/socket.io/'
-            )
+            print(f"Connecting to {self.url}...")
+            self.sio.connect(self.url, **CONNECT_OPTIONS)
             self.sio.wait()
         except KeyboardInterrupt:
             print("\n\nStopping recording...")
@@ -196,13 +230,7 @@ class GoldenHourRecorder:
         if self.file_handle and not self.file_handle.closed:
             try:
                 # Write session footer
-                footer = {
-                    'session_end': datetime.now().isoformat(),
-                    'total_events': self.event_count,
-                    'total_games': self.game_count,
-                    'games': self.games_recorded
-                }
-                self.file_handle.write(f"# Session End: {json.dumps(footer)}\n")
+                self.file_handle.write(self._session_footer())
                 self.file_handle.close()
             except:
                 pass
@@ -225,7 +253,20 @@ class GoldenHourRecorder:
             self.file_handle.write(f"# Session End: {json.dumps(footer)}\n")
             self.file_handle.close()
 
-        # Print summary
+        self._print_summary()
+
+    def _session_footer(self) -> str:
+        """Session end comment line."""
+        footer = {
+            'session_end': datetime.now().isoformat(),
+            'total_events': self.event_count,
+            'total_games': self.game_count,
+            'games': self.games_recorded
+        }
+        return f"# Session End: {json.dumps(footer)}\n"
+
+    def _print_summary(self):
+        """Print the end-of-session summary."""
         print(f"\n{'='*60}")
         print(f"RECORDING COMPLETE")
         print(f"{'='*60}")
@@ -244,6 +285,203 @@ class GoldenHourRecorder:
         print(f"{'='*60}\n")
 
 
+class AsyncGoldenHourRecorder(GoldenHourRecorder):
+    """
+    Records rugs.fun events with socketio.AsyncClient and a writer task.
+
+    Event handlers only build the record and enqueue it. A writer task
+    drains the queue in batches (batch_size events or flush_interval
+    seconds, whichever comes first) and hands each batch to a
+    SegmentedRecordingWriter in a worker thread, so every batch costs one
+    write and one flush per segment. Progress is printed by a separate status task
+    every status_interval seconds instead of from the event handler.
+    """
+
+    def __init__(
+        self,
+        output_path: str,
+        url: str = BACKEND_URL,
+        compression: str = 'none',
+        level: Optional[int] = None,
+        rotate_bytes: Optional[int] = None,
+        rotate_seconds: Optional[float] = None,
+        rotate_per_game: bool = False,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_queue: int = 100000,
+        status_interval: float = 10.0,
+    ):
+        """
+        Args:
+            output_path: Base JSONL path
+            url: Socket.IO server URL
+            compression: 'none', 'gzip' or 'zstd'
+            level: Compression level
+            rotate_bytes: Rotate segments after this many bytes on disk
+            rotate_seconds: Rotate segments after this many seconds
+            rotate_per_game: Start a new segment for every new gameId
+            batch_size: Write once this many events are queued
+            flush_interval: Write queued events at least this often (seconds)
+            max_queue: Events buffered before new ones are dropped
+            status_interval: Seconds between progress lines
+        """
+        super().__init__(output_path, url=url)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.status_interval = status_interval
+        self.dropped_count = 0
+        self.writer = SegmentedRecordingWriter(
+            self.output_path,
+            compression=compression,
+            level=level,
+            rotate_bytes=rotate_bytes,
+            rotate_seconds=rotate_seconds,
+            rotate_per_game=rotate_per_game,
+            header=self._session_header,
+        )
+        self._queue: Optional[asyncio.Queue] = None
+        self._batch_ready: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._tasks: List[asyncio.Task] = []
+
+    def _create_client(self):
+        """Create the asyncio Socket.IO client."""
+        try:
+            import aiohttp  # noqa: F401 - required by socketio.AsyncClient
+        except ImportError:
+            print("ERROR: aiohttp not installed")
+            print("Run: pip install 'python-socketio[asyncio_client]'")
+            sys.exit(1)
+        return socketio.AsyncClient(logger=False, engineio_logger=False)
+
+    def _session_header(self, segment: int) -> str:
+        header = {
+            'session_start': datetime.now().isoformat(),
+            'type': 'golden_hour_recording',
+            'version': '1.0',
+            'segment': segment,
+            'compression': self.writer.compression,
+        }
+        return f"# Session: {json.dumps(header)}\n"
+
+    def _record_event(self, event_name: str, args: tuple):
+        """Enqueue a single event for the writer task (no I/O)."""
+        if self._queue is None:
+            return
+        record = self._build_record(event_name, args, datetime.now())
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self.dropped_count += 1
+        else:
+            if self._queue.qsize() >= self.batch_size:
+                self._batch_ready.set()
+
+        self.event_count += 1
+        self._track_event(event_name, args)
+
+    async def _write_loop(self):
+        """Drain the queue in batches and write them off the event loop."""
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        stopping = False
+        while not stopping:
+            batch = [await queue.get()]
+            if batch[0] is not _STOP:
+                # Wait for a full batch or the flush deadline (not when
+                # stopping: the stop signal may predate the clear())
+                self._batch_ready.clear()
+                if queue.qsize() < self.batch_size and not self._stopping:
+                    try:
+                        await asyncio.wait_for(self._batch_ready.wait(), self.flush_interval)
+                    except asyncio.TimeoutError:
+                        pass
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+
+            records = [record for record in batch if record is not _STOP]
+            stopping = len(records) != len(batch)
+            if records:
+                await loop.run_in_executor(None, self.writer.write_records, records)
+
+    async def _status_loop(self):
+        """Print progress periodically."""
+        while True:
+            await asyncio.sleep(self.status_interval)
+            elapsed = (datetime.now() - self.start_time).total_seconds() if self.start_time else 0
+            rate = self.event_count / elapsed if elapsed > 0 else 0
+            print(f"  [{self.event_count:,} events | {rate:.1f}/sec | {self.game_count} games"
+                  f" | queue {self._queue.qsize()} | dropped {self.dropped_count}]")
+
+    async def run(self):
+        """Connect and record until disconnected or cancelled."""
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._batch_ready = asyncio.Event()
+        self._stopping = False
+        self._tasks = [
+            asyncio.create_task(self._write_loop()),
+            asyncio.create_task(self._status_loop()),
+        ]
+
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+        try:
+            print(f"Connecting to {self.url}...")
+            await self.sio.connect(self.url, **CONNECT_OPTIONS)
+            await self.sio.wait()
+        except asyncio.CancelledError:
+            print("\n\nStopping recording...")
+        finally:
+            await self.stop_async()
+
+    async def stop_async(self):
+        """Disconnect, write everything still queued and finalize the recording."""
+        if self.sio.connected:
+            try:
+                await self.sio.disconnect()
+            except Exception:
+                pass
+
+        if self._tasks:
+            write_task, status_task = self._tasks
+            self._tasks = []
+            status_task.cancel()
+            self._stopping = True
+            await self._queue.put(_STOP)
+            self._batch_ready.set()
+            await write_task
+            self._queue = None
+
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.writer.close, self._session_footer())
+            self._print_summary()
+
+    def start(self):
+        """Connect and start recording (blocks until stopped)."""
+        try:
+            asyncio.run(self.run())
+        except KeyboardInterrupt:
+            pass
+
+    def _print_summary(self):
+        """Print the end-of-session summary with writer statistics."""
+        super()._print_summary()
+        stats = self.writer.stats
+        ratio = stats['raw_bytes'] / stats['bytes'] if stats['bytes'] else 0
+        print(f"Dropped events: {self.dropped_count:,}")
+        print(f"Frames written: {stats['frames']:,} ({stats['events'] / max(stats['frames'], 1):.1f} events/frame)")
+        print(f"Disk bytes:     {stats['bytes']:,} ({ratio:.1f}x {self.writer.compression})")
+        print(f"Manifest:       {self.writer.manifest_path}")
+        for path in self.writer.paths:
+            print(f"  {path}")
+        print()
+
+
 def main():
     parser = argparse.ArgumentParser(description='Record Golden Hour events from rugs.fun')
     parser.add_argument(
@@ -251,11 +489,48 @@ def main():
         default=f"~/rugs_recordings/golden_hour_{datetime.now().strftime('%Y-%m-%d_%H%M%S')}.jsonl",
         help='Output JSONL file path'
     )
+    parser.add_argument('--url', default=BACKEND_URL, help='Socket.IO server URL')
+    parser.add_argument(
+        '--async', dest='use_async', action='store_true',
+        help='Use the asyncio client with a batched writer task'
+    )
+    parser.add_argument(
+        '--compression', choices=list(COMPRESSION_SUFFIXES), default='none',
+        help='Compress each written batch (--async only)'
+    )
+    parser.add_argument('--level', type=int, help='Compression level (--async only)')
+    parser.add_argument('--rotate-mb', type=float, help='Start a new segment after N MB (--async only)')
+    parser.add_argument('--rotate-minutes', type=float, help='Start a new segment after N minutes (--async only)')
+    parser.add_argument(
+        '--rotate-per-game', action='store_true',
+        help='Start a new segment for every new gameId (--async only)'
+    )
+    parser.add_argument('--batch-size', type=int, default=500, help='Events per write (--async only)')
+    parser.add_argument('--flush-interval', type=float, default=1.0, help='Max seconds between writes (--async only)')
     args = parser.parse_args()
 
     output_path = Path(args.output).expanduser()
 
-    recorder = GoldenHourRecorder(str(output_path))
+    if args.use_async:
+        recorder = AsyncGoldenHourRecorder(
+            str(output_path),
+            url=args.url,
+            compression=args.compression,
+            level=args.level,
+            rotate_bytes=int(args.rotate_mb * 1024 * 1024) if args.rotate_mb else None,
+            rotate_seconds=args.rotate_minutes * 60 if args.rotate_minutes else None,
+            rotate_per_game=args.rotate_per_game,
+            batch_size=args.batch_size,
+            flush_interval=args.flush_interval,
+        )
+        # asyncio.run() turns Ctrl+C into cancellation; run() handles SIGTERM
+        recorder.start()
+        return
+
+    if args.compression != 'none' or args.rotate_mb or args.rotate_minutes or args.rotate_per_game:
+        parser.error('--compression and --rotate-* require --async')
+
+    recorder = GoldenHourRecorder(str(output_path), url=args.url)
 
     # Handle Ctrl+C gracefully
     def signal_handler(sig, frame):